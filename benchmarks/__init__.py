@@ -0,0 +1,11 @@
+"""
+Benchmarks de las rutas críticas (ingesta, /stats/*, reportes y predicciones) sobre datos sintéticos.
+
+No forman parte de la suite de tests (testpaths = tests); se ejecutan explícitamente:
+
+    pytest benchmarks --bench-rows 1000000 --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+
+Las bases generadas se guardan en benchmarks/.data/ y se reutilizan entre corridas; los
+resultados guardados (--benchmark-autosave / --benchmark-save) quedan en benchmarks/baselines/.
+"""
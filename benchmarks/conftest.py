@@ -0,0 +1,86 @@
+import os
+
+import duckdb
+import pytest
+
+from benchmarks.generator import DEFAULT_SEED, build_database, write_source_files
+from src.application.use_cases.manage_sectors import ManageSectors
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_SECTOR = "benchmark"
+
+# Filter sets the dashboard sends most often: everything, one year, one airport in one quarter
+SCENARIOS = {
+    "all": {},
+    "year": {"start_date": "2024-01-01", "end_date": "2024-12-31"},
+    "airport": {"start_date": "2024-01-01", "end_date": "2024-03-31", "origins": ["SKBO"]},
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("flight benchmarks")
+    group.addoption("--bench-rows", type=int, default=1_000_000,
+                    help="Synthetic flights in the benchmark database (default: 1,000,000)")
+    group.addoption("--bench-ingest-rows", type=int, default=200_000,
+                    help="Rows per source file in the ingest benchmarks (default: 200,000)")
+    group.addoption("--bench-xlsx-rows", type=int, default=20_000,
+                    help="Rows in the xlsx ingest benchmark (default: 20,000)")
+    group.addoption("--bench-seed", type=int, default=DEFAULT_SEED, help="Generator seed")
+    group.addoption("--bench-data-dir", default=os.path.join(BENCHMARKS_DIR, ".data"),
+                    help="Where generated databases and source files are cached")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Keep saved runs with the suite instead of ./.benchmarks, unless a storage was given explicitly
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = "file://" + os.path.join(BENCHMARKS_DIR, "baselines")
+
+
+@pytest.fixture(scope="session")
+def bench_options(request):
+    options = request.config.option
+    data_dir = options.bench_data_dir
+    os.makedirs(data_dir, exist_ok=True)
+    return {"rows": options.bench_rows, "ingest_rows": options.bench_ingest_rows,
+            "xlsx_rows": options.bench_xlsx_rows, "seed": options.bench_seed, "data_dir": data_dir}
+
+
+@pytest.fixture(scope="session")
+def bench_db(bench_options):
+    """Base de métricas con --bench-rows vuelos y un sector de prueba; se genera una vez por tamaño/semilla."""
+    path = os.path.join(bench_options["data_dir"], f"flights_{bench_options['rows']}_{bench_options['seed']}.duckdb")
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        for leftover in (partial, partial + ".wal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        build_database(partial, bench_options["rows"], seed=bench_options["seed"])
+        ManageSectors(partial).create({
+            "name": BENCHMARK_SECTOR,
+            "definition": {"origins": ["SKBO", "SKRG", "SKCL"], "destinations": ["SKCG", "SKBQ", "SKSP"]},
+            "t_transfer": 30.0, "t_comm_ag": 15.0, "t_separation": 20.0, "t_coordination": 10.0,
+        })
+        os.replace(partial, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def bench_sector_id(bench_db):
+    conn = duckdb.connect(bench_db, read_only=True)
+    try:
+        return conn.execute("SELECT id FROM sectors WHERE name = ?", [BENCHMARK_SECTOR]).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="session")
+def source_files(bench_options):
+    """Archivos fuente sintéticos (CSV y xlsx) con los encabezados originales, cacheados por tamaño."""
+    def build(file_format: str, rows: int):
+        directory = os.path.join(bench_options["data_dir"], f"source_{file_format}_{rows}_{bench_options['seed']}")
+        if not os.path.isdir(directory):
+            write_source_files(directory + ".partial", rows, file_format, seed=bench_options["seed"], rows_per_file=rows)
+            os.replace(directory + ".partial", directory)
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    return build
@@ -0,0 +1,313 @@
+"""
+Generador determinista de vuelos sintéticos para benchmarks.
+
+Las filas se calculan en DuckDB a partir del número de fila con una función hash entera propia
+(no `hash()` de DuckDB, que puede cambiar entre versiones), así que con la misma semilla se
+obtienen exactamente los mismos vuelos en cualquier máquina y a cualquier escala (1M-200M filas)
+sin materializar nada en Python.
+
+Uso:
+    python -m benchmarks.generator database data/bench.duckdb --rows 10000000
+    python -m benchmarks.generator csv data/bench_csv --rows 1000000 --rows-per-file 250000
+    python -m benchmarks.generator xlsx data/bench_xlsx --rows 50000
+"""
+import argparse
+import os
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import duckdb
+
+from src.infrastructure.adapters.database.filter_values import add_filter_values
+from src.infrastructure.adapters.database.flights_store import build_flights_store, FLIGHTS_COLUMNS
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+
+DEFAULT_SEED = 20240101
+DEFAULT_START = date(2023, 1, 1)
+DEFAULT_DAYS = 730
+
+# (ICAO, name, relative traffic weight): Colombian network plus the main international links
+AIRPORTS: List[Tuple[str, str, int]] = [
+    ("SKBO", "EL DORADO", 34), ("SKRG", "JOSE MARIA CORDOVA", 12), ("SKCL", "ALFONSO BONILLA ARAGON", 9),
+    ("SKCG", "RAFAEL NUNEZ", 9), ("SKBQ", "ERNESTO CORTISSOZ", 6), ("SKSP", "GUSTAVO ROJAS PINILLA", 5),
+    ("SKSM", "SIMON BOLIVAR", 4), ("SKPE", "MATECANA", 3), ("SKBG", "PALONEGRO", 3), ("SKMR", "LOS GARZONES", 2),
+    ("SKCC", "CAMILO DAZA", 2), ("SKMD", "OLAYA HERRERA", 3), ("SKAR", "EL EDEN", 2), ("SKVP", "ALFONSO LOPEZ", 2),
+    ("SKLT", "ALFREDO VASQUEZ COBO", 1), ("SKRH", "ALMIRANTE PADILLA", 1), ("SKPS", "ANTONIO NARINO", 1),
+    ("SKIB", "PERALES", 1), ("SKVV", "VANGUARDIA", 1), ("SKYP", "EL ALCARAVAN", 1), ("SKUI", "EL CARANO", 1),
+    ("SKEJ", "YARIGUIES", 1), ("SKMZ", "LA NUBIA", 1), ("SKPP", "GUILLERMO LEON VALENCIA", 1),
+    ("KMIA", "MIAMI INTL", 3), ("KFLL", "FORT LAUDERDALE INTL", 1), ("KJFK", "JOHN F KENNEDY INTL", 1),
+    ("MPTO", "TOCUMEN", 3), ("MMMX", "BENITO JUAREZ", 2), ("SEQM", "MARISCAL SUCRE", 1), ("SPJC", "JORGE CHAVEZ", 2),
+    ("SVMI", "SIMON BOLIVAR INTL", 1), ("LEMD", "ADOLFO SUAREZ BARAJAS", 1), ("MDSD", "LAS AMERICAS", 1),
+]
+
+# (ICAO designator, company name, weight)
+AIRLINES: List[Tuple[str, str, int]] = [
+    ("AVA", "AVIANCA", 38), ("LAN", "LATAM AIRLINES COLOMBIA", 18), ("RPB", "AEROREPUBLICA", 6),
+    ("SRU", "SATENA", 5), ("JAT", "JETSMART COLOMBIA", 4), ("WGO", "WINGO", 6), ("CMP", "COPA AIRLINES", 5),
+    ("AAL", "AMERICAN AIRLINES", 3), ("AEA", "AIR EUROPA", 1), ("IBE", "IBERIA", 1), ("ARE", "AIRES", 3),
+    ("TPA", "AVIANCA CARGO", 3), ("LCO", "LATAM CARGO", 2), ("EFY", "EASYFLY", 4), ("ADA", "ADA AEROLINEA", 1),
+]
+
+# (ICAO aircraft type designator, weight)
+AIRCRAFT: List[Tuple[str, int]] = [
+    ("A320", 30), ("A20N", 12), ("A319", 8), ("A321", 6), ("B738", 9), ("B38M", 3), ("B788", 3), ("B789", 2),
+    ("AT72", 8), ("AT76", 4), ("E190", 4), ("DH8D", 2), ("C208", 3), ("BE20", 2), ("A332", 1), ("B763", 1),
+]
+
+# ICAO flight plan item 8: scheduled, non-scheduled, general aviation, military, other
+FLIGHT_TYPES: List[Tuple[str, int]] = [("S", 82), ("N", 10), ("G", 6), ("M", 1), ("X", 1)]
+
+# Departures per hour of day (local time): morning and evening banks
+HOURLY_PROFILE = [1, 1, 1, 1, 2, 6, 9, 10, 9, 8, 7, 7, 7, 7, 7, 7, 8, 9, 9, 8, 6, 4, 3, 2]
+
+# Spreadsheet headers as exported by the source system (see IngestFlightsDataUseCase.column_mapping)
+SOURCE_HEADERS = {
+    "fecha": "Fecha", "id": "ID", "sid": "SID", "ssr": "SSR", "callsign": "Callsign", "matricula": "Matrícula",
+    "tipo_aeronave": "Tip Aer", "empresa": "Empresa", "numero_vuelo": "# Vuelo", "tipo_vuelo": "Tip Vuel",
+    "tiempo_inicial": "Tiempo Inicial", "origen": "Origen", "fecha_salida": "Fec Sal", "hora_salida": "Hr Sal",
+    "hora_pv": "Hora PV", "destino": "Destino", "fecha_llegada": "Fec Lle", "hora_llegada": "Hr Lle",
+    "nivel": "Nivel", "duracion": "Duración", "distancia": "Distancia", "velocidad": "Velocidad",
+    "eq_ssr": "Eq SSR", "nombre_origen": "Nombre origen ZZZZ", "nombre_destino": "Nombre destino ZZZZ",
+    "fecha_registro": "Fecha de Registro",
+}
+
+
+def _sql_list(values: Sequence) -> str:
+    return "[" + ", ".join("'" + str(v).replace("'", "''") + "'" if isinstance(v, str) else str(v) for v in values) + "]"
+
+
+def _weighted(items: Sequence[tuple]) -> List[int]:
+    """Índices repetidos según su peso (la última columna de cada tupla)."""
+    return [index for index, item in enumerate(items) for _ in range(item[-1])]
+
+
+def _install_macros(conn, seed: int) -> None:
+    # 32-bit integer hash (two multiply-xorshift rounds): decorrelates consecutive rows and salts
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP MACRO bench_seed(i, salt) AS
+            ((i * 2654435761 + salt * 40503 + {int(seed) % 4294967296}) & 4294967295)
+    """)
+    conn.execute("CREATE OR REPLACE TEMP MACRO bench_round(x) AS ((xor(x, x >> 16) * 73244475) & 4294967295)")
+    conn.execute("CREATE OR REPLACE TEMP MACRO bench_hash(i, salt) AS "
+                 "(xor(bench_round(bench_round(bench_seed(i, salt))), bench_round(bench_round(bench_seed(i, salt))) >> 16))")
+    conn.execute("CREATE OR REPLACE TEMP MACRO bench_pick(weights, i, salt) AS "
+                 "(weights[1 + (bench_hash(i, salt) % len(weights))::BIGINT])")
+
+
+def flights_sql(start_row: int, rows: int, file_id: int = 1, start: date = DEFAULT_START,
+                days: int = DEFAULT_DAYS) -> str:
+    """
+    SELECT que produce las filas [start_row, start_row + rows) con el esquema de FLIGHTS_COLUMNS.
+    Requiere las macros de `_install_macros` en la conexión. Cada fila depende solo de su número
+    y de la semilla, así que cualquier rango se puede generar por separado (archivos o lotes).
+    """
+    airport_codes = _sql_list([a[0] for a in AIRPORTS])
+    airport_names = _sql_list([a[1] for a in AIRPORTS])
+    airport_weights = _sql_list(_weighted(AIRPORTS))
+    airline_codes = _sql_list([a[0] for a in AIRLINES])
+    airline_names = _sql_list([a[1] for a in AIRLINES])
+    airline_weights = _sql_list(_weighted(AIRLINES))
+    aircraft = _sql_list([a[0] for a in AIRCRAFT])
+    aircraft_weights = _sql_list(_weighted(AIRCRAFT))
+    flight_types = _sql_list([t[0] for t in FLIGHT_TYPES])
+    flight_type_weights = _sql_list(_weighted(FLIGHT_TYPES))
+    hour_weights = _sql_list([hour for hour, weight in enumerate(HOURLY_PROFILE) for _ in range(weight)])
+    airport_count = len(AIRPORTS)
+
+    return f"""
+        WITH base AS (
+            SELECT
+                i,
+                bench_pick({airport_weights}, i, 1) AS o,
+                bench_pick({airport_weights}, i, 2) AS d0,
+                bench_pick({airline_weights}, i, 3) AS a,
+                bench_pick({hour_weights}, i, 4) * 60 + bench_hash(i, 5) % 60 AS dep_minute,
+                DATE '{start.isoformat()}' + (bench_hash(i, 6) % {int(days)})::INTEGER AS day
+            FROM range({int(start_row)}, {int(start_row) + int(rows)}) t(i)
+        ), route AS (
+            SELECT *,
+                -- Never the same airport at both ends
+                CASE WHEN d0 = o THEN (o + 1 + bench_hash(i, 7) % {airport_count - 1}) % {airport_count} ELSE d0 END AS d
+            FROM base
+        ), legs AS (
+            SELECT *,
+                -- Fixed distance per route, cruise speed per flight
+                120 + bench_hash(least(o, d) * 100 + greatest(o, d), 8) % 2400 AS km,
+                420 + bench_hash(i, 9) % 80 AS kt
+            FROM route
+        ), timed AS (
+            SELECT *,
+                (km / (kt * 1.852) * 60)::BIGINT + 12 AS minutes,
+                dep_minute - 10 - bench_hash(i, 10) % 35 AS plan_minute
+            FROM legs
+        )
+        SELECT
+            i + 1 AS id,
+            {int(file_id)}::BIGINT AS file_id,
+            day AS fecha,
+            printf('%08d', i + 1) AS sid,
+            printf('%04o', bench_hash(i, 11) % 4096) AS ssr,
+            {airline_codes}[a + 1] || (100 + bench_hash(i, 12) % 8900)::VARCHAR AS callsign,
+            'HK' || (4000 + bench_hash(i, 13) % 1600)::VARCHAR AS matricula,
+            {aircraft}[bench_pick({aircraft_weights}, i, 14) + 1] AS tipo_aeronave,
+            {airline_names}[a + 1] AS empresa,
+            100 + bench_hash(i, 12) % 8900 AS numero_vuelo,
+            {flight_types}[bench_pick({flight_type_weights}, i, 15) + 1] AS tipo_vuelo,
+            day + to_minutes(greatest(plan_minute, 0)) AS tiempo_inicial,
+            {airport_codes}[o + 1] AS origen,
+            day AS fecha_salida,
+            make_time(dep_minute // 60, dep_minute % 60, 0) AS hora_salida,
+            make_time(greatest(plan_minute, 0) // 60, greatest(plan_minute, 0) % 60, 0) AS hora_pv,
+            {airport_codes}[d + 1] AS destino,
+            day + ((dep_minute + minutes) // 1440)::INTEGER AS fecha_llegada,
+            make_time(((dep_minute + minutes) % 1440) // 60, (dep_minute + minutes) % 60, 0) AS hora_llegada,
+            least(410, 80 + (km // 60) * 10) AS nivel,
+            minutes AS duracion,
+            km AS distancia,
+            kt AS velocidad,
+            CASE WHEN bench_hash(i, 16) % 100 < 85 THEN 'S' ELSE 'C' END AS eq_ssr,
+            {airport_names}[o + 1] AS nombre_origen,
+            {airport_names}[d + 1] AS nombre_destino,
+            day + 1 AS fecha_registro
+        FROM timed
+    """
+
+
+def open_generator(seed: int = DEFAULT_SEED, database: str = ":memory:") -> duckdb.DuckDBPyConnection:
+    """Conexión DuckDB con las macros del generador instaladas para `seed`."""
+    conn = duckdb.connect(database)
+    _install_macros(conn, seed)
+    return conn
+
+
+def build_database(db_path: str, rows: int, seed: int = DEFAULT_SEED, rows_per_file: int = 5_000_000,
+                   backend: str = "duckdb", parquet_directory: Optional[str] = None,
+                   airports_csv_path: str = "data/raw/data.csv",
+                   region_airports_csv_path: str = "data/raw/region_airports.csv") -> str:
+    """
+    Crea una base de métricas completa (migraciones, catálogo de aeropuertos y regiones) y carga
+    `rows` vuelos sintéticos, repartidos en "archivos" de `rows_per_file` filas registrados en
+    file_processing_control como si vinieran de la ingesta.
+
+    Args:
+        db_path (str): Base DuckDB a crear (no debe existir).
+        rows (int): Cantidad total de vuelos.
+        seed (int): Semilla del generador.
+        rows_per_file (int): Filas por archivo simulado (y por lote de carga).
+        backend (str): "duckdb" o "parquet", como FLIGHTS_STORAGE_BACKEND.
+        parquet_directory (Optional[str]): Directorio del dataset Parquet (backend "parquet").
+
+    Returns:
+        str: La ruta de la base creada.
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    store = build_flights_store(backend, parquet_directory=parquet_directory or f"{os.path.splitext(db_path)[0]}_parquet")
+    SchemaMigrator(db_path, store, airports_csv_path=airports_csv_path,
+                   region_airports_csv_path=region_airports_csv_path).run()
+
+    conn = duckdb.connect(db_path)
+    try:
+        _install_macros(conn, seed)
+        for file_number, start_row in enumerate(range(0, rows, rows_per_file), start=1):
+            batch_rows = min(rows_per_file, rows - start_row)
+            file_id = conn.execute(
+                "INSERT INTO file_processing_control (file_name, processed_at, status, row_count) "
+                "VALUES (?, CURRENT_TIMESTAMP, 'COMPLETED', ?) RETURNING id",
+                [f"synthetic_{seed}_{file_number:04d}.csv", batch_rows]
+            ).fetchone()[0]
+            conn.execute(f"CREATE OR REPLACE TEMP VIEW synthetic_batch AS {flights_sql(start_row, batch_rows, file_id)}")
+            store.append(conn, "synthetic_batch", file_id)
+            add_filter_values(conn, "synthetic_batch")
+        conn.execute("DROP VIEW IF EXISTS synthetic_batch")
+        conn.execute("CHECKPOINT")
+    finally:
+        conn.close()
+    return db_path
+
+
+def _source_select(start_row: int, rows: int) -> str:
+    """Las mismas filas con los encabezados y formatos de las planillas de origen (fechas ISO, horas HHMM)."""
+    formats = {
+        column: f"strftime(DATE '2000-01-01' + {column}, '%H%M')" for column in ("hora_salida", "hora_pv", "hora_llegada")
+    }
+    formats["tiempo_inicial"] = "strftime(tiempo_inicial, '%Y-%m-%d %H:%M:%S')"
+    columns = [
+        f'{formats.get(column, f"{column}::VARCHAR")} AS "{SOURCE_HEADERS[column]}"'
+        for column in FLIGHTS_COLUMNS if column != "file_id"
+    ]
+    return f"SELECT {', '.join(columns)} FROM ({flights_sql(start_row, rows)})"
+
+
+def write_source_files(directory: str, rows: int, file_format: str = "csv", seed: int = DEFAULT_SEED,
+                       rows_per_file: int = 1_000_000) -> List[str]:
+    """
+    Escribe los vuelos como archivos fuente (CSV o xlsx) listos para la ingesta.
+
+    Args:
+        directory (str): Directorio destino (se crea si no existe).
+        rows (int): Cantidad total de filas.
+        file_format (str): "csv" o "xlsx" (xlsx usa openpyxl en modo write-only; conviene para
+            escalas chicas, Excel no admite más de 1.048.575 filas por hoja).
+        rows_per_file (int): Filas por archivo.
+
+    Returns:
+        List[str]: Rutas de los archivos escritos, en orden.
+    """
+    if file_format not in ("csv", "xlsx"):
+        raise ValueError(f"Unsupported source format: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    conn = open_generator(seed)
+    paths = []
+    try:
+        for file_number, start_row in enumerate(range(0, rows, rows_per_file), start=1):
+            batch_rows = min(rows_per_file, rows - start_row)
+            path = os.path.join(directory, f"vuelos_{seed}_{file_number:04d}.{file_format}")
+            if file_format == "csv":
+                conn.execute(f"COPY ({_source_select(start_row, batch_rows)}) TO '{path}' (HEADER, DELIMITER ',')")
+            else:
+                _write_xlsx(conn, path, _source_select(start_row, batch_rows))
+            paths.append(path)
+    finally:
+        conn.close()
+    return paths
+
+
+def _write_xlsx(conn, path: str, select_sql: str, batch_size: int = 50_000) -> None:
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Vuelos")
+    result = conn.execute(select_sql)
+    sheet.append([column[0] for column in result.description])
+    while True:
+        batch = result.fetchmany(batch_size)
+        if not batch:
+            break
+        for row in batch:
+            sheet.append(list(row))
+    workbook.save(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic flights for benchmarks.")
+    parser.add_argument("target", choices=["database", "csv", "xlsx"])
+    parser.add_argument("path", help="DuckDB file (database) or output directory (csv/xlsx)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--rows-per-file", type=int, default=None)
+    parser.add_argument("--backend", choices=["duckdb", "parquet"], default="duckdb")
+    args = parser.parse_args(argv)
+
+    if args.target == "database":
+        build_database(args.path, args.rows, seed=args.seed, rows_per_file=args.rows_per_file or 5_000_000,
+                       backend=args.backend)
+        print(f"{args.rows} flights written to {args.path}")
+    else:
+        paths = write_source_files(args.path, args.rows, args.target, seed=args.seed,
+                                   rows_per_file=args.rows_per_file or 1_000_000)
+        print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Ingesta completa (parseo, validación, spool Parquet y carga) de archivos fuente sintéticos."""
+import shutil
+import tempfile
+
+import pytest
+
+from src.application.use_cases.ingest_flights_data import IngestFlightsDataUseCase
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+
+
+def _fresh_ingest(backend: str):
+    # Each round loads into a new, migrated database so rounds are independent
+    workdir = tempfile.mkdtemp(prefix="bench_ingest_")
+    IngestFlightsDataUseCase._instance = None
+    use_case = IngestFlightsDataUseCase(db_path=f"{workdir}/metrics.duckdb", data_dir=workdir,
+                                        storage_backend=backend, parquet_directory=f"{workdir}/flights_parquet")
+    SchemaMigrator(use_case.db_path, use_case.store).run()
+    return workdir, use_case
+
+
+@pytest.mark.parametrize("file_format,backend", [("csv", "duckdb"), ("csv", "parquet"), ("xlsx", "duckdb")])
+def test_ingest(benchmark, bench_options, source_files, file_format, backend):
+    rows = bench_options["xlsx_rows"] if file_format == "xlsx" else bench_options["ingest_rows"]
+    files = source_files(file_format, rows)
+    workdirs = []
+
+    def setup():
+        workdir, use_case = _fresh_ingest(backend)
+        workdirs.append(workdir)
+        return (use_case,), {}
+
+    try:
+        result = benchmark.pedantic(lambda use_case: use_case.execute(files=files), setup=setup, rounds=3)
+    finally:
+        IngestFlightsDataUseCase._instance = None
+        for workdir in workdirs:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    benchmark.extra_info["rows"] = rows
+    assert result.get("status") != "error", result
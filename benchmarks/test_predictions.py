@@ -0,0 +1,43 @@
+"""Casos de uso de predicción y capacidad de sector sobre la base sintética."""
+from src.application.use_cases.calculate_sector_capacity import CalculateSectorCapacity
+from src.application.use_cases.predict_airline_growth import PredictAirlineGrowth
+from src.application.use_cases.predict_daily_demand import PredictDailyDemand
+from src.application.use_cases.predict_peak_hours import PredictPeakHours
+from src.application.use_cases.predict_seasonal_trend import PredictSeasonalTrend
+from src.application.use_cases.predict_sector_saturation import PredictSectorSaturation
+
+
+def _run(benchmark, function, **kwargs):
+    # Model fits take seconds at scale; a few rounds are enough for a stable median
+    result = benchmark.pedantic(function, kwargs=kwargs, rounds=3)
+    assert isinstance(result, dict)
+    return result
+
+
+def test_predict_daily_demand(benchmark, bench_db):
+    _run(benchmark, PredictDailyDemand(bench_db).execute, days_ahead=30)
+
+
+def test_predict_daily_demand_airport(benchmark, bench_db):
+    _run(benchmark, PredictDailyDemand(bench_db).execute, days_ahead=30, airport="SKBO")
+
+
+def test_predict_peak_hours(benchmark, bench_db):
+    _run(benchmark, PredictPeakHours(bench_db).execute, start_date="2024-01-01", end_date="2024-12-31")
+
+
+def test_predict_airline_growth(benchmark, bench_db):
+    _run(benchmark, PredictAirlineGrowth(bench_db).execute, months_history=12)
+
+
+def test_predict_seasonal_trend(benchmark, bench_db):
+    _run(benchmark, PredictSeasonalTrend(bench_db).execute, start_date="2023-01-01", end_date="2024-12-31")
+
+
+def test_predict_sector_saturation(benchmark, bench_db, bench_sector_id):
+    _run(benchmark, PredictSectorSaturation(bench_db).execute, sector_id=bench_sector_id, days_ahead=30)
+
+
+def test_calculate_sector_capacity(benchmark, bench_db, bench_sector_id):
+    result = benchmark(CalculateSectorCapacity(bench_db).execute, bench_sector_id, {})
+    assert result is not None
@@ -0,0 +1,46 @@
+"""Generación de cada reporte (Excel y PDF) y de la exportación de vuelos crudos."""
+import pytest
+
+from benchmarks.conftest import SCENARIOS
+from src.application.use_cases.export_raw_flights_use_case import ExportRawFlightsUseCase
+from src.application.use_cases.generate_company_report import GenerateCompanyReport
+from src.application.use_cases.generate_destination_report import GenerateDestinationReport
+from src.application.use_cases.generate_executive_report import GenerateExecutiveReport
+from src.application.use_cases.generate_flight_type_report import GenerateFlightTypeReport
+from src.application.use_cases.generate_heatmap_report import GenerateHeatmapReport
+from src.application.use_cases.generate_origin_report import GenerateOriginReport
+from src.application.use_cases.generate_raw_data_report import GenerateRawDataReport
+from src.application.use_cases.generate_region_report import GenerateRegionReport
+from src.application.use_cases.generate_time_report import GenerateTimeReport
+
+REPORTS = {
+    "company": GenerateCompanyReport,
+    "destination": GenerateDestinationReport,
+    "executive": GenerateExecutiveReport,
+    "flight_type": GenerateFlightTypeReport,
+    "heatmap": GenerateHeatmapReport,
+    "origin": GenerateOriginReport,
+    "region": GenerateRegionReport,
+    "time": GenerateTimeReport,
+}
+
+# Raw data reports are bounded by the rows they export, so they only run with the narrow filter
+RAW_SCENARIO = SCENARIOS["airport"]
+
+
+@pytest.mark.parametrize("output", ["excel", "pdf"])
+@pytest.mark.parametrize("name", REPORTS)
+def test_report(benchmark, bench_db, name, output):
+    generate = getattr(REPORTS[name](bench_db), f"generate_{output}")
+    buffer = benchmark.pedantic(generate, args=(SCENARIOS["year"],), rounds=3)
+    assert buffer.getbuffer().nbytes > 0
+
+
+def test_raw_data_report(benchmark, bench_db):
+    buffer = benchmark.pedantic(GenerateRawDataReport(bench_db).generate_excel, args=(RAW_SCENARIO,), rounds=3)
+    assert buffer.getbuffer().nbytes > 0
+
+
+def test_export_raw_flights(benchmark, bench_db):
+    buffer = benchmark.pedantic(ExportRawFlightsUseCase(bench_db).execute, args=(RAW_SCENARIO,), rounds=3)
+    assert buffer.getbuffer().nbytes > 0
@@ -0,0 +1,33 @@
+"""Consultas de los endpoints /stats/* (y facetas de filtros) sobre la base sintética."""
+import pytest
+
+from benchmarks.conftest import SCENARIOS
+from src.application.use_cases.get_company_stats import GetCompanyStats
+from src.application.use_cases.get_destination_stats import GetDestinationStats
+from src.application.use_cases.get_filter_facets import GetFilterFacets
+from src.application.use_cases.get_flight_stats import GetFlightStats
+from src.application.use_cases.get_flight_type_stats import GetFlightTypeStats
+from src.application.use_cases.get_peak_hour_stats import GetPeakHourStats
+from src.application.use_cases.get_region_destination_stats import GetRegionDestinationStats
+from src.application.use_cases.get_region_stats import GetRegionStats
+from src.application.use_cases.get_time_stats import GetTimeStats
+
+STATS = {
+    "origin": GetFlightStats,
+    "destination": GetDestinationStats,
+    "flight_type": GetFlightTypeStats,
+    "company": GetCompanyStats,
+    "time": GetTimeStats,
+    "peak_hour": GetPeakHourStats,
+    "region": GetRegionStats,
+    "region_destination": GetRegionDestinationStats,
+    "filter_facets": GetFilterFacets,
+}
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS)
+@pytest.mark.parametrize("name", STATS)
+def test_stats(benchmark, bench_db, name, scenario):
+    use_case = STATS[name](bench_db)
+    result = benchmark(use_case.execute, SCENARIOS[scenario])
+    assert result is not None
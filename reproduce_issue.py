@@ -4,7 +4,7 @@ import os
 
 try:
     print("Initializing repository...")
-    repo = DuckDBAirportRepository(db_path="tesis.db", csv_path="data/raw/data.csv")
+    repo = DuckDBAirportRepository(db_path="tesis.db")
     print("Repository initialized.")
     
     with duckdb.connect("tesis.db") as conn:
@@ -6,7 +6,16 @@ from ...infrastructure.adapters.database.duckdb_metric_repository import DuckDBM
 from ...infrastructure.config.settings import Settings
 from ...infrastructure.adapters.duckdb_repository import DuckDBRegionRepository
 from ...infrastructure.adapters.duckdb_airport_repository import DuckDBAirportRepository
+from ...infrastructure.adapters.airport_catalog import CachedAirportRepository
 from ...infrastructure.adapters.duckdb_region_airport_repository import DuckDBRegionAirportRepository
+from ...infrastructure.adapters.database.flights_store import build_flights_store
+from ...infrastructure.adapters.database.migrations import SchemaMigrator
+from ...infrastructure.adapters.filter_search_index import FilterSearchIndex
+from ...infrastructure.adapters.ingest_progress import IngestProgress
+from ...infrastructure.adapters.api.query_executor import QueryExecutor
+from ...infrastructure.adapters.database.resource_governor import ResourceGovernor, WorkloadProfile
+from ...infrastructure.adapters.observability import MetricsRegistry, QueryObserver
+from ...infrastructure.adapters.query_log import QueryLog
 from ..use_cases.ingest_flights_data import IngestFlightsDataUseCase
 from ..use_cases.manage_regions import ManageRegions
 from ..use_cases.manage_airports import ManageAirports
@@ -21,6 +30,10 @@ from ..use_cases.predict_peak_hours import PredictPeakHours
 from ..use_cases.predict_airline_growth import PredictAirlineGrowth
 from ..use_cases.predict_sector_saturation import PredictSectorSaturation
 from ..use_cases.predict_seasonal_trend import PredictSeasonalTrend
+from ..use_cases.manage_report_jobs import ManageReportJobs
+from ..use_cases.manage_ingest_jobs import ManageIngestJobs
+from ..use_cases.manage_filters import ManageFilters
+from ..use_cases.get_filter_facets import GetFilterFacets
 
 
 class Container(containers.DeclarativeContainer):
@@ -52,18 +65,115 @@ class Container(containers.DeclarativeContainer):
         db_path=config.provided.database_path
     )
 
+    # Airport reads are served from an in-memory catalog; writes go to DuckDB and invalidate it
     airports_repository = providers.Singleton(
-        DuckDBAirportRepository,
-        db_path=config.provided.database_path,
-        csv_path="data/raw/data.csv" # Or configured path
+        CachedAirportRepository,
+        repository=providers.Singleton(
+            DuckDBAirportRepository,
+            db_path=config.provided.database_path
+        )
     )
 
     region_airports_repository = providers.Singleton(
         DuckDBRegionAirportRepository,
+        db_path=config.provided.database_path
+    )
+
+    # Schema migrations (run once at startup, see main.lifespan)
+    schema_migrator = providers.Factory(
+        SchemaMigrator,
         db_path=config.provided.database_path,
-        csv_path="data/raw/region_airports.csv" # Or configured path
+        flights_store=providers.Factory(
+            build_flights_store,
+            backend=config.provided.flights_storage_backend,
+            parquet_directory=config.provided.flights_parquet_directory,
+            partition_by_file=config.provided.flights_partition_by_file
+        ),
+        airports_csv_path="data/raw/data.csv", # Or configured path
+        region_airports_csv_path="data/raw/region_airports.csv" # Or configured path
     )
     
+    # Singleton: in-memory autocomplete index shared by every request
+    filter_search_index = providers.Singleton(
+        FilterSearchIndex,
+        db_path=config.provided.database_path
+    )
+
+    # Singleton: live ingest telemetry, written by the ingest thread and read by /etl/progress and its SSE stream
+    ingest_progress = providers.Singleton(IngestProgress)
+
+    # Singletons: one bounded pool per workload so heavy reports/forecasts cannot starve /stats
+    interactive_executor = providers.Singleton(
+        QueryExecutor,
+        name="interactive",
+        max_workers=config.provided.interactive_query_workers
+    )
+
+    report_executor = providers.Singleton(
+        QueryExecutor,
+        name="reports",
+        max_workers=config.provided.report_query_workers,
+        workload="report"
+    )
+
+    ml_executor = providers.Singleton(
+        QueryExecutor,
+        name="ml",
+        max_workers=config.provided.ml_query_workers
+    )
+
+    # Singleton: DuckDB threads/memory/spill budget and per-workload profiles applied by connect()
+    resource_governor = providers.Singleton(
+        ResourceGovernor,
+        engine=providers.Factory(
+            WorkloadProfile,
+            threads=config.provided.duckdb_threads,
+            memory_limit=config.provided.duckdb_memory_limit,
+            temp_directory=config.provided.duckdb_temp_directory,
+            max_temp_directory_size=config.provided.duckdb_max_temp_directory_size
+        ),
+        profiles=providers.Dict(
+            interactive=providers.Factory(
+                WorkloadProfile, statement_timeout_seconds=config.provided.interactive_statement_timeout_seconds),
+            report=providers.Factory(
+                WorkloadProfile, statement_timeout_seconds=config.provided.report_statement_timeout_seconds),
+            ingest=providers.Factory(
+                WorkloadProfile,
+                threads=config.provided.ingest_threads,
+                memory_limit=config.provided.ingest_memory_limit,
+                temp_directory=config.provided.ingest_temp_directory,
+                statement_timeout_seconds=config.provided.ingest_statement_timeout_seconds
+            ),
+            ml=providers.Factory(
+                WorkloadProfile, statement_timeout_seconds=config.provided.ml_statement_timeout_seconds),
+        ),
+        shared_database=config.provided.database_path
+    )
+
+    # Singletons: process-wide Prometheus registry, the per-statement query log and the DuckDB
+    # statement observer that feeds both
+    metrics_registry = providers.Singleton(MetricsRegistry)
+
+    query_log = providers.Singleton(
+        QueryLog,
+        enabled=config.provided.query_log_enabled,
+        capacity=config.provided.query_log_size,
+        path=config.provided.query_log_path,
+        max_bytes=config.provided.query_log_max_bytes,
+        backup_count=config.provided.query_log_backup_count,
+        min_duration_ms=config.provided.query_log_min_ms
+    )
+
+    query_observer = providers.Singleton(
+        QueryObserver,
+        registry=metrics_registry,
+        profile=config.provided.query_profiling_enabled,
+        slow_query_ms=config.provided.slow_query_ms,
+        capture_slow_plans=config.provided.capture_slow_query_plans,
+        plan_history=config.provided.slow_query_plan_history,
+        query_log=query_log
+    )
+
     # Application - Use Cases
     # Application - Use Cases
     # Metrics use cases removed as requested
@@ -71,7 +181,13 @@ class Container(containers.DeclarativeContainer):
     ingest_flights_data_use_case = providers.Factory(
         IngestFlightsDataUseCase,
         db_path=config.provided.database_path,
-        data_dir=config.provided.data_directory
+        data_dir=config.provided.data_directory,
+        storage_backend=config.provided.flights_storage_backend,
+        parquet_directory=config.provided.flights_parquet_directory,
+        partition_by_file=config.provided.flights_partition_by_file,
+        snapshot_ingest=config.provided.ingest_snapshot_mode,
+        filter_search_index=filter_search_index,
+        progress=ingest_progress
     )
 
     manage_regions_use_case = providers.Factory(
@@ -102,6 +218,17 @@ class Container(containers.DeclarativeContainer):
         db_path=config.provided.database_path
     )
 
+    manage_filters_use_case = providers.Factory(
+        ManageFilters,
+        db_path=config.provided.database_path,
+        search_index=filter_search_index
+    )
+
+    get_filter_facets_use_case = providers.Factory(
+        GetFilterFacets,
+        db_path=config.provided.database_path
+    )
+
     manage_sectors_use_case = providers.Factory(
         ManageSectors,
         db_path=config.provided.database_path
@@ -137,6 +264,24 @@ class Container(containers.DeclarativeContainer):
         db_path=config.provided.database_path
     )
 
+    # Singleton: one job registry per worker; jobs run on the shared report executor
+    manage_report_jobs_use_case = providers.Singleton(
+        ManageReportJobs,
+        db_path=config.provided.database_path,
+        jobs_directory=config.provided.report_jobs_directory,
+        ttl_seconds=config.provided.report_job_ttl_seconds,
+        executor=report_executor
+    )
+
+    # Singleton: the ingest queue and its writer lock must be shared across requests
+    manage_ingest_jobs_use_case = providers.Singleton(
+        ManageIngestJobs,
+        ingest_use_case=ingest_flights_data_use_case,
+        db_path=config.provided.database_path,
+        jobs_directory=config.provided.ingest_jobs_directory,
+        history_size=config.provided.ingest_job_history
+    )
+
 
 # Global container instance
 container = Container()
@@ -164,6 +309,12 @@ def get_export_raw_flights_use_case() -> ExportRawFlightsUseCase:
 def get_generate_executive_report_use_case() -> GenerateExecutiveReport:
     return container.generate_executive_report_use_case()
 
+def get_manage_filters_use_case() -> ManageFilters:
+    return container.manage_filters_use_case()
+
+def get_filter_facets_use_case() -> GetFilterFacets:
+    return container.get_filter_facets_use_case()
+
 def get_manage_sectors_use_case() -> ManageSectors:
     return container.manage_sectors_use_case()
 
@@ -185,4 +336,35 @@ def get_predict_sector_saturation_use_case() -> PredictSectorSaturation:
 def get_predict_seasonal_trend_use_case() -> PredictSeasonalTrend:
     return container.predict_seasonal_trend_use_case()
 
+def get_manage_report_jobs_use_case() -> ManageReportJobs:
+    return container.manage_report_jobs_use_case()
+
+def get_manage_ingest_jobs_use_case() -> ManageIngestJobs:
+    return container.manage_ingest_jobs_use_case()
+
+def get_schema_migrator() -> SchemaMigrator:
+    return container.schema_migrator()
+
+def get_ingest_progress() -> IngestProgress:
+    return container.ingest_progress()
+
+def get_interactive_executor() -> QueryExecutor:
+    return container.interactive_executor()
+
+def get_report_executor() -> QueryExecutor:
+    return container.report_executor()
+
+def get_ml_executor() -> QueryExecutor:
+    return container.ml_executor()
+
+def get_metrics_registry() -> MetricsRegistry:
+    return container.metrics_registry()
+
+def get_query_observer() -> QueryObserver:
+    return container.query_observer()
+
+def get_query_log() -> QueryLog:
+    return container.query_log()
 
+def get_resource_governor() -> ResourceGovernor:
+    return container.resource_governor()
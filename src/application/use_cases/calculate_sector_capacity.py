@@ -1,8 +1,9 @@
 
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
 import json
 from typing import Dict, Any, List
-from .manage_sectors import ManageSectors
+from .manage_sectors import ManageSectors, SECTOR_ORIGINS_FILTER, SECTOR_DESTINATIONS_FILTER
 
 class CalculateSectorCapacity:
     """
@@ -64,27 +65,24 @@ class CalculateSectorCapacity:
         
         # Aplicar filtros de fecha
         if filters.get('start_date'):
-            query += " AND fecha >= ?"
-            params.append(filters['start_date'])
+            date_sql, date_params = fecha_range_sql(start=filters['start_date'])
+            query += f" AND {date_sql}"
+            params.extend(date_params)
         if filters.get('end_date'):
-            query += " AND fecha <= ?"
-            params.append(filters['end_date'])
+            date_sql, date_params = fecha_range_sql(end=filters['end_date'])
+            query += f" AND {date_sql}"
+            params.extend(date_params)
             
-        # Filtrar por Orígenes y Destinos definidos en el sector
-        origins = sector_def.get('origins', [])
-        destinations = sector_def.get('destinations', [])
-        
-        if origins:
-            placeholders = ','.join(['?'] * len(origins))
-            query += f" AND origen IN ({placeholders})"
-            params.extend(origins)
-            
-        if destinations:
-            placeholders = ','.join(['?'] * len(destinations))
-            query += f" AND destino IN ({placeholders})"
-            params.extend(destinations)
+        # Filtrar por Orígenes y Destinos definidos en el sector (semi-join contra las tablas de membresía)
+        if sector_def.get('origins'):
+            query += f" AND {SECTOR_ORIGINS_FILTER}"
+            params.append(sector_id)
+
+        if sector_def.get('destinations'):
+            query += f" AND {SECTOR_DESTINATIONS_FILTER}"
+            params.append(sector_id)
 
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             result = conn.execute(query, params).fetchone()
             avg_duration_sec = result[0] if result[0] else 0
@@ -1,6 +1,8 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import FLIGHTS_COLUMNS, fecha_range_sql
+from .report_progress import ReportProgress, report_stage
 import io
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import polars as pl
 from src.infrastructure.config.settings import Settings
 
@@ -8,21 +10,21 @@ class ExportRawFlightsUseCase:
     def __init__(self, db_path: str = "data/metrics.duckdb"):
         self.db_path = db_path
 
-    def execute(self, filters: Dict[str, Any]) -> io.BytesIO:
-        conn = duckdb.connect(self.db_path, read_only=True)
+    def execute(self, filters: Dict[str, Any], progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
+        conn = connect(self.db_path, read_only=True)
         try:
-            # Base Query with Joins
-            query = """
+            # Base Query: source columns (not the Parquet view's year/month) plus region names,
+            # resolved from the region ids denormalized on flights at ingest
+            query = f"""
                 SELECT 
-                    f.*,
+                    {', '.join('f.' + c for c in FLIGHTS_COLUMNS)},
                     r_orig.name as region_origen,
                     r_dest.name as region_destino,
                     fpc.file_name as archivo_origen
                 FROM flights f
-                LEFT JOIN region_airports ra_orig ON f.origen = ra_orig.icao_code
-                LEFT JOIN regions r_orig ON ra_orig.region_id = r_orig.id
-                LEFT JOIN region_airports ra_dest ON f.destino = ra_dest.icao_code
-                LEFT JOIN regions r_dest ON ra_dest.region_id = r_dest.id
+                LEFT JOIN regions r_orig ON f.region_origen_id = r_orig.id
+                LEFT JOIN regions r_dest ON f.region_destino_id = r_dest.id
                 LEFT JOIN file_processing_control fpc ON f.file_id = fpc.id
                 WHERE 1=1
             """
@@ -31,12 +33,14 @@ class ExportRawFlightsUseCase:
 
             # 1. Date Range
             if filters.get('start_date'):
-                query += " AND f.fecha >= ?"
-                params.append(filters['start_date'])
+                date_sql, date_params = fecha_range_sql(start=filters['start_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             
             if filters.get('end_date'):
-                query += " AND f.fecha <= ?"
-                params.append(filters['end_date'])
+                date_sql, date_params = fecha_range_sql(end=filters['end_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
 
             # 2. Flight Level
             if filters.get('min_level') is not None:
@@ -75,6 +79,7 @@ class ExportRawFlightsUseCase:
             df = conn.execute(query, params).pl()
             
             # Write to buffer
+            report_stage(progress, "layout")
             buffer = io.BytesIO()
             df.write_csv(buffer,separator=";")
             buffer.seek(0)
@@ -1,7 +1,9 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
+from .report_progress import ReportProgress, report_stage
 import io
 import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -18,16 +20,18 @@ class GenerateCompanyReport:
         self.db_path = db_path
 
     def _get_data(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             query = "SELECT empresa, COUNT(*) as count FROM flights WHERE 1=1"
             params = []
             if filters.get('start_date'):
-                query += " AND fecha >= ?"
-                params.append(filters['start_date'])
+                date_sql, date_params = fecha_range_sql(start=filters['start_date'])
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             if filters.get('end_date'):
-                query += " AND fecha <= ?"
-                params.append(filters['end_date'])
+                date_sql, date_params = fecha_range_sql(end=filters['end_date'])
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             
             # ... other filters logic ...
             
@@ -57,9 +61,12 @@ class GenerateCompanyReport:
         buffer.seek(0)
         return buffer
 
-    def generate_excel(self, filters: Dict[str, Any]) -> io.BytesIO:
+    def generate_excel(self, filters: Dict[str, Any], progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         df = pd.DataFrame(data)
         output = io.BytesIO()
         writer = pd.ExcelWriter(output, engine='openpyxl')
@@ -74,9 +81,12 @@ class GenerateCompanyReport:
         output.seek(0)
         return output
 
-    def generate_pdf(self, filters: Dict[str, Any]) -> io.BytesIO:
+    def generate_pdf(self, filters: Dict[str, Any], progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
@@ -3,7 +3,7 @@ import duckdb
 import io
 import datetime
 import calendar
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, landscape
@@ -26,6 +26,7 @@ from .generate_flight_type_report import GenerateFlightTypeReport
 from .generate_company_report import GenerateCompanyReport
 from .generate_region_report import GenerateRegionReport
 from .generate_heatmap_report import GenerateHeatmapReport
+from .report_progress import ReportProgress, report_stage
 
 class GenerateExecutiveReport:
     def __init__(self, db_path: str = "data/metrics.duckdb"):
@@ -146,8 +147,11 @@ class GenerateExecutiveReport:
             print(f"Error gathering data: {e}")
             raise e
 
-    def generate_pdf(self, filters: Dict[str, Any]) -> io.BytesIO:
+    def generate_pdf(self, filters: Dict[str, Any], progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_aggregated_data(filters)
+        # Charts are drawn while the pages are laid out; the final build is the layout stage
+        report_stage(progress, "chart")
         buffer = io.BytesIO()
         
         # Document Setup
@@ -305,12 +309,15 @@ class GenerateExecutiveReport:
             elements.append(Paragraph("Hora de Llegada", styles['Heading3']))
             elements.append(PlatypusImage(img_heat_arr, width=500, height=250))
 
+        report_stage(progress, "layout")
         doc.build(elements)
         buffer.seek(0)
         return buffer
 
-    def generate_excel(self, filters: Dict[str, Any]) -> io.BytesIO:
+    def generate_excel(self, filters: Dict[str, Any], progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_aggregated_data(filters)
+        report_stage(progress, "chart")
         output = io.BytesIO()
         writer = pd.ExcelWriter(output, engine='openpyxl')
         workbook = writer.book
@@ -380,6 +387,7 @@ class GenerateExecutiveReport:
         if img_comp:
             ws.add_image(ExcelImage(img_comp), 'H25')
             
+        report_stage(progress, "layout")
         # --- DATA SHEETS ---
         def write_sheet(name, data_dict):
             if not data_dict: return
@@ -1,4 +1,6 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
+from .report_progress import ReportProgress, report_stage
 import io
 import datetime
 from typing import Dict, Any, List, Optional
@@ -17,7 +19,7 @@ class GenerateHeatmapReport:
         self.db_path = db_path
 
     def _get_data(self, filters: Dict[str, Any], time_column: str) -> List[Dict[str, Any]]:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # dayofweek(date) -> 0=Mon..6=Sun? 
             # DuckDB ISODOW -> 1=Mon..7=Sun
@@ -42,8 +44,9 @@ class GenerateHeatmapReport:
             params = []
             
             if filters.get('start_date'):
-               query += " AND fecha >= ?"
-               params.append(filters['start_date'])
+               date_sql, date_params = fecha_range_sql(start=filters['start_date'])
+               query += f" AND {date_sql}"
+               params.extend(date_params)
             # ... other filters ...
             
             query += " GROUP BY day, hour"
@@ -89,9 +92,12 @@ class GenerateHeatmapReport:
         buffer.seek(0)
         return buffer
 
-    def generate_excel(self, filters: Dict[str, Any], time_column: str = 'hora_salida') -> io.BytesIO:
+    def generate_excel(self, filters: Dict[str, Any], time_column: str = 'hora_salida', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, time_column)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         
         # Pivot for Excel Table
         # Rows: Days, Cols: Hours
@@ -117,9 +123,12 @@ class GenerateHeatmapReport:
         output.seek(0)
         return output
 
-    def generate_pdf(self, filters: Dict[str, Any], time_column: str = 'hora_salida') -> io.BytesIO:
+    def generate_pdf(self, filters: Dict[str, Any], time_column: str = 'hora_salida', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, time_column)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
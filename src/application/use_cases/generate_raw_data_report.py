@@ -1,4 +1,5 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import FLIGHTS_COLUMNS, fecha_range_sql
 import io
 import datetime
 from typing import Dict, Any, List
@@ -19,21 +20,18 @@ class GenerateRawDataReport:
         return summary
 
     def generate_excel(self, filters: Dict[str, Any]) -> io.BytesIO:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
-            # Base query with Joins
-            # f.*, region_orig.name, region_dest.name, file.file_name
-            query = """
+            # Base query: source columns, region names (via denormalized region ids), file.file_name
+            query = f"""
                 SELECT 
-                    f.*,
+                    {', '.join('f.' + c for c in FLIGHTS_COLUMNS)},
                     r_orig.name as region_origen,
                     r_dest.name as region_destino,
                     fc.file_name as nombre_archivo
                 FROM flights f
-                LEFT JOIN region_airports ra_orig ON f.origen = ra_orig.icao_code
-                LEFT JOIN regions r_orig ON ra_orig.region_id = r_orig.id
-                LEFT JOIN region_airports ra_dest ON f.destino = ra_dest.icao_code
-                LEFT JOIN regions r_dest ON ra_dest.region_id = r_dest.id
+                LEFT JOIN regions r_orig ON f.region_origen_id = r_orig.id
+                LEFT JOIN regions r_dest ON f.region_destino_id = r_dest.id
                 LEFT JOIN file_processing_control fc ON f.file_id = fc.id
                 WHERE 1=1
             """
@@ -41,11 +39,13 @@ class GenerateRawDataReport:
             
             # Apply Filters
             if filters.get('start_date'):
-                query += " AND f.fecha >= ?"
-                params.append(filters['start_date'])
+                date_sql, date_params = fecha_range_sql(start=filters['start_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             if filters.get('end_date'):
-                query += " AND f.fecha <= ?"
-                params.append(filters['end_date'])
+                date_sql, date_params = fecha_range_sql(end=filters['end_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             
             # List filters
             # Helper to add WHERE IN clauses
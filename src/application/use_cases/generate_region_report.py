@@ -1,7 +1,9 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
+from .report_progress import ReportProgress, report_stage
 import io
 import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -61,52 +63,37 @@ class GenerateRegionReport:
         return summary
 
     def _get_data(self, filters: Dict[str, Any], dimension: str) -> List[Dict[str, Any]]:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
-            # Determine field based on dimension
-            flight_field = 'f.origen' if dimension == 'origin' else 'f.destino'
-            
+            # Region ids are denormalized on flights at ingest: a plain group-by per region
+            region_field = 'f.region_origen_id' if dimension == 'origin' else 'f.region_destino_id'
+
             query = f"""
                 SELECT 
                     r.name as region_name,
-                    {flight_field} as airport_code,
                     COUNT(*) as count
                 FROM flights f
-                JOIN region_airports ra ON {flight_field} = ra.icao_code
-                JOIN regions r ON ra.region_id = r.id
+                JOIN regions r ON {region_field} = r.id
                 WHERE 1=1
             """
             params = []
             
             if filters.get('start_date'):
-                query += " AND f.fecha >= ?"
-                params.append(filters['start_date'])
+                date_sql, date_params = fecha_range_sql(start=filters['start_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             if filters.get('end_date'):
-                query += " AND f.fecha <= ?"
-                params.append(filters['end_date'])
+                date_sql, date_params = fecha_range_sql(end=filters['end_date'], alias="f.")
+                query += f" AND {date_sql}"
+                params.extend(date_params)
                 
             # ... other filters logic (simplified for report but ideally should match UseCase) ...
             # For strict consistency, we should replicate all filters, but starting with date is key.
 
-            query += f" GROUP BY region_name, airport_code"
+            query += " GROUP BY region_name"
             results = conn.execute(query, params).fetchall()
-            
-            # Map results: Region -> Total Count (aggregating all airports in that region)
-            # OR Region -> List of Airports?
-            # The report chart expects: [{'region': 'Andina', 'count': 100}, ...]
-            # So we aggregate by region here in python or in SQL?
-            # In SQL is better.
-            
-            # Re-aggregating in Python for flexibility if I want detail later, 
-            # but for the Chart/Report summary we need Region totals.
-            
-            data_map = {}
-            for r in results:
-                region = r[0] if r[0] else 'Desconocida'
-                cnt = r[2]
-                data_map[region] = data_map.get(region, 0) + cnt
-                
-            return [{'region': k, 'count': v} for k, v in data_map.items()]
+
+            return [{'region': r[0] if r[0] else 'Desconocida', 'count': r[1]} for r in results]
 
         except Exception as e:
             print(f"Error fetching data: {e}")
@@ -134,9 +121,12 @@ class GenerateRegionReport:
         buffer.seek(0)
         return buffer
 
-    def generate_excel(self, filters: Dict[str, Any], dimension: str = 'origin') -> io.BytesIO:
+    def generate_excel(self, filters: Dict[str, Any], dimension: str = 'origin', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, dimension)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         df = pd.DataFrame(data)
         output = io.BytesIO()
         writer = pd.ExcelWriter(output, engine='openpyxl')
@@ -159,9 +149,12 @@ class GenerateRegionReport:
         output.seek(0)
         return output
 
-    def generate_pdf(self, filters: Dict[str, Any], dimension: str = 'origin') -> io.BytesIO:
+    def generate_pdf(self, filters: Dict[str, Any], dimension: str = 'origin', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, dimension)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data)
+        report_stage(progress, "layout")
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
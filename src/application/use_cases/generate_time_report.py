@@ -1,7 +1,9 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
+from .report_progress import ReportProgress, report_stage
 import io
 import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -18,7 +20,7 @@ class GenerateTimeReport:
         self.db_path = db_path
 
     def _get_data(self, filters: Dict[str, Any], group_by: str) -> List[Dict[str, Any]]:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # group_by: 'month' or 'year'
             if group_by == 'year':
@@ -30,8 +32,9 @@ class GenerateTimeReport:
             params = []
             
             if filters.get('start_date'):
-                query += " AND fecha >= ?"
-                params.append(filters['start_date'])
+                date_sql, date_params = fecha_range_sql(start=filters['start_date'])
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             # ... other filters ...
             
             query += f" GROUP BY period ORDER BY period"
@@ -58,9 +61,12 @@ class GenerateTimeReport:
         buffer.seek(0)
         return buffer
 
-    def generate_excel(self, filters: Dict[str, Any], group_by: str = 'month') -> io.BytesIO:
+    def generate_excel(self, filters: Dict[str, Any], group_by: str = 'month', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, group_by)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data, group_by)
+        report_stage(progress, "layout")
         df = pd.DataFrame(data)
         output = io.BytesIO()
         writer = pd.ExcelWriter(output, engine='openpyxl')
@@ -73,9 +79,12 @@ class GenerateTimeReport:
         output.seek(0)
         return output
 
-    def generate_pdf(self, filters: Dict[str, Any], group_by: str = 'month') -> io.BytesIO:
+    def generate_pdf(self, filters: Dict[str, Any], group_by: str = 'month', progress: Optional[ReportProgress] = None) -> io.BytesIO:
+        report_stage(progress, "data")
         data = self._get_data(filters, group_by)
+        report_stage(progress, "chart")
         chart = self._generate_chart(data, group_by)
+        report_stage(progress, "layout")
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
@@ -1,4 +1,4 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import logging
 from typing import List, Dict, Any, Optional
 
@@ -8,11 +8,12 @@ class GetCompanyStats:
     def __init__(self, db_path: str = "data/metrics.duckdb"):
         self.db_path = db_path
 
-    def execute(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def execute(self, filters: Dict[str, Any], as_arrow: bool = False) -> List[Dict[str, Any]]:
         """
         Aggregates flight data by Company (empresa) based on provided filters.
+        With as_arrow=True the same columns are returned as a pyarrow Table.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # Base query - group by EMPRESA
             query = "SELECT empresa, COUNT(*) as count FROM flights WHERE empresa IS NOT NULL"
@@ -69,7 +70,11 @@ class GetCompanyStats:
             print(f"[RunDebug] Params: {params}")
 
             # Execute
-            results = conn.execute(query, params).fetchall()
+            result = conn.execute(query, params)
+            if as_arrow:
+                # Columnar clients get the Arrow table straight from DuckDB, no row dicts
+                return result.to_arrow_table().rename_columns(["name", "value"])
+            results = result.fetchall()
             
             # Format results
             return [{"name": r[0], "value": r[1]} for r in results]
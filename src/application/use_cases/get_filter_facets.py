@@ -0,0 +1,107 @@
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
+import logging
+from typing import List, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Facet dimensions: (payload key, flights column). Payload keys match the dashboard filter body.
+FACET_DIMENSIONS: List[Tuple[str, str]] = [
+    ('origins', 'origen'),
+    ('destinations', 'destino'),
+    ('empresa', 'empresa'),
+    ('tipo_vuelo', 'tipo_vuelo'),
+    ('tipo_aeronave', 'tipo_aeronave'),
+    ('matriculas', 'matricula'),
+    ('callsign', 'callsign'),
+]
+
+
+class GetFilterFacets:
+    def __init__(self, db_path: str = "data/metrics.duckdb"):
+        self.db_path = db_path
+
+    def execute(self, filters: Dict[str, Any], limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Cross-filtered facet counts for the dashboard filter panel.
+
+        Each dimension is counted under every active filter except its own, so the
+        panel shows how many flights each option would add to the current selection,
+        and options with no flights under the other filters are left out.
+        All dimensions are computed in one scan of flights with GROUPING SETS.
+
+        Args:
+            filters (Dict): Same payload as the /stats endpoints (dates, levels, value lists).
+            limit (int): Maximum values returned per dimension (highest counts first).
+
+        Returns:
+            Dict[str, List[Dict]]: {payload key: [{'value', 'count'}]} for every facet dimension.
+        """
+        conn = connect(self.db_path, read_only=True)
+        try:
+            # 1. Per-row flags: does the row pass each dimension's list filter?
+            flag_params = []
+            flags = []
+            for key, column in FACET_DIMENSIONS:
+                items = filters.get(key, [])
+                if items:
+                    flags.append(f"{column} IN ({','.join(['?'] * len(items))}) AS ok_{column}")
+                    flag_params.extend(items)
+                else:
+                    flags.append(f"TRUE AS ok_{column}")
+
+            # 2. Filters shared by every facet (date and level ranges)
+            where = ["1=1"]
+            where_params = []
+            if filters.get('start_date') or filters.get('end_date'):
+                date_sql, date_params = fecha_range_sql(filters.get('start_date') or None, filters.get('end_date') or None)
+                where.append(date_sql)
+                where_params.extend(date_params)
+            for key, op in (('min_level', '>='), ('max_level', '<=')):
+                if filters.get(key):
+                    try:
+                        where_params.append(int(filters[key]))
+                        where.append(f"CAST(nivel AS INTEGER) {op} ?")
+                    except (TypeError, ValueError):
+                        pass
+
+            # 3. One grouping set per dimension; each counts rows passing all *other* list filters
+            columns = [column for _, column in FACET_DIMENSIONS]
+            facet_case = " ".join(f"WHEN GROUPING({c}) = 0 THEN '{c}'" for c in columns)
+            value_case = " ".join(f"WHEN GROUPING({c}) = 0 THEN CAST({c} AS VARCHAR)" for c in columns)
+            count_case = " ".join(
+                f"WHEN GROUPING({c}) = 0 THEN count(*) FILTER (WHERE {' AND '.join(f'ok_{o}' for o in columns if o != c) or 'TRUE'})"
+                for c in columns
+            )
+            query = f"""
+                WITH base AS (
+                    SELECT {', '.join(columns)}, {', '.join(flags)}
+                    FROM flights
+                    WHERE {' AND '.join(where)}
+                ),
+                facets AS (
+                    SELECT
+                        CASE {facet_case} END AS facet,
+                        CASE {value_case} END AS value,
+                        CASE {count_case} END AS row_count
+                    FROM base
+                    GROUP BY GROUPING SETS ({', '.join(f'({c})' for c in columns)})
+                )
+                SELECT facet, value, row_count
+                FROM facets
+                WHERE value IS NOT NULL AND row_count > 0
+                QUALIFY row_number() OVER (PARTITION BY facet ORDER BY row_count DESC, value) <= ?
+                ORDER BY facet, row_count DESC, value
+            """
+            rows = conn.execute(query, flag_params + where_params + [int(limit)]).fetchall()
+
+            by_column = {column: [] for column in columns}
+            for facet, value, count in rows:
+                by_column[facet].append({"value": value, "count": count})
+            return {key: by_column[column] for key, column in FACET_DIMENSIONS}
+
+        except Exception as e:
+            logger.error(f"Error getting filter facets: {e}")
+            return {key: [] for key, _ in FACET_DIMENSIONS}
+        finally:
+            conn.close()
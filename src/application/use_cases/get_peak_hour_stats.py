@@ -1,13 +1,18 @@
-import duckdb
+import logging
+
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
 from typing import List, Dict, Any
 
+logger = logging.getLogger(__name__)
+
 class GetPeakHourStats:
     def __init__(self, db_path: str = "data/metrics.duckdb"):
         self.db_path = db_path
 
-    def execute(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        print(f"DEBUG: GetPeakHourStats executing with filters: {filters}")
-        conn = duckdb.connect(self.db_path, read_only=True)
+    def execute(self, filters: Dict[str, Any], as_arrow: bool = False) -> List[Dict[str, Any]]:
+        logger.debug(f"GetPeakHourStats executing with filters: {filters}")
+        conn = connect(self.db_path, read_only=True)
         try:
             # Query to get count by Day of Week (1-7) and Hour (0-23)
             # We treat hora_salida as 'HH:MM:SS' string or similar. 
@@ -38,13 +43,15 @@ class GetPeakHourStats:
             # --- Standard Filters (Enhanced to support both camelCase and snake_case keys) ---
             start_date = filters.get('startDate') or filters.get('start_date')
             if start_date and start_date.strip():
-                query += " AND fecha >= ?"
-                params.append(start_date)
+                date_sql, date_params = fecha_range_sql(start=start_date)
+                query += f" AND {date_sql}"
+                params.extend(date_params)
             
             end_date = filters.get('endDate') or filters.get('end_date')
             if end_date and end_date.strip():
-                query += " AND fecha <= ?"
-                params.append(end_date)
+                date_sql, date_params = fecha_range_sql(end=end_date)
+                query += f" AND {date_sql}"
+                params.extend(date_params)
 
             min_level = filters.get('minLevel') or filters.get('min_level')
             if min_level:
@@ -104,7 +111,11 @@ class GetPeakHourStats:
                 ORDER BY day_of_week, hour_of_day
             """
 
-            results = conn.execute(query, params).fetchall()
+            result = conn.execute(query, params)
+            if as_arrow:
+                # Columnar clients get the Arrow table straight from DuckDB, no row dicts
+                return result.to_arrow_table().rename_columns(["day", "hour", "value"])
+            results = result.fetchall()
             
             # Map results to list of dicts
             # isodow 1=Mon, 7=Sun.
@@ -1,4 +1,5 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
 from typing import List, Dict, Any
 
 class GetRegionStats:
@@ -6,7 +7,7 @@ class GetRegionStats:
         self.db_path = db_path
 
     def execute(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # Query to get count by Region and Origin
             # Structure: Region -> Origin -> Count
@@ -17,8 +18,7 @@ class GetRegionStats:
                     f.origen as origin_code,
                     COUNT(*) as value
                 FROM flights f
-                JOIN region_airports ra ON f.origen = ra.icao_code
-                JOIN regions r ON ra.region_id = r.id
+                JOIN regions r ON f.region_origen_id = r.id
                 WHERE 1=1
             """
             params = []
@@ -26,13 +26,15 @@ class GetRegionStats:
             # --- Apply Filters (Standard) ---
             if filters.get('startDate'):
                 if filters['startDate'].strip():
-                    query += " AND f.fecha >= ?"
-                    params.append(filters['startDate'])
+                    date_sql, date_params = fecha_range_sql(start=filters['startDate'], alias="f.")
+                    query += f" AND {date_sql}"
+                    params.extend(date_params)
             
             if filters.get('endDate'):
                 if filters['endDate'].strip():
-                    query += " AND f.fecha <= ?"
-                    params.append(filters['endDate'])
+                    date_sql, date_params = fecha_range_sql(end=filters['endDate'], alias="f.")
+                    query += f" AND {date_sql}"
+                    params.extend(date_params)
 
             if filters.get('minLevel'):
                 try: 
@@ -1,13 +1,18 @@
-import duckdb
+import logging
+
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.flights_store import fecha_range_sql
 from typing import List, Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
 class GetTimeStats:
     def __init__(self, db_path: str = "data/metrics.duckdb"):
         self.db_path = db_path
 
-    def execute(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        print(f"DEBUG: GetTimeStats executing with filters: {filters}")
-        conn = duckdb.connect(self.db_path, read_only=True)
+    def execute(self, filters: Dict[str, Any], as_arrow: bool = False) -> List[Dict[str, Any]]:
+        logger.debug(f"GetTimeStats executing with filters: {filters}")
+        conn = connect(self.db_path, read_only=True)
         try:
             # Determine grouping
             group_by = filters.get('groupBy', 'month')
@@ -25,13 +30,15 @@ class GetTimeStats:
             if filters.get('startDate'):
                 # Handle possible Empty strings
                 if filters['startDate'].strip():
-                    query += " AND fecha >= ?"
-                    params.append(filters['startDate'])
+                    date_sql, date_params = fecha_range_sql(start=filters['startDate'])
+                    query += f" AND {date_sql}"
+                    params.extend(date_params)
             
             if filters.get('endDate'):
                 if filters['endDate'].strip():
-                    query += " AND fecha <= ?"
-                    params.append(filters['endDate'])
+                    date_sql, date_params = fecha_range_sql(end=filters['endDate'])
+                    query += f" AND {date_sql}"
+                    params.extend(date_params)
 
             if filters.get('minLevel'):
                 try: 
@@ -99,11 +106,15 @@ class GetTimeStats:
 
             query += " GROUP BY name ORDER BY name"
 
-            print(f"DEBUG: Executing query: {query}")
-            print(f"DEBUG: Params: {params}")
+            logger.debug(f"Executing query: {query}")
+            logger.debug(f"Params: {params}")
 
-            results = conn.execute(query, params).fetchall()
-            print(f"DEBUG: Result count: {len(results)}")
+            result = conn.execute(query, params)
+            if as_arrow:
+                # Columnar clients get the Arrow table straight from DuckDB, no row dicts
+                return result.to_arrow_table().rename_columns(["name", "value"])
+            results = result.fetchall()
+            logger.debug(f"Result count: {len(results)}")
             
             # Format as Dicts for JSON response
             return [{"name": r[0], "value": r[1]} for r in results]
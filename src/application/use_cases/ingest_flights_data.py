@@ -1,12 +1,25 @@
-import duckdb
 import polars as pl
 import glob
+import json
 import os
+import re
 import logging
 import time
 from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import pandas as pd
-from src.infrastructure.utils.date_parser import DateParser
+from src.infrastructure.utils.date_parser import DateParser, per_distinct
+from src.infrastructure.adapters.database.flights_store import (
+    build_flights_store, FLIGHTS_COLUMNS, FLIGHTS_SCHEMA,
+    cache_route_distances, route_distance_fill_sql, count_missing_distances
+)
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.filter_values import add_filter_values, remove_file_filter_values, rebuild_filter_values
+from src.infrastructure.adapters.ingest_progress import IngestProgress, ensure_timing_columns
+from src.infrastructure.adapters.database.rejected_rows import (
+    ensure_rejected_schema, drop_rejected_schema, flag_rejected, split_rejected, insert_rejected, refresh_rejected_counts,
+    RAW_FECHA, RAW_RECORD, SOURCE_ROW, REASONS
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,18 +39,35 @@ class IngestFlightsDataUseCase:
             cls._instance = super(IngestFlightsDataUseCase, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, db_path: str = "data/metrics.duckdb", data_dir: str = "data"):
+    def __init__(self, db_path: str = "data/metrics.duckdb", data_dir: str = "data",
+                 storage_backend: str = "duckdb", parquet_directory: str = "data/flights_parquet",
+                 partition_by_file: bool = False, snapshot_ingest: bool = False,
+                 filter_search_index=None, progress: IngestProgress = None):
         """
         Inicializa el motor ETL con mapeos de columnas y configuraciones de directorios.
         
         Args:
             db_path (str): Ruta a la base de datos de destino.
             data_dir (str): Directorio donde se depositan los archivos fuente.
+            storage_backend (str): 'duckdb' (tabla nativa) o 'parquet' (dataset Hive + vista).
+            parquet_directory (str): Raíz del dataset Parquet cuando storage_backend='parquet'.
+            partition_by_file (bool): Particionar el dataset Parquet también por file_id.
+            snapshot_ingest (bool): Construir la carga en una base de staging y publicarla al final
+                en una sola transacción (las lecturas solo esperan durante la publicación).
+            filter_search_index: Índice de autocompletado a reconstruir cuando cambian los valores de filtro.
+            progress (IngestProgress): Telemetría compartida con /etl/progress y el stream SSE.
         """
         # Prevent re-initialization if singleton wrapper logic isn't perfect, though __new__ handles creation
         if not hasattr(self, 'initialized'):
             self.db_path = db_path
             self.data_dir = data_dir
+            self.store = build_flights_store(storage_backend, parquet_directory, partition_by_file)
+            self.snapshot_ingest = snapshot_ingest
+            self.filter_search_index = filter_search_index
+            self.progress = progress or IngestProgress()
+            self.staging_path = os.path.splitext(db_path)[0] + ".staging.duckdb"
+            # Parsed and validated files are spooled here as Parquet before loading into DuckDB
+            self.spool_dir = os.path.splitext(db_path)[0] + ".spool"
             
             # Column mapping
             self.column_mapping = {
@@ -70,102 +100,60 @@ class IngestFlightsDataUseCase:
             }
 
             # Target columns list
-            self.target_columns = [
-                'id', 'file_id', 'fecha', 'sid', 'ssr', 'callsign', 'matricula', 'tipo_aeronave', 'empresa', 
-                'numero_vuelo', 'tipo_vuelo', 'tiempo_inicial', 'origen', 'fecha_salida', 
-                'hora_salida', 'hora_pv', 'destino', 'fecha_llegada', 'hora_llegada', 'nivel', 
-                'duracion', 'distancia', 'velocidad', 'eq_ssr', 'nombre_origen', 
-                'nombre_destino', 'fecha_registro'
-            ]
+            self.target_columns = list(FLIGHTS_COLUMNS)
+            # Source fields kept as text in flights_rejected.raw_record (corrected and re-validated from there)
+            self.raw_columns = [c for c in self.target_columns if c != 'file_id']
             
-            # State tracking
-            self.current_file = None
-            self.total_files = 0
-            self.processed_count = 0
             self.initialized = True
 
     def _init_db(self, conn):
         """
-        Inicializa las tablas y secuencias necesarias para la persistencia de vuelos y control de archivos.
+        Recrea las tablas y secuencias de vuelos y control de archivos después de un reset.
+        En el arranque normal el esquema lo crea y actualiza SchemaMigrator (ver migrations.py);
+        las rutas de ingesta, historial y compactación ya no lo verifican en cada llamada.
         
         Fases:
         1. file_processing_control: Almacena el historial de ingestas (id, nombre_archivo, estado).
-        2. flights: Tabla principal de hechos con llave foránea al control de archivos.
+        2. flights: Tabla principal de hechos con llave foránea al control de archivos
+           (o vista sobre el dataset Parquet si el backend de almacenamiento es 'parquet').
+        3. flights_rejected: Cuarentena de filas que no pasaron la validación.
         
         Args:
             conn (duckdb.Connection): Conexión activa a la base de datos de métricas.
         """
 
-        # 2. Main Flights Table
+        # 1. File Processing Control
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS tracking_id_seq")
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS flights (
-                id BIGINT, 
-                file_id BIGINT REFERENCES file_processing_control(id), -- Added FK
-                fecha DATE,
-                sid VARCHAR,
-                ssr VARCHAR,
-                callsign VARCHAR,
-                matricula VARCHAR,
-                tipo_aeronave VARCHAR,
-                empresa VARCHAR,
-                numero_vuelo BIGINT,
-                tipo_vuelo VARCHAR,
-                tiempo_inicial TIMESTAMP,
-                origen VARCHAR,
-                fecha_salida DATE,
-                hora_salida TIME,
-                hora_pv TIME,
-                destino VARCHAR,
-                fecha_llegada DATE,
-                hora_llegada TIME,
-                nivel BIGINT,
-                duracion BIGINT,
-                distancia BIGINT,
-                velocidad BIGINT,
-                eq_ssr VARCHAR,
-                nombre_origen VARCHAR,
-                nombre_destino VARCHAR,
-                fecha_registro DATE
+            CREATE TABLE IF NOT EXISTS file_processing_control (
+                id BIGINT DEFAULT nextval('tracking_id_seq') PRIMARY KEY,
+                file_name VARCHAR,
+                processed_at TIMESTAMP,
+                status VARCHAR,
+                row_count BIGINT,
+                error_message VARCHAR
             )
         """)
-        
-        # Schema Correction/Migration: Ensure sid is VARCHAR
-        try:
-            # Check current schema
-            columns = conn.execute("DESCRIBE flights").fetchall()
-            logger.info(f"Current flights schema: {columns}")
-            for col in columns:
-                name = col[0].lower()
-                type_ = str(col[1]).upper()
-                logger.info(f"Checking column {name} of type {type_}")
-                if name == 'sid' and type_ not in ['VARCHAR', 'STRING']:
-                    logger.info(f"Detected sid column as {type_}. Migrating to VARCHAR.")
-                    conn.execute("ALTER TABLE flights ALTER COLUMN sid TYPE VARCHAR")
-                    logger.info("Migration command executed.")
-        except Exception as e:
-            logger.warning(f"Schema migration check failed: {e}")
+        ensure_timing_columns(conn)
 
-        except Exception as e:
-            logger.warning(f"Schema migration check failed: {e}")
+        # 2. Main Flights Table (native table or Parquet-backed view, per storage backend)
+        self.store.create_schema(conn)
+
+        # 3. Quarantine for rows rejected by validation
+        ensure_rejected_schema(conn)
 
-        # Schema Correction: Ensure file_id exists
+    def _refresh_filter_index(self):
+        """
+        Reconstruye el índice de autocompletado tras un cambio de filters_values. El índice lee con
+        su propia conexión, así que se llama con la conexión de escritura ya cerrada.
+        """
+        if self.filter_search_index is None:
+            return
         try:
-            # Re-fetch columns to check for file_id
-            columns = conn.execute("DESCRIBE flights").fetchall()
-            col_names = [col[0].lower() for col in columns]
-            if 'file_id' not in col_names:
-                logger.info("Adding file_id column to flights table.")
-                conn.execute("ALTER TABLE flights ADD COLUMN file_id BIGINT")
-                
-                # Update existing records to link to a dummy or keep null?
-                # For now keep null.
-                
-                # Try adding FK. Note: Adding FK to existing table in DuckDB is limited/syntax specific.
-                # Just column for now to enable insertion. 
+            self.filter_search_index.rebuild()
         except Exception as e:
-             logger.warning(f"file_id migration check failed: {e}")
-
-        
+            # The write already succeeded; the next search retries the rebuild
+            logger.error(f"Error rebuilding the filter search index: {e}")
 
     @staticmethod
     def _clean_int(val):
@@ -178,8 +166,41 @@ class IngestFlightsDataUseCase:
         Returns:
             Optional[int]: Entero limpio o None si el valor no es convertible.
         """
+        if val is None:
+            return None
+        if isinstance(val, (int, float)):
+            return None if val != val else int(val)
+        text = str(val).strip().replace(" ", "")
+        if not text:
+            return None
+        if "," in text:
+            # "1,200.0" / "1,200" use thousands separators; "12,5" is a decimal comma
+            if "." in text or re.fullmatch(r"-?\d{1,3}(,\d{3})+", text):
+                text = text.replace(",", "")
+            else:
+                text = text.replace(",", ".")
+        try:
+            return int(float(text))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _clean_int_expr(expr: pl.Expr) -> pl.Expr:
+        """Versión vectorizada de _clean_int para columnas de texto (mismas reglas de separadores)."""
+        text = expr.cast(pl.Utf8).str.strip_chars().str.replace_all(" ", "", literal=True)
+        has_comma = text.str.contains(",", literal=True)
+        thousands = text.str.contains(".", literal=True) | text.str.contains(r"^-?\d{1,3}(,\d{3})+$")
+        text = (
+            pl.when(has_comma & thousands).then(text.str.replace_all(",", "", literal=True))
+            .when(has_comma).then(text.str.replace_all(",", ".", literal=True))
+            .otherwise(text)
+        )
+        number = text.cast(pl.Float64, strict=False)
+        return pl.when(number.is_finite()).then(number.cast(pl.Int64, strict=False))
 
-    def execute(self, force_reload: bool = False, specific_file: str = None) -> dict:
+    def execute(self, force_reload: bool = False, specific_file: str = None, files: Optional[List[str]] = None,
+                should_stop: Optional[Callable[[], bool]] = None,
+                on_file_done: Optional[Callable[[str, str], None]] = None) -> dict:
         """
         Ejecuta el proceso de ingesta para archivos nuevos o todos los archivos.
         
@@ -192,13 +213,22 @@ class IngestFlightsDataUseCase:
         Args:
             force_reload (bool): Si es True, limpia la BD y recarga todo.
             specific_file (str): Nombre de un archivo específico para procesar solitario.
+            files (Optional[List[str]]): Rutas explícitas a procesar, en orden (la cola de trabajos
+                de ingesta las fija al encolar para poder reanudar desde un checkpoint).
+            should_stop (Optional[Callable]): Se consulta entre archivos; si devuelve True la ingesta
+                se detiene limpiamente antes del siguiente archivo (cancelación cooperativa).
+            on_file_done (Optional[Callable]): Recibe (nombre de archivo, estado) cuando un archivo
+                queda registrado en file_processing_control (checkpoint).
             
         Returns:
-            dict: Resumen del proceso (archivos procesados, filas insertadas, errores).
+            dict: Resumen del proceso (archivos procesados, filas insertadas, errores);
+                  status 'cancelled' si se detuvo por should_stop.
         """
         start_time = time.time()
         
-        if specific_file:
+        if files:
+            files = list(files)
+        elif specific_file:
             files = [specific_file]
         else:
             files_xlsx = glob.glob(os.path.join(self.data_dir, "*.xlsx"))
@@ -208,138 +238,124 @@ class IngestFlightsDataUseCase:
         if not files:
             return {"status": "error", "message": "No data files found."}
 
-        self.total_files = len(files)
-        self.processed_count = 0
+        self.progress.start_run(files)
+
+        if self.snapshot_ingest:
+            return self._execute_snapshot(files, force_reload, specific_file, start_time, should_stop, on_file_done)
         
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
+        run_status = "completed"
         
         if force_reload and not specific_file:
             self.reset_database(conn)
-            
-        self._init_db(conn)
         
         processed_files = 0
         total_inserted = 0
+        remaining = len(files)
+        on_file_done = on_file_done or (lambda file_name, status: None)
         
         try:
             for i, file_path in enumerate(files):
                 file_name = os.path.basename(file_path)
-                self.current_file = file_name
+                if should_stop and should_stop():
+                    logger.info(f"Ingestion cancelled before {file_name}; {remaining} files left.")
+                    run_status = "cancelled"
+                    break
+                remaining -= 1
                 
                 if not force_reload:
                     status_row = conn.execute("SELECT status FROM file_processing_control WHERE file_name = ?", [file_name]).fetchone()
                     if status_row and status_row[0] == 'COMPLETED':
                         logger.info(f"Skipping {file_name} (already processed)")
-                        self.processed_count += 1
+                        self.progress.skip_file(file_name)
+                        on_file_done(file_name, 'COMPLETED')
                         continue
                 
                 logger.info(f"Processing ({i+1}/{len(files)}): {file_name}")
+                self.progress.start_file(file_name)
                 
-                # Update status to PROCESSING and get ID
-                conn.execute("DELETE FROM file_processing_control WHERE file_name = ?", [file_name])
-                
-                # Fetch sequence manually or use RETURNING
-                tracking_id = conn.execute("INSERT INTO file_processing_control (file_name, processed_at, status) VALUES (?, CURRENT_TIMESTAMP, 'PROCESSING') RETURNING id", [file_name]).fetchone()[0]
-                
+                spool_path = None
+                tracking_id = None
                 try:
-                    # Read
-                    if file_path.endswith('.xlsx'):
-                        pdf = pd.read_excel(file_path, dtype=str, engine='openpyxl')
-                        df = pl.from_pandas(pdf)
-                    else:
-                        df = pl.read_csv(file_path, ignore_errors=True, infer_schema_length=0)
+                    with self.progress.stage("control"):
+                        # A reload replaces the previous load of the file; the new one gets a fresh id
+                        self._remove_loaded_file(conn, file_name)
+                        tracking_id = conn.execute("SELECT nextval('tracking_id_seq')").fetchone()[0]
+
+                    spool_path = self._read_and_transform(file_path, tracking_id)
 
-                    if df.height == 0:
+                    if spool_path is None:
                         logger.warning(f"File {file_name} is empty.")
-                        conn.execute("UPDATE file_processing_control SET status = 'SKIPPED', error_message = 'Empty file' WHERE file_name = ?", [file_name])
-                        self.processed_count += 1
+                        self._register_file(conn, tracking_id, file_name)
+                        self._finish_file(conn, tracking_id, 'SKIPPED', error_message='Empty file')
+                        self.progress.finish_file('SKIPPED', None, 'Empty file')
+                        on_file_done(file_name, 'SKIPPED')
                         continue
 
-                    # 1. Rename Columns
-                    rename_map = {}
-                    for col in df.columns:
-                        if col in self.column_mapping:
-                            rename_map[col] = self.column_mapping[col]
-                    df = df.rename(rename_map)
-
-                    # 1b. Add file_id
-                    df = df.with_columns(pl.lit(tracking_id).alias('file_id'))
-
-                    # 1c. Enforce types for critical columns immediately
-                    if 'sid' in df.columns:
-                        df = df.with_columns(pl.col('sid').cast(pl.Utf8))
-
-                    # 2. Add Missing Columns
-                    existing = set(df.columns)
-                    missing = [c for c in self.target_columns if c not in existing]
-                    if missing:
-                        df = df.with_columns([pl.lit(None).alias(c) for c in missing])
-                    
-                    # 3. Robust Transformation using DateParser
-                    # Dates
-                    date_cols = ['fecha', 'fecha_salida', 'fecha_llegada', 'fecha_registro']
-                    for col in date_cols:
-                        if col in df.columns:
-                            df = df.with_columns(
-                                pl.col(col).map_elements(DateParser.parse_date, return_dtype=pl.Date, skip_nulls=True).alias(col)
-                            )
-                    
-                    # Times
-                    for col in ['hora_salida', 'hora_pv', 'hora_llegada']:
-                         if col in df.columns:
-                            df = df.with_columns(
-                                pl.col(col).map_elements(DateParser.parse_time, return_dtype=pl.Time, skip_nulls=True).alias(col)
-                            )
-
-                    if 'tiempo_inicial' in df.columns:
-                         df = df.with_columns(
-                            pl.col('tiempo_inicial').cast(pl.String).str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False)
-                         )
-
-                    # INT Columns
-                    int_cols = ['numero_vuelo', 'nivel', 'duracion', 'distancia', 'velocidad'] 
-                    
-                    if 'id' in df.columns:
-                         df = df.with_columns(
-                            pl.col('id').map_elements(self._clean_int, return_dtype=pl.Int64, skip_nulls=True).alias('id')
-                        )
-
-                    for col in int_cols:
-                        if col in df.columns:
-                             df = df.with_columns(
-                                pl.col(col).map_elements(self._clean_int, return_dtype=pl.Int64, skip_nulls=True).alias(col)
-                            )
-
-                    # 4. Final Select
-                    df = df.select(self.target_columns)
-                    
-                    # 5. Insert
-                    conn.register('temp_view', df)
-                    conn.execute(f"INSERT INTO flights ({', '.join(self.target_columns)}) SELECT * FROM temp_view")
-                    conn.unregister('temp_view')
+                    with self.progress.stage("insert"):
+                        rows, rejected = self._open_spool(conn, spool_path)
+                        if rows:
+                            # 5. Fill missing distances from the per-route cache (one computation per new route)
+                            cache_route_distances(conn, 'temp_view')
+                            conn.execute(f"CREATE OR REPLACE TEMP VIEW flights_batch AS {route_distance_fill_sql('temp_view')}")
+                            # ENUM dictionaries are widened in their own transactions, before the load
+                            self.store.prepare(conn, 'flights_batch')
+
+                    # 6. Control row, flights, filter counts and quarantined rows commit together
+                    conn.execute("BEGIN TRANSACTION")
+                    try:
+                        self._register_file(conn, tracking_id, file_name)
+                        with self.progress.stage("insert"):
+                            if rows:
+                                # The store clusters the batch by fecha, origen
+                                self.store.insert(conn, 'flights_batch', tracking_id)
+                                add_filter_values(conn, 'temp_view')
+                            # 7. Quarantine the rows that failed validation
+                            if rejected:
+                                logger.warning(f"{file_name}: {rejected} rows quarantined in flights_rejected")
+                                insert_rejected(conn, 'rejected_view', tracking_id, file_name)
+                        self._finish_file(conn, tracking_id, 'COMPLETED', rows=rows, rejected=rejected)
+                        self.store.publish(conn)
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        # Parquet parts written for the rolled-back load were never published
+                        self.store.discard(conn)
+                        raise
+                    finally:
+                        conn.execute("DROP VIEW IF EXISTS flights_batch")
+                        self._close_spool(conn)
                     
-                    rows = len(df)
                     total_inserted += rows
                     processed_files += 1
                     
-                    conn.execute("""
-                        UPDATE file_processing_control 
-                        SET status = 'COMPLETED', row_count = ?, error_message = NULL 
-                        WHERE file_name = ?
-                    """, [rows, file_name])
-                    
-                    del df
+                    self.progress.finish_file('COMPLETED', rows, None)
+                    on_file_done(file_name, 'COMPLETED')
 
                 except Exception as file_error:
                     error_msg = str(file_error)
                     logger.error(f"Error processing {file_name}: {error_msg}")
                     import traceback
                     logger.error(traceback.format_exc())
-                    conn.execute("UPDATE file_processing_control SET status = 'ERROR', error_message = ? WHERE file_name = ?", [error_msg, file_name])
-                
-                self.processed_count += 1
-                self.current_file = None
+                    try:
+                        # The failed load was rolled back (or never started), so register the file again
+                        tracking_id = self._register_file(conn, tracking_id, file_name)
+                        self._finish_file(conn, tracking_id, 'ERROR', error_message=error_msg)
+                    except Exception as control_error:
+                        logger.error(f"Could not record the error of {file_name}: {control_error}")
+                    self.progress.finish_file('ERROR', None, error_msg)
+                    on_file_done(file_name, 'ERROR')
+                finally:
+                    self._discard_spool(spool_path)
             
+            if run_status == "cancelled":
+                return {
+                    "status": "cancelled",
+                    "message": f"Cancelled after {processed_files} files; {remaining} files left.",
+                    "rows_inserted": total_inserted,
+                    "remaining_files": remaining,
+                    "duration_seconds": time.time() - start_time
+                }
             return {
                 "status": "success", 
                 "message": f"Processed {processed_files} files.", 
@@ -351,9 +367,396 @@ class IngestFlightsDataUseCase:
             logger.error(f"Ingestion failed: {e}")
             import traceback
             logger.error(traceback.format_exc())
+            run_status = "error"
             return {"status": "error", "message": str(e)}
         finally:
+            self.progress.finish_run(run_status)
             conn.close()
+            self._refresh_filter_index()
+
+    def _remove_loaded_file(self, conn, file_name: str, in_transaction: bool = False) -> Optional[int]:
+        """
+        Elimina de la base lo cargado de un archivo: vuelos, conteos de filtros, filas rechazadas
+        y su registro de control (el archivo físico no se toca).
+
+        DuckDB no permite borrar en una misma transacción las filas de `flights` y el registro de
+        control al que referencian. Fuera de una transacción se borra todo con sentencias sueltas.
+        Con `in_transaction` (publicación por instantánea) el registro de control se conserva para
+        que la carga nueva lo reutilice, y los Parquet se retiran con withdraw_file (el ROLLBACK
+        seguido de store.discard() los restaura).
+
+        Returns:
+            Optional[int]: Con `in_transaction`, el id de control conservado (None si el archivo no
+                estaba registrado).
+        """
+        kept_id = None
+        for (file_id,) in conn.execute(
+            "SELECT id FROM file_processing_control WHERE file_name = ? ORDER BY id", [file_name]
+        ).fetchall():
+            logger.info(f"Deleting flights for file {file_name} (ID: {file_id})...")
+            remove_file_filter_values(conn, file_id)
+            conn.execute("DELETE FROM flights_rejected WHERE file_id = ?", [file_id])
+            if in_transaction:
+                self.store.withdraw_file(conn, file_id)
+                kept_id = file_id
+            else:
+                self.store.delete_file(conn, file_id)
+                conn.execute("DELETE FROM file_processing_control WHERE id = ?", [file_id])
+        conn.execute("DELETE FROM flights_rejected WHERE file_name = ?", [file_name])
+        return kept_id
+
+    def _register_file(self, conn, tracking_id: Optional[int], file_name: str) -> int:
+        """Registra el archivo en file_processing_control como PROCESSING y devuelve su id."""
+        with self.progress.stage("control"):
+            if tracking_id is None:
+                tracking_id = conn.execute("SELECT nextval('tracking_id_seq')").fetchone()[0]
+            conn.execute(
+                "INSERT INTO file_processing_control (id, file_name, processed_at, status) VALUES (?, ?, CURRENT_TIMESTAMP, 'PROCESSING')",
+                [tracking_id, file_name]
+            )
+        return tracking_id
+
+    def _finish_file(self, conn, tracking_id: int, status: str, rows: int = None, error_message: str = None,
+                     rejected: int = None) -> None:
+        """
+        Cierra el registro del archivo en file_processing_control con su estado y telemetría.
+
+        Args:
+            conn (duckdb.Connection): Conexión de escritura.
+            tracking_id (int): Id del registro del archivo.
+            status (str): 'COMPLETED', 'SKIPPED' o 'ERROR'.
+            rows (int): Filas cargadas (solo COMPLETED).
+            error_message (str): Motivo de omisión o error.
+            rejected (int): Filas enviadas a flights_rejected (solo COMPLETED).
+        """
+        with self.progress.stage("control"):
+            # Timings are taken before this UPDATE, so the persisted control time covers the registration
+            metrics = {**self.progress.file_metrics(rows), "rejected_count": rejected}
+            assignments = ", ".join(f"{column} = ?" for column in metrics)
+            conn.execute(
+                f"UPDATE file_processing_control SET status = ?, row_count = ?, error_message = ?, {assignments} WHERE id = ?",
+                [status, rows, error_message, *metrics.values(), tracking_id]
+            )
+
+    def _execute_snapshot(self, files: list, force_reload: bool, specific_file: str, start_time: float,
+                          should_stop: Optional[Callable[[], bool]] = None,
+                          on_file_done: Optional[Callable[[str, str], None]] = None) -> dict:
+        """
+        Ingesta en dos fases para que las lecturas solo esperen al escritor durante la publicación.
+
+        1. Staging: los archivos se leen, transforman y cargan en una base DuckDB aparte
+           (`<db>.staging.duckdb`); la base de métricas solo se abre en modo lectura para
+           consultar qué archivos ya están completos.
+        2. Publicación: se adjunta la base de staging y, en una única transacción, se registran
+           los archivos en file_processing_control y se insertan sus vuelos (con el backend
+           Parquet se escriben los archivos y se cambia la vista). La conexión de escritura solo
+           dura esta fase: DuckDB no admite a la vez conexiones de lectura y de escritura al mismo
+           archivo en un proceso, así que abrirla espera a que se cierren las lecturas en curso y
+           las nuevas esperan a que se cierre (ver connections.connect).
+
+        Args:
+            files (list): Rutas a procesar.
+            force_reload (bool): Reprocesar aunque ya estén completos (y, sin specific_file,
+                reiniciar la base justo antes de publicar).
+            specific_file (str): Archivo puntual solicitado, si lo hay.
+            start_time (float): Marca de inicio para calcular la duración.
+            should_stop (Optional[Callable]): Cancelación cooperativa, consultada entre archivos;
+                lo ya cargado en staging se publica igual.
+            on_file_done (Optional[Callable]): Checkpoint por archivo, llamado tras la publicación.
+
+        Returns:
+            dict: Resumen del proceso, con la misma forma que execute().
+        """
+        on_file_done = on_file_done or (lambda file_name, status: None)
+        remaining = len(files)
+        completed = set()
+        if not force_reload:
+            conn = connect(self.db_path, read_only=True)
+            try:
+                completed = {row[0] for row in conn.execute(
+                    "SELECT file_name FROM file_processing_control WHERE status = 'COMPLETED'"
+                ).fetchall()}
+            finally:
+                conn.close()
+
+        if os.path.exists(self.staging_path):
+            os.remove(self.staging_path)
+
+        # 1. Staging
+        staged = []
+        staging = connect(self.staging_path)
+        try:
+            columns = ", ".join(f"{name} {type_}" for name, type_ in FLIGHTS_SCHEMA)
+            staging.execute(f"CREATE TABLE staged_flights ({columns})")
+            staging.execute("CREATE TABLE staged_rejected (file_id BIGINT, source_row BIGINT, reasons VARCHAR[], raw_record VARCHAR)")
+            for i, file_path in enumerate(files):
+                file_name = os.path.basename(file_path)
+                if should_stop and should_stop():
+                    logger.info(f"Ingestion cancelled before {file_name}; publishing the {len(staged)} staged files.")
+                    break
+                remaining -= 1
+                if file_name in completed:
+                    logger.info(f"Skipping {file_name} (already processed)")
+                    self.progress.skip_file(file_name)
+                    on_file_done(file_name, 'COMPLETED')
+                    continue
+
+                logger.info(f"Staging ({i+1}/{len(files)}): {file_name}")
+                self.progress.start_file(file_name)
+                staged_id = len(staged) + 1
+                status, rows, rejected_rows, error_message = 'COMPLETED', None, None, None
+                spool_path = None
+                try:
+                    spool_path = self._read_and_transform(file_path, staged_id)
+                    if spool_path is None:
+                        logger.warning(f"File {file_name} is empty.")
+                        status, error_message = 'SKIPPED', 'Empty file'
+                    else:
+                        with self.progress.stage("insert"):
+                            rows, rejected_rows = self._open_spool(staging, spool_path)
+                            staging.execute(f"INSERT INTO staged_flights SELECT {', '.join(FLIGHTS_COLUMNS)} FROM temp_view")
+                            if rejected_rows:
+                                logger.warning(f"{file_name}: {rejected_rows} rows quarantined in flights_rejected")
+                                staging.execute("INSERT INTO staged_rejected SELECT * FROM rejected_view")
+                            self._close_spool(staging)
+                except Exception as file_error:
+                    logger.error(f"Error processing {file_name}: {file_error}")
+                    status, error_message = 'ERROR', str(file_error)
+                finally:
+                    self._discard_spool(spool_path)
+                metrics = {**self.progress.file_metrics(rows), "rejected_count": rejected_rows}
+                staged.append((staged_id, file_name, status, rows, error_message, metrics))
+                self.progress.finish_file(status, rows, error_message)
+        finally:
+            staging.close()
+
+        # 2. Publish
+        self.progress.set_phase("publishing")
+        conn = connect(self.db_path)
+        run_status = "completed"
+        try:
+            if force_reload and not specific_file:
+                self.reset_database(conn)
+            conn.execute(f"ATTACH '{self.staging_path}' AS staging (READ_ONLY)")
+            conn.execute("CREATE OR REPLACE TEMP VIEW staged_batch AS SELECT * FROM staging.staged_flights")
+            # ENUM dictionaries are widened in their own transactions, before the publish
+            self.store.prepare(conn, 'staged_batch')
+            cache_route_distances(conn, 'staged_batch')
+
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                for staged_id, file_name, status, rows, error_message, metrics in staged:
+                    # A reload replaces the previous load and keeps its control id
+                    tracking_id = self._remove_loaded_file(conn, file_name, in_transaction=True)
+                    if tracking_id is None:
+                        tracking_id = conn.execute("SELECT nextval('tracking_id_seq')").fetchone()[0]
+                        conn.execute("INSERT INTO file_processing_control (id, file_name) VALUES (?, ?)", [tracking_id, file_name])
+                    assignments = ", ".join(f"{column} = ?" for column in metrics)
+                    conn.execute(f"""
+                        UPDATE file_processing_control
+                        SET processed_at = CURRENT_TIMESTAMP, status = ?, row_count = ?, error_message = ?, {assignments}
+                        WHERE id = ?
+                    """, [status, rows, error_message, *metrics.values(), tracking_id])
+                    if status != 'COMPLETED':
+                        continue
+                    if metrics["rejected_count"]:
+                        conn.execute("""
+                            INSERT INTO flights_rejected (file_id, file_name, source_row, reasons, raw_record)
+                            SELECT ?, ?, source_row, reasons, raw_record FROM staging.staged_rejected WHERE file_id = ?
+                        """, [tracking_id, file_name, staged_id])
+                    if not rows:
+                        continue
+                    staged_rows = f"""(
+                        SELECT * REPLACE ({int(tracking_id)} AS file_id)
+                        FROM staging.staged_flights WHERE file_id = {int(staged_id)}
+                    )"""
+                    conn.execute(f"CREATE OR REPLACE TEMP VIEW staged_file AS {route_distance_fill_sql(staged_rows)}")
+                    self.store.insert(conn, 'staged_file', tracking_id)
+                    add_filter_values(conn, 'staged_file')
+                self.store.publish(conn)
+                conn.execute("COMMIT")
+                for _, file_name, status, _, _, _ in staged:
+                    on_file_done(file_name, status)
+            except Exception:
+                conn.execute("ROLLBACK")
+                # Parquet parts written for the rolled-back files were never published
+                self.store.discard(conn)
+                raise
+
+            total_inserted = sum(rows for _, _, status, rows, _, _ in staged if status == 'COMPLETED')
+            processed_files = sum(1 for _, _, status, _, _, _ in staged if status == 'COMPLETED')
+            if remaining:
+                run_status = "cancelled"
+                return {
+                    "status": "cancelled",
+                    "message": f"Cancelled after {processed_files} files; {remaining} files left.",
+                    "rows_inserted": total_inserted,
+                    "remaining_files": remaining,
+                    "duration_seconds": time.time() - start_time
+                }
+            return {
+                "status": "success",
+                "message": f"Processed {processed_files} files.",
+                "rows_inserted": total_inserted,
+                "duration_seconds": time.time() - start_time
+            }
+        except Exception as e:
+            logger.error(f"Snapshot publish failed: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            run_status = "error"
+            return {"status": "error", "message": str(e)}
+        finally:
+            self.progress.finish_run(run_status)
+            conn.execute("DROP VIEW IF EXISTS staged_file")
+            conn.execute("DROP VIEW IF EXISTS staged_batch")
+            conn.execute("DETACH DATABASE IF EXISTS staging")
+            conn.close()
+            self._refresh_filter_index()
+            if os.path.exists(self.staging_path):
+                os.remove(self.staging_path)
+
+    def _read_and_transform(self, file_path: str, file_id: int) -> Optional[str]:
+        """
+        Lee un archivo fuente, lo lleva al esquema canónico de `flights`, valida sus filas y deja
+        el resultado en un Parquet temporal (spool) del que DuckDB carga las filas válidas y las
+        rechazadas.
+
+        Los CSV se procesan como LazyFrame (scan_csv): renombrado, parseo de tipos y validación
+        forman parte del plan, que se ejecuta con el motor streaming y se escribe por lotes con
+        sink_parquet, así la memoria no depende del tamaño del archivo (en la telemetría ese paso
+        cuenta como etapa 'read'). Los Excel se leen enteros (openpyxl no tiene lectura por lotes)
+        y pasan por las mismas expresiones.
+
+        Args:
+            file_path (str): Ruta del archivo Excel/CSV.
+            file_id (int): Identificador a asignar en la columna file_id.
+
+        Returns:
+            Optional[str]: Ruta del spool (columnas de FLIGHTS_COLUMNS más las auxiliares de
+                validación), o None si el archivo no tiene filas. Se borra con _discard_spool.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        spool_path = os.path.join(self.spool_dir, f"{file_id}_{os.path.basename(file_path)}.parquet")
+
+        if file_path.endswith('.xlsx'):
+            with self.progress.stage("read"):
+                pdf = pd.read_excel(file_path, dtype=str, engine='openpyxl')
+                frame = pl.from_pandas(pdf)
+            if frame.height == 0:
+                return None
+        else:
+            # Every column as text: nothing is dropped here, bad values are flagged by validation
+            frame = pl.scan_csv(file_path, infer_schema_length=0)
+
+        # Spreadsheet row numbers: the header is row 1
+        frame = frame.with_row_index(SOURCE_ROW, offset=2)
+        with self.progress.stage("rename"):
+            frame = self._rename_columns(frame, file_id)
+        with self.progress.stage("parse"):
+            frame = flag_rejected(self._parse_columns(self._with_raw_columns(frame)))
+            if not isinstance(frame, pl.LazyFrame):
+                frame.write_parquet(spool_path)
+        if isinstance(frame, pl.LazyFrame):
+            # Scan, parse and validation run fused here, streamed batch by batch into the spool;
+            # the whole pipeline is timed as the read stage
+            with self.progress.stage("read"):
+                frame.sink_parquet(spool_path)
+
+        if pl.scan_parquet(spool_path).select(pl.len()).collect().item() == 0:
+            self._discard_spool(spool_path)
+            return None
+        return spool_path
+
+    def _open_spool(self, conn, spool_path: str) -> Tuple[int, int]:
+        """
+        Expone el spool en `conn` como las vistas temp_view (filas válidas con el esquema de
+        flights) y rejected_view (filas rechazadas con motivos y registro original).
+
+        Returns:
+            Tuple[int, int]: (filas válidas, filas rechazadas).
+        """
+        source = f"read_parquet('{spool_path.replace(chr(39), chr(39) * 2)}')"
+        conn.execute(f"""
+            CREATE OR REPLACE TEMP VIEW temp_view AS
+            SELECT {', '.join(self.target_columns)} FROM {source} WHERE len("{REASONS}") = 0
+        """)
+        conn.execute(f"""
+            CREATE OR REPLACE TEMP VIEW rejected_view AS
+            SELECT file_id, "{SOURCE_ROW}", "{REASONS}", "{RAW_RECORD}" FROM {source} WHERE len("{REASONS}") > 0
+        """)
+        rows, rejected = conn.execute(f"""
+            SELECT count(*) FILTER (WHERE len("{REASONS}") = 0), count(*) FILTER (WHERE len("{REASONS}") > 0)
+            FROM {source}
+        """).fetchone()
+        return rows, rejected
+
+    @staticmethod
+    def _close_spool(conn) -> None:
+        conn.execute("DROP VIEW IF EXISTS temp_view")
+        conn.execute("DROP VIEW IF EXISTS rejected_view")
+
+    @staticmethod
+    def _discard_spool(spool_path: Optional[str]) -> None:
+        if spool_path and os.path.exists(spool_path):
+            os.remove(spool_path)
+
+    def _with_raw_columns(self, frame):
+        """Agrega las columnas auxiliares de validación: Fecha original y registro original en JSON."""
+        return frame.with_columns(
+            pl.col('fecha').cast(pl.Utf8).alias(RAW_FECHA),
+            pl.struct([pl.col(c).cast(pl.Utf8) for c in self.raw_columns]).struct.json_encode().alias(RAW_RECORD),
+        )
+
+    def _rename_columns(self, df, file_id: int):
+        """
+        Mapea los encabezados de origen al esquema canónico, agrega file_id y las columnas faltantes.
+        Acepta DataFrame o LazyFrame (solo se lee el esquema).
+        """
+        # 1. Rename Columns
+        columns = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+        rename_map = {}
+        for col in columns:
+            if col in self.column_mapping:
+                rename_map[col] = self.column_mapping[col]
+        df = df.rename(rename_map)
+        columns = [rename_map.get(col, col) for col in columns]
+
+        # 1b. Add file_id
+        df = df.with_columns(pl.lit(file_id).alias('file_id'))
+
+        # 2. Add Missing Columns (as text, so parsing gives them their final types)
+        existing = set(columns) | {'file_id'}
+        missing = [c for c in self.target_columns if c not in existing]
+        if missing:
+            df = df.with_columns([pl.lit(None, dtype=pl.Utf8).alias(c) for c in missing])
+        return df
+
+    def _parse_columns(self, df):
+        """
+        Convierte fechas, horas y enteros con expresiones vectorizadas (mismas reglas que
+        DateParser/_clean_int) y deja solo las columnas de flights más las auxiliares. Acepta
+        DataFrame o LazyFrame: no hay funciones Python por fila que impidan el modo streaming.
+        """
+        # 3. Robust Transformation (vectorized DateParser rules)
+        date_cols = ['fecha', 'fecha_salida', 'fecha_llegada', 'fecha_registro']
+        time_cols = ['hora_salida', 'hora_pv', 'hora_llegada']
+        int_cols = ['id', 'numero_vuelo', 'nivel', 'duracion', 'distancia', 'velocidad']
+
+        df = df.with_columns(
+            [per_distinct(pl.col(col), DateParser.date_expr, pl.Date).alias(col) for col in date_cols]
+            + [per_distinct(pl.col(col), DateParser.time_expr, pl.Time).alias(col) for col in time_cols]
+            + [per_distinct(pl.col(col), self._clean_int_expr, pl.Int64).alias(col) for col in int_cols]
+            + [
+                pl.col('tiempo_inicial').cast(pl.String).str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False),
+                pl.col('sid').cast(pl.Utf8),
+                pl.col('file_id').cast(pl.Int64),
+            ]
+        )
+
+        # 4. Final Select (validation helper columns travel along until the split)
+        columns = df.collect_schema().names() if isinstance(df, pl.LazyFrame) else df.columns
+        return df.select(self.target_columns + [c for c in columns if c.startswith('__')])
 
     def reset_database(self, conn=None):
         """
@@ -368,43 +771,115 @@ class IngestFlightsDataUseCase:
         """
         should_close = False
         if conn is None:
-            conn = duckdb.connect(self.db_path)
+            conn = connect(self.db_path)
             should_close = True
             
         try:
             logger.info("Dropping tables for reset...")
-            conn.execute("DROP TABLE IF EXISTS flights")
+            self.store.reset(conn)
+            drop_rejected_schema(conn)
             conn.execute("DROP TABLE IF EXISTS file_processing_control")
             conn.execute("DROP SEQUENCE IF EXISTS tracking_id_seq")
             
             # Re-init inmediatamente
             self._init_db(conn)
+            rebuild_filter_values(conn)
             logger.info("Tables recreated.")
             return True
         except Exception as e:
             logger.error(f"Error resetting database: {e}")
             raise e
         finally:
+            # With a caller's connection the caller rebuilds the index once it closes it
             if should_close:
                 conn.close()
+                self._refresh_filter_index()
 
 
+    def compact_storage(self) -> dict:
+        """
+        Compacta la tabla de vuelos: la reescribe agrupada por fecha y origen y ejecuta CHECKPOINT.
+        Recomendado después de eliminar archivos o de cargas históricas grandes, para que los
+        filtros por rango de fechas vuelvan a descartar la mayoría de row groups.
+
+        Returns:
+            dict: Resumen con filas reescritas, estadísticas de almacenamiento antes/después y duración.
+        """
+        start_time = time.time()
+        conn = connect(self.db_path)
+        try:
+            storage_before = self.store.storage_stats(conn)
+            logger.info(f"Compacting flights storage ({self.store.backend}, {storage_before})...")
+            self.store.compact(conn)
+            rows = conn.execute("SELECT count(*) FROM flights").fetchone()[0]
+            storage_after = self.store.storage_stats(conn)
+            logger.info(f"Compaction finished: {rows} rows, {storage_after}.")
+            return {
+                "status": "success",
+                "rows": rows,
+                "storage_before": storage_before,
+                "storage_after": storage_after,
+                "duration_seconds": time.time() - start_time
+            }
+        except Exception as e:
+            logger.error(f"Compaction failed: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            conn.close()
+
+    def backfill_route_distances(self, recompute: bool = False) -> dict:
+        """
+        Completa distancia y velocidad de los vuelos ya cargados que no las traen.
+
+        Calcula la distancia ortodrómica de cada ruta distinta (origen, destino) con las
+        coordenadas de `airports`, la guarda en `od_distance` y con ella rellena las distancias
+        nulas o en cero y la velocidad implícita (distancia / duración). Con el backend Parquet
+        implica reescribir el dataset.
+
+        Args:
+            recompute (bool): Recalcular también las rutas ya cacheadas (p. ej. tras corregir coordenadas).
+
+        Returns:
+            dict: Resumen con rutas calculadas, vuelos incompletos antes/después y duración.
+        """
+        start_time = time.time()
+        conn = connect(self.db_path)
+        try:
+            missing_before = count_missing_distances(conn)
+            routes = cache_route_distances(conn, 'flights', recompute=recompute)
+            self.store.fill_route_distances(conn)
+            missing_after = count_missing_distances(conn)
+            logger.info(f"Route distances: {routes} routes computed, {missing_before - missing_after} flights completed.")
+            return {
+                "status": "success",
+                "routes_computed": routes,
+                "flights_missing_before": missing_before,
+                "flights_missing_after": missing_after,
+                "duration_seconds": time.time() - start_time
+            }
+        except Exception as e:
+            logger.error(f"Route distance backfill failed: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            conn.close()
+
     def get_progress(self):
         """
         Consulta el estado actual del proceso de procesamiento en segundo plano.
         
         Returns:
-            dict: Objeto con el archivo actual, estado ('running'/'idle') y fracción de progreso.
+            dict: Objeto con el archivo actual, estado ('running'/'idle') y fracción de progreso,
+                  más etapa actual, tiempos por etapa, filas/s, bytes/s y ETA (ver IngestProgress.snapshot).
         """
+        return self.progress.snapshot()
 
     def get_history(self):
         """Returns processing history."""
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
-             # Ensure table exists first just in case
-             self._init_db(conn)
              result = conn.execute("SELECT * FROM file_processing_control ORDER BY processed_at DESC LIMIT 50").fetchall()
-             columns = ["id", "file_name", "processed_at", "status", "row_count", "error_message"]
+             # Includes the per-stage telemetry columns when the schema has them
+             columns = [column[0] for column in conn.description]
              return [dict(zip(columns, row)) for row in result]
         except Exception as e:
             logger.error(f"Error fetching history: {e}")
@@ -413,6 +888,162 @@ class IngestFlightsDataUseCase:
             conn.close()
 
 
+    def get_rejected_rows(self, file_name: Optional[str] = None, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        """
+        Lista las filas en cuarentena (flights_rejected).
+
+        Args:
+            file_name (Optional[str]): Limitar a un archivo.
+            limit (int): Tamaño de página.
+            offset (int): Desplazamiento de la página.
+
+        Returns:
+            Dict: {"total", "reasons": {código: cantidad}, "rows": [...]} con el registro original
+                  decodificado en cada fila.
+        """
+        where, params = ("WHERE file_name = ?", [file_name]) if file_name else ("", [])
+        conn = connect(self.db_path, read_only=True)
+        try:
+            total = conn.execute(f"SELECT count(*) FROM flights_rejected {where}", params).fetchone()[0]
+            reasons = conn.execute(f"""
+                SELECT reason, count(*) FROM (SELECT unnest(reasons) AS reason FROM flights_rejected {where})
+                GROUP BY reason ORDER BY count(*) DESC
+            """, params).fetchall()
+            result = conn.execute(f"""
+                SELECT id, file_id, file_name, source_row, reasons, raw_record, rejected_at, corrected_at
+                FROM flights_rejected {where}
+                ORDER BY file_name, source_row
+                LIMIT ? OFFSET ?
+            """, params + [limit, offset])
+            columns = [column[0] for column in result.description]
+            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        finally:
+            conn.close()
+        for row in rows:
+            row["raw_record"] = json.loads(row["raw_record"])
+        return {"total": total, "reasons": dict(reasons), "rows": rows}
+
+    def correct_rejected_row(self, rejected_id: int, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Corrige campos del registro original de una fila en cuarentena (se aplican al reprocesar).
+
+        Args:
+            rejected_id (int): Identificador en flights_rejected.
+            values (Dict): {columna canónica: nuevo valor}; None borra el valor.
+
+        Returns:
+            Optional[Dict]: Registro corregido, o None si la fila no existe.
+
+        Raises:
+            ValueError: Si alguna columna no pertenece al esquema de flights.
+        """
+        unknown = sorted(set(values) - set(self.raw_columns))
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        conn = connect(self.db_path)
+        try:
+            row = conn.execute("SELECT raw_record FROM flights_rejected WHERE id = ?", [rejected_id]).fetchone()
+            if not row:
+                return None
+            record = json.loads(row[0])
+            record.update({k: None if v is None else str(v) for k, v in values.items()})
+            conn.execute(
+                "UPDATE flights_rejected SET raw_record = ?, corrected_at = CURRENT_TIMESTAMP WHERE id = ?",
+                [json.dumps(record), rejected_id]
+            )
+            return record
+        finally:
+            conn.close()
+
+    def reprocess_rejected(self, file_name: Optional[str] = None) -> dict:
+        """
+        Vuelve a validar las filas en cuarentena (normalmente después de corregirlas) y carga en
+        flights las que ahora pasan, con el file_id de su archivo original. El resto del archivo
+        no se vuelve a leer.
+
+        Args:
+            file_name (Optional[str]): Limitar a las filas de un archivo.
+
+        Returns:
+            dict: Filas cargadas, filas que siguen rechazadas y duración.
+        """
+        start_time = time.time()
+        where, params = ("WHERE file_name = ?", [file_name]) if file_name else ("", [])
+        conn = connect(self.db_path)
+        try:
+            quarantined = conn.execute(
+                f"SELECT id, file_id, source_row, raw_record FROM flights_rejected {where} ORDER BY id", params
+            ).fetchall()
+            if not quarantined:
+                return {"status": "success", "rows_loaded": 0, "still_rejected": 0,
+                        "duration_seconds": time.time() - start_time}
+
+            records = [json.loads(raw_record) for _, _, _, raw_record in quarantined]
+            df = pl.DataFrame(
+                {c: [r.get(c) for r in records] for c in self.raw_columns},
+                schema={c: pl.Utf8 for c in self.raw_columns}
+            ).with_columns(
+                pl.Series('file_id', [file_id for _, file_id, _, _ in quarantined], dtype=pl.Int64),
+                pl.Series('__rejected_id', [rejected_id for rejected_id, _, _, _ in quarantined], dtype=pl.Int64),
+                pl.Series(SOURCE_ROW, [source_row for _, _, source_row, _ in quarantined], dtype=pl.Int64),
+            )
+            df = self._with_raw_columns(df)
+            good, rejected = split_rejected(self._parse_columns(df))
+
+            conn.register('temp_view', good.select(self.target_columns))
+            cache_route_distances(conn, 'temp_view')
+            conn.execute(f"CREATE OR REPLACE TEMP VIEW flights_batch AS {route_distance_fill_sql('temp_view')}")
+            # ENUM dictionaries are widened in their own transactions, before the load
+            self.store.prepare(conn, 'flights_batch')
+            conn.register('loaded_view', good.select('__rejected_id'))
+            conn.register('still_view', rejected.select('__rejected_id', REASONS))
+
+            # Flights, filter counts, control rows and the quarantine change together
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                for (file_id,), batch in good.group_by(['file_id']):
+                    conn.execute(f"CREATE OR REPLACE TEMP VIEW file_batch AS SELECT * FROM flights_batch WHERE file_id = {int(file_id)}")
+                    self.store.insert(conn, 'file_batch', file_id)
+                    conn.execute(
+                        "UPDATE file_processing_control SET row_count = coalesce(row_count, 0) + ? WHERE id = ?",
+                        [batch.height, file_id]
+                    )
+                add_filter_values(conn, 'temp_view')
+
+                conn.execute("DELETE FROM flights_rejected WHERE id IN (SELECT __rejected_id FROM loaded_view)")
+                # Rules may flag different problems after a correction
+                conn.execute(f"""
+                    UPDATE flights_rejected SET reasons = s."{REASONS}"
+                    FROM still_view s WHERE flights_rejected.id = s.__rejected_id
+                """)
+                refresh_rejected_counts(conn, sorted({file_id for _, file_id, _, _ in quarantined}))
+                self.store.publish(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                # Parquet parts written for the rolled-back rows were never published
+                self.store.discard(conn)
+                raise
+            finally:
+                conn.execute("DROP VIEW IF EXISTS file_batch")
+                conn.execute("DROP VIEW IF EXISTS flights_batch")
+                for view in ('temp_view', 'loaded_view', 'still_view'):
+                    conn.unregister(view)
+
+            logger.info(f"Reprocessed {len(quarantined)} quarantined rows: {good.height} loaded, {rejected.height} still rejected.")
+            return {
+                "status": "success",
+                "rows_loaded": good.height,
+                "still_rejected": rejected.height,
+                "duration_seconds": time.time() - start_time
+            }
+        except Exception as e:
+            logger.error(f"Reprocessing rejected rows failed: {e}")
+            return {"status": "error", "message": str(e)}
+        finally:
+            conn.close()
+            self._refresh_filter_index()
+
     def delete_file(self, filename: str) -> bool:
         """
         Delete a file record, its associated flight data, and the physical file.
@@ -423,18 +1054,11 @@ class IngestFlightsDataUseCase:
         Returns:
             bool: True if deleted (or not found but handled), False if critical error.
         """
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
-            # 1. Get File ID
-            row = conn.execute("SELECT id FROM file_processing_control WHERE file_name = ?", [filename]).fetchone()
-            
-            if row:
-                file_id = row[0]
-                logger.info(f"Deleting flights for file {filename} (ID: {file_id})...")
-                conn.execute("DELETE FROM flights WHERE file_id = ?", [file_id])
-                
-                logger.info(f"Deleting file record {filename}...")
-                conn.execute("DELETE FROM file_processing_control WHERE id = ?", [file_id])
+            # 1. Flights, filter counts, quarantined rows and control record
+            if conn.execute("SELECT 1 FROM file_processing_control WHERE file_name = ?", [filename]).fetchone():
+                self._remove_loaded_file(conn, filename)
             else:
                 logger.warning(f"File {filename} not found in database. Proceeding to checking physical file.")
 
@@ -452,3 +1076,4 @@ class IngestFlightsDataUseCase:
             raise e
         finally:
             conn.close()
+            self._refresh_filter_index()
@@ -1,4 +1,6 @@
-from typing import List, Tuple, Optional
+import os
+import tempfile
+from typing import List, Tuple, Optional, Dict, Any
 from src.domain.entities.airport import Airport
 from src.domain.ports.airport_repository import AirportRepository
 
@@ -91,3 +93,36 @@ class ManageAirports:
         if not self.repository.get_by_id(airport_id):
             return False
         return self.repository.delete(airport_id)
+
+    def import_airports(self, filename: str, content: bytes) -> Dict[str, Any]:
+        """
+        Importa masivamente un catálogo de aeropuertos (CSV o Parquet) con upsert por código ICAO.
+
+        Las filas válidas se aplican en una sola transacción; las inválidas se omiten y se
+        informan en el reporte con su número de fila.
+
+        Args:
+            filename (str): Nombre original del archivo (define el formato por su extensión).
+            content (bytes): Contenido del archivo subido.
+
+        Returns:
+            Dict[str, Any]: Reporte con total_rows, inserted, updated, rejected y errors por fila.
+
+        Raises:
+            ValueError: Si el formato no es soportado o faltan columnas obligatorias.
+        """
+        return _with_temp_file(filename, content, self.repository.bulk_upsert)
+
+
+def _with_temp_file(filename: str, content: bytes, handler):
+    """Escribe el contenido subido en un archivo temporal con la misma extensión y ejecuta `handler(path)`."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in (".csv", ".parquet"):
+        raise ValueError("Formato no soportado: solo se aceptan archivos .csv o .parquet")
+    fd, path = tempfile.mkstemp(suffix=extension)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        return handler(path)
+    finally:
+        os.remove(path)
@@ -0,0 +1,426 @@
+import os
+import glob
+import json
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable
+
+from src.infrastructure.adapters.database.connections import connect
+from src.infrastructure.adapters.database.resource_governor import set_thread_workload
+from src.infrastructure.adapters.file_lock import InterProcessLock
+from .ingest_flights_data import IngestFlightsDataUseCase
+
+logger = logging.getLogger(__name__)
+
+# Job kinds: every one of them writes to the metrics database
+JOB_KINDS = ("ingest", "compact", "route-distances", "reprocess-rejected")
+ACTIVE_STATUSES = ("queued", "waiting", "running", "cancelling")
+RESUMABLE_STATUSES = ("cancelled", "interrupted", "failed")
+
+
+class WriterBusyError(RuntimeError):
+    """Otro trabajo (de este u otro proceso) tiene el lock de escritura."""
+
+
+class ManageIngestJobs:
+    """
+    Cola FIFO de trabajos de escritura sobre la base de métricas (ingesta, compactación,
+    backfill de distancias, reproceso de filas en cuarentena) con garantía de un solo escritor.
+
+    - Un único hilo consume la cola, así que dentro del proceso los trabajos corren en orden.
+    - Antes de escribir, cada trabajo toma un lock de archivo junto a la base; otros workers
+      de uvicorn esperan en estado 'waiting' en lugar de abrir la base en paralelo.
+    - La cancelación es cooperativa: la ingesta la revisa entre archivos y termina el archivo
+      en curso antes de detenerse.
+    - Cada archivo terminado se registra como checkpoint en el JSON del trabajo; un trabajo
+      cancelado o interrumpido (caída del proceso) se reanuda con los archivos pendientes.
+    """
+    def __init__(self, ingest_use_case: IngestFlightsDataUseCase, db_path: str = "data/metrics.duckdb",
+                 jobs_directory: str = "data/ingest_jobs", history_size: int = 50,
+                 lock_poll_seconds: float = 1.0):
+        """
+        Inicializa la cola y carga los trabajos persistidos.
+
+        Args:
+            ingest_use_case (IngestFlightsDataUseCase): Motor ETL que ejecuta los trabajos.
+            db_path (str): Base de métricas; el lock de escritura es `<db>.writer.lock`.
+            jobs_directory (str): Directorio de los JSON de trabajos (estado y checkpoints).
+            history_size (int): Trabajos terminados que se conservan.
+            lock_poll_seconds (float): Intervalo de reintento mientras otro proceso escribe.
+        """
+        self.ingest_use_case = ingest_use_case
+        self.jobs_directory = jobs_directory
+        self.history_size = history_size
+        self.lock_poll_seconds = lock_poll_seconds
+        self.writer_lock = InterProcessLock(os.path.splitext(db_path)[0] + ".writer.lock")
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        # One worker: jobs run strictly in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-job",
+                                            initializer=set_thread_workload, initargs=("ingest",))
+        os.makedirs(jobs_directory, exist_ok=True)
+        self._load()
+
+    def submit(self, kind: str = "ingest", force_reload: bool = False, filename: Optional[str] = None,
+               recompute: bool = False) -> Dict[str, Any]:
+        """
+        Encola un trabajo de escritura.
+
+        Args:
+            kind (str): 'ingest', 'compact', 'route-distances' o 'reprocess-rejected'.
+            force_reload (bool): Ingesta: reprocesar (y, sin filename, reiniciar la base).
+            filename (Optional[str]): Ingesta: archivo puntual dentro del directorio de datos;
+                reprocess-rejected: limitar a las filas rechazadas de ese archivo.
+            recompute (bool): route-distances: recalcular también las rutas cacheadas.
+
+        Returns:
+            Dict: Estado inicial del trabajo, incluyendo su identificador.
+
+        Raises:
+            ValueError: Si el tipo no existe, no hay archivos para ingerir o `filename` no es un
+                archivo del directorio de datos.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'. Supported: {', '.join(JOB_KINDS)}")
+
+        files: List[str] = []
+        if kind == "ingest":
+            files = self._resolve_files(filename)
+            if not files:
+                raise ValueError("No data files found.")
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "force_reload": force_reload,
+            "filename": os.path.basename(filename) if filename else None,
+            "recompute": recompute,
+            "files": [os.path.basename(path) for path in files],
+            "pending_files": files,
+            "completed_files": [],
+            "resumes": 0,
+            "result": None,
+            "error": None,
+            "pid": os.getpid(),
+        }
+        return self._enqueue(job)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Solicita la cancelación de un trabajo.
+
+        Un trabajo en cola se cancela de inmediato; uno en ejecución pasa a 'cancelling' y se
+        detiene al terminar el archivo actual (compactación y backfill no se interrumpen). Si el
+        trabajo pertenece a otro worker, la solicitud se deja como archivo marcador junto a su JSON.
+
+        Returns:
+            Optional[Dict]: Estado del trabajo, o None si no existe.
+        """
+        self._refresh()
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return None
+            event = self._cancel_events.get(job_id)
+            if event is None:
+                if job["status"] in ACTIVE_STATUSES:
+                    self._request_remote_cancel(job_id)
+                    job["status"] = "cancelling"
+                return self._public(job)
+            if job["status"] in ("queued", "waiting"):
+                job.update(status="cancelled", finished_at=time.time())
+            elif job["status"] == "running":
+                job["status"] = "cancelling"
+            snapshot = dict(job)
+        event.set()
+        self._persist(snapshot)
+        return self._public(snapshot)
+
+    def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Vuelve a encolar una ingesta cancelada, interrumpida o fallida desde su checkpoint.
+
+        Solo se procesan los archivos pendientes y nunca se reinicia la base (si el trabajo
+        original era force_reload, el reinicio ya ocurrió en la primera ejecución).
+
+        Returns:
+            Optional[Dict]: Estado del trabajo, o None si no existe.
+
+        Raises:
+            ValueError: Si el trabajo no es una ingesta reanudable o no le quedan archivos.
+        """
+        self._refresh()
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return None
+            if job["kind"] != "ingest" or job["status"] not in RESUMABLE_STATUSES:
+                raise ValueError(f"Job is {job['status']}; only cancelled, interrupted or failed ingest jobs can be resumed")
+            if not job["pending_files"]:
+                raise ValueError("Job has no pending files")
+            reset_done = job["force_reload"] and not job["filename"] and job["started_at"] is not None
+            job.update(status="queued", finished_at=None, result=None, error=None, pid=os.getpid(),
+                       resumes=job["resumes"] + 1)
+            if reset_done:
+                job["force_reload"] = False
+            snapshot = dict(job)
+        return self._enqueue(snapshot, register=False)
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Estado, archivos pendientes/terminados y resultado de un trabajo, o None si no existe."""
+        self._refresh()
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return self._public(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Lista los trabajos, del más reciente al más antiguo."""
+        self._refresh()
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda j: j["created_at"], reverse=True)
+            return [self._public(j) for j in jobs]
+
+    def mark_interrupted(self) -> int:
+        """
+        Marca como 'interrupted' los trabajos que quedaron activos en un proceso que ya no existe
+        (se llama al arrancar). Solo actúa si nadie tiene el lock de escritura, es decir, si ningún
+        otro worker está ejecutando un trabajo.
+
+        Returns:
+            int: Cantidad de trabajos marcados.
+        """
+        if not self.writer_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._lock:
+                stale = [j for j in self.jobs.values()
+                         if j["status"] in ACTIVE_STATUSES and j["id"] not in self._cancel_events]
+                for job in stale:
+                    job.update(status="interrupted", finished_at=time.time())
+                snapshots = [dict(j) for j in stale]
+            for snapshot in snapshots:
+                self._persist(snapshot)
+            if snapshots:
+                logger.warning(f"{len(snapshots)} ingest jobs were interrupted by a previous shutdown; resume them from /etl/jobs/{{id}}/resume")
+            return len(snapshots)
+        finally:
+            self.writer_lock.release()
+
+    def recover_storage(self) -> bool:
+        """
+        Repara el almacenamiento de `flights` que dejó una compactación o carga interrumpida (ver
+        recover() del backend). Se llama en cada arranque y, como mark_interrupted, solo actúa si
+        nadie tiene el lock de escritura: con otro worker escribiendo, sus archivos están en uso.
+
+        Returns:
+            bool: True si se revisó el almacenamiento.
+        """
+        if not self.writer_lock.acquire(blocking=False):
+            return False
+        try:
+            conn = connect(self.ingest_use_case.db_path, workload="ingest")
+            try:
+                self.ingest_use_case.store.recover(conn)
+            finally:
+                conn.close()
+            return True
+        finally:
+            self.writer_lock.release()
+
+    def run_exclusive(self, fn: Callable[..., Any], *args, timeout: float = 5.0, **kwargs) -> Any:
+        """
+        Ejecuta una escritura puntual (borrado de archivo, reset) con el lock de escritura.
+
+        Raises:
+            WriterBusyError: Si otro trabajo sigue escribiendo después de `timeout` segundos.
+        """
+        if not self.writer_lock.acquire(timeout=timeout, poll_seconds=min(self.lock_poll_seconds, timeout)):
+            raise WriterBusyError("Another ingest job is writing to the database; try again when it finishes")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.writer_lock.release()
+
+    # --- Worker ---
+
+    def _enqueue(self, job: Dict[str, Any], register: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            if register:
+                self.jobs[job["id"]] = job
+            self._cancel_events[job["id"]] = threading.Event()
+        self._prune_history()
+        self._persist(job)
+        self._executor.submit(self._run, job["id"])
+        return self._public(job)
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            event = self._cancel_events.get(job_id)
+            if not job or job["status"] != "queued":
+                self._cancel_events.pop(job_id, None)
+                return
+        self._update(job_id, status="waiting")
+
+        # Wait for writers in other processes, staying responsive to cancellation
+        def should_stop() -> bool:
+            return event.is_set() or os.path.exists(self._cancel_marker(job_id))
+
+        while not self.writer_lock.acquire(timeout=self.lock_poll_seconds, poll_seconds=min(0.2, self.lock_poll_seconds)):
+            if should_stop():
+                self._finish(job_id, "cancelled")
+                return
+
+        try:
+            if should_stop():
+                self._finish(job_id, "cancelled")
+                return
+            self._update(job_id, status="running", started_at=time.time())
+            with self._lock:
+                kind = job["kind"]
+                options = dict(job)
+            if kind == "ingest":
+                result = self.ingest_use_case.execute(
+                    force_reload=options["force_reload"],
+                    specific_file=options["filename"],
+                    files=options["pending_files"],
+                    should_stop=should_stop,
+                    on_file_done=lambda file_name, status: self._checkpoint(job_id, file_name),
+                )
+            elif kind == "compact":
+                result = self.ingest_use_case.compact_storage()
+            elif kind == "reprocess-rejected":
+                result = self.ingest_use_case.reprocess_rejected(file_name=options["filename"])
+            else:
+                result = self.ingest_use_case.backfill_route_distances(recompute=options["recompute"])
+
+            status = {"cancelled": "cancelled", "error": "failed"}.get(result.get("status"), "completed")
+            self._finish(job_id, status, result=result, error=result.get("message") if status == "failed" else None)
+        except Exception as e:
+            logger.error(f"Ingest job {job_id} failed: {e}")
+            self._finish(job_id, "failed", error=str(e))
+        finally:
+            self.writer_lock.release()
+
+    def _checkpoint(self, job_id: str, file_name: str) -> None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job["pending_files"] = [p for p in job["pending_files"] if os.path.basename(p) != file_name]
+            if file_name not in job["completed_files"]:
+                job["completed_files"].append(file_name)
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        try:
+            os.remove(self._cancel_marker(job_id))
+        except OSError:
+            pass
+        # Status and ownership change together, so a resume right after cannot lose its event
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job.update(status=status, result=result, error=error, finished_at=time.time())
+            self._cancel_events.pop(job_id, None)
+            self._persist(job)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job.update(fields)
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    # --- Persistence ---
+
+    def _resolve_files(self, filename: Optional[str]) -> List[str]:
+        data_dir = self.ingest_use_case.data_dir
+        if filename:
+            # Only the name counts: directory parts from the client never leave the data directory
+            path = os.path.join(data_dir, os.path.basename(filename))
+            if os.path.dirname(os.path.realpath(path)) != os.path.realpath(data_dir) or not os.path.isfile(path):
+                raise ValueError(f"File '{filename}' not found in the data directory")
+            return [path]
+        files = glob.glob(os.path.join(data_dir, "*.xlsx")) + glob.glob(os.path.join(data_dir, "*.csv"))
+        return sorted(files)
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_directory, f"{job_id}.json")
+
+    def _persist(self, job: Dict[str, Any]) -> None:
+        path = self._job_path(job["id"])
+        tmp_path = path + ".part"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist ingest job {job['id']}: {e}")
+
+    def _cancel_marker(self, job_id: str) -> str:
+        return os.path.join(self.jobs_directory, f"{job_id}.cancel")
+
+    def _request_remote_cancel(self, job_id: str) -> None:
+        try:
+            with open(self._cancel_marker(job_id), "w", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+        except OSError as e:
+            logger.warning(f"Could not request cancellation of ingest job {job_id}: {e}")
+
+    def _load(self) -> None:
+        for path in glob.glob(os.path.join(self.jobs_directory, "*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    job = json.load(f)
+                self.jobs[job["id"]] = job
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable ingest job file {path}: {e}")
+
+    def _refresh(self) -> None:
+        """Relee los trabajos de otros workers (los propios ya están al día en memoria)."""
+        for path in glob.glob(os.path.join(self.jobs_directory, "*.json")):
+            job_id = os.path.splitext(os.path.basename(path))[0]
+            if job_id in self._cancel_events:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    job = json.load(f)
+            except (OSError, ValueError):
+                continue
+            with self._lock:
+                if job_id not in self._cancel_events:
+                    self.jobs[job_id] = job
+
+    def _prune_history(self) -> None:
+        with self._lock:
+            finished = sorted(
+                (j for j in self.jobs.values() if j["status"] not in ACTIVE_STATUSES and j["status"] not in RESUMABLE_STATUSES),
+                key=lambda j: j["created_at"], reverse=True
+            )
+            expired = finished[self.history_size:]
+            for job in expired:
+                del self.jobs[job["id"]]
+        for job in expired:
+            try:
+                os.remove(self._job_path(job["id"]))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+        public = dict(job)
+        public["pending_files"] = [os.path.basename(p) for p in job["pending_files"]]
+        return public
@@ -1,8 +1,9 @@
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Any
 from src.domain.entities.region_airport import RegionAirport
 from src.domain.ports.region_airport_repository import RegionAirportRepository
 from src.domain.ports.airport_repository import AirportRepository
 from src.domain.ports.region_repository import RegionRepository
+from src.application.use_cases.manage_airports import _with_temp_file
 
 class ManageRegionAirports:
     def __init__(self, repository: RegionAirportRepository, airport_repository: AirportRepository, region_repository: RegionRepository):
@@ -39,3 +40,19 @@ class ManageRegionAirports:
 
     def delete_region_airport(self, id: int) -> None:
         self.repository.delete(id)
+
+    def import_region_airports(self, filename: str, content: bytes) -> Dict[str, Any]:
+        """
+        Importa masivamente asignaciones aeropuerto-región (CSV o Parquet con icao_code y region_id).
+
+        La existencia de aeropuertos y regiones se valida en bloque dentro del repositorio, en
+        lugar de consultar cada fila por separado.
+
+        Args:
+            filename (str): Nombre original del archivo (define el formato por su extensión).
+            content (bytes): Contenido del archivo subido.
+
+        Returns:
+            Dict[str, Any]: Reporte con total_rows, inserted, updated, rejected y errors por fila.
+        """
+        return _with_temp_file(filename, content, self.repository.bulk_upsert)
@@ -0,0 +1,329 @@
+import os
+import glob
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, Any, Optional, List
+
+from src.infrastructure.adapters.api.query_executor import QueryExecutor
+from .generate_origin_report import GenerateOriginReport
+from .generate_destination_report import GenerateDestinationReport
+from .generate_region_report import GenerateRegionReport
+from .generate_flight_type_report import GenerateFlightTypeReport
+from .generate_company_report import GenerateCompanyReport
+from .generate_time_report import GenerateTimeReport
+from .generate_heatmap_report import GenerateHeatmapReport
+from .generate_executive_report import GenerateExecutiveReport
+from .export_raw_flights_use_case import ExportRawFlightsUseCase
+
+logger = logging.getLogger(__name__)
+
+# Report catalog: key -> (use case class, (payload option, default) or None, base filename)
+REPORT_TYPES = {
+    "origin": (GenerateOriginReport, None, "reporte_origen"),
+    "destination": (GenerateDestinationReport, None, "reporte_destino"),
+    "region": (GenerateRegionReport, ("dimension", "origin"), "reporte_region"),
+    "flight-type": (GenerateFlightTypeReport, None, "reporte_tipo_vuelo"),
+    "company": (GenerateCompanyReport, None, "reporte_empresa"),
+    "time": (GenerateTimeReport, ("groupBy", "month"), "reporte_tiempo"),
+    "heatmap": (GenerateHeatmapReport, ("timeColumn", "hora_salida"), "reporte_heatmap"),
+    "executive": (GenerateExecutiveReport, None, "reporte_ejecutivo"),
+    "raw": (ExportRawFlightsUseCase, None, "data_cruda_vuelos"),
+}
+
+FORMATS = {
+    "pdf": ("pdf", "application/pdf"),
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+}
+
+# Progress reached when each stage starts (monotonic, 0-100)
+STAGE_PROGRESS = {"queued": 0, "data": 10, "chart": 45, "layout": 75, "done": 100}
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ManageReportJobs:
+    """
+    Cola de generación asíncrona de reportes (PDF/Excel/CSV).
+    Recibe los filtros, devuelve un identificador de trabajo y ejecuta la generación
+    en el pool de reportes (el mismo de los endpoints síncronos), de modo que las ráfagas
+    de reportes no compitan con el tráfico interactivo de /stats. El estado de cada trabajo
+    se guarda como JSON junto a su artefacto, así cualquier worker de uvicorn responde la
+    consulta de estado o la descarga; todo se elimina al vencer su tiempo de vida (TTL).
+    """
+    def __init__(self, db_path: str = "data/metrics.duckdb", jobs_directory: str = "data/report_jobs",
+                 ttl_seconds: int = 3600, executor: Optional[QueryExecutor] = None):
+        """
+        Inicializa la cola de trabajos.
+
+        Args:
+            db_path (str): Ruta a la base de datos de métricas.
+            jobs_directory (str): Directorio de los JSON de trabajos y de los artefactos generados.
+            ttl_seconds (int): Tiempo de vida de un trabajo terminado antes de su limpieza.
+            executor (Optional[QueryExecutor]): Pool de reportes; sin él se crea uno de un hilo.
+        """
+        self.db_path = db_path
+        self.jobs_directory = jobs_directory
+        self.ttl_seconds = ttl_seconds
+        # Jobs running in this process; the rest are read from their JSON files
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._executor = executor or QueryExecutor(name="report-jobs", max_workers=1, workload="report")
+        os.makedirs(jobs_directory, exist_ok=True)
+        self._purge_orphan_files()
+
+    def submit(self, report: str, report_format: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encola un reporte para generación en segundo plano.
+
+        Args:
+            report (str): Tipo de reporte (origin, destination, region, flight-type, company,
+                          time, heatmap, executive, raw).
+            report_format (str): Formato de salida ('pdf', 'excel' o 'csv' para raw).
+            filters (Dict): Payload de filtros, igual al de los endpoints síncronos.
+
+        Returns:
+            Dict: Estado inicial del trabajo, incluyendo su identificador.
+
+        Raises:
+            ValueError: Si el tipo de reporte o el formato no son soportados.
+        """
+        if report not in REPORT_TYPES:
+            raise ValueError(f"Unknown report type '{report}'. Supported: {', '.join(REPORT_TYPES)}")
+        allowed = ("csv",) if report == "raw" else ("pdf", "excel")
+        if report_format not in allowed:
+            raise ValueError(f"Format '{report_format}' not supported for report '{report}'. Supported: {', '.join(allowed)}")
+
+        self.cleanup_expired()
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "report": report,
+            "format": report_format,
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": None,
+            "error": None,
+            "filename": None,
+            "pid": os.getpid(),
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+            snapshot = dict(job)
+        self._persist(snapshot)
+        self._executor.submit(self._run, job_id, dict(filters or {}))
+        return self._public(snapshot)
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el estado y progreso de un trabajo, o None si no existe o ya expiró."""
+        self.cleanup_expired()
+        job = self._read(job_id)
+        return self._public(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Lista los trabajos vigentes de todos los workers, del más reciente al más antiguo."""
+        self.cleanup_expired()
+        jobs = sorted(self._read_all(), key=lambda j: j["created_at"], reverse=True)
+        return [self._public(j) for j in jobs]
+
+    def get_artifact(self, job_id: str) -> Optional[Dict[str, str]]:
+        """
+        Localiza el artefacto de un trabajo terminado.
+
+        Returns:
+            Optional[Dict]: {'path', 'filename', 'media_type'} si el trabajo está completo,
+                            None si no existe, expiró o aún no termina.
+        """
+        self.cleanup_expired()
+        job = self._read(job_id)
+        if not job or job["status"] != "completed":
+            return None
+        extension, media_type = FORMATS[job["format"]]
+        return {
+            "path": self._artifact_path(job_id, extension),
+            "filename": job["filename"],
+            "media_type": media_type,
+        }
+
+    def cleanup_expired(self) -> int:
+        """
+        Elimina los trabajos terminados cuyo TTL venció (de cualquier worker), junto con sus archivos.
+
+        Returns:
+            int: Cantidad de trabajos eliminados.
+        """
+        now = time.time()
+        expired = [j for j in self._read_all() if j["expires_at"] and j["expires_at"] <= now]
+        with self._lock:
+            for job in expired:
+                self.jobs.pop(job["id"], None)
+        for job in expired:
+            extension, _ = FORMATS[job["format"]]
+            self._remove_file(self._artifact_path(job["id"], extension))
+            self._remove_file(self._job_path(job["id"]))
+        return len(expired)
+
+    def _run(self, job_id: str, filters: Dict[str, Any]) -> None:
+        with self._lock:
+            job = self.jobs[job_id]
+            report, report_format = job["report"], job["format"]
+        self._update(job_id, status="running", started_at=time.time())
+
+        try:
+            use_case_cls, option, base_name = REPORT_TYPES[report]
+            use_case = use_case_cls(self.db_path)
+
+            def progress(stage: str) -> None:
+                self._enter_stage(job_id, stage)
+
+            args = [filters]
+            if option:
+                value = filters.get(option[0], option[1])
+                args.append(value)
+                if report in ("region", "time"):
+                    base_name = f"{base_name}_{value}"
+
+            if report == "raw":
+                buffer = use_case.execute(filters, progress=progress)
+            elif report_format == "pdf":
+                buffer = use_case.generate_pdf(*args, progress=progress)
+            else:
+                buffer = use_case.generate_excel(*args, progress=progress)
+
+            extension, _ = FORMATS[report_format]
+            path = self._artifact_path(job_id, extension)
+            tmp_path = path + ".part"
+            with open(tmp_path, "wb") as f:
+                f.write(buffer.getbuffer())
+            os.replace(tmp_path, path)
+
+            finished = time.time()
+            self._update(job_id, status="completed", stage="done", progress=100,
+                         filename=f"{base_name}.{extension}",
+                         finished_at=finished, expires_at=finished + self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Report job {job_id} ({report}/{report_format}) failed: {e}")
+            finished = time.time()
+            self._update(job_id, status="failed", error=str(e),
+                         finished_at=finished, expires_at=finished + self.ttl_seconds)
+        finally:
+            # Finished jobs are served from their JSON file like any other worker's
+            with self._lock:
+                self.jobs.pop(job_id, None)
+
+    def _enter_stage(self, job_id: str, stage: str) -> None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] != "running" or STAGE_PROGRESS[stage] <= job["progress"]:
+                return
+            job["stage"] = stage
+            job["progress"] = STAGE_PROGRESS[stage]
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return
+            job.update(fields)
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    # --- Persistence ---
+
+    def _artifact_path(self, job_id: str, extension: str) -> str:
+        return os.path.join(self.jobs_directory, f"{job_id}.{extension}")
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_directory, f"{job_id}.json")
+
+    def _persist(self, job: Dict[str, Any]) -> None:
+        path = self._job_path(job["id"])
+        tmp_path = f"{path}.{os.getpid()}.part"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist report job {job['id']}: {e}")
+
+    def _read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                return dict(job)
+        return self._load(self._job_path(job_id))
+
+    def _read_all(self) -> List[Dict[str, Any]]:
+        jobs = []
+        for path in glob.glob(os.path.join(self.jobs_directory, "*.json")):
+            job = self._read(os.path.splitext(os.path.basename(path))[0])
+            if job:
+                jobs.append(job)
+        return jobs
+
+    def _load(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if job.get("status") in ACTIVE_STATUSES and not self._process_alive(job.get("pid")):
+            # Its worker died mid-generation: report it as failed and let the TTL clean it up
+            finished = time.time()
+            job.update(status="failed", error="Report job was interrupted by a worker restart",
+                       finished_at=finished, expires_at=finished + self.ttl_seconds)
+            self._persist(job)
+        return job
+
+    def _purge_orphan_files(self) -> None:
+        # Artifacts and partial writes whose job file is gone are no longer addressable
+        cutoff = time.time() - self.ttl_seconds
+        for path in glob.glob(os.path.join(self.jobs_directory, "*")):
+            if path.endswith(".json"):
+                continue
+            job_id = os.path.basename(path).split(".", 1)[0]
+            if os.path.exists(self._job_path(job_id)):
+                continue
+            try:
+                if os.path.getmtime(path) <= cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _process_alive(pid: Optional[int]) -> bool:
+        if not pid:
+            return False
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Exists but belongs to another user
+            return True
+        return True
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove report artifact {path}: {e}")
+
+    @staticmethod
+    def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+        public = dict(job)
+        public.pop("pid", None)
+        return public
@@ -1,14 +1,24 @@
 
 import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import uuid
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+# Semi-join filters against the normalized sector membership tables (param: sector_id)
+SECTOR_ORIGINS_FILTER = "origen IN (SELECT icao_code FROM sector_origins WHERE sector_id = ?)"
+SECTOR_DESTINATIONS_FILTER = "destino IN (SELECT icao_code FROM sector_destinations WHERE sector_id = ?)"
+
 
 class ManageSectors:
     """
     Controlador de persistencia para la configuración de Sectores ATC.
     Gestiona el ciclo de vida (CRUD) de las definiciones de sectores y sus
     parámetros técnicos en la base de datos DuckDB.
+
+    Además del JSON `definition`, mantiene las tablas normalizadas `sector_origins` y
+    `sector_destinations` (sector_id, icao_code), contra las que las consultas de vuelos
+    hacen semi-joins en lugar de armar listas IN con literales.
     """
     def __init__(self, db_path: str = "data/metrics.duckdb"):
         """
@@ -27,7 +37,7 @@ class ManageSectors:
             List[Dict]: Lista de diccionarios, cada uno representando un sector 
                        con su definición (JSON) y parámetros de capacidad.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # simple select
             result = conn.execute("SELECT * FROM sectors").fetchall()
@@ -58,7 +68,7 @@ class ManageSectors:
         Returns:
             Optional[Dict]: Diccionario del sector si existe, else None.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             result = conn.execute("SELECT * FROM sectors WHERE id = ?", [sector_id]).fetchone()
             if result:
@@ -88,11 +98,13 @@ class ManageSectors:
         Returns:
             str: El UUID asignado al nuevo sector.
         """
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
             sector_id = str(uuid.uuid4())
-            definition_json = json.dumps(data.get("definition", {}))
-            
+            definition = data.get("definition", {})
+            definition_json = json.dumps(definition)
+
+            conn.execute("BEGIN TRANSACTION")
             conn.execute("""
                 INSERT INTO sectors (id, name, definition, t_transfer, t_comm_ag, t_separation, t_coordination, adjustment_factor_r, capacity_baseline)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -107,7 +119,12 @@ class ManageSectors:
                 data.get("adjustment_factor_r", 0.8), # Default R
                 data.get("capacity_baseline", 0)
             ])
+            self._write_memberships(conn, sector_id, definition)
+            conn.execute("COMMIT")
             return sector_id
+        except Exception:
+            self._rollback(conn)
+            raise
         finally:
             conn.close()
 
@@ -133,8 +150,9 @@ class ManageSectors:
         else:
                 definition_json = json.dumps(current_sector["definition"])
 
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
+            conn.execute("BEGIN TRANSACTION")
             conn.execute("""
                 UPDATE sectors 
                 SET name = COALESCE(?, name), 
@@ -157,9 +175,13 @@ class ManageSectors:
                 data.get("capacity_baseline"),
                 sector_id
             ])
+            if "definition" in data:
+                self._write_memberships(conn, sector_id, data["definition"])
+            conn.execute("COMMIT")
             return True
         except Exception as e:
             print(f"Update error: {e}")
+            self._rollback(conn)
             return False
         finally:
             conn.close()
@@ -175,9 +197,56 @@ class ManageSectors:
         Returns:
             bool: True si la operación se ejecutó (independiente de si el registro existía).
         """
-        conn = duckdb.connect(self.db_path)
+        conn = connect(self.db_path)
         try:
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute("DELETE FROM sector_origins WHERE sector_id = ?", [sector_id])
+            conn.execute("DELETE FROM sector_destinations WHERE sector_id = ?", [sector_id])
             conn.execute("DELETE FROM sectors WHERE id = ?", [sector_id])
+            conn.execute("COMMIT")
             return True
+        except Exception:
+            self._rollback(conn)
+            raise
         finally:
             conn.close()
+
+    @staticmethod
+    def get_membership_counts(conn, sector_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Consulta cuántos orígenes y destinos tiene un sector en las tablas de membresía.
+
+        Args:
+            conn (duckdb.Connection): Conexión abierta (de lectura o escritura).
+            sector_id (str): UUID del sector.
+
+        Returns:
+            Optional[Tuple[int, int]]: (orígenes, destinos), o None si el sector no existe.
+        """
+        row = conn.execute("""
+            SELECT
+                (SELECT count(*) FROM sectors WHERE id = ?),
+                (SELECT count(*) FROM sector_origins WHERE sector_id = ?),
+                (SELECT count(*) FROM sector_destinations WHERE sector_id = ?)
+        """, [sector_id, sector_id, sector_id]).fetchone()
+        if not row[0]:
+            return None
+        return row[1], row[2]
+
+    @staticmethod
+    def _rollback(conn) -> None:
+        try:
+            conn.execute("ROLLBACK")
+        except duckdb.TransactionException:
+            # Failed before the transaction was opened
+            pass
+
+    @staticmethod
+    def _write_memberships(conn, sector_id: str, definition: Dict[str, Any]) -> None:
+        """Reemplaza la membresía de un sector con los orígenes/destinos de su definición."""
+        for table, key in (("sector_origins", "origins"), ("sector_destinations", "destinations")):
+            conn.execute(f"DELETE FROM {table} WHERE sector_id = ?", [sector_id])
+            codes = sorted({str(code) for code in (definition or {}).get(key, []) if code})
+            if codes:
+                conn.executemany(f"INSERT INTO {table} (sector_id, icao_code) VALUES (?, ?)",
+                                 [[sector_id, code] for code in codes])
@@ -1,8 +1,9 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from typing import Dict, Any, List
+from .manage_sectors import ManageSectors, SECTOR_ORIGINS_FILTER, SECTOR_DESTINATIONS_FILTER
 from datetime import datetime
 
 class PredictAirlineGrowth:
@@ -32,7 +33,7 @@ class PredictAirlineGrowth:
         Returns:
             Dict: Ranking de crecimiento, reporte ejecutivo y series temporales por operador.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # 1. Build Base Filter
             conditions = []
@@ -59,16 +60,10 @@ class PredictAirlineGrowth:
                 is_seasonal = False
 
             if sector_id:
-                sector = conn.execute("SELECT definition FROM sectors WHERE id = ?", [sector_id]).fetchone()
-                if sector and sector[0]:
-                    import json
-                    definition = json.loads(sector[0])
-                    origins = definition.get("origins", [])
-                    destinations = definition.get("destinations", [])
-                    if origins and destinations:
-                        origins_str = "', '".join(origins)
-                        destinations_str = "', '".join(destinations)
-                        conditions.append(f"origen IN ('{origins_str}') AND destino IN ('{destinations_str}')")
+                membership = ManageSectors.get_membership_counts(conn, sector_id)
+                if membership is not None and all(membership):
+                    conditions.append(f"{SECTOR_ORIGINS_FILTER} AND {SECTOR_DESTINATIONS_FILTER}")
+                    params.extend([sector_id, sector_id])
 
             if airport:
                 conditions.append("(origen = ? OR destino = ?)")
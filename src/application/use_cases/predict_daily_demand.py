@@ -1,9 +1,11 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor
 from typing import Dict, Any, List
+from .manage_sectors import ManageSectors, SECTOR_ORIGINS_FILTER, SECTOR_DESTINATIONS_FILTER
 
 class PredictDailyDemand:
     """
@@ -20,7 +22,7 @@ class PredictDailyDemand:
         """
         self.db_path = db_path
 
-    def execute(self, days_ahead: int = 30, sector_id: str = None, airport: str = None, route: str = None, min_level: int = None, max_level: int = None, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+    def execute(self, days_ahead: int = 30, sector_id: str = None, airport: str = None, route: str = None, min_level: int = None, max_level: int = None, start_date: str = None, end_date: str = None, as_arrow: bool = False) -> Dict[str, Any]:
         """
         Orquesta el proceso de predicción según los filtros aplicados.
         Soporta dos modos: Estándar (Random Forest) y Estacional (Decomposición).
@@ -33,11 +35,12 @@ class PredictDailyDemand:
             min_level (int): Nivel de vuelo mínimo.
             max_level (int): Nivel de vuelo máximo.
             start_date/end_date (str): Si se proveen, activa el modo estacional comparativo.
+            as_arrow (bool): Devolver historia y pronóstico como tablas Arrow (respuestas columnares).
             
         Returns:
             Dict: Objeto con series históricas, proyecciones e intervalos de confianza.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # 1. Build Filter Conditions
             conditions = ["fecha IS NOT NULL"]
@@ -45,22 +48,14 @@ class PredictDailyDemand:
 
             # Sector Filter
             if sector_id:
-                sector = conn.execute("SELECT definition FROM sectors WHERE id = ?", [sector_id]).fetchone()
-                if sector and sector[0]:
-                    import json
-                    definition = json.loads(sector[0])
-                    origins = definition.get("origins", [])
-                    destinations = definition.get("destinations", [])
-                    
-                    if origins and destinations:
-                        # Construct IN clauses for sector
-                        origins_str = "', '".join(origins)
-                        destinations_str = "', '".join(destinations)
-                        conditions.append(f"origen IN ('{origins_str}') AND destino IN ('{destinations_str}')")
-                    else:
-                        return {"error": "Sector definition is incomplete (missing origins/destinations)."}
-                else:
+                membership = ManageSectors.get_membership_counts(conn, sector_id)
+                if membership is None:
                     return {"error": "Sector not found."}
+                if not all(membership):
+                    return {"error": "Sector definition is incomplete (missing origins/destinations)."}
+                # Semi-join against the normalized sector membership tables
+                conditions.append(f"{SECTOR_ORIGINS_FILTER} AND {SECTOR_DESTINATIONS_FILTER}")
+                params.extend([sector_id, sector_id])
 
             # Airport Filter (Origin OR Destination)
             if airport:
@@ -186,10 +181,17 @@ class PredictDailyDemand:
                 })
 
             # Format History for Chart
-            history_data = [
-                {"date": row['ds'].strftime("%Y-%m-%d"), "value": int(row['y'])}
-                for _, row in df.tail(90).iterrows() # Last 90 days context
-            ]
+            recent = df.tail(90) # Last 90 days context
+            if as_arrow:
+                history_data = pa.table({
+                    "date": pa.array(recent['ds']).cast(pa.date32()),
+                    "value": pa.array(recent['y'].astype('int64')),
+                })
+            else:
+                history_data = [
+                    {"date": row['ds'].strftime("%Y-%m-%d"), "value": int(row['y'])}
+                    for _, row in recent.iterrows()
+                ]
             
             # --- GENERATING PLAIN LANGUAGE EXPLANATION ---
             trend_slope = 0
@@ -266,7 +268,7 @@ class PredictDailyDemand:
             return {
                 "model": "Random Forest Regressor (Recursive)",
                 "history": history_data,
-                "forecast": forecast_data,
+                "forecast": pa.Table.from_pylist(forecast_data) if as_arrow else forecast_data,
                 "accuracy_metrics": {
                     "r2_score": round(r2_score, 3),
                     "confidence_score": "Alta" if r2_score > 0.7 else "Media",
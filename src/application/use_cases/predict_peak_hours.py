@@ -1,7 +1,9 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from typing import Dict, Any, List
+from .manage_sectors import ManageSectors, SECTOR_ORIGINS_FILTER, SECTOR_DESTINATIONS_FILTER
 
 class PredictPeakHours:
     """
@@ -15,7 +17,7 @@ class PredictPeakHours:
         """
         self.db_path = db_path
 
-    def execute(self, sector_id: str = None, airport: str = None, route: str = None, min_level: int = None, max_level: int = None, start_date: str = None, end_date: str = None, aggregation: str = "avg") -> Dict[str, Any]:
+    def execute(self, sector_id: str = None, airport: str = None, route: str = None, min_level: int = None, max_level: int = None, start_date: str = None, end_date: str = None, aggregation: str = "avg", as_arrow: bool = False) -> Dict[str, Any]:
         """
         Genera un mapa de calor (Heatmap) de la demanda horaria por día de la semana.
         
@@ -26,11 +28,12 @@ class PredictPeakHours:
             min_level/max_level: Filtros de altitud.
             start_date/end_date: Rango para análisis estacional.
             aggregation (str): Método de agregación (promedio por defecto).
+            as_arrow (bool): Devolver el historial como tabla Arrow (respuestas columnares) en lugar de filas.
             
         Returns:
             Dict: Datos de mapa de calor, informe ejecutivo y métricas de intensidad.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # 1. Build Filter Conditions
             conditions = ["hora_salida IS NOT NULL"]
@@ -61,22 +64,13 @@ class PredictPeakHours:
 
             # Sector Filter
             if sector_id:
-                sector = conn.execute("SELECT definition FROM sectors WHERE id = ?", [sector_id]).fetchone()
-                if sector and sector[0]:
-                    import json
-                    definition = json.loads(sector[0])
-                    origins = definition.get("origins", [])
-                    destinations = definition.get("destinations", [])
-                    
-                    if origins and destinations:
-                        origins_str = "', '".join(origins)
-                        destinations_str = "', '".join(destinations)
-                        conditions.append(f"origen IN ('{origins_str}') AND destino IN ('{destinations_str}')")
-                    else:
-                        # STANDARD MODE: Last 90 Days
-                        conditions.append("fecha >= CURRENT_DATE - INTERVAL '90 DAYS'")
-                        is_seasonal = False
+                membership = ManageSectors.get_membership_counts(conn, sector_id)
+                if membership is not None:
+                    if not all(membership):
                         return {"error": "Sector definition is incomplete."}
+                    # Semi-join against the normalized sector membership tables
+                    conditions.append(f"{SECTOR_ORIGINS_FILTER} AND {SECTOR_DESTINATIONS_FILTER}")
+                    params.extend([sector_id, sector_id])
 
             # Airport Filter
             if airport:
@@ -153,15 +147,24 @@ class PredictPeakHours:
                     })
             
             # Format History for Table
-            history_data = [
-                {
-                    "date": row['fecha'].strftime("%Y-%m-%d") if pd.notnull(row['fecha']) else None,
-                    "dow": int(row['dow']),
-                    "hour": int(row['hour']),
-                    "count": int(row['count'])
-                }
-                for _, row in df.sort_values('fecha', ascending=False).head(1000).iterrows() # Limit to last 1000 records for performance
-            ]
+            recent = df.sort_values('fecha', ascending=False).head(1000) # Limit to last 1000 records for performance
+            if as_arrow:
+                history_data = pa.table({
+                    "date": pa.array(recent['fecha']).cast(pa.date32()),
+                    "dow": pa.array(recent['dow'].astype('int64')),
+                    "hour": pa.array(recent['hour'].astype('int64')),
+                    "count": pa.array(recent['count'].astype('int64')),
+                })
+            else:
+                history_data = [
+                    {
+                        "date": row['fecha'].strftime("%Y-%m-%d") if pd.notnull(row['fecha']) else None,
+                        "dow": int(row['dow']),
+                        "hour": int(row['hour']),
+                        "count": int(row['count'])
+                    }
+                    for _, row in recent.iterrows()
+                ]
 
             # --- GENERATING PLAIN LANGUAGE EXPLANATION ---
             # 1. Find the Peak Slot
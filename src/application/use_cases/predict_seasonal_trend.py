@@ -1,4 +1,4 @@
-import duckdb
+from src.infrastructure.adapters.database.connections import connect
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -6,6 +6,7 @@ from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from typing import Dict, Any, List
+from .manage_sectors import ManageSectors, SECTOR_ORIGINS_FILTER, SECTOR_DESTINATIONS_FILTER
 
 class PredictSeasonalTrend:
     """
@@ -32,7 +33,7 @@ class PredictSeasonalTrend:
         Returns:
             Dict: Reporte ejecutivo, historial y proyección futura con intervalos de confianza.
         """
-        conn = duckdb.connect(self.db_path, read_only=True)
+        conn = connect(self.db_path, read_only=True)
         try:
             # 1. Construcción de la Consulta con filtros dinámicos
             conditions = ["fecha IS NOT NULL"]
@@ -40,16 +41,10 @@ class PredictSeasonalTrend:
 
             # Filtrado por definición de sector (orígenes/destinos)
             if sector_id:
-                sector = conn.execute("SELECT definition FROM sectors WHERE id = ?", [sector_id]).fetchone()
-                if sector and sector[0]:
-                    import json
-                    definition = json.loads(sector[0])
-                    origins = definition.get("origins", [])
-                    destinations = definition.get("destinations", [])
-                    if origins and destinations:
-                        origins_str = "', '".join(origins)
-                        destinations_str = "', '".join(destinations)
-                        conditions.append(f"origen IN ('{origins_str}') AND destino IN ('{destinations_str}')")
+                membership = ManageSectors.get_membership_counts(conn, sector_id)
+                if membership is not None and all(membership):
+                    conditions.append(f"{SECTOR_ORIGINS_FILTER} AND {SECTOR_DESTINATIONS_FILTER}")
+                    params.extend([sector_id, sector_id])
 
             # Filtros por aeropuerto único (origen o destino)
             if airport:
@@ -0,0 +1,18 @@
+"""
+Avance de la generación de un reporte, consumido por la cola asíncrona (ver ManageReportJobs).
+
+Los generadores reciben un `progress` opcional y lo invocan al entrar a cada etapa; los
+endpoints síncronos no lo pasan.
+"""
+from typing import Callable, Optional
+
+# Stages in the order a report goes through them
+STAGES = ("data", "chart", "layout")
+
+ReportProgress = Callable[[str], None]
+
+
+def report_stage(progress: Optional[ReportProgress], stage: str) -> None:
+    """Notifica a `progress` (si se pasó) que el reporte entra a la etapa `stage`."""
+    if progress is not None:
+        progress(stage)
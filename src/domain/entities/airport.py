@@ -12,12 +12,12 @@ class Airport(BaseModel):
     icao_code: str  # Código OACI (ICAO) de 4 caracteres (ej. SKBO)
     iata_code: Optional[str] = None  # Código IATA de 3 caracteres (ej. BOG)
     name: str  # Nombre completo del aeropuerto
-    city: str  # Ciudad donde se ubica
-    country: str  # País de ubicación
-    latitude: float  # Latitud en coordenadas decimales
-    longitude: float  # Longitud en coordenadas decimales
-    altitude: int  # Altitud sobre el nivel del mar en pies
-    timezone: float  # Desplazamiento horario UTC
-    dst: str  # Horario de verano (Daylight Saving Time)
-    type: str  # Tipo de instalación (aeropuerto, helipuerto, etc.)
-    source: str  # Fuente de los datos (ej. OurAirports)
+    city: Optional[str] = None  # Ciudad donde se ubica
+    country: Optional[str] = None  # País de ubicación
+    latitude: Optional[float] = None  # Latitud en coordenadas decimales
+    longitude: Optional[float] = None  # Longitud en coordenadas decimales
+    altitude: Optional[int] = None  # Altitud sobre el nivel del mar en pies
+    timezone: Optional[float] = None  # Desplazamiento horario UTC
+    dst: Optional[str] = None  # Horario de verano (Daylight Saving Time)
+    type: Optional[str] = None  # Tipo de instalación (aeropuerto, helipuerto, etc.)
+    source: Optional[str] = None  # Fuente de los datos (ej. OurAirports)
@@ -13,3 +13,4 @@ class FileInfo:
     validation_status: bool  # Indica si el archivo superó las validaciones iniciales
     error_message: Optional[str] = None  # Mensaje detallado en caso de error de proceso
     db_status: Optional[str] = None  # Estado de la integración en la base de datos (ej. 'PROCESSED')
+    content_hash: Optional[str] = None  # SHA-256 del contenido subido (base para deduplicar cargas)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Dict, Any
 from src.domain.entities.airport import Airport
 
 class AirportRepository(ABC):
@@ -24,6 +24,11 @@ class AirportRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_all(self) -> List[Airport]:
+        """Recupera el catálogo completo de aeropuertos ordenado por ID."""
+        pass
+
     @abstractmethod
     def get_by_id(self, airport_id: int) -> Optional[Airport]:
         """Recupera un aeropuerto específico por su identificador numérico interno."""
@@ -48,3 +53,8 @@ class AirportRepository(ABC):
     def delete(self, airport_id: int) -> bool:
         """Elimina un aeropuerto del sistema por su ID."""
         pass
+
+    @abstractmethod
+    def bulk_upsert(self, file_path: str) -> Dict[str, Any]:
+        """Importa un archivo CSV/Parquet de aeropuertos (upsert por ICAO) y devuelve el reporte por fila."""
+        pass
@@ -13,5 +13,10 @@ class FileRepository(ABC):
 
     @abstractmethod
     def save_file(self, filename: str, content: BinaryIO) -> FileInfo:
-        """Guarda un nuevo archivo en el sistema y retorna su estado de validación inicial."""
+        """
+        Guarda un nuevo archivo en el sistema y retorna su estado de validación inicial.
+
+        `content` se consume como stream (por bloques); las implementaciones no deben cargarlo
+        completo en memoria.
+        """
         pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any
 from src.domain.entities.region_airport import RegionAirport
 
 class RegionAirportRepository(ABC):
@@ -25,3 +25,8 @@ class RegionAirportRepository(ABC):
     def delete(self, id: int) -> None:
         """Elimina la relación entre un aeropuerto y su región."""
         pass
+
+    @abstractmethod
+    def bulk_upsert(self, file_path: str) -> Dict[str, Any]:
+        """Importa un archivo CSV/Parquet de asignaciones (upsert por ICAO) y devuelve el reporte por fila."""
+        pass
@@ -0,0 +1,170 @@
+import bisect
+import re
+import threading
+import unicodedata
+from array import array
+from typing import List, Optional, Tuple, Dict, Any
+
+from src.domain.entities.airport import Airport
+from src.domain.ports.airport_repository import AirportRepository
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+_FIELDS = ("id", "icao_code", "iata_code", "name", "city", "country", "latitude", "longitude",
+           "altitude", "timezone", "dst", "type", "source")
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Minúsculas y sin tildes, para que 'bogota' encuentre 'Bogotá'."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+class AirportCatalog:
+    """
+    Índice columnar inmutable del catálogo de aeropuertos.
+
+    Guarda cada atributo en su propia lista (posición = fila, ordenadas por id) y arma:
+    - hashes por id, ICAO e IATA para búsquedas puntuales;
+    - un índice de tokens (nombre, ciudad, país y códigos) con vocabulario ordenado, de modo
+      que cada palabra buscada se resuelve como prefijo de token con bisect.
+    """
+    def __init__(self, airports: List[Airport]):
+        airports = sorted(airports, key=lambda a: a.id or 0)
+        self.columns: Dict[str, list] = {field: [getattr(a, field) for a in airports] for field in _FIELDS}
+        self.size = len(airports)
+        self.by_id = {airport_id: pos for pos, airport_id in enumerate(self.columns["id"])}
+        self.by_icao = {}
+        self.by_iata = {}
+        for pos in range(self.size):
+            icao = self.columns["icao_code"][pos]
+            iata = self.columns["iata_code"][pos]
+            if icao:
+                self.by_icao.setdefault(icao.upper(), pos)
+            if iata:
+                self.by_iata.setdefault(iata.upper(), pos)
+
+        # Row positions per token; positions are appended in id order, so postings stay sorted
+        postings: Dict[str, array] = {}
+        self.haystacks = []
+        for pos in range(self.size):
+            text = " ".join(_normalize(self.columns[field][pos]) for field in ("name", "city", "country", "icao_code", "iata_code"))
+            self.haystacks.append(text)
+            for token in set(_TOKEN_SPLIT.split(text)):
+                if token:
+                    postings.setdefault(token, array("I")).append(pos)
+        self.vocabulary = sorted(postings)
+        self.postings = [postings[token] for token in self.vocabulary]
+
+    def row(self, pos: int) -> Airport:
+        return Airport(**{field: self.columns[field][pos] for field in _FIELDS})
+
+    def search(self, term: str) -> List[int]:
+        """
+        Posiciones (en orden de id) de los aeropuertos que coinciden con `term`.
+
+        Cada palabra debe ser prefijo de algún token del aeropuerto. Si ninguna fila cumple,
+        se recurre a la coincidencia por subcadena (el comportamiento ILIKE '%term%' anterior).
+        """
+        words = [w for w in _TOKEN_SPLIT.split(_normalize(term)) if w]
+        if not words:
+            return list(range(self.size))
+
+        matches: Optional[set] = None
+        for word in words:
+            start = bisect.bisect_left(self.vocabulary, word)
+            end = bisect.bisect_left(self.vocabulary, word + "\uffff")
+            hits = set()
+            for i in range(start, end):
+                hits.update(self.postings[i])
+            matches = hits if matches is None else matches & hits
+            if not matches:
+                break
+        if matches:
+            return sorted(matches)
+
+        needle = _normalize(term).strip()
+        return [pos for pos, text in enumerate(self.haystacks) if needle in text]
+
+
+class CachedAirportRepository(AirportRepository):
+    """
+    Repositorio de aeropuertos con el catálogo completo en memoria.
+
+    Las lecturas (paginación con búsqueda, get_by_id, get_by_icao, get_by_iata) se resuelven
+    sobre AirportCatalog sin abrir conexiones; las escrituras se delegan al repositorio
+    persistente e invalidan el catálogo, que se recarga en la siguiente lectura.
+    """
+    def __init__(self, repository: AirportRepository):
+        """
+        Args:
+            repository (AirportRepository): Repositorio persistente (DuckDB) al que se delegan las escrituras.
+        """
+        self.repository = repository
+        self._catalog: Optional[AirportCatalog] = None
+        self._lock = threading.Lock()
+
+    @property
+    def catalog(self) -> AirportCatalog:
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog = AirportCatalog(self.repository.get_all())
+                catalog = self._catalog
+        return catalog
+
+    def invalidate(self) -> None:
+        """Descarta el catálogo en memoria (tras escrituras o importaciones masivas)."""
+        self._catalog = None
+
+    def get_all(self) -> List[Airport]:
+        catalog = self.catalog
+        return [catalog.row(pos) for pos in range(catalog.size)]
+
+    def get_paginated(self, page: int, page_size: int, search: str = "") -> Tuple[List[Airport], int]:
+        catalog = self.catalog
+        positions = catalog.search(search) if search else range(catalog.size)
+        offset = (page - 1) * page_size
+        return [catalog.row(pos) for pos in positions[offset:offset + page_size]], len(positions)
+
+    def get_by_id(self, airport_id: int) -> Optional[Airport]:
+        catalog = self.catalog
+        pos = catalog.by_id.get(airport_id)
+        return catalog.row(pos) if pos is not None else None
+
+    def get_by_icao(self, icao_code: str) -> Optional[Airport]:
+        catalog = self.catalog
+        pos = catalog.by_icao.get((icao_code or "").upper())
+        return catalog.row(pos) if pos is not None else None
+
+    def get_by_iata(self, iata_code: str) -> Optional[Airport]:
+        """Recupera un aeropuerto por su código IATA (ej. BOG)."""
+        catalog = self.catalog
+        pos = catalog.by_iata.get((iata_code or "").upper())
+        return catalog.row(pos) if pos is not None else None
+
+    def create(self, airport: Airport) -> Airport:
+        try:
+            return self.repository.create(airport)
+        finally:
+            self.invalidate()
+
+    def update(self, airport: Airport) -> Optional[Airport]:
+        try:
+            return self.repository.update(airport)
+        finally:
+            self.invalidate()
+
+    def delete(self, airport_id: int) -> bool:
+        try:
+            return self.repository.delete(airport_id)
+        finally:
+            self.invalidate()
+
+    def bulk_upsert(self, file_path: str) -> Dict[str, Any]:
+        try:
+            return self.repository.bulk_upsert(file_path)
+        finally:
+            self.invalidate()
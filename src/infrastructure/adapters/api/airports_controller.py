@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from src.application.use_cases.manage_airports import ManageAirports
 from src.application.use_cases.manage_airports import ManageAirports
-from src.application.di.container import get_manage_airports_use_case
+from src.application.di.container import get_manage_airports_use_case, get_interactive_executor, get_report_executor
 from src.domain.entities.airport import Airport
 
 router = APIRouter(prefix="/airports", tags=["airports"])
@@ -45,7 +45,8 @@ class PaginatedResponse(BaseModel):
 
 
 @router.get("/", response_model=PaginatedResponse)
-def list_airports(
+async def list_airports(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página para la paginación (basado en 1)"), 
     page_size: int = Query(10, ge=1, le=100, description="Cantidad de aeropuertos por página (máx: 100)"), 
     search: str = Query("", description="Término de búsqueda opcional para filtrar por código OACI o nombre"),
@@ -63,7 +64,7 @@ def list_airports(
     Returns:
         PaginatedResponse: Objeto conteniendo el set de datos, el total de registros y metadatos de paginación.
     """
-    items, total = use_case.get_airports(page, page_size, search)
+    items, total = await get_interactive_executor().run(request, use_case.get_airports, page, page_size, search)
     return {
         "data": items,
         "total": total,
@@ -72,7 +73,7 @@ def list_airports(
     }
 
 @router.post("/", response_model=AirportResponse)
-def create_airport(
+async def create_airport(
     airport: AirportCreate, 
     use_case: ManageAirports = Depends(get_manage_airports_use_case)
 ):
@@ -86,10 +87,41 @@ def create_airport(
     Returns:
         AirportResponse: El registro del aeropuerto recién creado con su ID asignado.
     """
-    return use_case.create_airport(airport.model_dump())
+    try:
+        return await get_interactive_executor().run(None, use_case.create_airport, airport.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/import")
+async def import_airports(
+    file: UploadFile,
+    use_case: ManageAirports = Depends(get_manage_airports_use_case)
+):
+    """
+    Importa masivamente aeropuertos desde un CSV o Parquet (p. ej. el dataset de OurAirports).
+
+    Los registros se insertan o actualizan por código ICAO en una sola transacción; las filas
+    inválidas no se aplican y se devuelven en `errors` con su número de fila.
+
+    Args:
+        file (UploadFile): Archivo .csv o .parquet con encabezados iguales a las columnas de aeropuertos.
+        use_case (ManageAirports): Orquestador de la importación.
+
+    Returns:
+        dict: Reporte con total_rows, inserted, updated, rejected y errors.
+
+    Raises:
+        HTTPException: Error 400 si el formato no es soportado o faltan columnas obligatorias.
+    """
+    content = await file.read()
+    try:
+        return await get_report_executor().run(None, use_case.import_airports, file.filename, content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{airport_id}", response_model=AirportResponse)
-def get_airport(
+async def get_airport(
+    request: Request,
     airport_id: int, 
     use_case: ManageAirports = Depends(get_manage_airports_use_case)
 ):
@@ -106,13 +138,13 @@ def get_airport(
     Raises:
         HTTPException: Error 404 si el ID no corresponde a ningún aeropuerto registrado.
     """
-    airport = use_case.get_airport(airport_id)
+    airport = await get_interactive_executor().run(request, use_case.get_airport, airport_id)
     if not airport:
         raise HTTPException(status_code=404, detail="Airport not found")
     return airport
 
 @router.put("/{airport_id}", response_model=AirportResponse)
-def update_airport(
+async def update_airport(
     airport_id: int, 
     airport: AirportCreate, 
     use_case: ManageAirports = Depends(get_manage_airports_use_case)
@@ -131,13 +163,16 @@ def update_airport(
     Raises:
         HTTPException: Error 404 si el aeropuerto no existe.
     """
-    updated = use_case.update_airport(airport_id, airport.model_dump())
+    try:
+        updated = await get_interactive_executor().run(None, use_case.update_airport, airport_id, airport.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Airport not found")
     return updated
 
 @router.delete("/{airport_id}")
-def delete_airport(
+async def delete_airport(
     airport_id: int, 
     use_case: ManageAirports = Depends(get_manage_airports_use_case)
 ):
@@ -154,6 +189,6 @@ def delete_airport(
     Raises:
         HTTPException: Error 404 si el aeropuerto no pudo ser localizado para su eliminación.
     """
-    if not use_case.delete_airport(airport_id):
+    if not await get_interactive_executor().run(None, use_case.delete_airport, airport_id):
         raise HTTPException(status_code=404, detail="Airport not found")
     return {"message": "Airport deleted"}
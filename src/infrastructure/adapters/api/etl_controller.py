@@ -1,25 +1,99 @@
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from src.application.use_cases.ingest_flights_data import IngestFlightsDataUseCase
-from src.application.di.container import get_ingest_flights_use_case
+from src.application.use_cases.manage_ingest_jobs import ManageIngestJobs, WriterBusyError
+from src.application.di.container import get_ingest_flights_use_case, get_ingest_progress, get_manage_ingest_jobs_use_case
+from src.infrastructure.adapters.ingest_progress import IngestProgress
 
 router = APIRouter(prefix="/etl", tags=["ETL"])
 
+# SSE cadence: how often the tracker is sampled and how long an idle stream waits before a keep-alive comment
+PROGRESS_POLL_SECONDS = 0.5
+PROGRESS_HEARTBEAT_SECONDS = 15
+
 
 @router.post("/ingest")
 def trigger_ingestion(
-    background_tasks: BackgroundTasks,
     force_reload: bool = False,
     filename: str = None,
-    use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
 ):
-    """Trigger the ingestion process in the background."""
-    background_tasks.add_task(use_case.execute, force_reload=force_reload, specific_file=filename)
-    return {"message": "Ingestion started", "status": "processing"}
+    """Queue an ingestion job (jobs run one at a time; see /etl/jobs)."""
+    try:
+        job = jobs.submit("ingest", force_reload=force_reload, filename=filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Ingestion queued", "status": "processing", "job_id": job["id"], "job": job}
+
+@router.get("/jobs")
+def list_jobs(jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)):
+    """Ingest, compaction and backfill jobs, newest first."""
+    return jobs.list_jobs()
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)):
+    job = jobs.get_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str, jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)):
+    """Cancel a queued job, or stop a running ingest after its current file."""
+    job = jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/jobs/{job_id}/resume")
+def resume_job(job_id: str, jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)):
+    """Re-queue the pending files of a cancelled, interrupted or failed ingest job."""
+    try:
+        job = jobs.resume(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.get("/progress")
 def get_progress(use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)):
     return use_case.get_progress()
 
+@router.get("/progress/stream")
+async def stream_progress(request: Request, progress: IngestProgress = Depends(get_ingest_progress)):
+    """
+    Server-Sent Events con la telemetría de ingesta (mismo contenido que /etl/progress).
+
+    Emite un evento `progress` en cada cambio (archivo, etapa, filas/s, bytes/s, ETA) y un
+    comentario de keep-alive cuando no hay cambios. El stream sigue abierto entre corridas.
+    """
+    async def events():
+        last_version = None
+        last_sent = 0.0
+        while not await request.is_disconnected():
+            snapshot = progress.snapshot()
+            now = time.monotonic()
+            if snapshot["version"] != last_version:
+                last_version = snapshot["version"]
+                last_sent = now
+                yield f"event: progress\ndata: {json.dumps(snapshot, default=str)}\n\n"
+            elif now - last_sent >= PROGRESS_HEARTBEAT_SECONDS:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/status")
 def get_status(use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)):
     """Alias for progress used by SystemStatus component."""
@@ -30,19 +104,82 @@ def get_history(use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_
     return use_case.get_history()
 
 @router.delete("/files/{filename}")
-def delete_file(filename: str, use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)):
+def delete_file(
+    filename: str,
+    use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case),
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
+):
     """Delete a file and its associated data."""
     try:
-        use_case.delete_file(filename)
+        jobs.run_exclusive(use_case.delete_file, filename)
         return {"message": "File deleted successfully"}
+    except WriterBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/compact")
+def compact_storage(jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)):
+    """Rewrite flights clustered by date (run after deletes or large backfills)."""
+    job = jobs.submit("compact")
+    return {"message": "Compaction queued", "status": "processing", "job_id": job["id"], "job": job}
+
+@router.post("/route-distances")
+def backfill_route_distances(
+    recompute: bool = False,
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
+):
+    """Fill missing distances and implied speeds from per-route great-circle distances."""
+    job = jobs.submit("route-distances", recompute=recompute)
+    return {"message": "Route distance backfill queued", "status": "processing", "job_id": job["id"], "job": job}
+
+@router.get("/rejected")
+def get_rejected_rows(
+    file_name: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+    use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)
+):
+    """Rows quarantined by ingest validation, with reason codes and the original record."""
+    return use_case.get_rejected_rows(file_name=file_name, limit=limit, offset=offset)
+
+@router.patch("/rejected/{rejected_id}")
+def correct_rejected_row(
+    rejected_id: int,
+    values: Dict[str, Any],
+    use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case),
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
+):
+    """Correct fields of a quarantined row; POST /etl/rejected/reprocess loads it once it validates."""
+    try:
+        record = jobs.run_exclusive(use_case.correct_rejected_row, rejected_id, values)
+    except WriterBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if record is None:
+        raise HTTPException(status_code=404, detail="Rejected row not found")
+    return {"id": rejected_id, "raw_record": record}
+
+@router.post("/rejected/reprocess")
+def reprocess_rejected(
+    file_name: Optional[str] = None,
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
+):
+    """Re-validate quarantined rows and load the ones that now pass (only those rows are read)."""
+    job = jobs.submit("reprocess-rejected", filename=file_name)
+    return {"message": "Rejected rows reprocess queued", "status": "processing", "job_id": job["id"], "job": job}
+
 @router.post("/reset")
-def reset_database(use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case)):
+def reset_database(
+    use_case: IngestFlightsDataUseCase = Depends(get_ingest_flights_use_case),
+    jobs: ManageIngestJobs = Depends(get_manage_ingest_jobs_use_case)
+):
     """Truncate flights and file_processing_control tables."""
     try:
-        use_case.reset_database()
+        jobs.run_exclusive(use_case.reset_database)
         return {"message": "Database reset successfully"}
+    except WriterBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, UploadFile, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, HTTPException, Depends, Request
 from typing import List
 from src.domain.entities.file_info import FileInfo
 from src.application.use_cases.manage_files import ManageFiles
 from src.infrastructure.adapters.filesystem_repository import FilesystemRepository
+from src.application.di.container import get_interactive_executor, get_report_executor
 
 router = APIRouter(prefix="/files", tags=["files"])
 
@@ -12,8 +13,8 @@ def get_manage_files_use_case() -> ManageFiles:
     return ManageFiles(repository)
 
 @router.get("/", response_model=List[FileInfo])
-async def list_files(use_case: ManageFiles = Depends(get_manage_files_use_case)):
-    return use_case.list_files()
+async def list_files(request: Request, use_case: ManageFiles = Depends(get_manage_files_use_case)):
+    return await get_interactive_executor().run(request, use_case.list_files)
 
 @router.post("/", response_model=FileInfo)
 async def upload_file(
@@ -23,8 +24,9 @@ async def upload_file(
     if not file.filename.endswith(".xlsx"):
         raise HTTPException(status_code=400, detail="Only .xlsx files are allowed")
     
-    content = await file.read()
-    file_info = use_case.upload_file(file.filename, content)
+    # The multipart body is already spooled to a temp file; the repository copies it to data/
+    # in chunks and validates only the header row, so memory does not grow with the upload
+    file_info = await get_report_executor().run(None, use_case.upload_file, file.filename, file.file)
     
     if not file_info.validation_status:
         raise HTTPException(status_code=400, detail=file_info.error_message)
@@ -1,23 +1,44 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Request
+from typing import List, Any, Dict
 from src.application.use_cases.manage_filters import ManageFilters
+from src.application.use_cases.get_filter_facets import GetFilterFacets
+from src.application.di.container import get_manage_filters_use_case, get_filter_facets_use_case, get_interactive_executor, get_report_executor
 
 router = APIRouter(prefix="/filters", tags=["filters"])
 
-def get_manage_filters_use_case():
-    return ManageFilters()
-
 @router.post("/refresh")
-def refresh_filters(use_case: ManageFilters = Depends(get_manage_filters_use_case)):
+async def refresh_filters(request: Request, use_case: ManageFilters = Depends(get_manage_filters_use_case)):
     """Re-populates the filters cache table from the flights data."""
     try:
-        result = use_case.refresh_filters()
+        # Full rebuild scans every flight: run it with the heavy workloads, not the interactive pool
+        result = await get_report_executor().run(request, use_case.refresh_filters)
         return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/facets")
+async def get_filter_facets(
+    request: Request,
+    filters: Dict[str, Any] = Body(default={}),
+    limit: int = Query(50, ge=1, le=500),
+    use_case: GetFilterFacets = Depends(get_filter_facets_use_case)
+):
+    """
+    Value counts per filter dimension under the current selection.
+    Each dimension ignores its own filter, so sibling options stay visible.
+    """
+    try:
+        return await get_interactive_executor().run(request, use_case.execute, filters, limit)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{parent_id}/search")
-def search_filter_values(
+async def search_filter_values(
+    request: Request,
     parent_id: int, 
     q: str = "", 
     use_case: ManageFilters = Depends(get_manage_filters_use_case)
@@ -26,20 +47,29 @@ def search_filter_values(
     Search values for a specific category (parent_id).
     Parent IDs: 1=Matricula, 2=Tipo Aeronave, 3=Empresa, 4=Tipo Vuelo, 5=Callsign
     """
-    return use_case.search_values(parent_id, q)
+    try:
+        return await get_interactive_executor().run(request, use_case.search_values, parent_id, q)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/origins")
-def get_origins(use_case: ManageFilters = Depends(get_manage_filters_use_case)):
+async def get_origins(request: Request, use_case: ManageFilters = Depends(get_manage_filters_use_case)):
     """Get distinct origins for filtering."""
     try:
-        return use_case.get_origins()
+        return await get_interactive_executor().run(request, use_case.get_origins)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/destinations")
-def get_destinations(use_case: ManageFilters = Depends(get_manage_filters_use_case)):
+async def get_destinations(request: Request, use_case: ManageFilters = Depends(get_manage_filters_use_case)):
     """Get distinct destinations for filtering."""
     try:
-        return use_case.get_destinations()
+        return await get_interactive_executor().run(request, use_case.get_destinations)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
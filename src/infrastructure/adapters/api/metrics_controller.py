@@ -1,11 +1,18 @@
 """Metrics API Controller - FastAPI router for metrics endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from ....application.di.container import Container
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from ....application.di.container import Container, get_metrics_registry, get_query_log, get_query_observer
 from ....application.dtos.metric_dto import HealthCheckResponse
+from ..observability import MetricsRegistry, QueryObserver
+from ..query_log import ORDER_BY, QueryLog
 
 
 router = APIRouter(prefix="/api/v1", tags=["metrics"])
 
+# Prometheus scrapes /metrics at the root, outside the versioned API
+exposition_router = APIRouter(tags=["metrics"])
+
 
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
@@ -14,3 +21,76 @@ async def health_check():
         status="healthy",
         version="1.0.0"
     )
+
+
+@exposition_router.get("/metrics", include_in_schema=False)
+def prometheus_metrics(registry: MetricsRegistry = Depends(get_metrics_registry)):
+    """Métricas del proceso en formato de texto de Prometheus (latencia HTTP y consultas DuckDB)."""
+    return Response(content=registry.render(), media_type=MetricsRegistry.CONTENT_TYPE)
+
+
+@router.get("/metrics/slow-queries")
+def slow_queries(fingerprint: Optional[str] = None, observer: QueryObserver = Depends(get_query_observer)):
+    """
+    Planes perfilados (EXPLAIN ANALYZE) de las últimas sentencias lentas.
+
+    Args:
+        fingerprint (Optional[str]): Filtrar por la huella que aparece en /metrics.
+    """
+    if not observer.capture_slow_plans:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow-query plan capture is disabled (CAPTURE_SLOW_QUERY_PLANS)"
+        )
+    return {
+        "threshold_ms": observer.slow_query_seconds * 1000,
+        "plans": observer.slow_plans(fingerprint),
+    }
+
+
+def _require_query_log(query_log: QueryLog) -> None:
+    if not query_log.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The query log is disabled (QUERY_LOG_ENABLED)"
+        )
+
+
+@router.get("/metrics/queries/top")
+def top_queries(
+    limit: int = Query(10, ge=1, le=500),
+    order_by: str = Query("total", pattern="^(" + "|".join(ORDER_BY) + ")$"),
+    query_log: QueryLog = Depends(get_query_log)
+):
+    """
+    Huellas de SQL que más tiempo consumen entre las últimas sentencias registradas.
+
+    Args:
+        limit (int): Cantidad de huellas.
+        order_by (str): "total" (tiempo acumulado) o "p95" (percentil 95 de la duración).
+    """
+    _require_query_log(query_log)
+    return {
+        "order_by": order_by,
+        "window": query_log.size(),
+        "fingerprints": query_log.top(limit, order_by),
+    }
+
+
+@router.get("/metrics/queries/recent")
+def recent_queries(
+    limit: int = Query(100, ge=1, le=1000),
+    fingerprint: Optional[str] = None,
+    use_case: Optional[str] = None,
+    query_log: QueryLog = Depends(get_query_log)
+):
+    """
+    Últimas sentencias ejecutadas, con duración, parámetros, filas y caso de uso.
+
+    Args:
+        limit (int): Cantidad máxima de sentencias.
+        fingerprint (Optional[str]): Filtrar por huella.
+        use_case (Optional[str]): Filtrar por caso de uso (nombre de la clase).
+    """
+    _require_query_log(query_log)
+    return {"queries": query_log.recent(limit, fingerprint, use_case)}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List, Dict, Any, Optional
 from src.application.use_cases.predict_daily_demand import PredictDailyDemand
 from src.application.use_cases.predict_peak_hours import PredictPeakHours
@@ -12,13 +12,16 @@ from src.application.di.container import (
     get_predict_peak_hours_use_case,
     get_predict_airline_growth_use_case,
     get_predict_sector_saturation_use_case,
-    get_predict_seasonal_trend_use_case
+    get_predict_seasonal_trend_use_case,
+    get_ml_executor
 )
+from src.infrastructure.adapters.api.response_encoding import tabular_response, wants_columns
 
 router = APIRouter(prefix="/predictive", tags=["Predictive"])
 
 @router.get("/daily-demand")
-def get_daily_demand_forecast(
+async def get_daily_demand_forecast(
+    request: Request,
     days: int = Query(30, description="Horizonte de predicción en días (ej. 7, 30, 90)"),
     sector_id: Optional[str] = Query(None, description="Filtrar proyección para un sector ATC específico"),
     airport: Optional[str] = Query(None, description="Filtrar por vuelos asociados a un aeropuerto (OACI)"),
@@ -40,12 +43,20 @@ def get_daily_demand_forecast(
         Dict: Series históricas y proyecciones con intervalos de confianza.
     """
     try:
-        return use_case.execute(days_ahead=days, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level)
+        result = await get_ml_executor().run(
+            request, use_case.execute,
+            days_ahead=days, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level,
+            as_arrow=wants_columns(request)
+        )
+        return tabular_response(request, result, main_table="history")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/peak-hours")
-def get_peak_hours_forecast(
+async def get_peak_hours_forecast(
+    request: Request,
     sector_id: Optional[str] = Query(None, description="ID del sector para el análisis de calor"),
     airport: Optional[str] = Query(None, description="Filtro por aeropuerto"),
     route: Optional[str] = Query(None, description="Filtro por ruta"),
@@ -70,7 +81,8 @@ def get_peak_hours_forecast(
         Dict: Matriz de calor formateada para PeakHoursHeatmap.tsx.
     """
     try:
-        return use_case.execute(
+        result = await get_ml_executor().run(
+            request, use_case.execute,
             sector_id=sector_id, 
             airport=airport, 
             route=route, 
@@ -78,13 +90,18 @@ def get_peak_hours_forecast(
             max_level=max_level,
             start_date=start_date,
             end_date=end_date,
-            aggregation=aggregation
+            aggregation=aggregation,
+            as_arrow=wants_columns(request)
         )
+        return tabular_response(request, result, main_table="history")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/airline-growth")
-def get_airline_growth_forecast(
+async def get_airline_growth_forecast(
+    request: Request,
     months: int = Query(12, description="Meses de historia para el análisis de tendencia de mercado"),
     sector_id: Optional[str] = Query(None, description="Filtro por sector"),
     airport: Optional[str] = Query(None, description="Filtro por aeropuerto"),
@@ -105,12 +122,15 @@ def get_airline_growth_forecast(
         Dict: Ranking de aerolíneas con mayor crecimiento y proyecciones individuales.
     """
     try:
-        return use_case.execute(months_history=months, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level)
+        return await get_ml_executor().run(request, use_case.execute, months_history=months, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sector-saturation/{sector_id}")
-def get_sector_saturation_forecast(
+async def get_sector_saturation_forecast(
+    request: Request,
     sector_id: str,
     days: int = Query(30, description="Días a proyectar"),
     use_case: PredictSectorSaturation = Depends(get_predict_sector_saturation_use_case)
@@ -128,7 +148,7 @@ def get_sector_saturation_forecast(
         Dict: Reporte de riesgo con descripción en lenguaje natural e indicadores clave.
     """
     try:
-        result = use_case.execute(sector_id, days_ahead=days)
+        result = await get_ml_executor().run(request, use_case.execute, sector_id, days_ahead=days)
         if "error" in result:
              raise HTTPException(status_code=400, detail=result["error"])
         return result
@@ -138,7 +158,8 @@ def get_sector_saturation_forecast(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/seasonal-trend")
-def get_seasonal_trend_forecast(
+async def get_seasonal_trend_forecast(
+    request: Request,
     start_date: str = Query(..., description="Fecha de inicio del periodo estacional (YYYY-MM-DD)"),
     end_date: str = Query(..., description="Fecha de fin del periodo estacional (YYYY-MM-DD)"),
     sector_id: Optional[str] = Query(None, description="ID del sector"),
@@ -160,6 +181,8 @@ def get_seasonal_trend_forecast(
         Dict: Descomposición de la serie, reporte ejecutivo y proyecciones de confianza.
     """
     try:
-        return use_case.execute(start_date=start_date, end_date=end_date, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level)
+        return await get_ml_executor().run(request, use_case.execute, start_date=start_date, end_date=end_date, sector_id=sector_id, airport=airport, route=route, min_level=min_level, max_level=max_level)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,143 @@
+"""
+Pools de ejecución acotados para el trabajo bloqueante de los endpoints (DuckDB, pandas, sklearn).
+
+Cada tipo de carga tiene su propio pool de tamaño fijo (consultas interactivas, reportes y
+modelos predictivos), así una ráfaga de pronósticos no deja sin hilos a /stats. Los endpoints
+son `async` y esperan el resultado; mientras tanto se vigila la conexión del cliente y, si se
+cae, se interrumpen las consultas DuckDB de la petición (ver database.connections).
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Request
+
+from src.infrastructure.adapters.database.connections import QueryScope
+from src.infrastructure.adapters.database.resource_governor import WORKLOADS, StatementTimeout, set_thread_workload
+
+logger = logging.getLogger(__name__)
+
+# nginx convention for "client closed request"; never reaches the client, only logs
+CLIENT_CLOSED_REQUEST = 499
+
+
+class QueryCancelled(HTTPException):
+    """La petición se canceló porque el cliente se desconectó."""
+    def __init__(self):
+        super().__init__(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+
+
+class QueryTimedOut(HTTPException):
+    """Una sentencia superó el plazo de su carga (ver database.resource_governor)."""
+    def __init__(self, detail: str):
+        super().__init__(status_code=504, detail=detail)
+
+
+class QueryExecutor:
+    """
+    Pool de hilos con nombre y tamaño fijo para un tipo de carga.
+    """
+    def __init__(self, name: str, max_workers: int, disconnect_poll_seconds: float = 0.25,
+                 workload: Optional[str] = None):
+        """
+        Args:
+            name (str): Nombre del pool (prefijo de los hilos y etiqueta en logs).
+            max_workers (int): Tareas ejecutándose en paralelo; el resto espera en cola.
+            disconnect_poll_seconds (float): Cada cuánto se verifica si el cliente sigue conectado.
+            workload (Optional[str]): Carga de resource_governor.WORKLOADS cuyo perfil reciben las
+                conexiones DuckDB del pool; por defecto `name`, si es una de ellas.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.disconnect_poll_seconds = disconnect_poll_seconds
+        self.workload = workload or (name if name in WORKLOADS else None)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-query",
+            **({"initializer": set_thread_workload, "initargs": (self.workload,)} if self.workload else {})
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    async def run(self, request: Optional[Request], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta `fn(*args, **kwargs)` en el pool y espera su resultado sin bloquear el event loop.
+
+        Args:
+            request (Optional[Request]): Petición cuyo cliente se vigila; None para no vigilar.
+            fn (Callable): Trabajo bloqueante (normalmente el execute de un caso de uso).
+
+        Returns:
+            Any: Lo que devuelva `fn`.
+
+        Raises:
+            QueryCancelled: Si el cliente se desconectó antes de terminar.
+            QueryTimedOut: Si una sentencia superó el plazo de la carga del pool.
+        """
+        scope = QueryScope()
+
+        def call():
+            with scope.bind():
+                return fn(*args, **kwargs)
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+            if request is None:
+                return await future
+            watcher = asyncio.create_task(self._watch_disconnect(request, future, scope))
+            try:
+                result = await future
+            except Exception:
+                if scope.cancelled:
+                    raise QueryCancelled()
+                raise
+            finally:
+                watcher.cancel()
+            if scope.cancelled:
+                raise QueryCancelled()
+            return result
+        except StatementTimeout as e:
+            raise QueryTimedOut(str(e))
+        except asyncio.CancelledError:
+            # The handler task itself was cancelled (shutdown): stop the queries too
+            scope.cancel()
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Encola `fn(*args, **kwargs)` en el pool sin esperarla (trabajos en segundo plano, como los
+        reportes asíncronos). Comparte los hilos, y por lo tanto el límite, con `run`.
+        """
+        def call():
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return self._executor.submit(call)
+        except RuntimeError:
+            # Pool already shut down
+            with self._lock:
+                self.in_flight -= 1
+            raise
+
+    async def _watch_disconnect(self, request: Request, future: asyncio.Future, scope: QueryScope) -> None:
+        while not future.done():
+            if await request.is_disconnected():
+                interrupted = scope.cancel()
+                logger.info(f"[{self.name}] client disconnected from {request.url.path}; interrupted {interrupted} queries")
+                return
+            await asyncio.sleep(self.disconnect_poll_seconds)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
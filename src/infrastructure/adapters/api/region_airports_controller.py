@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from src.domain.entities.region_airport import RegionAirport
 from src.application.use_cases.manage_region_airports import ManageRegionAirports
-from src.application.di.container import get_manage_region_airports_use_case
+from src.application.di.container import get_manage_region_airports_use_case, get_interactive_executor, get_report_executor
 
 router = APIRouter(prefix="/region-airports", tags=["region-airports"])
 
@@ -14,13 +14,14 @@ class PaginatedResponse(BaseModel):
     page_size: int
 
 @router.get("/", response_model=PaginatedResponse)
-def list_region_airports(
+async def list_region_airports(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     search: str = "",
     use_case: ManageRegionAirports = Depends(get_manage_region_airports_use_case)
 ):
-    items, total = use_case.get_region_airports(page, page_size, search)
+    items, total = await get_interactive_executor().run(request, use_case.get_region_airports, page, page_size, search)
     return {
         "data": items,
         "total": total,
@@ -29,30 +30,41 @@ def list_region_airports(
     }
 
 @router.post("/", response_model=RegionAirport)
-def create_region_airport(
+async def create_region_airport(
     item: RegionAirport,
     use_case: ManageRegionAirports = Depends(get_manage_region_airports_use_case)
 ):
     try:
-        return use_case.create_region_airport(item)
+        return await get_interactive_executor().run(None, use_case.create_region_airport, item)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/import")
+async def import_region_airports(
+    file: UploadFile,
+    use_case: ManageRegionAirports = Depends(get_manage_region_airports_use_case)
+):
+    content = await file.read()
+    try:
+        return await get_report_executor().run(None, use_case.import_region_airports, file.filename, content)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{id}", response_model=RegionAirport)
-def update_region_airport(
+async def update_region_airport(
     id: int,
     item: RegionAirport,
     use_case: ManageRegionAirports = Depends(get_manage_region_airports_use_case)
 ):
     try:
-        return use_case.update_region_airport(id, item)
+        return await get_interactive_executor().run(None, use_case.update_region_airport, id, item)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{id}")
-def delete_region_airport(
+async def delete_region_airport(
     id: int,
     use_case: ManageRegionAirports = Depends(get_manage_region_airports_use_case)
 ):
-    use_case.delete_region_airport(id)
+    await get_interactive_executor().run(None, use_case.delete_region_airport, id)
     return {"status": "success"}
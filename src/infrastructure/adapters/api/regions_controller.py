@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from src.application.use_cases.manage_regions import ManageRegions
 from src.application.use_cases.manage_regions import ManageRegions
-from src.application.di.container import get_manage_regions_use_case
+from src.application.di.container import get_manage_regions_use_case, get_interactive_executor
 
 router = APIRouter(prefix="/regions", tags=["regions"])
 
@@ -28,29 +28,29 @@ class RegionResponse(BaseModel):
 # Dependency replaced by imports from container
 
 @router.get("/", response_model=List[RegionResponse])
-def list_regions(use_case: ManageRegions = Depends(get_manage_regions_use_case)):
-    return use_case.list_regions()
+async def list_regions(request: Request, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
+    return await get_interactive_executor().run(request, use_case.list_regions)
 
 @router.get("/{region_id}", response_model=RegionResponse)
-def get_region(region_id: int, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
-    region = use_case.get_region(region_id)
+async def get_region(request: Request, region_id: int, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
+    region = await get_interactive_executor().run(request, use_case.get_region, region_id)
     if not region:
         raise HTTPException(status_code=404, detail="Region not found")
     return region
 
 @router.post("/", response_model=RegionResponse)
-def create_region(region: RegionCreate, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
-    return use_case.create_region(region.model_dump())
+async def create_region(region: RegionCreate, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
+    return await get_interactive_executor().run(None, use_case.create_region, region.model_dump())
 
 @router.put("/{region_id}", response_model=RegionResponse)
-def update_region(region_id: int, region: RegionCreate, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
-    updated_region = use_case.update_region(region_id, region.model_dump())
+async def update_region(region_id: int, region: RegionCreate, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
+    updated_region = await get_interactive_executor().run(None, use_case.update_region, region_id, region.model_dump())
     if not updated_region:
         raise HTTPException(status_code=404, detail="Region not found")
     return updated_region
 
 @router.delete("/{region_id}")
-def delete_region(region_id: int, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
-    if not use_case.delete_region(region_id):
+async def delete_region(region_id: int, use_case: ManageRegions = Depends(get_manage_regions_use_case)):
+    if not await get_interactive_executor().run(None, use_case.delete_region, region_id):
          raise HTTPException(status_code=404, detail="Region not found")
     return {"message": "Region deleted"}
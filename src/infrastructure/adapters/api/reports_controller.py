@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
+from fastapi.responses import StreamingResponse, FileResponse
 from typing import Dict, Any
+from pydantic import BaseModel
 from src.application.use_cases.generate_origin_report import GenerateOriginReport
 from src.application.use_cases.generate_destination_report import GenerateDestinationReport
 from src.application.use_cases.generate_region_report import GenerateRegionReport
@@ -10,7 +11,8 @@ from src.application.use_cases.generate_time_report import GenerateTimeReport
 from src.application.use_cases.generate_heatmap_report import GenerateHeatmapReport
 from src.application.use_cases.export_raw_flights_use_case import ExportRawFlightsUseCase
 from src.application.use_cases.generate_executive_report import GenerateExecutiveReport
-from src.application.di.container import get_export_raw_flights_use_case, get_generate_executive_report_use_case
+from src.application.use_cases.manage_report_jobs import ManageReportJobs
+from src.application.di.container import get_export_raw_flights_use_case, get_generate_executive_report_use_case, get_manage_report_jobs_use_case, get_report_executor
 import io
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -28,7 +30,8 @@ def get_time_use_case(): return GenerateTimeReport()
 def get_heatmap_use_case(): return GenerateHeatmapReport()
 
 @router.post("/origin/excel")
-def generate_origin_excel(
+async def generate_origin_excel(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateOriginReport = Depends(get_report_use_case)
 ):
@@ -36,17 +39,20 @@ def generate_origin_excel(
     Generate Excel report for Flights by Origin.
     """
     try:
-        excel_file = use_case.generate_excel(filters)
+        excel_file = await get_report_executor().run(request, use_case.generate_excel, filters)
         return StreamingResponse(
             excel_file, 
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": "attachment; filename=reporte_origen.xlsx"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/origin/pdf")
-def generate_origin_pdf(
+async def generate_origin_pdf(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateOriginReport = Depends(get_report_use_case)
 ):
@@ -54,17 +60,20 @@ def generate_origin_pdf(
     Generate PDF report for Flights by Origin.
     """
     try:
-        pdf_file = use_case.generate_pdf(filters)
+        pdf_file = await get_report_executor().run(request, use_case.generate_pdf, filters)
         return StreamingResponse(
             pdf_file, 
             media_type="application/pdf",
             headers={"Content-Disposition": "attachment; filename=reporte_origen.pdf"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/destination/excel")
-def generate_destination_excel(
+async def generate_destination_excel(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateDestinationReport = Depends(get_destination_report_use_case)
 ):
@@ -72,17 +81,20 @@ def generate_destination_excel(
     Generate Excel report for Flights by Destination.
     """
     try:
-        excel_file = use_case.generate_excel(filters)
+        excel_file = await get_report_executor().run(request, use_case.generate_excel, filters)
         return StreamingResponse(
             excel_file, 
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": "attachment; filename=reporte_destino.xlsx"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/destination/pdf")
-def generate_destination_pdf(
+async def generate_destination_pdf(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateDestinationReport = Depends(get_destination_report_use_case)
 ):
@@ -90,136 +102,202 @@ def generate_destination_pdf(
     Generate PDF report for Flights by Destination.
     """
     try:
-        pdf_file = use_case.generate_pdf(filters)
+        pdf_file = await get_report_executor().run(request, use_case.generate_pdf, filters)
         return StreamingResponse(
             pdf_file, 
             media_type="application/pdf",
             headers={"Content-Disposition": "attachment; filename=reporte_destino.pdf"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- Region Reports ---
 @router.post("/region/excel")
-def generate_region_excel(
+async def generate_region_excel(
+    request: Request,
     payload: Dict[str, Any] = Body(...),
     use_case: GenerateRegionReport = Depends(get_region_use_case)
 ):
     try:
         dimension = payload.get('dimension', 'origin')
-        file = use_case.generate_excel(payload, dimension)
+        file = await get_report_executor().run(request, use_case.generate_excel, payload, dimension)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": f"attachment; filename=reporte_region_{dimension}.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/region/pdf")
-def generate_region_pdf(
+async def generate_region_pdf(
+    request: Request,
     payload: Dict[str, Any] = Body(...),
     use_case: GenerateRegionReport = Depends(get_region_use_case)
 ):
     try:
         dimension = payload.get('dimension', 'origin')
-        file = use_case.generate_pdf(payload, dimension)
+        file = await get_report_executor().run(request, use_case.generate_pdf, payload, dimension)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": f"attachment; filename=reporte_region_{dimension}.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 # --- Flight Type Reports ---
 @router.post("/flight-type/excel")
-def generate_flight_type_excel(filters: Dict[str, Any] = Body(...), use_case: GenerateFlightTypeReport = Depends(get_flight_type_use_case)):
+async def generate_flight_type_excel(request: Request, filters: Dict[str, Any] = Body(...), use_case: GenerateFlightTypeReport = Depends(get_flight_type_use_case)):
     try:
-        file = use_case.generate_excel(filters)
+        file = await get_report_executor().run(request, use_case.generate_excel, filters)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=reporte_tipo_vuelo.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/flight-type/pdf")
-def generate_flight_type_pdf(filters: Dict[str, Any] = Body(...), use_case: GenerateFlightTypeReport = Depends(get_flight_type_use_case)):
+async def generate_flight_type_pdf(request: Request, filters: Dict[str, Any] = Body(...), use_case: GenerateFlightTypeReport = Depends(get_flight_type_use_case)):
     try:
-        file = use_case.generate_pdf(filters)
+        file = await get_report_executor().run(request, use_case.generate_pdf, filters)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=reporte_tipo_vuelo.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 # --- Company Reports ---
 @router.post("/company/excel")
-def generate_company_excel(filters: Dict[str, Any] = Body(...), use_case: GenerateCompanyReport = Depends(get_company_use_case)):
+async def generate_company_excel(request: Request, filters: Dict[str, Any] = Body(...), use_case: GenerateCompanyReport = Depends(get_company_use_case)):
     try:
-        file = use_case.generate_excel(filters)
+        file = await get_report_executor().run(request, use_case.generate_excel, filters)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=reporte_empresa.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/company/pdf")
-def generate_company_pdf(filters: Dict[str, Any] = Body(...), use_case: GenerateCompanyReport = Depends(get_company_use_case)):
+async def generate_company_pdf(request: Request, filters: Dict[str, Any] = Body(...), use_case: GenerateCompanyReport = Depends(get_company_use_case)):
     try:
-        file = use_case.generate_pdf(filters)
+        file = await get_report_executor().run(request, use_case.generate_pdf, filters)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=reporte_empresa.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 # --- Time Reports ---
 @router.post("/time/excel")
-def generate_time_excel(payload: Dict[str, Any] = Body(...), use_case: GenerateTimeReport = Depends(get_time_use_case)):
+async def generate_time_excel(request: Request, payload: Dict[str, Any] = Body(...), use_case: GenerateTimeReport = Depends(get_time_use_case)):
     try:
         groupBy = payload.get('groupBy', 'month')
-        file = use_case.generate_excel(payload, groupBy)
+        file = await get_report_executor().run(request, use_case.generate_excel, payload, groupBy)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": f"attachment; filename=reporte_tiempo_{groupBy}.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/time/pdf")
-def generate_time_pdf(payload: Dict[str, Any] = Body(...), use_case: GenerateTimeReport = Depends(get_time_use_case)):
+async def generate_time_pdf(request: Request, payload: Dict[str, Any] = Body(...), use_case: GenerateTimeReport = Depends(get_time_use_case)):
     try:
         groupBy = payload.get('groupBy', 'month')
-        file = use_case.generate_pdf(payload, groupBy)
+        file = await get_report_executor().run(request, use_case.generate_pdf, payload, groupBy)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": f"attachment; filename=reporte_tiempo_{groupBy}.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 # --- Heatmap Reports ---
 @router.post("/heatmap/excel")
-def generate_heatmap_excel(payload: Dict[str, Any] = Body(...), use_case: GenerateHeatmapReport = Depends(get_heatmap_use_case)):
+async def generate_heatmap_excel(request: Request, payload: Dict[str, Any] = Body(...), use_case: GenerateHeatmapReport = Depends(get_heatmap_use_case)):
     try:
         timeColumn = payload.get('timeColumn', 'hora_salida')
-        file = use_case.generate_excel(payload, timeColumn)
+        file = await get_report_executor().run(request, use_case.generate_excel, payload, timeColumn)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=reporte_heatmap.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/heatmap/pdf")
-def generate_heatmap_pdf(payload: Dict[str, Any] = Body(...), use_case: GenerateHeatmapReport = Depends(get_heatmap_use_case)):
+async def generate_heatmap_pdf(request: Request, payload: Dict[str, Any] = Body(...), use_case: GenerateHeatmapReport = Depends(get_heatmap_use_case)):
     try:
         timeColumn = payload.get('timeColumn', 'hora_salida')
-        file = use_case.generate_pdf(payload, timeColumn)
+        file = await get_report_executor().run(request, use_case.generate_pdf, payload, timeColumn)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=reporte_heatmap.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 
 # --- Raw Data Export ---
 @router.post("/raw/csv")
-def export_raw_data_csv(
+async def export_raw_data_csv(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: ExportRawFlightsUseCase = Depends(get_export_raw_flights_use_case)
 ):
     try:
-        csv_file = use_case.execute(filters)
+        csv_file = await get_report_executor().run(request, use_case.execute, filters)
         return StreamingResponse(
             csv_file,
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=data_cruda_vuelos.csv"}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- Executive Reports ---
 @router.post("/executive/pdf")
-def generate_executive_pdf(
+async def generate_executive_pdf(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateExecutiveReport = Depends(get_generate_executive_report_use_case)
 ):
     try:
-        file = use_case.generate_pdf(filters)
+        file = await get_report_executor().run(request, use_case.generate_pdf, filters)
         return StreamingResponse(file, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=reporte_ejecutivo.pdf"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/executive/excel")
-def generate_executive_excel(
+async def generate_executive_excel(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GenerateExecutiveReport = Depends(get_generate_executive_report_use_case)
 ):
     try:
-        file = use_case.generate_excel(filters)
+        file = await get_report_executor().run(request, use_case.generate_excel, filters)
         return StreamingResponse(file, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={"Content-Disposition": "attachment; filename=reporte_ejecutivo.xlsx"})
+    except HTTPException: raise
     except Exception as e: raise HTTPException(status_code=500, detail=str(e))
+
+
+# --- Asynchronous Report Jobs ---
+class ReportJobRequest(BaseModel):
+    report: str  # origin, destination, region, flight-type, company, time, heatmap, executive, raw
+    format: str = "pdf"  # pdf | excel (csv for raw)
+    filters: Dict[str, Any] = {}
+
+@router.post("/jobs", status_code=202)
+def submit_report_job(
+    request: ReportJobRequest,
+    use_case: ManageReportJobs = Depends(get_manage_report_jobs_use_case)
+):
+    """
+    Encola la generación de un reporte y retorna de inmediato el identificador del trabajo.
+    El progreso se consulta en /reports/jobs/{job_id} y el archivo en /reports/jobs/{job_id}/download.
+    """
+    try:
+        return use_case.submit(request.report, request.format, request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/jobs")
+def list_report_jobs(use_case: ManageReportJobs = Depends(get_manage_report_jobs_use_case)):
+    """Lista los trabajos de reportes vigentes (no expirados)."""
+    return use_case.list_jobs()
+
+@router.get("/jobs/{job_id}")
+def get_report_job(job_id: str, use_case: ManageReportJobs = Depends(get_manage_report_jobs_use_case)):
+    """Estado, etapa (data, chart, layout) y porcentaje de avance de un trabajo."""
+    job = use_case.get_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found or expired")
+    return job
+
+@router.get("/jobs/{job_id}/download")
+def download_report_job(job_id: str, use_case: ManageReportJobs = Depends(get_manage_report_jobs_use_case)):
+    """Descarga el artefacto de un trabajo terminado."""
+    job = use_case.get_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found or expired")
+    artifact = use_case.get_artifact(job_id)
+    if not artifact:
+        raise HTTPException(status_code=409, detail=f"Report job is {job['status']}: {job['error'] or 'not ready yet'}")
+    return FileResponse(artifact["path"], media_type=artifact["media_type"], filename=artifact["filename"])
@@ -0,0 +1,96 @@
+"""
+Opt-in columnar encodings for analytic endpoints.
+
+By default endpoints keep returning row-oriented JSON (a list of objects). Clients can ask for:
+
+- columnar JSON with `?format=columnar`: every table becomes {"column": [values, ...]},
+  serialized with orjson straight from Arrow buffers (numeric columns go through NumPy);
+- an Arrow IPC stream with `Accept: application/vnd.apache.arrow.stream` (or `?format=arrow`).
+  The stream carries the endpoint's main table; the remaining fields of the payload travel
+  as columnar JSON in the schema metadata under the key `payload`.
+"""
+from typing import Any, Optional
+
+import orjson
+import pyarrow as pa
+from fastapi import Request
+from fastapi.responses import Response
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def requested_format(request: Request) -> str:
+    """'arrow', 'columnar' or 'rows' (default) según el parámetro `format` o el encabezado Accept."""
+    fmt = (request.query_params.get("format") or "").lower()
+    if fmt in ("arrow", "columnar", "rows"):
+        return fmt
+    if ARROW_STREAM in request.headers.get("accept", ""):
+        return "arrow"
+    return "rows"
+
+
+def wants_columns(request: Request) -> bool:
+    """True si el cliente pidió un formato columnar (los casos de uso devuelven tablas Arrow)."""
+    return requested_format(request) != "rows"
+
+
+def _column_values(column: pa.ChunkedArray):
+    if column.null_count == 0 and (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+        # Zero-copy for single-chunk numeric columns; orjson serializes the ndarray natively
+        return column.to_numpy()
+    return column.to_pylist()
+
+
+def to_columns(payload: Any) -> Any:
+    """Reemplaza recursivamente cada tabla Arrow del payload por un dict columna -> valores."""
+    if isinstance(payload, pa.Table):
+        return {name: _column_values(payload.column(name)) for name in payload.column_names}
+    if isinstance(payload, dict):
+        return {key: to_columns(value) for key, value in payload.items()}
+    return payload
+
+
+def to_rows(payload: Any) -> Any:
+    """Reemplaza recursivamente cada tabla Arrow del payload por su lista de filas (formato por defecto)."""
+    if isinstance(payload, pa.Table):
+        return payload.to_pylist()
+    if isinstance(payload, dict):
+        return {key: to_rows(value) for key, value in payload.items()}
+    return payload
+
+
+def _arrow_stream(table: pa.Table, metadata: Optional[dict] = None) -> bytes:
+    if metadata:
+        table = table.replace_schema_metadata({"payload": orjson.dumps(to_columns(metadata), option=_ORJSON_OPTIONS)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def tabular_response(request: Request, payload: Any, main_table: Optional[str] = None) -> Any:
+    """
+    Codifica el resultado de un caso de uso según el formato negociado.
+
+    Args:
+        request (Request): Petición entrante (parámetro `format` y encabezado Accept).
+        payload (Any): Tabla Arrow, dict con tablas Arrow, o el resultado en filas de siempre.
+        main_table (Optional[str]): Clave de la tabla a emitir como stream Arrow cuando el payload es un dict.
+
+    Returns:
+        Any: Response con el cuerpo ya serializado, o el payload en filas para la serialización por defecto.
+    """
+    fmt = requested_format(request)
+    if fmt == "arrow":
+        if isinstance(payload, pa.Table):
+            return Response(_arrow_stream(payload), media_type=ARROW_STREAM)
+        if isinstance(payload, dict) and isinstance(payload.get(main_table), pa.Table):
+            rest = {key: value for key, value in payload.items() if key != main_table}
+            return Response(_arrow_stream(payload[main_table], rest), media_type=ARROW_STREAM)
+        # Nothing tabular to stream (error or empty result): fall back to columnar JSON
+        fmt = "columnar"
+    if fmt == "columnar":
+        return Response(orjson.dumps(to_columns(payload), option=_ORJSON_OPTIONS), media_type="application/json")
+    return to_rows(payload)
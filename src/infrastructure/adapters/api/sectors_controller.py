@@ -1,7 +1,7 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List, Dict, Any, Optional
-from src.application.di.container import get_manage_sectors_use_case, get_calculate_sector_capacity_use_case
+from src.application.di.container import get_manage_sectors_use_case, get_calculate_sector_capacity_use_case, get_interactive_executor
 from src.application.use_cases.manage_sectors import ManageSectors
 from src.application.use_cases.calculate_sector_capacity import CalculateSectorCapacity
 from pydantic import BaseModel
@@ -33,7 +33,7 @@ class CapacityRequest(BaseModel):
     end_date: Optional[str] = None
 
 @router.get("/")
-def get_sectors(uc: ManageSectors = Depends(get_manage_sectors_use_case)):
+async def get_sectors(request: Request, uc: ManageSectors = Depends(get_manage_sectors_use_case)):
     """
     Recupera el listado completo de los sectores ATC predefinidos en el sistema.
     
@@ -43,10 +43,11 @@ def get_sectors(uc: ManageSectors = Depends(get_manage_sectors_use_case)):
     Returns:
         List[Dict]: Una lista de objetos JSON representando cada sector y sus parámetros técnicos.
     """
-    return uc.get_all()
+    return await get_interactive_executor().run(request, uc.get_all)
 
 @router.get("/{id}")
-def get_sector(
+async def get_sector(
+    request: Request,
     id: str, 
     uc: ManageSectors = Depends(get_manage_sectors_use_case)
 ):
@@ -63,13 +64,13 @@ def get_sector(
     Raises:
         HTTPException: Código 404 si el sector no existe en la base de datos.
     """
-    sector = uc.get_by_id(id)
+    sector = await get_interactive_executor().run(request, uc.get_by_id, id)
     if not sector:
         raise HTTPException(status_code=404, detail="Sector not found")
     return sector
 
 @router.post("/")
-def create_sector(
+async def create_sector(
     sector: SectorCreate, 
     uc: ManageSectors = Depends(get_manage_sectors_use_case)
 ):
@@ -83,11 +84,11 @@ def create_sector(
     Returns:
         dict: Objeto con el ID del nuevo sector y mensaje de éxito.
     """
-    new_id = uc.create(sector.dict())
+    new_id = await get_interactive_executor().run(None, uc.create, sector.dict())
     return {"id": new_id, "message": "Sector created"}
 
 @router.put("/{id}")
-def update_sector(
+async def update_sector(
     id: str, 
     sector: SectorUpdate, 
     uc: ManageSectors = Depends(get_manage_sectors_use_case)
@@ -107,13 +108,13 @@ def update_sector(
         HTTPException: Error 404 si no se encuentra el sector objetivo.
     """
     # Pydantic dict exclude_unset to avoid overwriting with None
-    success = uc.update(id, sector.dict(exclude_unset=True))
+    success = await get_interactive_executor().run(None, uc.update, id, sector.dict(exclude_unset=True))
     if not success:
          raise HTTPException(status_code=404, detail="Sector not found or update failed")
     return {"message": "Sector updated"}
 
 @router.delete("/{id}")
-def delete_sector(
+async def delete_sector(
     id: str, 
     uc: ManageSectors = Depends(get_manage_sectors_use_case)
 ):
@@ -130,13 +131,14 @@ def delete_sector(
     Raises:
         HTTPException: Error 404 si el sector no existe.
     """
-    success = uc.delete(id)
+    success = await get_interactive_executor().run(None, uc.delete, id)
     if not success:
          raise HTTPException(status_code=404, detail="Sector not found")
     return {"message": "Sector deleted"}
 
 @router.post("/{id}/calculate")
-def calculate_capacity(
+async def calculate_capacity(
+    request: Request,
     id: str, 
     req: CapacityRequest, 
     uc: CalculateSectorCapacity = Depends(get_calculate_sector_capacity_use_case)
@@ -158,9 +160,11 @@ def calculate_capacity(
     """
     try:
         filters = {"start_date": req.start_date, "end_date": req.end_date}
-        result = uc.execute(id, filters)
+        result = await get_interactive_executor().run(request, uc.execute, id, filters)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
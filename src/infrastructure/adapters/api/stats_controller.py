@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
 from typing import List, Dict, Any
 from src.application.use_cases.get_flight_stats import GetFlightStats
+from src.application.di.container import get_interactive_executor
+from src.infrastructure.adapters.api.response_encoding import tabular_response, wants_columns
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
@@ -8,7 +10,8 @@ def get_stats_use_case():
     return GetFlightStats()
 
 @router.post("/flights-by-origin")
-def get_flights_by_origin(
+async def get_flights_by_origin(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetFlightStats = Depends(get_stats_use_case)
 ):
@@ -16,7 +19,10 @@ def get_flights_by_origin(
     Get flight counts aggregated by origin, filtered by the provided criteria.
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -26,7 +32,8 @@ def get_dest_stats_use_case():
     return GetDestinationStats()
 
 @router.post("/flights-by-destination")
-def get_flights_by_destination(
+async def get_flights_by_destination(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetDestinationStats = Depends(get_dest_stats_use_case)
 ):
@@ -34,7 +41,10 @@ def get_flights_by_destination(
     Get flight counts aggregated by destination, filtered by the provided criteria.
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -44,7 +54,8 @@ def get_flight_type_stats_use_case():
     return GetFlightTypeStats()
 
 @router.post("/flights-by-type")
-def get_flights_by_type(
+async def get_flights_by_type(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetFlightTypeStats = Depends(get_flight_type_stats_use_case)
 ):
@@ -52,7 +63,10 @@ def get_flights_by_type(
     Get flight counts aggregated by flight type (tipo_vuelo), filtered by the provided criteria.
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -62,7 +76,8 @@ def get_company_stats_use_case():
     return GetCompanyStats()
 
 @router.post("/flights-by-company")
-def get_flights_by_company(
+async def get_flights_by_company(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetCompanyStats = Depends(get_company_stats_use_case)
 ):
@@ -70,7 +85,10 @@ def get_flights_by_company(
     Get flight counts aggregated by company (empresa), filtered by the provided criteria.
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -81,7 +99,8 @@ def get_time_stats_use_case():
     return GetTimeStats()
 
 @router.post("/flights-over-time")
-def get_flights_over_time(
+async def get_flights_over_time(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetTimeStats = Depends(get_time_stats_use_case)
 ):
@@ -89,7 +108,10 @@ def get_flights_over_time(
     Get flight counts aggregated by time (YYYY/MM), filtered by the provided criteria.
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -97,7 +119,8 @@ def get_peak_hour_stats_use_case():
     return GetPeakHourStats()
 
 @router.post("/flights-peak-hours")
-def get_flights_peak_hours(
+async def get_flights_peak_hours(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetPeakHourStats = Depends(get_peak_hour_stats_use_case)
 ):
@@ -105,7 +128,10 @@ def get_flights_peak_hours(
     Get flight counts aggregated by Day of Week and Hour (Heatmap).
     """
     try:
-        return use_case.execute(filters)
+        result = await get_interactive_executor().run(request, use_case.execute, filters, as_arrow=wants_columns(request))
+        return tabular_response(request, result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -115,7 +141,8 @@ def get_region_stats_use_case():
     return GetRegionStats()
 
 @router.post("/flights-by-region")
-def get_flights_by_region(
+async def get_flights_by_region(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetRegionStats = Depends(get_region_stats_use_case)
 ):
@@ -123,7 +150,9 @@ def get_flights_by_region(
     Get flight counts aggregated by Region and Origin.
     """
     try:
-        return use_case.execute(filters)
+        return await get_interactive_executor().run(request, use_case.execute, filters)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -133,7 +162,8 @@ def get_region_dest_stats_use_case():
     return GetRegionDestinationStats()
 
 @router.post("/flights-by-region-destination")
-def get_flights_by_region_destination(
+async def get_flights_by_region_destination(
+    request: Request,
     filters: Dict[str, Any] = Body(...),
     use_case: GetRegionDestinationStats = Depends(get_region_dest_stats_use_case)
 ):
@@ -141,6 +171,8 @@ def get_flights_by_region_destination(
     Get flight counts aggregated by Region and Destination.
     """
     try:
-        return use_case.execute(filters)
+        return await get_interactive_executor().run(request, use_case.execute, filters)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,204 @@
+import os
+from typing import Dict, List, Any, Tuple
+
+from src.infrastructure.adapters.database.flights_store import refresh_flight_regions
+
+# Target columns and how staged text is typed: (column, SQL type or None for VARCHAR)
+AIRPORT_IMPORT_COLUMNS: List[Tuple[str, str]] = [
+    ("icao_code", None), ("iata_code", None), ("name", None), ("city", None), ("country", None),
+    ("latitude", "DOUBLE"), ("longitude", "DOUBLE"), ("altitude", "INTEGER"), ("timezone", "DOUBLE"),
+    ("dst", None), ("type", None), ("source", None),
+]
+AIRPORT_REQUIRED_COLUMNS = ("icao_code", "name")
+REGION_AIRPORT_IMPORT_COLUMNS: List[Tuple[str, str]] = [("icao_code", None), ("region_id", "INTEGER")]
+
+
+def stage_file(conn, file_path: str, table: str) -> List[str]:
+    """
+    Carga un CSV o Parquet en una tabla temporal, como texto y con el número de fila (`row_num`, 1 = primera fila de datos).
+
+    Todo se lee como VARCHAR para que los valores no convertibles se reporten por fila en lugar
+    de abortar la lectura completa.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        file_path (str): Archivo subido (.csv o .parquet).
+        table (str): Nombre de la tabla temporal.
+
+    Returns:
+        List[str]: Columnas del archivo (en minúsculas).
+    """
+    path = file_path.replace("\\", "/").replace("'", "''")
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet":
+        source = f"read_parquet('{path}')"
+    elif extension == ".csv":
+        source = f"read_csv('{path}', header=true, all_varchar=true, nullstr=['\\N', ''])"
+    else:
+        raise ValueError("Formato no soportado: solo se aceptan archivos .csv o .parquet")
+
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE {table} AS SELECT row_number() OVER () AS row_num, * FROM {source}")
+    columns = [row[0] for row in conn.execute(f"DESCRIBE {table}").fetchall() if row[0] != "row_num"]
+    # Normalize header case so 'ICAO_CODE' or 'Name' map onto the table columns
+    for column in columns:
+        if column != column.lower():
+            conn.execute(f'ALTER TABLE {table} RENAME "{column}" TO "{column.lower()}"')
+    return [column.lower() for column in columns]
+
+
+def _typed_select(table: str, columns: List[str], spec: List[Tuple[str, str]]) -> str:
+    """SELECT de la tabla staged con las columnas destino tipadas (TRY_CAST) y las originales como texto."""
+    parts = ["row_num"]
+    for column, sql_type in spec:
+        raw = f'NULLIF(trim(CAST("{column}" AS VARCHAR)), \'\')' if column in columns else "CAST(NULL AS VARCHAR)"
+        if column == "icao_code":
+            parts.append(f"upper({raw}) AS icao_code")
+        elif sql_type:
+            parts.append(f"{raw} AS raw_{column}, TRY_CAST({raw} AS {sql_type}) AS {column}")
+        else:
+            parts.append(f"{raw} AS {column}")
+    return f"SELECT {', '.join(parts)} FROM {table}"
+
+
+def _collect_errors(conn, checks: List[Tuple[str, str]], source: str) -> List[Dict[str, Any]]:
+    """Evalúa todas las validaciones en una sola consulta y devuelve [{'row', 'icao_code', 'error'}]."""
+    query = " UNION ALL ".join(
+        f"SELECT row_num, icao_code, '{message}' AS error FROM {source} WHERE {condition}"
+        for condition, message in checks
+    )
+    rows = conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE import_errors AS {query};
+        SELECT row_num, icao_code, error FROM import_errors ORDER BY row_num, error
+    """).fetchall()
+    return [{"row": row_num, "icao_code": icao_code, "error": error} for row_num, icao_code, error in rows]
+
+
+def _duplicate_check() -> Tuple[str, str]:
+    # Only the first occurrence of an ICAO code in the file is applied
+    return (
+        "icao_code IS NOT NULL AND row_num > (SELECT MIN(d.row_num) FROM import_rows d WHERE d.icao_code = import_rows.icao_code)",
+        "Código ICAO repetido en el archivo (se aplica la primera aparición)",
+    )
+
+
+def _report(total: int, inserted: int, updated: int, errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "total_rows": total,
+        "inserted": inserted,
+        "updated": updated,
+        "rejected": len({error["row"] for error in errors}),
+        "errors": errors,
+    }
+
+
+def import_airports(conn, file_path: str) -> Dict[str, Any]:
+    """
+    Importa un catálogo de aeropuertos con upsert por código ICAO.
+
+    Las filas se cargan en staging, se validan en bloque (ICAO y nombre obligatorios, tipos
+    numéricos y rangos de coordenadas, duplicados dentro del archivo) y las válidas se aplican
+    con un único INSERT ... ON CONFLICT (icao_code) DO UPDATE dentro de una transacción.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        file_path (str): Archivo .csv o .parquet con encabezados iguales a las columnas de `airports`.
+
+    Returns:
+        Dict: {'total_rows', 'inserted', 'updated', 'rejected', 'errors': [{'row', 'icao_code', 'error'}]}.
+    """
+    columns = stage_file(conn, file_path, "import_staged")
+    missing = [column for column in AIRPORT_REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Faltan columnas obligatorias en el archivo: {', '.join(missing)}")
+
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE import_rows AS {_typed_select('import_staged', columns, AIRPORT_IMPORT_COLUMNS)}")
+    checks = [("icao_code IS NULL", "Código ICAO vacío"), ("name IS NULL", "Nombre vacío"), _duplicate_check()]
+    for column, sql_type in AIRPORT_IMPORT_COLUMNS:
+        if sql_type:
+            checks.append((f"raw_{column} IS NOT NULL AND {column} IS NULL", f"Valor no numérico en {column}"))
+    checks.append(("latitude NOT BETWEEN -90 AND 90", "Latitud fuera de rango"))
+    checks.append(("longitude NOT BETWEEN -180 AND 180", "Longitud fuera de rango"))
+    errors = _collect_errors(conn, checks, "import_rows")
+
+    names = [column for column, _ in AIRPORT_IMPORT_COLUMNS]
+    valid = "SELECT * FROM import_rows WHERE row_num NOT IN (SELECT row_num FROM import_errors)"
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        total = conn.execute("SELECT count(*) FROM import_rows").fetchone()[0]
+        updated = conn.execute(f"SELECT count(*) FROM ({valid}) v JOIN airports a ON a.icao_code = v.icao_code").fetchone()[0]
+        applied = conn.execute(f"""
+            INSERT INTO airports ({', '.join(names)})
+            SELECT {', '.join(names)} FROM ({valid}) v
+            ON CONFLICT (icao_code) DO UPDATE SET {', '.join(f'{n} = excluded.{n}' for n in names if n != 'icao_code')}
+        """).fetchone()[0]
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.execute("DROP TABLE IF EXISTS import_staged; DROP TABLE IF EXISTS import_rows; DROP TABLE IF EXISTS import_errors")
+    return _report(total, applied - updated, updated, errors)
+
+
+def import_region_airports(conn, file_path: str) -> Dict[str, Any]:
+    """
+    Importa asignaciones aeropuerto-región con upsert por código ICAO (un aeropuerto pertenece a una región).
+
+    Las referencias se validan con un solo LEFT JOIN contra `airports` y `regions`; las filas
+    válidas se aplican en una transacción junto con el recálculo de regiones de los vuelos
+    de los aeropuertos afectados.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        file_path (str): Archivo .csv o .parquet con columnas icao_code y region_id (id y created_at se ignoran).
+
+    Returns:
+        Dict: {'total_rows', 'inserted', 'updated', 'rejected', 'errors': [{'row', 'icao_code', 'error'}]}.
+    """
+    columns = stage_file(conn, file_path, "import_staged")
+    missing = [column for column in ("icao_code", "region_id") if column not in columns]
+    if missing:
+        raise ValueError(f"Faltan columnas obligatorias en el archivo: {', '.join(missing)}")
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE import_rows AS
+        SELECT s.*, a.icao_code IS NOT NULL AS airport_exists, r.id IS NOT NULL AS region_exists
+        FROM ({_typed_select('import_staged', columns, REGION_AIRPORT_IMPORT_COLUMNS)}) s
+        LEFT JOIN (SELECT DISTINCT icao_code FROM airports) a ON a.icao_code = s.icao_code
+        LEFT JOIN regions r ON r.id = s.region_id
+    """)
+    checks = [
+        ("icao_code IS NULL", "Código ICAO vacío"),
+        ("raw_region_id IS NULL", "Región vacía"),
+        ("raw_region_id IS NOT NULL AND region_id IS NULL", "Valor no numérico en region_id"),
+        ("icao_code IS NOT NULL AND NOT airport_exists", "El aeropuerto no existe en el catálogo"),
+        ("region_id IS NOT NULL AND NOT region_exists", "La región no existe"),
+        _duplicate_check(),
+    ]
+    errors = _collect_errors(conn, checks, "import_rows")
+
+    valid = "SELECT icao_code, region_id FROM import_rows WHERE row_num NOT IN (SELECT row_num FROM import_errors)"
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        total = conn.execute("SELECT count(*) FROM import_rows").fetchone()[0]
+        # (icao_code, already mapped, mapping changes) per valid row
+        plan = conn.execute(f"""
+            SELECT v.icao_code, ra.icao_code IS NOT NULL, ra.region_id IS DISTINCT FROM v.region_id
+            FROM ({valid}) v
+            LEFT JOIN region_airports ra ON ra.icao_code = v.icao_code
+        """).fetchall()
+        conn.execute(f"""
+            INSERT INTO region_airports (icao_code, region_id)
+            {valid}
+            ON CONFLICT (icao_code) DO UPDATE SET region_id = excluded.region_id
+        """)
+        # Only flights touching airports whose region changed need their region ids recomputed
+        refresh_flight_regions(conn, [code for code, _, changed in plan if changed])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.execute("DROP TABLE IF EXISTS import_staged; DROP TABLE IF EXISTS import_rows; DROP TABLE IF EXISTS import_errors")
+    updated = sum(1 for _, existed, _ in plan if existed)
+    return _report(total, len(plan) - updated, updated, errors)
@@ -0,0 +1,262 @@
+"""
+Conexiones DuckDB cancelables por petición.
+
+Los casos de uso abren sus conexiones con `connect()` en lugar de `duckdb.connect()`. Cuando el
+código corre dentro de un QueryScope (ver QueryExecutor), cada conexión abierta queda registrada
+y `QueryScope.cancel()` interrumpe la sentencia en curso con `conn.interrupt()`. Fuera de un scope
+`connect()` se comporta exactamente como `duckdb.connect()`.
+
+Si hay un QueryObserver configurado (`set_query_observer`, ver adapters.observability), las
+conexiones se entregan envueltas en InstrumentedConnection, que mide cada sentencia. Si hay un
+ResourceGovernor (`set_resource_governor`, ver database.resource_governor), cada conexión recibe
+los límites de hilos, memoria, spill y plazo por sentencia de la carga en curso.
+
+DuckDB no deja abrir en un mismo proceso conexiones de solo lectura y de escritura al mismo
+archivo a la vez (ni otro proceso mientras uno tiene el lock de escritura). `connect()` reintenta
+con espera exponencial hasta `set_connect_wait()` segundos, así que lectores y escritor se turnan
+en lugar de fallar: una lectura espera a que termine la publicación de la ingesta y la
+publicación espera a que se cierren las lecturas en curso.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+import duckdb
+
+from src.infrastructure.adapters.database.resource_governor import ResourceGovernor
+from src.infrastructure.adapters.observability import QueryObserver
+
+_current_scope: ContextVar[Optional["QueryScope"]] = ContextVar("query_scope", default=None)
+_observer: Optional[QueryObserver] = None
+_governor: Optional[ResourceGovernor] = None
+_connect_wait_seconds = 30.0
+
+# Errors DuckDB raises while another connection holds the file with a different mode
+_BUSY_MESSAGES = ("different configuration", "Could not set lock")
+_BACKOFF_START_SECONDS = 0.01
+_BACKOFF_MAX_SECONDS = 0.5
+
+
+class QueryScope:
+    """Conexiones abiertas por una misma petición, para poder interrumpirlas en bloque."""
+    def __init__(self):
+        self.cancelled = False
+        self._connections: List[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+
+    def register(self, conn: duckdb.DuckDBPyConnection) -> None:
+        with self._lock:
+            if not self.cancelled:
+                self._connections.append(conn)
+                return
+        # The request is already gone: do not let the use case start new work
+        conn.close()
+        raise duckdb.InterruptException("Query cancelled: the client disconnected")
+
+    def cancel(self) -> int:
+        """
+        Interrumpe las sentencias en curso de todas las conexiones registradas.
+
+        Returns:
+            int: Cantidad de conexiones interrumpidas (las ya cerradas se ignoran).
+        """
+        with self._lock:
+            self.cancelled = True
+            connections = list(self._connections)
+        interrupted = 0
+        for conn in connections:
+            try:
+                conn.interrupt()
+                interrupted += 1
+            except duckdb.ConnectionException:
+                pass
+        return interrupted
+
+    @contextmanager
+    def bind(self) -> Iterator["QueryScope"]:
+        """Activa el scope en el hilo actual mientras dura el bloque."""
+        token = _current_scope.set(self)
+        try:
+            yield self
+        finally:
+            _current_scope.reset(token)
+
+
+def set_query_observer(observer: Optional[QueryObserver]) -> None:
+    """Activa (o con None desactiva) la medición de las conexiones que abre `connect()`."""
+    global _observer
+    _observer = observer
+
+
+def set_resource_governor(governor: Optional[ResourceGovernor]) -> None:
+    """Activa (o con None desactiva) los límites por carga de las conexiones que abre `connect()`."""
+    global _governor
+    _governor = governor
+
+
+def set_connect_wait(seconds: float) -> None:
+    """Tiempo máximo que `connect()` espera a que se libere un archivo abierto en otro modo (0 = no espera)."""
+    global _connect_wait_seconds
+    _connect_wait_seconds = max(0.0, seconds)
+
+
+class InstrumentedConnection:
+    """
+    Conexión DuckDB que reporta cada sentencia al QueryObserver (duración, filas y huella).
+
+    DuckDB entrega los SELECT en streaming: `execute` vuelve enseguida y el trabajo ocurre al leer
+    el resultado, así que la medición empieza en execute y termina en la primera lectura (fetch*,
+    df, pl, arrow). Las sentencias cuyo resultado nunca se lee (DDL, INSERT) se registran con el
+    tiempo de execute. El resto de la API (register, interrupt...) se delega sin cambios y
+    `execute` devuelve el propio envoltorio, así que `conn.execute(...).fetchall()` sigue igual.
+    """
+    def __init__(self, conn: duckdb.DuckDBPyConnection, observer: QueryObserver):
+        self._conn = conn
+        self._observer = observer
+        # (sql, start time, execute seconds, parameter count) of a statement whose result has not been read yet
+        self._pending: Optional[Tuple[str, float, float, Optional[int]]] = None
+
+    def execute(self, query, parameters=None, *args, **kwargs) -> "InstrumentedConnection":
+        return self._run(self._conn.execute, query, _parameter_count(parameters), parameters, *args, **kwargs)
+
+    def executemany(self, query, parameters=None, *args, **kwargs) -> "InstrumentedConnection":
+        # One row of parameters per execution; count those of a single row
+        first = next(iter(parameters), None) if parameters else None
+        return self._run(self._conn.executemany, query, _parameter_count(first), parameters, *args, **kwargs)
+
+    def cursor(self) -> "InstrumentedConnection":
+        cursor = self._conn.cursor()
+        self._observer.prepare(cursor)
+        return InstrumentedConnection(cursor, self._observer)
+
+    def close(self) -> None:
+        self._flush()
+        self._conn.close()
+
+    def _run(self, method, query, parameter_count: Optional[int], *args, **kwargs) -> "InstrumentedConnection":
+        self._flush()
+        sql = str(query)
+        started = time.perf_counter()
+        try:
+            method(query, *args, **kwargs)
+        except Exception as e:
+            self._observer.record(self._conn, sql, time.perf_counter() - started, error=e,
+                                  parameters=parameter_count)
+            raise
+        elapsed = time.perf_counter() - started
+        profile = self._observer.read_profile(self._conn, sql)
+        if profile is not None:
+            # Already final: DML/DDL and results that were fully materialized
+            self._observer.record(self._conn, sql, elapsed, profile=profile, parameters=parameter_count)
+        else:
+            self._pending = (sql, started, elapsed, parameter_count)
+        return self
+
+    def _fetch(self, name: str, *args, **kwargs):
+        pending, self._pending = self._pending, None
+        try:
+            result = getattr(self._conn, name)(*args, **kwargs)
+        except Exception as e:
+            if pending is not None:
+                sql, started, _, parameter_count = pending
+                self._observer.record(self._conn, sql, time.perf_counter() - started, error=e,
+                                      parameters=parameter_count)
+            raise
+        if pending is not None:
+            sql, started, _, parameter_count = pending
+            self._observer.record(self._conn, sql, time.perf_counter() - started,
+                                  profile=self._observer.read_profile(self._conn, sql), parameters=parameter_count)
+        return result
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, _, execute_seconds, parameter_count = pending
+            self._observer.record(self._conn, sql, execute_seconds, parameters=parameter_count)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "InstrumentedConnection":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _parameter_count(parameters) -> Optional[int]:
+    if parameters is None:
+        return 0
+    try:
+        return len(parameters)
+    except TypeError:
+        return None
+
+
+def _fetcher(name: str):
+    def fetch(self, *args, **kwargs):
+        return self._fetch(name, *args, **kwargs)
+    fetch.__name__ = name
+    return fetch
+
+
+# Result readers: the statement's measurement ends when the first of them returns
+for _name in ("fetchone", "fetchmany", "fetchall", "fetchdf", "fetch_df", "fetchnumpy", "df", "pl",
+              "arrow", "fetch_arrow_table", "to_arrow_table"):
+    setattr(InstrumentedConnection, _name, _fetcher(_name))
+
+
+def connect(database: str = ":memory:", read_only: bool = False, workload: Optional[str] = None,
+            **kwargs) -> duckdb.DuckDBPyConnection:
+    """
+    Abre una conexión DuckDB y la registra en el QueryScope activo, si lo hay.
+
+    Args:
+        database (str): Ruta de la base de datos.
+        read_only (bool): Abrir en modo solo lectura.
+        workload (Optional[str]): Carga cuyos límites aplicar; por defecto la del contexto
+            (ver resource_governor.workload).
+
+    Returns:
+        duckdb.DuckDBPyConnection: Conexión abierta (GovernedConnection si la carga tiene plazo por
+            sentencia, InstrumentedConnection si hay observer).
+
+    Raises:
+        duckdb.ConnectionException: El archivo siguió abierto en otro modo durante toda la espera.
+    """
+    conn = _open(database, read_only, **kwargs)
+    governor = _governor
+    if governor is not None:
+        try:
+            conn = governor.govern(conn, str(database), workload)
+        except Exception:
+            conn.close()
+            raise
+    observer = _observer
+    if observer is not None:
+        observer.prepare(conn)
+        conn = InstrumentedConnection(conn, observer)
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.register(conn)
+    return conn
+
+
+def _open(database: str, read_only: bool, **kwargs) -> duckdb.DuckDBPyConnection:
+    # Waits while the file is held with the other mode (see set_connect_wait)
+    deadline = time.monotonic() + _connect_wait_seconds
+    delay = _BACKOFF_START_SECONDS
+    while True:
+        try:
+            return duckdb.connect(database, read_only=read_only, **kwargs)
+        except (duckdb.ConnectionException, duckdb.IOException) as e:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not any(message in str(e) for message in _BUSY_MESSAGES):
+                raise
+        scope = _current_scope.get()
+        if scope is not None and scope.cancelled:
+            raise duckdb.InterruptException("Query cancelled: the client disconnected")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _BACKOFF_MAX_SECONDS)
@@ -0,0 +1,87 @@
+from typing import List, Tuple
+
+# Root categories of filters_values: (id, label, category_code, flights column).
+# Children use parent_id = id and category_code = '<CODE>_VAL'.
+FILTER_CATEGORIES: List[Tuple[int, str, str, str]] = [
+    (1, 'Matrícula', 'MATRICULA', 'matricula'),
+    (2, 'Tipo de Aeronave', 'TIPO_AERONAVE', 'tipo_aeronave'),
+    (3, 'Empresa', 'EMPRESA', 'empresa'),
+    (4, 'Tipo de Vuelo', 'TIPO_VUELO', 'tipo_vuelo'),
+    (5, 'Callsign', 'CALLSIGN', 'callsign'),
+]
+
+
+def filter_value_counts_sql(source: str) -> str:
+    """
+    (parent_id, category_code, value, row_count) de todas las categorías en un solo recorrido de
+    `source`: las cinco columnas se despivotan con UNPIVOT (que descarta los NULL) y se agrupan.
+    """
+    columns = ", ".join(f"CAST({column} AS VARCHAR) AS {code}" for _, _, code, column in FILTER_CATEGORIES)
+    codes = ", ".join(code for _, _, code, _ in FILTER_CATEGORIES)
+    categories = ", ".join(f"({parent_id}, '{code}')" for parent_id, _, code, _ in FILTER_CATEGORIES)
+    return f"""
+        SELECT cat.parent_id, cat.category_code || '_VAL' AS category_code, u.value, count(*) AS row_count
+        FROM (UNPIVOT (SELECT {columns} FROM {source}) ON {codes} INTO NAME category VALUE value) u
+        JOIN (VALUES {categories}) cat(parent_id, category_code) ON cat.category_code = u.category
+        GROUP BY ALL
+    """
+
+
+def add_filter_values(conn, relation: str) -> None:
+    """
+    Suma a filters_values los valores de un lote recién ingerido (upsert por parent_id/value).
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        relation (str): Vista/tabla con las filas del lote (esquema de flights).
+    """
+    conn.execute(f"""
+        INSERT INTO filters_values (parent_id, category_code, value, row_count)
+        {filter_value_counts_sql(relation)}
+        ON CONFLICT (parent_id, value) DO UPDATE SET row_count = filters_values.row_count + excluded.row_count
+    """)
+
+
+def remove_file_filter_values(conn, file_id: int) -> None:
+    """
+    Descuenta los valores de un archivo antes de borrar sus vuelos y elimina los que quedan en cero.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        file_id (int): Identificador del archivo en file_processing_control.
+    """
+    counts = filter_value_counts_sql(f"flights WHERE file_id = {int(file_id)}")
+    conn.execute(f"""
+        UPDATE filters_values SET row_count = filters_values.row_count - d.row_count
+        FROM ({counts}) d
+        WHERE filters_values.parent_id = d.parent_id AND filters_values.value = d.value
+    """)
+    conn.execute("DELETE FROM filters_values WHERE parent_id IS NOT NULL AND row_count <= 0")
+
+
+def rebuild_filter_values(conn) -> None:
+    """
+    Recalcula todos los valores de filtro desde `flights` con un único recorrido.
+    Las categorías raíz (ids 1-5) se conservan. Ejecutar dentro de una transacción
+    para que las lecturas no vean la tabla vacía.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+    """
+    # Upsert + delete of stale values: DuckDB rejects deleting and re-inserting the
+    # same unique key within one transaction
+    conn.execute(f"CREATE OR REPLACE TEMP TABLE filter_value_counts AS {filter_value_counts_sql('flights')}")
+    conn.execute("""
+        INSERT INTO filters_values (parent_id, category_code, value, row_count)
+        SELECT parent_id, category_code, value, row_count FROM filter_value_counts
+        ON CONFLICT (parent_id, value) DO UPDATE SET row_count = excluded.row_count
+    """)
+    conn.execute("""
+        DELETE FROM filters_values
+        WHERE parent_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM filter_value_counts c
+              WHERE c.parent_id = filters_values.parent_id AND c.value = filters_values.value
+          )
+    """)
+    conn.execute("DROP TABLE filter_value_counts")
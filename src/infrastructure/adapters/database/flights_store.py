@@ -0,0 +1,737 @@
+import os
+import glob
+import shutil
+import logging
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canonical column layout of the flights fact table (shared by every storage backend)
+FLIGHTS_SCHEMA: List[Tuple[str, str]] = [
+    ("id", "BIGINT"),
+    ("file_id", "BIGINT"),
+    ("fecha", "DATE"),
+    ("sid", "VARCHAR"),
+    ("ssr", "VARCHAR"),
+    ("callsign", "VARCHAR"),
+    ("matricula", "VARCHAR"),
+    ("tipo_aeronave", "VARCHAR"),
+    ("empresa", "VARCHAR"),
+    ("numero_vuelo", "BIGINT"),
+    ("tipo_vuelo", "VARCHAR"),
+    ("tiempo_inicial", "TIMESTAMP"),
+    ("origen", "VARCHAR"),
+    ("fecha_salida", "DATE"),
+    ("hora_salida", "TIME"),
+    ("hora_pv", "TIME"),
+    ("destino", "VARCHAR"),
+    ("fecha_llegada", "DATE"),
+    ("hora_llegada", "TIME"),
+    ("nivel", "BIGINT"),
+    ("duracion", "BIGINT"),
+    ("distancia", "BIGINT"),
+    ("velocidad", "BIGINT"),
+    ("eq_ssr", "VARCHAR"),
+    ("nombre_origen", "VARCHAR"),
+    ("nombre_destino", "VARCHAR"),
+    ("fecha_registro", "DATE"),
+]
+
+FLIGHTS_COLUMNS = [name for name, _ in FLIGHTS_SCHEMA]
+
+# Region ids denormalized from region_airports (derived, not part of the source files)
+REGION_SCHEMA: List[Tuple[str, str]] = [
+    ("region_origen_id", "INTEGER"),
+    ("region_destino_id", "INTEGER"),
+]
+
+REGION_COLUMNS = [name for name, _ in REGION_SCHEMA]
+
+# Physical clustering key: keeps fecha zone maps (and Parquet min/max stats) tight
+CLUSTER_ORDER = "fecha NULLS LAST, origen NULLS LAST"
+
+# Hive partition columns of the Parquet dataset, exposed by its `flights` view for partition pruning
+PARTITION_SCHEMA: List[Tuple[str, str]] = [
+    ("year", "BIGINT"),
+    ("month", "BIGINT"),
+]
+
+# Low-cardinality dimensions stored as dictionary-encoded ENUM codes in the native table.
+# High-cardinality columns (callsign, matricula, sid) stay VARCHAR: new values keep arriving with
+# every file and each one would force a column rewrite (see DuckDBFlightsStore._extend_dimensions)
+DIMENSION_COLUMNS = ("origen", "destino", "empresa", "tipo_vuelo", "tipo_aeronave", "eq_ssr")
+
+
+class DuckDBFlightsStore:
+    """
+    Almacenamiento por defecto: `flights` es una tabla nativa dentro de la base DuckDB.
+
+    Las dimensiones de baja cardinalidad (DIMENSION_COLUMNS) se guardan como tipos ENUM
+    versionados (`flights_<columna>_enum_v<n>`): la tabla almacena códigos enteros y
+    DuckDB los decodifica al leer, por lo que las consultas existentes siguen comparando
+    contra texto. Antes de cada inserción se extiende el diccionario con los valores nuevos.
+
+    Compromisos: un valor nuevo obliga a reescribir la columna completa (DuckDB no amplía un
+    ENUM en sitio), así que los valores nuevos de un archivo se incorporan en una sola pasada
+    y solo en las columnas que los traen. La ganancia está en almacenamiento, GROUP BY y filtros
+    IN; los joins contra `airports`/`region_airports` (VARCHAR) comparan a través de un cast a
+    texto y no se aceleran.
+    """
+    backend = "duckdb"
+
+    def create_schema(self, conn) -> None:
+        """
+        Crea la tabla de hechos `flights` (y sus tipos ENUM vacíos) en una base donde no existe.
+        No inspecciona el esquema: la usan la migración inicial y el reset.
+
+        Args:
+            conn (duckdb.Connection): Conexión de escritura a la base de métricas.
+        """
+        types = dict(FLIGHTS_SCHEMA)
+        for column in DIMENSION_COLUMNS:
+            types[column] = f"flights_{column}_enum_v1"
+            conn.execute(f"DROP TYPE IF EXISTS {types[column]}")
+            conn.execute(f"CREATE TYPE {types[column]} AS ENUM (SELECT '' WHERE false)")
+
+        columns_sql = ",\n                ".join(
+            f"{name} {types.get(name, type_)} REFERENCES file_processing_control(id)" if name == "file_id"
+            else f"{name} {types.get(name, type_)}"
+            for name, type_ in FLIGHTS_SCHEMA + REGION_SCHEMA
+        )
+        conn.execute(f"""
+            CREATE TABLE flights (
+                {columns_sql}
+            )
+        """)
+
+    def recover(self, conn) -> None:
+        """La tabla nativa no deja restos de operaciones interrumpidas: DuckDB revierte sola lo no confirmado."""
+
+    def upgrade_schema(self, conn) -> None:
+        """
+        Lleva una tabla `flights` creada por versiones anteriores al esquema actual.
+        Solo se ejecuta desde el motor de migraciones.
+
+        Args:
+            conn (duckdb.Connection): Conexión de escritura a la base de métricas.
+        """
+        columns = {col[0].lower(): str(col[1]).upper() for col in conn.execute("DESCRIBE flights").fetchall()}
+
+        # sid used to be inferred as a number
+        if columns.get('sid') not in (None, 'VARCHAR', 'STRING'):
+            logger.info(f"Detected sid column as {columns['sid']}. Migrating to VARCHAR.")
+            conn.execute("ALTER TABLE flights ALTER COLUMN sid TYPE VARCHAR")
+
+        # Columns added since the table was created (file_id, ...)
+        for name, type_ in FLIGHTS_SCHEMA:
+            if name not in columns:
+                logger.info(f"Adding {name} column to flights table.")
+                conn.execute(f"ALTER TABLE flights ADD COLUMN {name} {type_}")
+
+        # Denormalized region ids (backfilled once for existing rows)
+        missing_regions = [(name, type_) for name, type_ in REGION_SCHEMA if name not in columns]
+        if missing_regions:
+            logger.info("Adding region id columns to flights table.")
+            for name, type_ in missing_regions:
+                conn.execute(f"ALTER TABLE flights ADD COLUMN {name} {type_}")
+            refresh_flight_regions(conn)
+
+        # Dictionary-encode dimensions still stored as plain VARCHAR
+        plain = [column for column in DIMENSION_COLUMNS if self._dimension_type(conn, column) is None]
+        if plain:
+            logger.info(f"Encoding flights.{', '.join(plain)} as ENUM.")
+            self._extend_dimensions(conn, "flights", plain)
+
+    def append(self, conn, relation: str, file_id: int) -> None:
+        """Inserta en `flights` las filas de una relación registrada (vista temporal) con el esquema canónico."""
+        self.prepare(conn, relation)
+        self.insert(conn, relation, file_id)
+        self.publish(conn)
+
+    def prepare(self, conn, relation: str) -> None:
+        """
+        Amplía los ENUM de dimensiones con los valores nuevos de `relation`.
+        Abre su propia transacción, por lo que debe llamarse fuera de la transacción de carga.
+        """
+        self._extend_dimensions(conn, relation, DIMENSION_COLUMNS)
+
+    def insert(self, conn, relation: str, file_id: int) -> None:
+        """Inserta las filas de `relation` (ya preparada); puede ejecutarse dentro de una transacción."""
+        columns = ', '.join(FLIGHTS_COLUMNS + REGION_COLUMNS)
+        conn.execute(f"""
+            INSERT INTO flights ({columns})
+            SELECT {_select_with_regions(relation)}
+            ORDER BY {CLUSTER_ORDER}
+        """)
+
+    def publish(self, conn) -> None:
+        """La tabla nativa no necesita publicación: las filas quedan visibles al hacer COMMIT."""
+
+    def discard(self, conn) -> None:
+        """Nada que descartar: el ROLLBACK ya revierte los INSERT en la tabla nativa."""
+
+    def delete_file(self, conn, file_id: int) -> None:
+        """Elimina las filas de vuelos asociadas a un archivo ingerido."""
+        conn.execute("DELETE FROM flights WHERE file_id = ?", [file_id])
+
+    def withdraw_file(self, conn, file_id: int) -> None:
+        """Como delete_file; dentro de una transacción el ROLLBACK lo revierte."""
+        self.delete_file(conn, file_id)
+
+    def compact(self, conn) -> None:
+        """
+        Reescribe `flights` agrupada por fecha/origen y ejecuta CHECKPOINT.
+
+        Los row groups que quedan con filas borradas (delete_file) o desordenados (cargas
+        históricas) se reemplazan por row groups nuevos y contiguos, de modo que los zone maps
+        de `fecha` vuelvan a descartar la mayoría de ellos en filtros por rango de fechas.
+        Se hace con DELETE + INSERT dentro de una transacción para conservar la llave foránea
+        y los tipos ENUM de la tabla.
+        """
+        columns = ', '.join(FLIGHTS_COLUMNS + REGION_COLUMNS)
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute(f"CREATE OR REPLACE TEMP TABLE flights_compaction AS SELECT {columns} FROM flights")
+            conn.execute("DELETE FROM flights")
+            conn.execute(f"INSERT INTO flights ({columns}) SELECT {columns} FROM flights_compaction ORDER BY {CLUSTER_ORDER}")
+            conn.execute("DROP TABLE flights_compaction")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("CHECKPOINT")
+
+    def fill_route_distances(self, conn) -> None:
+        """Completa en sitio distancia/velocidad de los vuelos que no las traen, desde `od_distance`."""
+        conn.execute(f"""
+            UPDATE flights SET
+                distancia = {_FILL_DISTANCE.format(src='flights')},
+                velocidad = {_FILL_SPEED.format(src='flights')}
+            FROM od_distance od
+            WHERE od.origen = CAST(flights.origen AS VARCHAR) AND od.destino = CAST(flights.destino AS VARCHAR)
+              AND ({_MISSING_DISTANCE.format(src='flights')})
+        """)
+
+    def storage_stats(self, conn) -> dict:
+        """Bloques usados y libres del archivo de base de datos (útil para medir la compactación)."""
+        used_blocks, free_blocks = conn.execute("SELECT used_blocks, free_blocks FROM pragma_database_size()").fetchone()
+        return {"used_blocks": used_blocks, "free_blocks": free_blocks}
+
+    def reset(self, conn) -> None:
+        """Elimina por completo los datos de vuelos y sus diccionarios de dimensiones."""
+        conn.execute("DROP TABLE IF EXISTS flights")
+        for (type_name,) in conn.execute(
+            "SELECT type_name FROM duckdb_types() WHERE type_name LIKE 'flights\\_%\\_enum\\_v%' ESCAPE '\\'"
+        ).fetchall():
+            conn.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+    def _extend_dimensions(self, conn, source: str, columns: Sequence[str]) -> None:
+        """
+        Garantiza que los ENUM de `columns` contengan todos los valores de `source`.
+
+        Una sola consulta sobre `source` encuentra los valores nuevos de todas las columnas.
+        Para cada columna que los tenga se crea la siguiente versión del tipo (etiquetas
+        ordenadas, para que ORDER BY siga siendo alfabético), se migra la columna y se elimina
+        la versión anterior; todas las columnas cambian en una misma transacción.
+
+        Args:
+            conn (duckdb.Connection): Conexión de escritura.
+            source (str): Relación con los valores a incorporar (vista temporal o `flights`).
+            columns (Sequence[str]): Columnas de dimensión a revisar.
+        """
+        # Types are read from the catalog inside the writer transaction, never from a
+        # per-process cache: another process may have moved a column to a newer version
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            current = {column: self._dimension_type(conn, column) for column in columns}
+            incoming = " UNION ALL ".join(
+                f"SELECT DISTINCT '{column}' AS col, CAST({column} AS VARCHAR) AS v FROM {source} WHERE {column} IS NOT NULL"
+                for column in columns
+            )
+            known = " UNION ALL ".join(
+                f"SELECT '{column}' AS col, CAST(unnest(enum_range(NULL::{type_name})) AS VARCHAR) AS v"
+                for column, type_name in current.items() if type_name
+            )
+            if known:
+                incoming = f"SELECT col, v FROM ({incoming}) i WHERE NOT EXISTS (SELECT 1 FROM ({known}) k WHERE k.col = i.col AND k.v = i.v)"
+            new_values: Dict[str, List[str]] = {}
+            for column, value in conn.execute(incoming).fetchall():
+                new_values.setdefault(column, []).append(value)
+
+            # Columns still stored as VARCHAR are encoded even when empty
+            for column in columns:
+                if column not in new_values and current[column] is not None:
+                    continue
+                previous = current[column]
+                labels = set(new_values.get(column, []))
+                if previous:
+                    labels.update(row[0] for row in conn.execute(
+                        f"SELECT CAST(unnest(enum_range(NULL::{previous})) AS VARCHAR)"
+                    ).fetchall())
+                # `previous` is the highest version in the catalog, so the next one is always free
+                version = int(previous.rsplit("_v", 1)[1]) + 1 if previous else 1
+                new_type = f"flights_{column}_enum_v{version}"
+                conn.execute(f"CREATE TYPE {new_type} AS ENUM (SELECT unnest(?::VARCHAR[]))", [sorted(labels)])
+                conn.execute(f"ALTER TABLE flights ALTER COLUMN {column} SET DATA TYPE {new_type}")
+                if previous:
+                    conn.execute(f"DROP TYPE {previous}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _dimension_type(conn, column: str) -> Optional[str]:
+        """Nombre del tipo ENUM vigente de una dimensión, o None si la columna aún es VARCHAR."""
+        data_type = conn.execute(
+            "SELECT data_type FROM duckdb_columns() WHERE table_name = 'flights' AND column_name = ?", [column]
+        ).fetchone()
+        if not data_type or not str(data_type[0]).upper().startswith("ENUM"):
+            return None
+        versions = conn.execute(
+            "SELECT type_name FROM duckdb_types() WHERE type_name LIKE ? ESCAPE '\\'",
+            [f"flights\\_{column}\\_enum\\_v%"]
+        ).fetchall()
+        if not versions:
+            return None
+        return max((row[0] for row in versions), key=lambda name: int(name.rsplit("_v", 1)[1]))
+
+
+# Parts withdrawn by a load that has not been published yet (outside the *.parquet glob)
+WITHDRAWN_SUFFIX = ".withdrawn"
+
+
+class ParquetFlightsStore:
+    """
+    Almacenamiento opcional en Parquet particionado estilo Hive (year=/month=[/file_id=]).
+
+    Cada escritura de un archivo ingerido crea Parquet propios
+    (`flights_<file_id>_<lote>_<n>.parquet`, con un lote nuevo por escritura para que una
+    segunda carga del mismo file_id, como el reproceso de rechazados, no pise las partes
+    anteriores) y `flights` pasa a ser una vista de DuckDB sobre
+    `read_parquet(..., hive_partitioning=true)` que expone también las columnas de partición
+    year/month. Los filtros armados con fecha_range_sql las usan para descartar particiones
+    completas sin abrir sus archivos; eliminar un archivo equivale a borrar sus Parquet, sin
+    reescribir la base de datos.
+    """
+    backend = "parquet"
+
+    def __init__(self, root: str = "data/flights_parquet", partition_by_file: bool = False):
+        """
+        Args:
+            root (str): Directorio raíz del dataset particionado.
+            partition_by_file (bool): Si es True agrega `file_id` como tercer nivel de partición.
+        """
+        self.root = root
+        self.partition_by_file = partition_by_file
+        # Glob patterns of the parts written since the last publish, removed by discard()
+        self._unpublished: List[str] = []
+        # Parts set aside by withdraw_file(), deleted by publish() or restored by discard()
+        self._withdrawn: List[str] = []
+
+    def create_schema(self, conn) -> None:
+        """Crea el directorio del dataset y publica la vista `flights` (vacía si no hay archivos)."""
+        self.recover(conn)
+        os.makedirs(self.root, exist_ok=True)
+        self.publish_view(conn)
+
+    def recover(self, conn) -> None:
+        """
+        Repara el dataset tras un proceso interrumpido; se llama en cada arranque (ver main.lifespan).
+
+        - Una compactación que murió entre sus dos renombres deja el dataset completo en
+          `<root>.previous` y ningún `<root>`: se vuelve a poner en su lugar.
+        - Una carga que murió antes del COMMIT deja Parquet apartados por withdraw_file(): la
+          vista confirmada todavía los lista, así que se restauran.
+        """
+        previous = self._previous_root()
+        if not os.path.isdir(self.root) and os.path.isdir(previous):
+            # The previous dataset is still complete; the staging copy may not be
+            logger.warning(f"Restoring {previous} left by an interrupted compaction.")
+            os.replace(previous, self.root)
+        withdrawn = glob.glob(os.path.join(self.root, "**", "*.parquet" + WITHDRAWN_SUFFIX), recursive=True)
+        for path in withdrawn:
+            os.replace(path, path[:-len(WITHDRAWN_SUFFIX)])
+        if withdrawn:
+            logger.warning(f"Restored {len(withdrawn)} Parquet parts withdrawn by an interrupted load.")
+
+    def upgrade_schema(self, conn) -> None:
+        """Re-publica la vista con la definición actual (columnas de región incluidas)."""
+        self.create_schema(conn)
+
+    def append(self, conn, relation: str, file_id: int) -> None:
+        """
+        Escribe las filas de la relación como Parquet particionado por año/mes (y archivo)
+        y re-publica la vista.
+
+        Args:
+            conn (duckdb.Connection): Conexión activa.
+            relation (str): Nombre de la vista/tabla registrada con las filas del archivo.
+            file_id (int): Identificador del archivo en file_processing_control.
+        """
+        self.insert(conn, relation, file_id)
+        self.publish(conn)
+
+    def prepare(self, conn, relation: str) -> None:
+        """Parquet no tiene diccionarios de dimensiones que ampliar."""
+
+    def insert(self, conn, relation: str, file_id: int) -> None:
+        """
+        Escribe los Parquet de un archivo sin publicarlos: la vista `flights` lista los archivos
+        explícitamente, así que las lecturas no los ven hasta el siguiente publish().
+        """
+        os.makedirs(self.root, exist_ok=True)
+        partition_cols = ["year", "month"] + (["file_id"] if self.partition_by_file else [])
+        batch = f"{int(file_id)}_{uuid.uuid4().hex[:12]}"
+        self._unpublished.append(f"flights_{batch}_*.parquet")
+        conn.execute(f"""
+            COPY (
+                SELECT {', '.join(FLIGHTS_COLUMNS)}, year(fecha) AS year, month(fecha) AS month
+                FROM {relation}
+                ORDER BY {CLUSTER_ORDER}
+            ) TO '{self._sql_path(self.root)}' (
+                FORMAT PARQUET,
+                PARTITION_BY ({', '.join(partition_cols)}),
+                FILENAME_PATTERN 'flights_{batch}_{{i}}',
+                OVERWRITE_OR_IGNORE
+            )
+        """)
+
+    def publish(self, conn) -> None:
+        """Publica en `flights` el conjunto actual de archivos (cambio atómico de la vista)."""
+        self.publish_view(conn)
+        self._unpublished.clear()
+        for path in self._withdrawn:
+            os.remove(path + WITHDRAWN_SUFFIX)
+        self._withdrawn.clear()
+        self._prune_empty_dirs()
+
+    def discard(self, conn) -> None:
+        """
+        Deshace lo escrito desde la última publicación: borra los Parquet de insert() y restaura
+        los apartados por withdraw_file(). Se llama tras el ROLLBACK de una carga, cuando la vista
+        vuelve a la lista anterior (los archivos nuevos quedarían huérfanos y visibles en la
+        siguiente publicación).
+        """
+        for path in self._withdrawn:
+            os.replace(path + WITHDRAWN_SUFFIX, path)
+        self._withdrawn.clear()
+        for pattern in self._unpublished:
+            for path in glob.glob(os.path.join(self.root, "**", pattern), recursive=True):
+                os.remove(path)
+        self._unpublished.clear()
+        self._prune_empty_dirs()
+
+    def delete_file(self, conn, file_id: int) -> None:
+        """Elimina los Parquet de un archivo (equivalente a soltar su partición) y re-publica la vista."""
+        for path in self._file_parts(file_id):
+            os.remove(path)
+        self._prune_empty_dirs()
+        self.publish_view(conn)
+
+    def withdraw_file(self, conn, file_id: int) -> None:
+        """
+        Retira los Parquet de un archivo dentro de una carga transaccional: se renombran fuera del
+        dataset, la siguiente publish() los borra y discard() los restaura.
+        """
+        for path in self._file_parts(file_id):
+            os.replace(path, path + WITHDRAWN_SUFFIX)
+            self._withdrawn.append(path)
+
+    def compact(self, conn, source: str = "flights") -> None:
+        """
+        Reescribe el dataset completo ordenado por fecha/origen, un archivo fuente a la vez,
+        en un directorio temporal que luego reemplaza al actual. Conserva el prefijo
+        `flights_<file_id>_` del que depende delete_file (las partes de cada archivo se unen en
+        `flights_<file_id>_<n>.parquet`); las filas sin file_id
+        (datos anteriores al control de archivos) se reescriben como `flights_unfiled_<n>.parquet`.
+
+        Args:
+            conn (duckdb.Connection): Conexión activa.
+            source (str): Relación desde la que se reescriben las filas (por defecto la vista `flights`).
+        """
+        if not self._has_parts():
+            return
+        staging = self.root.rstrip("/\\") + ".compacting"
+        if os.path.isdir(staging):
+            shutil.rmtree(staging)
+        os.makedirs(staging)
+
+        partition_cols = ["year", "month"] + (["file_id"] if self.partition_by_file else [])
+        file_ids = [row[0] for row in conn.execute("SELECT DISTINCT file_id FROM flights").fetchall()]
+        for file_id in file_ids:
+            rows = "file_id IS NULL" if file_id is None else f"file_id = {int(file_id)}"
+            prefix = "unfiled" if file_id is None else int(file_id)
+            conn.execute(f"""
+                COPY (
+                    SELECT {', '.join(FLIGHTS_COLUMNS)}, year(fecha) AS year, month(fecha) AS month
+                    FROM {source}
+                    WHERE {rows}
+                    ORDER BY {CLUSTER_ORDER}
+                ) TO '{self._sql_path(staging)}' (
+                    FORMAT PARQUET,
+                    PARTITION_BY ({', '.join(partition_cols)}),
+                    FILENAME_PATTERN 'flights_{prefix}_{{i}}',
+                    OVERWRITE_OR_IGNORE
+                )
+            """)
+
+        # A .previous left by a compaction that crashed after swapping is a stale copy
+        previous = self._previous_root()
+        if os.path.isdir(previous):
+            shutil.rmtree(previous)
+        os.replace(self.root, previous)
+        os.replace(staging, self.root)
+        shutil.rmtree(previous)
+        self.publish_view(conn)
+        conn.execute("CHECKPOINT")
+
+    def fill_route_distances(self, conn) -> None:
+        """Los Parquet son inmutables: se reescribe el dataset completando distancia/velocidad al copiar."""
+        if self._has_parts():
+            self.compact(conn, source=f"({route_distance_fill_sql('flights')})")
+
+    def storage_stats(self, conn) -> dict:
+        """Cantidad de archivos y row groups del dataset Parquet."""
+        if not self._has_parts():
+            return {"files": 0, "row_groups": 0}
+        pattern = self._sql_path(os.path.join(self.root, "**", "*.parquet"))
+        files, row_groups = conn.execute(
+            f"SELECT count(DISTINCT file_name), count(DISTINCT (file_name, row_group_id)) FROM parquet_metadata('{pattern}')"
+        ).fetchone()
+        return {"files": files, "row_groups": row_groups}
+
+    def reset(self, conn) -> None:
+        """Elimina la vista y todo el dataset Parquet."""
+        conn.execute("DROP VIEW IF EXISTS flights")
+        if os.path.isdir(self.root):
+            shutil.rmtree(self.root)
+
+    def publish_view(self, conn) -> None:
+        """
+        Define `flights` como vista sobre el dataset. Sin archivos, la vista queda vacía pero tipada,
+        para que las consultas de lectura no fallen en una instalación nueva.
+
+        La vista enumera los archivos existentes al publicarla (no un glob), de modo que cada
+        publicación es una instantánea: los Parquet escritos después no son visibles hasta la siguiente.
+        La poda por year/month funciona igual sobre la lista explícita que sobre un glob.
+        """
+        parts = self._all_parts()
+        partition_columns = [name for name, _ in PARTITION_SCHEMA]
+        if parts:
+            files = ", ".join(f"'{self._sql_path(path)}'" for path in parts)
+            source = f"read_parquet([{files}], hive_partitioning = true, union_by_name = true)"
+            # Region ids are resolved at read time, so region-airport edits need no rewrite here
+            conn.execute(f"CREATE OR REPLACE VIEW flights AS SELECT {_select_with_regions(source, partition_columns)}")
+        else:
+            typed_nulls = ", ".join(
+                f"CAST(NULL AS {type_}) AS {name}" for name, type_ in FLIGHTS_SCHEMA + REGION_SCHEMA + PARTITION_SCHEMA
+            )
+            conn.execute(f"CREATE OR REPLACE VIEW flights AS SELECT {typed_nulls} WHERE false")
+
+    def _previous_root(self) -> str:
+        return self.root.rstrip("/\\") + ".previous"
+
+    def _file_parts(self, file_id: int) -> List[str]:
+        return glob.glob(os.path.join(self.root, "**", f"flights_{int(file_id)}_*.parquet"), recursive=True)
+
+    def _all_parts(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.root, "**", "*.parquet"), recursive=True))
+
+    def _has_parts(self) -> bool:
+        return bool(self._all_parts())
+
+    def _prune_empty_dirs(self) -> None:
+        for dirpath, _, _ in sorted(os.walk(self.root), key=lambda w: len(w[0]), reverse=True):
+            if dirpath != self.root and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    @staticmethod
+    def _sql_path(path: str) -> str:
+        return path.replace("\\", "/").replace("'", "''")
+
+
+# Set at startup when `flights` is the Parquet view (see main.create_app)
+_partition_pruning = False
+
+
+def set_partition_pruning(enabled: bool) -> None:
+    """Activa en fecha_range_sql los predicados sobre las columnas de partición year/month."""
+    global _partition_pruning
+    _partition_pruning = enabled
+
+
+def fecha_range_sql(start: Any = None, end: Any = None, alias: str = "") -> Tuple[str, List[Any]]:
+    """
+    Condición (y sus parámetros) para filtrar `flights` por un rango de `fecha` con extremos opcionales.
+
+    Con el backend Parquet se agrega la misma cota sobre las columnas de partición year/month:
+    DuckDB solo descarta particiones completas (sin abrir sus archivos) cuando el filtro nombra
+    las columnas Hive, no con un filtro sobre `fecha`.
+
+    Args:
+        start (Any): Fecha mínima inclusive ('YYYY-MM-DD'), o None.
+        end (Any): Fecha máxima inclusive ('YYYY-MM-DD'), o None.
+        alias (str): Prefijo de las columnas, por ejemplo "f.".
+
+    Returns:
+        Tuple[str, List[Any]]: Condiciones unidas con AND ("TRUE" sin extremos) y sus parámetros.
+    """
+    conditions, params = [], []
+    for value, op in ((start, ">="), (end, "<=")):
+        if value is None:
+            continue
+        conditions.append(f"{alias}fecha {op} ?")
+        params.append(value)
+        bound = _partition_bound(value) if _partition_pruning else None
+        if bound:
+            # (year, month) >= / <= (y, m), written so DuckDB can evaluate it on the hive values alone
+            conditions.append(f"({alias}year {op[0]} ? OR ({alias}year = ? AND {alias}month {op} ?))")
+            params.extend([bound[0], bound[0], bound[1]])
+    return " AND ".join(conditions) or "TRUE", params
+
+
+def _partition_bound(value: Any) -> Optional[Tuple[int, int]]:
+    try:
+        day = value if isinstance(value, date) else date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        # Not a plain date: the fecha condition alone still applies
+        return None
+    return day.year, day.month
+
+
+# icao_code -> region_id, one region per airport (the lowest id when mapped to several)
+REGION_LOOKUP_SQL = "SELECT icao_code, MIN(region_id) AS region_id FROM region_airports GROUP BY icao_code"
+
+
+def _select_with_regions(source: str, extra_columns: Sequence[str] = ()) -> str:
+    """Columnas canónicas de `source` (y `extra_columns`) más los ids de región de origen y destino."""
+    columns = ", ".join(f"src.{name}" for name in FLIGHTS_COLUMNS + list(extra_columns))
+    return f"""{columns}, ro.region_id AS region_origen_id, rd.region_id AS region_destino_id
+            FROM {source} src
+            LEFT JOIN ({REGION_LOOKUP_SQL}) ro ON src.origen = ro.icao_code
+            LEFT JOIN ({REGION_LOOKUP_SQL}) rd ON src.destino = rd.icao_code"""
+
+
+def refresh_flight_regions(conn, icao_codes: Optional[List[str]] = None) -> None:
+    """
+    Recalcula region_origen_id/region_destino_id en la tabla nativa `flights`.
+
+    Con `icao_codes` solo se actualizan las filas cuyo origen o destino está en la lista
+    (backfill incremental tras editar region_airports); sin ella se recalcula todo.
+    Con el backend Parquet `flights` es una vista que ya resuelve las regiones al leer.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        icao_codes (Optional[List[str]]): Aeropuertos cuyo mapeo de región cambió.
+    """
+    is_table = conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = 'flights' AND table_type = 'BASE TABLE'"
+    ).fetchone()[0]
+    if not is_table:
+        return
+    codes = sorted({code for code in icao_codes if code}) if icao_codes is not None else None
+    if codes == []:
+        return
+
+    for column, code_column in (("region_origen_id", "origen"), ("region_destino_id", "destino")):
+        value = f"(SELECT m.region_id FROM ({REGION_LOOKUP_SQL}) m WHERE m.icao_code = flights.{code_column})"
+        query = f"UPDATE flights SET {column} = {value}"
+        params = []
+        if codes is not None:
+            query += f" WHERE {code_column} IN ({','.join(['?'] * len(codes))})"
+            params = list(codes)
+        conn.execute(query, params)
+
+
+# Great-circle distance in nautical miles between airports a and b (haversine, Earth radius 3440.065 NM)
+ROUTE_DISTANCE_NM_SQL = """
+    2 * 3440.065 * asin(sqrt(
+        pow(sin(radians(b.latitude - a.latitude) / 2), 2)
+        + cos(radians(a.latitude)) * cos(radians(b.latitude)) * pow(sin(radians(b.longitude - a.longitude) / 2), 2)
+    ))
+"""
+
+# Source distancia is in NM and duracion in minutes, so the implied speed is in knots
+_MISSING_DISTANCE = "{src}.distancia IS NULL OR {src}.distancia = 0 OR {src}.velocidad IS NULL OR {src}.velocidad = 0"
+_FILL_DISTANCE = "COALESCE(NULLIF({src}.distancia, 0), CAST(round(od.distance_nm) AS BIGINT))"
+_FILL_SPEED = (
+    "COALESCE(NULLIF({src}.velocidad, 0), CASE WHEN {src}.duracion > 0 THEN "
+    "CAST(round(COALESCE(NULLIF({src}.distancia, 0), od.distance_nm) * 60.0 / {src}.duracion) AS BIGINT) END)"
+)
+
+
+def cache_route_distances(conn, relation: str = "flights", recompute: bool = False) -> int:
+    """
+    Calcula y guarda en `od_distance` la distancia ortodrómica de cada ruta (origen, destino) de `relation`.
+
+    Se calcula una vez por ruta distinta, en una sola consulta vectorizada sobre las coordenadas
+    de `airports`; las rutas ya cacheadas se omiten salvo con `recompute`. Las rutas cuyos
+    aeropuertos no tienen coordenadas quedan fuera (distancia desconocida).
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        relation (str): Vista/tabla con columnas origen y destino.
+        recompute (bool): Recalcular también las rutas ya cacheadas (tras corregir coordenadas).
+
+    Returns:
+        int: Rutas calculadas.
+    """
+    pending = "" if recompute else """
+        AND NOT EXISTS (SELECT 1 FROM od_distance d WHERE d.origen = r.origen AND d.destino = r.destino)
+    """
+    return conn.execute(f"""
+        INSERT INTO od_distance (origen, destino, distance_nm)
+        SELECT r.origen, r.destino, {ROUTE_DISTANCE_NM_SQL}
+        FROM (
+            SELECT DISTINCT CAST(origen AS VARCHAR) AS origen, CAST(destino AS VARCHAR) AS destino
+            FROM {relation}
+            WHERE origen IS NOT NULL AND destino IS NOT NULL
+        ) r
+        JOIN airports a ON a.icao_code = r.origen
+        JOIN airports b ON b.icao_code = r.destino
+        WHERE a.latitude IS NOT NULL AND a.longitude IS NOT NULL
+          AND b.latitude IS NOT NULL AND b.longitude IS NOT NULL
+          {pending}
+        ON CONFLICT (origen, destino) DO UPDATE SET distance_nm = excluded.distance_nm, computed_at = now()
+    """).fetchone()[0]
+
+
+def route_distance_fill_sql(relation: str) -> str:
+    """
+    SELECT de `relation` con distancia (NM) y velocidad (nudos) completadas desde `od_distance`
+    cuando vienen nulas o en cero; los valores reportados en la fuente se conservan.
+    """
+    return f"""
+        SELECT src.* REPLACE (
+            {_FILL_DISTANCE.format(src='src')} AS distancia,
+            {_FILL_SPEED.format(src='src')} AS velocidad
+        )
+        FROM {relation} src
+        LEFT JOIN od_distance od
+            ON od.origen = CAST(src.origen AS VARCHAR) AND od.destino = CAST(src.destino AS VARCHAR)
+    """
+
+
+def count_missing_distances(conn) -> int:
+    """Vuelos sin distancia o sin velocidad."""
+    return conn.execute(f"SELECT count(*) FROM flights WHERE {_MISSING_DISTANCE.format(src='flights')}").fetchone()[0]
+
+
+def build_flights_store(backend: str = "duckdb", parquet_directory: str = "data/flights_parquet",
+                        partition_by_file: bool = False):
+    """
+    Construye el backend de almacenamiento de `flights` configurado.
+
+    Args:
+        backend (str): 'duckdb' (tabla nativa) o 'parquet' (dataset Hive + vista).
+        parquet_directory (str): Raíz del dataset cuando backend='parquet'.
+        partition_by_file (bool): Particionar también por file_id.
+    """
+    if backend == "duckdb":
+        return DuckDBFlightsStore()
+    if backend == "parquet":
+        return ParquetFlightsStore(parquet_directory, partition_by_file)
+    raise ValueError(f"Unknown flights storage backend '{backend}'. Use 'duckdb' or 'parquet'.")
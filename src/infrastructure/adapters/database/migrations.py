@@ -0,0 +1,326 @@
+import os
+import logging
+from typing import List
+
+import duckdb
+
+from src.infrastructure.adapters.database.flights_store import DuckDBFlightsStore, refresh_flight_regions
+from src.infrastructure.adapters.database.filter_values import FILTER_CATEGORIES, rebuild_filter_values
+from src.infrastructure.adapters.ingest_progress import ensure_timing_columns
+from src.infrastructure.adapters.database.rejected_rows import ensure_rejected_schema
+
+logger = logging.getLogger(__name__)
+
+# Ordered schema migrations: (version, description, method name, transactional).
+# Append only; never renumber. Non-transactional migrations manage their own
+# transactions (the flights store re-types ENUM columns one transaction per column)
+# and must be safe to re-run if interrupted.
+MIGRATIONS = [
+    (1, "file processing control", "_m001_file_processing_control", True),
+    (2, "regions with seed data", "_m002_regions", True),
+    (3, "airports catalog", "_m003_airports", True),
+    (4, "region airports", "_m004_region_airports", True),
+    (5, "flights fact table", "_m005_flights", False),
+    (6, "sectors and membership tables", "_m006_sectors", True),
+    (7, "filter values", "_m007_filters_values", True),
+    (8, "filter value counts", "_m008_filter_value_counts", True),
+    (9, "deduplicate ICAO codes of airports and region airports", "_m009_deduplicate_icao_codes", True),
+    (10, "unique ICAO keys for airports and region airports", "_m010_unique_icao_keys", True),
+    (11, "route distance matrix", "_m011_od_distance", True),
+    (12, "ingest telemetry columns", "_m012_ingest_telemetry", True),
+    (13, "rejected rows quarantine", "_m013_flights_rejected", True),
+]
+
+
+class SchemaMigrator:
+    """
+    Motor de migraciones versionadas de la base de métricas.
+
+    Registra en `schema_version` cada migración aplicada y, al iniciar la aplicación,
+    ejecuta una sola vez las pendientes, en orden y cada una en su propia transacción.
+    Las migraciones son idempotentes para poder adoptar bases creadas antes de este motor;
+    así las rutas de uso diario (ingesta, historial, repositorios) no inspeccionan el esquema.
+    """
+    def __init__(self, db_path: str = "data/metrics.duckdb", flights_store=None,
+                 airports_csv_path: str = "data/raw/data.csv",
+                 region_airports_csv_path: str = "data/raw/region_airports.csv"):
+        """
+        Args:
+            db_path (str): Ruta a la base de datos de métricas.
+            flights_store: Backend de almacenamiento de `flights` (ver flights_store.build_flights_store).
+            airports_csv_path (str): CSV semilla del catálogo de aeropuertos.
+            region_airports_csv_path (str): CSV semilla de la relación región-aeropuerto.
+        """
+        self.db_path = db_path
+        self.flights_store = flights_store or DuckDBFlightsStore()
+        self.airports_csv_path = airports_csv_path
+        self.region_airports_csv_path = region_airports_csv_path
+
+    def run(self) -> List[int]:
+        """
+        Aplica las migraciones pendientes.
+
+        Returns:
+            List[int]: Versiones aplicadas en esta ejecución (vacía si el esquema ya estaba al día).
+        """
+        conn = duckdb.connect(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description VARCHAR,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            current = self.current_version(conn)
+            applied = []
+            for version, description, method, transactional in MIGRATIONS:
+                if version <= current:
+                    continue
+                logger.info(f"Applying schema migration {version}: {description}")
+                try:
+                    if transactional:
+                        conn.execute("BEGIN TRANSACTION")
+                    getattr(self, method)(conn)
+                    if not transactional:
+                        conn.execute("BEGIN TRANSACTION")
+                    conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", [version, description])
+                    conn.execute("COMMIT")
+                except Exception:
+                    self._rollback(conn)
+                    logger.error(f"Schema migration {version} ({description}) failed")
+                    raise
+                applied.append(version)
+            return applied
+        finally:
+            conn.close()
+
+    @staticmethod
+    def current_version(conn) -> int:
+        """Versión de esquema registrada (0 en una base nueva)."""
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+    # --- Migrations ---
+
+    def _m001_file_processing_control(self, conn) -> None:
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS tracking_id_seq")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_processing_control (
+                id BIGINT DEFAULT nextval('tracking_id_seq') PRIMARY KEY,
+                file_name VARCHAR,
+                processed_at TIMESTAMP,
+                status VARCHAR,
+                row_count BIGINT,
+                error_message VARCHAR
+            )
+        """)
+
+    def _m002_regions(self, conn) -> None:
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS regions_id_seq")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS regions (
+                id INTEGER DEFAULT nextval('regions_id_seq'),
+                name VARCHAR,
+                code VARCHAR,
+                description VARCHAR,
+                created_at TIMESTAMP,
+                updated_at TIMESTAMP,
+                nivel_min INTEGER,
+                PRIMARY KEY (id)
+            )
+        """)
+        conn.execute("""
+            INSERT INTO regions (id, name, code, description, created_at, updated_at, nivel_min)
+            VALUES
+            (1, 'FIR Barranquilla(SKBQ)', 'FIR-SKBQ', 'FIR Barranquilla (SKBQ): Cubre la parte norte del país.', '2025-04-09 16:29:57.58647', '2025-04-09 16:29:57.58647', 0),
+            (2, 'FIR Bogotá(SKBO)', 'FIR-SKBO', 'FIR Bogotá (SKBO): Cubre la parte central y sur del país...', '2025-04-09 16:30:32.451245', '2025-04-10 00:50:50.322984', 0)
+            ON CONFLICT (id) DO NOTHING
+        """)
+        # Seeded ids were inserted explicitly: start a fresh sequence past them
+        self._sync_id_sequence(conn, "regions", "regions_id_seq_v3")
+
+    def _m003_airports(self, conn) -> None:
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS airports_id_seq START 1")
+        if not self._table_exists(conn, "airports"):
+            conn.execute("""
+                CREATE TABLE airports (
+                    id INTEGER DEFAULT nextval('airports_id_seq'),
+                    icao_code VARCHAR,
+                    iata_code VARCHAR,
+                    name VARCHAR,
+                    city VARCHAR,
+                    country VARCHAR,
+                    latitude DOUBLE,
+                    longitude DOUBLE,
+                    altitude INTEGER,
+                    timezone DOUBLE,
+                    dst VARCHAR,
+                    type VARCHAR,
+                    source VARCHAR,
+                    PRIMARY KEY (id)
+                )
+            """)
+            if os.path.exists(self.airports_csv_path):
+                # The CSV has no id column: ids come from the sequence
+                conn.execute(f"""
+                    INSERT INTO airports (icao_code, iata_code, name, city, country, latitude, longitude, altitude, timezone, dst, type, source)
+                    SELECT * FROM read_csv_auto('{self._sql_path(self.airports_csv_path)}', nullstr='\\N')
+                """)
+        self._sync_id_sequence(conn, "airports", "airports_id_seq_v2")
+
+    def _m004_region_airports(self, conn) -> None:
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS region_airports_id_seq START 1")
+        if not self._table_exists(conn, "region_airports"):
+            conn.execute("""
+                CREATE TABLE region_airports (
+                    id INTEGER DEFAULT nextval('region_airports_id_seq'),
+                    icao_code VARCHAR,
+                    region_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (id)
+                )
+            """)
+            if os.path.exists(self.region_airports_csv_path):
+                # The CSV has id, icao_code, region_id, created_at
+                conn.execute(f"""
+                    INSERT INTO region_airports
+                    SELECT * FROM read_csv_auto('{self._sql_path(self.region_airports_csv_path)}')
+                """)
+                # Flights ingested before the mapping existed get their region ids now
+                refresh_flight_regions(conn)
+        self._sync_id_sequence(conn, "region_airports", "region_airports_id_seq_v2")
+
+    def _m005_flights(self, conn) -> None:
+        if self._table_exists(conn, "flights"):
+            self.flights_store.upgrade_schema(conn)
+        else:
+            self.flights_store.create_schema(conn)
+
+    def _m006_sectors(self, conn) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sectors (
+                id VARCHAR PRIMARY KEY,
+                name VARCHAR,
+                definition VARCHAR, -- JSON string
+                t_transfer FLOAT,
+                t_comm_ag FLOAT,
+                t_separation FLOAT,
+                t_coordination FLOAT,
+                adjustment_factor_r FLOAT DEFAULT 0.8,
+                capacity_baseline INTEGER
+            )
+        """)
+        for table, key in (("sector_origins", "origins"), ("sector_destinations", "destinations")):
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    sector_id VARCHAR NOT NULL,
+                    icao_code VARCHAR NOT NULL,
+                    PRIMARY KEY (sector_id, icao_code)
+                )
+            """)
+            # Backfill membership of sectors created before the normalized tables existed
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f"""
+                INSERT INTO {table} (sector_id, icao_code)
+                SELECT DISTINCT sector_id, icao_code FROM (
+                    SELECT id AS sector_id,
+                           unnest(from_json(json_extract(definition, '$.{key}'), '["VARCHAR"]')) AS icao_code
+                    FROM sectors
+                    WHERE definition IS NOT NULL
+                )
+                WHERE icao_code IS NOT NULL AND icao_code <> ''
+            """)
+
+    def _m007_filters_values(self, conn) -> None:
+        conn.execute("CREATE SEQUENCE IF NOT EXISTS filter_id_seq")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS filters_values (
+                id BIGINT DEFAULT nextval('filter_id_seq') PRIMARY KEY,
+                value VARCHAR,
+                parent_id BIGINT,
+                category_code VARCHAR
+            )
+        """)
+
+    def _m008_filter_value_counts(self, conn) -> None:
+        conn.execute("ALTER TABLE filters_values ADD COLUMN IF NOT EXISTS row_count BIGINT DEFAULT 0")
+        conn.executemany(
+            "INSERT INTO filters_values (id, value, parent_id, category_code) VALUES (?, ?, NULL, ?) ON CONFLICT (id) DO NOTHING",
+            [[parent_id, label, code] for parent_id, label, code, _ in FILTER_CATEGORIES]
+        )
+        # Root ids 1-5 are explicit; the old refresh restarted filter_id_seq at 100 on every run
+        self._sync_id_sequence(conn, "filters_values", "filter_id_seq_v2")
+        # Children are upserted per (parent_id, value) as files are ingested
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS filters_values_parent_value_idx ON filters_values (parent_id, value)")
+        rebuild_filter_values(conn)
+
+    def _m009_deduplicate_icao_codes(self, conn) -> None:
+        # Bulk imports upsert by ICAO code. Duplicates could only be reached through the
+        # CRUD endpoints and were shadowed by the first match: keep the effective row.
+        for table, keep in (("airports", "id"), ("region_airports", "region_id, id")):
+            conn.execute(f"UPDATE {table} SET icao_code = upper(trim(icao_code)) WHERE icao_code <> upper(trim(icao_code))")
+            removed = conn.execute(f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, row_number() OVER (PARTITION BY icao_code ORDER BY {keep}) AS rank
+                        FROM {table} WHERE icao_code IS NOT NULL
+                    ) WHERE rank > 1
+                )
+            """).fetchone()[0]
+            if removed:
+                logger.warning(f"Removed {removed} duplicated ICAO rows from {table}")
+
+    def _m010_unique_icao_keys(self, conn) -> None:
+        # Separate from the cleanup: DuckDB cannot create an index with outstanding updates in the transaction
+        for table in ("airports", "region_airports"):
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_icao_code_idx ON {table} (icao_code)")
+
+    def _m011_od_distance(self, conn) -> None:
+        # Filled per route by cache_route_distances (ingest and the on-demand backfill)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS od_distance (
+                origen VARCHAR NOT NULL,
+                destino VARCHAR NOT NULL,
+                distance_nm DOUBLE NOT NULL,
+                computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (origen, destino)
+            )
+        """)
+
+    def _m012_ingest_telemetry(self, conn) -> None:
+        # Per-file stage timings and throughput written by the ingest (see IngestProgress)
+        ensure_timing_columns(conn)
+
+    def _m013_flights_rejected(self, conn) -> None:
+        # Rows that fail ingest validation, with reason codes, plus the per-file rejected count
+        ensure_rejected_schema(conn)
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _sync_id_sequence(conn, table: str, sequence: str) -> None:
+        """
+        Apunta el id por defecto de `table` a una secuencia que arranca después del id máximo.
+        DuckDB no tiene setval: crear la secuencia con START WITH evita avanzar con nextval en bucle.
+        """
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence} START WITH {int(max_id) + 1}")
+        conn.execute(f"ALTER TABLE {table} ALTER id SET DEFAULT nextval('{sequence}')")
+
+    @staticmethod
+    def _rollback(conn) -> None:
+        try:
+            conn.execute("ROLLBACK")
+        except duckdb.TransactionException:
+            # Failed outside of a transaction
+            pass
+
+    @staticmethod
+    def _table_exists(conn, table: str) -> bool:
+        return conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = ?", [table]
+        ).fetchone()[0] > 0
+
+    @staticmethod
+    def _sql_path(path: str) -> str:
+        return path.replace("\\", "/").replace("'", "''")
@@ -0,0 +1,117 @@
+"""
+Cuarentena de filas: las filas que no pasan la validación de la ingesta van a `flights_rejected`
+con sus códigos de motivo y el registro original, en lugar de hacer fallar todo el archivo.
+"""
+from typing import Tuple
+
+import polars as pl
+
+# Reason codes stored in flights_rejected.reasons
+REJECTION_REASONS = {
+    "missing_fecha": "La fila no tiene Fecha",
+    "invalid_fecha": "La Fecha no se pudo interpretar",
+    "nivel_out_of_range": "El Nivel está fuera del rango de niveles de vuelo",
+    "missing_origen": "La fila no tiene Origen",
+    "missing_destino": "La fila no tiene Destino",
+}
+
+# Accepted flight levels (FL000-FL999); anything else is a unit or typing error
+NIVEL_RANGE = (0, 999)
+
+# Helper columns carried from parsing to validation; never reach flights
+RAW_FECHA = "__raw_fecha"
+RAW_RECORD = "__raw_record"
+SOURCE_ROW = "__source_row"
+REASONS = "__reasons"
+
+
+def ensure_rejected_schema(conn) -> None:
+    """Crea flights_rejected (y su secuencia) y agrega rejected_count a file_processing_control si faltan."""
+    conn.execute("CREATE SEQUENCE IF NOT EXISTS flights_rejected_id_seq")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS flights_rejected (
+            id BIGINT DEFAULT nextval('flights_rejected_id_seq') PRIMARY KEY,
+            file_id BIGINT,
+            file_name VARCHAR,
+            source_row BIGINT,
+            reasons VARCHAR[],
+            raw_record VARCHAR,
+            rejected_at TIMESTAMP DEFAULT current_timestamp,
+            corrected_at TIMESTAMP
+        )
+    """)
+    conn.execute("ALTER TABLE file_processing_control ADD COLUMN IF NOT EXISTS rejected_count BIGINT")
+
+
+def drop_rejected_schema(conn) -> None:
+    conn.execute("DROP TABLE IF EXISTS flights_rejected")
+    conn.execute("DROP SEQUENCE IF EXISTS flights_rejected_id_seq")
+
+
+def _blank(expr: pl.Expr) -> pl.Expr:
+    return expr.is_null() | (expr.cast(pl.Utf8).str.strip_chars() == "")
+
+
+def flag_rejected(frame):
+    """
+    Agrega a las filas ya parseadas la columna REASONS con sus códigos de rechazo (lista vacía
+    si la fila es válida). Todas las reglas son expresiones vectorizadas, así que funciona igual
+    sobre un DataFrame o dentro del plan de un LazyFrame; una fila puede acumular varios motivos.
+
+    Args:
+        frame (pl.DataFrame | pl.LazyFrame): Filas parseadas con la columna auxiliar RAW_FECHA.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Las mismas filas con REASONS.
+    """
+    checks = [
+        ("missing_fecha", _blank(pl.col(RAW_FECHA))),
+        ("invalid_fecha", ~_blank(pl.col(RAW_FECHA)) & pl.col("fecha").is_null()),
+        ("nivel_out_of_range", pl.col("nivel").is_not_null() & ~pl.col("nivel").is_between(*NIVEL_RANGE)),
+        ("missing_origen", _blank(pl.col("origen"))),
+        ("missing_destino", _blank(pl.col("destino"))),
+    ]
+    reasons = pl.concat_list([
+        pl.when(condition).then(pl.lit(code)).otherwise(pl.lit(None, dtype=pl.Utf8))
+        for code, condition in checks
+    ]).list.drop_nulls()
+    return frame.with_columns(reasons.alias(REASONS))
+
+
+def split_rejected(df: pl.DataFrame) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Valida en bloque un DataFrame parseado y lo separa en filas válidas y rechazadas.
+
+    Returns:
+        Tuple[pl.DataFrame, pl.DataFrame]: (filas válidas con sus columnas auxiliares,
+            filas rechazadas con la columna REASONS agregada).
+    """
+    df = flag_rejected(df)
+    is_rejected = pl.col(REASONS).list.len() > 0
+    return df.filter(~is_rejected).drop(REASONS), df.filter(is_rejected)
+
+
+def insert_rejected(conn, relation: str, file_id: int, file_name: str) -> None:
+    """
+    Guarda en flights_rejected las filas rechazadas de una relación registrada.
+
+    Args:
+        conn (duckdb.Connection): Conexión de escritura.
+        relation (str): Vista/tabla con SOURCE_ROW, REASONS y RAW_RECORD.
+        file_id (int): Identificador del archivo en file_processing_control.
+        file_name (str): Nombre del archivo (permite limpiar sus rechazos al reprocesarlo).
+    """
+    conn.execute(f"""
+        INSERT INTO flights_rejected (file_id, file_name, source_row, reasons, raw_record)
+        SELECT ?, ?, "{SOURCE_ROW}", "{REASONS}", "{RAW_RECORD}" FROM {relation}
+    """, [file_id, file_name])
+
+
+def refresh_rejected_counts(conn, file_ids=None) -> None:
+    """Recalcula file_processing_control.rejected_count a partir de flights_rejected."""
+    where = f"WHERE id IN ({', '.join(str(int(i)) for i in file_ids)})" if file_ids else ""
+    conn.execute(f"""
+        UPDATE file_processing_control
+        SET rejected_count = (SELECT count(*) FROM flights_rejected r WHERE r.file_id = file_processing_control.id)
+        {where}
+    """)
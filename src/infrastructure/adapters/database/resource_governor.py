@@ -0,0 +1,299 @@
+"""
+Gobierno de recursos de DuckDB por tipo de carga: interactiva, reportes, ingesta y modelos (ML).
+
+DuckDB aplica `threads`, `memory_limit`, `temp_directory` y `max_temp_directory_size` a la
+instancia de base de datos completa (un SET en una conexión cambia todas las conexiones del
+proceso a ese archivo), así que no se pueden asignar por conexión. El gobierno se reparte así:
+
+- Presupuesto del motor (`engine`): límites de la base de métricas compartida, iguales para todas
+  las conexiones. Dejan CPU y RAM libres para el resto del servidor y fijan dónde se derrama
+  a disco lo que no entra en memoria.
+- Perfil de la carga (`profiles`): sus límites de hilos/memoria/spill se aplican a las bases que
+  esa carga abre por su cuenta (la base de staging de la ingesta) y su `statement_timeout_seconds`
+  a todas sus sentencias. La concurrencia de cada carga ya la acotan sus pools de hilos
+  (QueryExecutor, trabajos de reportes e ingesta).
+
+La carga actual se fija con `workload("report")` (QueryExecutor y los trabajos en segundo plano
+lo hacen) y `connections.connect()` le pide al gobernador que configure cada conexión.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, Optional
+
+import duckdb
+
+WORKLOADS = ("interactive", "report", "ingest", "ml")
+
+_current_workload: ContextVar[Optional[str]] = ContextVar("duckdb_workload", default=None)
+
+
+@contextmanager
+def workload(name: str) -> Iterator[str]:
+    """Marca el trabajo del bloque (en el hilo/contexto actual) como de la carga `name`."""
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload '{name}'. Use one of: {', '.join(WORKLOADS)}")
+    token = _current_workload.set(name)
+    try:
+        yield name
+    finally:
+        _current_workload.reset(token)
+
+
+def current_workload() -> Optional[str]:
+    return _current_workload.get()
+
+
+def set_thread_workload(name: str) -> None:
+    """
+    Fija la carga por defecto del hilo actual. Pensado como `initializer` de los pools de hilos
+    dedicados a una carga: sus tareas corren en el contexto del hilo y heredan el valor.
+    """
+    if name not in WORKLOADS:
+        raise ValueError(f"Unknown workload '{name}'. Use one of: {', '.join(WORKLOADS)}")
+    _current_workload.set(name)
+
+
+@dataclass(frozen=True)
+class WorkloadProfile:
+    """
+    Límites de recursos. Los valores vacíos o en cero dejan el valor por defecto de DuckDB
+    (o, en un perfil de carga, el del presupuesto del motor).
+    """
+    threads: int = 0
+    memory_limit: str = ""
+    temp_directory: str = ""
+    max_temp_directory_size: str = ""
+    statement_timeout_seconds: float = 0.0
+
+    def over(self, base: "WorkloadProfile") -> "WorkloadProfile":
+        """Este perfil completando los límites que no fija con los de `base`."""
+        return replace(
+            self,
+            threads=self.threads or base.threads,
+            memory_limit=self.memory_limit or base.memory_limit,
+            temp_directory=self.temp_directory or base.temp_directory,
+            max_temp_directory_size=self.max_temp_directory_size or base.max_temp_directory_size,
+        )
+
+
+class StatementTimeout(duckdb.InterruptException):
+    """La sentencia superó el tiempo máximo de su carga y fue interrumpida."""
+
+
+class StatementWatchdog:
+    """
+    Un único hilo que interrumpe las conexiones cuyas sentencias vencen su plazo (heap de plazos;
+    no se crea un temporizador por sentencia). Interrumpir una conexión ociosa no tiene efecto.
+    """
+    def __init__(self):
+        self._deadlines = []
+        self._armed: Dict[int, "GovernedConnection"] = {}
+        self._ids = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def arm(self, conn: "GovernedConnection", seconds: float) -> int:
+        token = next(self._ids)
+        with self._condition:
+            self._armed[token] = conn
+            heapq.heappush(self._deadlines, (time.monotonic() + seconds, token))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="duckdb-statement-watchdog", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return token
+
+    def disarm(self, token: int) -> None:
+        # The heap entry stays until its deadline and is skipped then
+        with self._condition:
+            self._armed.pop(token, None)
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._deadlines:
+                    self._condition.wait()
+                deadline, token = self._deadlines[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._deadlines)
+                conn = self._armed.pop(token, None)
+            if conn is not None:
+                conn._expire(token)
+
+
+_FULL_READS = ("fetchall", "fetchdf", "fetch_df", "fetchnumpy", "df", "pl", "arrow", "fetch_arrow_table",
+               "to_arrow_table")
+_PARTIAL_READS = ("fetchone", "fetchmany")
+
+
+class GovernedConnection:
+    """
+    Conexión DuckDB con plazo por sentencia: el plazo corre desde execute hasta que el resultado
+    se leyó completo (o hasta la siguiente sentencia / close), porque DuckDB entrega los SELECT en
+    streaming y el trabajo ocurre al leer. Al vencer se llama a `interrupt()` y la sentencia
+    falla con StatementTimeout. El resto de la API se delega sin cambios.
+    """
+    def __init__(self, conn: duckdb.DuckDBPyConnection, watchdog: StatementWatchdog, timeout_seconds: float,
+                 workload_name: Optional[str] = None):
+        self._conn = conn
+        self._watchdog = watchdog
+        self.timeout_seconds = timeout_seconds
+        self.workload = workload_name
+        self._token: Optional[int] = None
+        self._expired: Optional[int] = None
+        # Serializes the watchdog's interrupt with arming the next statement
+        self._lock = threading.Lock()
+
+    def execute(self, *args, **kwargs) -> "GovernedConnection":
+        self._arm()
+        self._guarded(self._conn.execute, *args, **kwargs)
+        return self
+
+    def executemany(self, *args, **kwargs) -> "GovernedConnection":
+        self._arm()
+        self._guarded(self._conn.executemany, *args, **kwargs)
+        return self
+
+    def cursor(self) -> "GovernedConnection":
+        return GovernedConnection(self._conn.cursor(), self._watchdog, self.timeout_seconds, self.workload)
+
+    def close(self) -> None:
+        self._disarm()
+        self._conn.close()
+
+    def _arm(self) -> None:
+        with self._lock:
+            if self._token is not None:
+                self._watchdog.disarm(self._token)
+            self._token = self._watchdog.arm(self, self.timeout_seconds)
+
+    def _disarm(self) -> None:
+        with self._lock:
+            if self._token is not None:
+                self._watchdog.disarm(self._token)
+                self._token = None
+
+    def _expire(self, token: int) -> None:
+        with self._lock:
+            # The statement may have finished between the deadline and now
+            if self._token != token:
+                return
+            self._expired = token
+            try:
+                self._conn.interrupt()
+            except duckdb.ConnectionException:
+                pass
+
+    def _guarded(self, method, *args, **kwargs):
+        token = self._token
+        try:
+            return method(*args, **kwargs)
+        except duckdb.InterruptException as e:
+            if token is not None and self._expired == token:
+                self._disarm()
+                raise StatementTimeout(
+                    f"Statement exceeded the {self.workload or 'default'} timeout of {self.timeout_seconds:g}s"
+                ) from e
+            raise
+
+    def _read(self, name: str, *args, **kwargs):
+        result = self._guarded(getattr(self._conn, name), *args, **kwargs)
+        if name in _FULL_READS:
+            self._disarm()
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "GovernedConnection":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _reader(name: str):
+    def read(self, *args, **kwargs):
+        return self._read(name, *args, **kwargs)
+    read.__name__ = name
+    return read
+
+
+for _name in _FULL_READS + _PARTIAL_READS:
+    setattr(GovernedConnection, _name, _reader(_name))
+
+
+class ResourceGovernor:
+    """
+    Configura las conexiones que entrega `connections.connect()` según la carga en curso.
+    """
+    def __init__(self, engine: WorkloadProfile = WorkloadProfile(),
+                 profiles: Optional[Dict[str, WorkloadProfile]] = None,
+                 shared_database: Optional[str] = None):
+        """
+        Args:
+            engine (WorkloadProfile): Presupuesto de la base compartida (su timeout no se usa).
+            profiles (Optional[Dict[str, WorkloadProfile]]): Perfil por carga (claves de WORKLOADS).
+            shared_database (Optional[str]): Base de métricas compartida; las demás bases que abre
+                una carga (staging de la ingesta) reciben los límites de su perfil.
+        """
+        unknown = set(profiles or {}) - set(WORKLOADS)
+        if unknown:
+            raise ValueError(f"Unknown workloads in resource profiles: {', '.join(sorted(unknown))}")
+        self.engine = engine
+        self.profiles = dict(profiles or {})
+        self.shared_database = os.path.abspath(shared_database) if shared_database else None
+        self.watchdog = StatementWatchdog()
+
+    def profile(self, workload_name: Optional[str]) -> WorkloadProfile:
+        """Perfil de la carga (el presupuesto del motor si no tiene uno propio)."""
+        return self.profiles.get(workload_name, WorkloadProfile()).over(self.engine)
+
+    def limits_for(self, database: str, workload_name: Optional[str]) -> WorkloadProfile:
+        """Límites de motor que corresponden a una conexión a `database` hecha por `workload_name`."""
+        # Every in-memory connection is its own instance; other files are opened by one workload alone
+        private = database in (":memory:", "") or (
+            self.shared_database is not None and os.path.abspath(database) != self.shared_database
+        )
+        return self.profile(workload_name) if private and workload_name is not None else self.engine
+
+    def govern(self, conn: duckdb.DuckDBPyConnection, database: str, workload_name: Optional[str] = None):
+        """
+        Aplica los límites a una conexión recién abierta y, si la carga tiene plazo por sentencia,
+        la devuelve envuelta en GovernedConnection.
+
+        Args:
+            conn (duckdb.DuckDBPyConnection): Conexión recién abierta.
+            database (str): Ruta con la que se abrió.
+            workload_name (Optional[str]): Carga; por defecto la del contexto (ver `workload`).
+        """
+        workload_name = workload_name or current_workload()
+        self._apply_limits(conn, self.limits_for(database, workload_name))
+        timeout = self.profile(workload_name).statement_timeout_seconds if workload_name else 0.0
+        if timeout and timeout > 0:
+            return GovernedConnection(conn, self.watchdog, timeout, workload_name)
+        return conn
+
+    @staticmethod
+    def _apply_limits(conn, limits: WorkloadProfile) -> None:
+        if limits.threads:
+            conn.execute(f"SET threads = {int(limits.threads)}")
+        if limits.memory_limit:
+            conn.execute("SET memory_limit = ?", [limits.memory_limit])
+        if limits.max_temp_directory_size:
+            conn.execute("SET max_temp_directory_size = ?", [limits.max_temp_directory_size])
+        if limits.temp_directory:
+            # DuckDB refuses to move a spill directory that is in use, so only set it when it differs
+            current = conn.execute("SELECT current_setting('temp_directory')").fetchone()[0]
+            if os.path.abspath(current or "") != os.path.abspath(limits.temp_directory):
+                os.makedirs(limits.temp_directory, exist_ok=True)
+                conn.execute("SET temp_directory = ?", [limits.temp_directory])
@@ -1,59 +1,18 @@
 import duckdb
-import os
-from typing import List, Tuple, Optional
+from src.infrastructure.adapters.database.connections import connect
+from typing import List, Tuple, Optional, Dict, Any
 from src.domain.entities.region_airport import RegionAirport
 from src.domain.ports.region_airport_repository import RegionAirportRepository
+from src.infrastructure.adapters.database.flights_store import refresh_flight_regions
+from src.infrastructure.adapters.database.bulk_import import import_region_airports
 
 class DuckDBRegionAirportRepository(RegionAirportRepository):
-    def __init__(self, db_path: str = "tesis.db", csv_path: str = "data/raw/region_airports.csv"):
+    def __init__(self, db_path: str = "tesis.db"):
+        # Table, seed CSV import and id sequence are created by SchemaMigrator
         self.db_path = db_path
-        self.csv_path = csv_path
-        self._init_db()
 
     def _get_connection(self):
-        return duckdb.connect(self.db_path)
-
-    def _init_db(self):
-        with self._get_connection() as conn:
-            # Create sequence
-            conn.execute("CREATE SEQUENCE IF NOT EXISTS region_airports_id_seq START 1;")
-            
-            # Check table
-            table_exists = conn.execute("SELECT count(*) FROM information_schema.tables WHERE table_name = 'region_airports'").fetchone()[0] > 0
-            
-            if not table_exists:
-                conn.execute(f"""
-                    CREATE TABLE region_airports (
-                        id INTEGER DEFAULT nextval('region_airports_id_seq'),
-                        icao_code VARCHAR,
-                        region_id INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        PRIMARY KEY (id)
-                    );
-                """)
-                
-                if os.path.exists(self.csv_path):
-                    # Import CSV
-                    # The CSV has id, icao_code, region_id, created_at
-                    # We can import directly, but we need to ensure the sequence is updated afterwards
-                    conn.execute(f"""
-                        INSERT INTO region_airports 
-                        SELECT * FROM read_csv_auto('{self.csv_path}');
-                    """)
-                    
-                    # Sync sequence
-                    max_id = conn.execute("SELECT MAX(id) FROM region_airports").fetchone()[0]
-                    if max_id:
-                        # Advance sequence to max_id
-                        # DuckDB doesn't have setval easily, so we loop nextval
-                        curr_seq = conn.execute("SELECT last_value FROM duckdb_sequences() WHERE sequence_name='region_airports_id_seq'").fetchone()
-                        # This logic is a bit brittle if last_value is null or something, 
-                        # but mimicking what we did for regions (or just assuming new inserts will be fine if we set start correctly)
-                        # Actually for regions we created a v2 sequence. Here we created fresh.
-                        # Ideally we just want nextval to be > max_id.
-                        
-                        # Simple hack: just burn sequence numbers until we are safe
-                        pass # For now relying on standard behavior, if issue arises we fix like regions.
+        return connect(self.db_path)
 
     def get_paginated(self, page: int, page_size: int, search: str = "") -> Tuple[List[RegionAirport], int]:
         offset = (page - 1) * page_size
@@ -89,12 +48,16 @@ class DuckDBRegionAirportRepository(RegionAirportRepository):
 
     def create(self, region_airport: RegionAirport) -> RegionAirport:
         with self._get_connection() as conn:
-            res = conn.execute("""
-                INSERT INTO region_airports (icao_code, region_id)
-                VALUES (?, ?)
-                RETURNING id, created_at;
-            """, [region_airport.icao_code, region_airport.region_id]).fetchone()
-            
+            try:
+                res = conn.execute("""
+                    INSERT INTO region_airports (icao_code, region_id)
+                    VALUES (?, ?)
+                    RETURNING id, created_at;
+                """, [region_airport.icao_code, region_airport.region_id]).fetchone()
+            except duckdb.ConstraintException:
+                raise ValueError(f"El aeropuerto '{region_airport.icao_code}' ya está asignado a una región.")
+            refresh_flight_regions(conn, [region_airport.icao_code])
+
             region_airport.id = res[0]
             region_airport.created_at = res[1]
             return region_airport
@@ -102,16 +65,21 @@ class DuckDBRegionAirportRepository(RegionAirportRepository):
     def update(self, id: int, region_airport: RegionAirport) -> RegionAirport:
         with self._get_connection() as conn:
             # Check existence
-            exists = conn.execute("SELECT count(*) FROM region_airports WHERE id = ?", [id]).fetchone()[0] > 0
-            if not exists:
+            previous = conn.execute("SELECT icao_code FROM region_airports WHERE id = ?", [id]).fetchone()
+            if not previous:
                 raise Exception(f"RegionAirport with id {id} not found")
 
-            conn.execute("""
-                UPDATE region_airports 
-                SET icao_code = ?, region_id = ?
-                WHERE id = ?
-            """, [region_airport.icao_code, region_airport.region_id, id])
-            
+            try:
+                conn.execute("""
+                    UPDATE region_airports 
+                    SET icao_code = ?, region_id = ?
+                    WHERE id = ?
+                """, [region_airport.icao_code, region_airport.region_id, id])
+            except duckdb.ConstraintException:
+                raise ValueError(f"El aeropuerto '{region_airport.icao_code}' ya está asignado a una región.")
+            # Backfill only flights touching the old or the new airport
+            refresh_flight_regions(conn, [previous[0], region_airport.icao_code])
+
             # Retrieve updated to return full object (preserving created_at)
             row = conn.execute("SELECT * FROM region_airports WHERE id = ?", [id]).fetchone()
             
@@ -124,4 +92,11 @@ class DuckDBRegionAirportRepository(RegionAirportRepository):
 
     def delete(self, id: int) -> None:
         with self._get_connection() as conn:
+            previous = conn.execute("SELECT icao_code FROM region_airports WHERE id = ?", [id]).fetchone()
             conn.execute("DELETE FROM region_airports WHERE id = ?", [id])
+            if previous:
+                refresh_flight_regions(conn, [previous[0]])
+
+    def bulk_upsert(self, file_path: str) -> Dict[str, Any]:
+        with self._get_connection() as conn:
+            return import_region_airports(conn, file_path)
@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from typing import Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class InterProcessLock:
+    """
+    Lock exclusivo basado en un archivo, válido entre procesos (varios workers de uvicorn)
+    y entre hilos del mismo proceso.
+
+    Usa flock en POSIX y msvcrt.locking en Windows; el sistema operativo libera el lock si
+    el proceso muere, así que no quedan locks huérfanos tras una caída.
+    """
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Archivo de lock (se crea si no existe).
+        """
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._handle = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None, poll_seconds: float = 0.2) -> bool:
+        """
+        Toma el lock.
+
+        Args:
+            blocking (bool): Esperar a que se libere; con False se intenta una sola vez.
+            timeout (Optional[float]): Espera máxima en segundos (None = indefinida).
+            poll_seconds (float): Intervalo entre intentos mientras otro proceso lo tiene.
+
+        Returns:
+            bool: True si se obtuvo el lock.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._thread_lock.acquire(blocking, timeout if blocking and timeout is not None else -1):
+            return False
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handle = open(self.path, "a+")
+            while True:
+                if self._try_lock(handle):
+                    self._handle = handle
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(str(os.getpid()))
+                    handle.flush()
+                    return True
+                if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                    handle.close()
+                    self._thread_lock.release()
+                    return False
+                time.sleep(poll_seconds)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
+            self._thread_lock.release()
+
+    @property
+    def locked(self) -> bool:
+        """True si este proceso tiene el lock."""
+        return self._handle is not None
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    @staticmethod
+    def _try_lock(handle) -> bool:
+        try:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
@@ -1,12 +1,18 @@
 import os
-import openpyxl
 import io
+import uuid
+import hashlib
 import logging
 import zipfile
-from typing import List, BinaryIO, Union
+import posixpath
+from typing import List, BinaryIO, Tuple, Union
+from xml.etree import ElementTree
 from src.domain.entities.file_info import FileInfo
 from src.domain.ports.file_repository import FileRepository
 
+# Uploads are copied to disk in blocks of this size, whatever the file size
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
 class FilesystemRepository(FileRepository):
     def __init__(self, data_directory: str):
         self.data_directory = data_directory
@@ -32,104 +38,75 @@ class FilesystemRepository(FileRepository):
         return files
 
     def save_file(self, filename: str, content: Union[BinaryIO, bytes]) -> FileInfo:
+        """
+        Guarda un archivo subido validando solo su fila de encabezados.
+
+        El contenido se copia por bloques a un temporal dentro del directorio de datos mientras
+        se calcula su SHA-256; la validación lee únicamente la primera fila de la hoja activa
+        desde el ZIP y, si pasa, el temporal se renombra atómicamente al nombre final. La memoria
+        usada no depende del tamaño del archivo.
+
+        Args:
+            filename (str): Nombre final del archivo dentro del directorio de datos.
+            content (Union[BinaryIO, bytes]): Stream (p. ej. UploadFile.file) o bytes.
+
+        Returns:
+            FileInfo: Resultado de la validación, con el hash del contenido.
+        """
         filepath = os.path.join(self.data_directory, filename)
         logger = logging.getLogger(__name__)
-        
-        # Validar antes de guardar permanentemente
+        stream = io.BytesIO(content) if isinstance(content, bytes) else content
+        tmp_path = os.path.join(self.data_directory, f".{filename}.{uuid.uuid4().hex}.part")
+
         try:
-            # Manejar tanto bytes como stream
-            if isinstance(content, bytes):
-                file_content = content
-            else:
-                content.seek(0)
-                file_content = content.read()
-            
-            file_size = len(file_content)
-            logger.info(f"Procesando archivo {filename}, tamaño: {file_size} bytes")
-            
+            # 1. Copiar por bloques a un temporal calculando el hash
+            file_size, content_hash, magic = self._spool(stream, tmp_path)
+            logger.info(f"Procesando archivo {filename}, tamaño: {file_size} bytes, sha256: {content_hash}")
+
+            def rejected(message: str, size: int = file_size) -> FileInfo:
+                return FileInfo(filename=filename, size_bytes=size, validation_status=False,
+                                error_message=message, content_hash=content_hash)
+
             if file_size == 0:
-                return FileInfo(
-                    filename=filename,
-                    size_bytes=0,
-                    validation_status=False,
-                    error_message="El archivo está vacío"
-                )
-
-            # Usar un buffer de memoria para que openpyxl no tenga problemas con el stream de FastAPI
-            buffer = io.BytesIO(file_content)
-            
-            # 1. Verificar Magic Numbers (Firma del archivo)
-            buffer.seek(0)
-            magic = buffer.read(8)
-            buffer.seek(0) # Siempre resetear
-            
+                return rejected("El archivo está vacío", size=0)
+
+            # 2. Verificar Magic Numbers (Firma del archivo)
             # ZIP magic numbers: PK.. (50 4B 03 04)
             is_zip = magic.startswith(b'PK\x03\x04')
             # OLE2 magic numbers (XLS antiguo): D0 CF 11 E0 A1 B1 1A E1
             is_ole = magic.startswith(b'\xd0\xcf\x11\xe0')
-            
-            logger.info(f"DEBUG: Magic numbers para {filename}: {magic.hex()} (ZIP: {is_zip}, OLE: {is_ole})")
-            print(f"DEBUG: Magic numbers para {filename}: {magic.hex()} (ZIP: {is_zip}, OLE: {is_ole})")
+
+            logger.debug(f"Magic numbers para {filename}: {magic.hex()} (ZIP: {is_zip}, OLE: {is_ole})")
 
             if not is_zip:
                 if is_ole:
-                    return FileInfo(
-                        filename=filename,
-                        size_bytes=file_size,
-                        validation_status=False,
-                        error_message="El archivo parece ser un Excel antiguo (.xls). Por favor, guárdelo como 'Libro de Excel (*.xlsx)' e intente de nuevo."
-                    )
-                else:
-                    return FileInfo(
-                        filename=filename,
-                        size_bytes=file_size,
-                        validation_status=False,
-                        error_message=f"El archivo no tiene el formato técnico de Excel .xlsx esperado (No es un archivo ZIP válido). Firma detectada: {magic.hex()[:8]}"
-                    )
-
-            # openpyxl necesita un archivo real o un objeto tipo archivo
-            # Un archivo .xlsx es técnicamente un archivo ZIP
+                    return rejected("El archivo parece ser un Excel antiguo (.xls). Por favor, guárdelo como 'Libro de Excel (*.xlsx)' e intente de nuevo.")
+                return rejected(f"El archivo no tiene el formato técnico de Excel .xlsx esperado (No es un archivo ZIP válido). Firma detectada: {magic.hex()[:8]}")
+
+            # 3. Leer solo la fila de encabezados desde el ZIP (un .xlsx es técnicamente un ZIP)
             try:
-                # Verificar con zipfile directamente primero por si openpyxl da error genérico
-                if not zipfile.is_zipfile(buffer):
-                    raise zipfile.BadZipFile("No es un archivo ZIP válido según zipfile")
-                
-                buffer.seek(0)
-                wb = openpyxl.load_workbook(buffer, read_only=True, data_only=True)
-                sheet = wb.active
-                # Obtener cabeceras (primera fila)
-                headers = [str(cell.value).strip() if cell.value else "" for cell in next(sheet.rows)]
+                headers = read_xlsx_header(tmp_path)
             except Exception as zip_err:
                 logger.error(f"Error de formato Excel/Zip para {filename}: {str(zip_err)}")
-                return FileInfo(
-                    filename=filename,
-                    size_bytes=file_size,
-                    validation_status=False,
-                    error_message=f"El archivo .xlsx está corrupto o no se puede abrir: {str(zip_err)}"
-                )
-            
+                return rejected(f"El archivo .xlsx está corrupto o no se puede abrir: {str(zip_err)}")
+
             # Verificar headers
             missing = [col for col in self.required_columns if col not in headers]
-            
+
             if missing:
-                return FileInfo(
-                    filename=filename,
-                    size_bytes=0,
-                    validation_status=False,
-                    error_message=f"Faltan columnas requeridas: {', '.join(missing)}"
-                )
-                
-            # Si es válido, guardar el contenido que ya leímos
-            with open(filepath, "wb") as f:
-                f.write(file_content)
-                
+                return rejected(f"Faltan columnas requeridas: {', '.join(missing)}", size=0)
+
+            # 4. Si es válido, publicar el temporal con un rename atómico
+            os.replace(tmp_path, filepath)
+
             return FileInfo(
                 filename=filename,
-                size_bytes=os.path.getsize(filepath),
+                size_bytes=file_size,
                 validation_status=True,
-                error_message=None
+                error_message=None,
+                content_hash=content_hash
             )
-            
+
         except Exception as e:
             logger.error(f"Error inesperado al guardar archivo {filename}: {str(e)}")
             return FileInfo(
@@ -138,3 +115,133 @@ class FilesystemRepository(FileRepository):
                 validation_status=False,
                 error_message=f"Error inesperado: {str(e)}"
             )
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _spool(stream: BinaryIO, tmp_path: str) -> Tuple[int, str, bytes]:
+        """Copia el stream al temporal por bloques; devuelve (tamaño, sha256, primeros 8 bytes)."""
+        if hasattr(stream, "seek"):
+            stream.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        magic = b""
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if len(magic) < 8:
+                    magic += chunk[:8 - len(magic)]
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        return size, digest.hexdigest(), magic
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_xlsx_header(path: str) -> List[str]:
+    """
+    Lee la primera fila de la hoja activa de un .xlsx sin cargar el libro.
+
+    Recorre con iterparse el XML de la hoja hasta cerrar la primera fila y, si hay celdas de
+    texto compartido, lee sharedStrings.xml solo hasta el mayor índice usado.
+
+    Args:
+        path (str): Ruta del archivo .xlsx.
+
+    Returns:
+        List[str]: Encabezados (celdas vacías como "").
+
+    Raises:
+        zipfile.BadZipFile, KeyError, ValueError: Si el archivo no es un libro válido.
+    """
+    with zipfile.ZipFile(path) as zf:
+        sheet_path = _active_sheet_path(zf)
+
+        cells: List[Tuple[str, str]] = []
+        with zf.open(sheet_path) as sheet:
+            cell_type, value, in_row = None, None, False
+            for event, elem in ElementTree.iterparse(sheet, events=("start", "end")):
+                tag = _local(elem.tag)
+                if event == "start":
+                    if tag == "row":
+                        in_row = True
+                    elif tag == "c":
+                        cell_type, value = elem.get("t", "n"), None
+                    continue
+                if not in_row:
+                    elem.clear()
+                    continue
+                if tag in ("v", "t") and elem.text is not None:
+                    value = (value or "") + elem.text
+                elif tag == "c":
+                    cells.append((cell_type, value))
+                elif tag == "row":
+                    break
+        if not in_row:
+            raise ValueError("La hoja no tiene filas")
+
+        shared_indexes = [int(v) for t, v in cells if t == "s" and v is not None]
+        shared = _read_shared_strings(zf, max(shared_indexes)) if shared_indexes else []
+
+    headers = []
+    for cell_type, value in cells:
+        if value is None:
+            headers.append("")
+        elif cell_type == "s":
+            headers.append(shared[int(value)].strip())
+        else:
+            headers.append(value.strip())
+    return headers
+
+
+def _active_sheet_path(zf: zipfile.ZipFile) -> str:
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    active_tab = 0
+    sheet_ids = []
+    for elem in workbook.iter():
+        tag = _local(elem.tag)
+        if tag == "workbookView":
+            active_tab = int(elem.get("activeTab", 0))
+        elif tag == "sheet":
+            rel_id = next((v for k, v in elem.attrib.items() if _local(k) == "id"), None)
+            sheet_ids.append(rel_id)
+    if not sheet_ids:
+        raise ValueError("El libro no tiene hojas")
+    rel_id = sheet_ids[min(active_tab, len(sheet_ids) - 1)]
+
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            # Targets are relative to xl/ unless absolute within the package
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Relación de hoja {rel_id} no encontrada")
+
+
+def _read_shared_strings(zf: zipfile.ZipFile, max_index: int) -> List[str]:
+    strings: List[str] = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for event, elem in ElementTree.iterparse(f, events=("end",)):
+            if _local(elem.tag) != "si":
+                continue
+            # Plain <t> or rich-text runs <r><t>; phonetic runs (<rPh>) are not displayed text
+            parts = []
+            for child in elem:
+                tag = _local(child.tag)
+                if tag == "t":
+                    parts.append(child.text or "")
+                elif tag == "r":
+                    parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+            strings.append("".join(parts))
+            elem.clear()
+            if len(strings) > max_index:
+                break
+    return strings
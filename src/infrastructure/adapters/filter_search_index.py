@@ -0,0 +1,150 @@
+import logging
+import threading
+from array import array
+from typing import Dict, List, Any, Optional
+
+from src.infrastructure.adapters.database.connections import connect
+
+logger = logging.getLogger(__name__)
+
+# Substrings up to this length are indexed directly; longer queries intersect their n-grams
+MAX_GRAM = 3
+
+
+class _CategoryIndex:
+    """
+    Índice inmutable de una categoría de filtro.
+
+    Los valores se numeran por frecuencia (0 = el de más vuelos), de modo que cada lista de
+    postings queda ordenada por ranking y las búsquedas pueden cortar en cuanto reúnen `limit`
+    resultados, sin ordenar candidatos.
+    """
+    __slots__ = ("ids", "values", "lowered", "counts", "grams", "prefixes")
+
+    def __init__(self, rows: List[tuple]):
+        # rows: (id, value, row_count), already ordered by row_count DESC, value
+        self.ids = [row[0] for row in rows]
+        self.values = [row[1] for row in rows]
+        self.lowered = [row[1].lower() for row in rows]
+        self.counts = [row[2] for row in rows]
+        grams: Dict[str, array] = {}
+        prefixes: Dict[str, array] = {}
+        for rank, text in enumerate(self.lowered):
+            seen = set()
+            for size in range(1, MAX_GRAM + 1):
+                for start in range(len(text) - size + 1):
+                    gram = text[start:start + size]
+                    if gram not in seen:
+                        seen.add(gram)
+                        grams.setdefault(gram, array("I")).append(rank)
+                if len(text) >= size:
+                    prefixes.setdefault(text[:size], array("I")).append(rank)
+        self.grams = grams
+        self.prefixes = prefixes
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """Ranks de los valores que contienen `query`: primero los que empiezan por ella, luego el resto, por frecuencia."""
+        if not query:
+            return list(range(min(limit, len(self.values))))
+
+        prefix_hits = []
+        for rank in self.prefixes.get(query[:MAX_GRAM], ()):
+            if len(query) <= MAX_GRAM or self.lowered[rank].startswith(query):
+                prefix_hits.append(rank)
+                if len(prefix_hits) == limit:
+                    return prefix_hits
+
+        # Substring matches: scan the rarest n-gram of the query and verify
+        if len(query) <= MAX_GRAM:
+            postings = self.grams.get(query, ())
+        else:
+            candidates = [self.grams.get(query[i:i + MAX_GRAM], ()) for i in range(len(query) - MAX_GRAM + 1)]
+            postings = min(candidates, key=len)
+        already = set(prefix_hits)
+        results = prefix_hits
+        for rank in postings:
+            if rank in already:
+                continue
+            if len(query) <= MAX_GRAM or query in self.lowered[rank]:
+                results.append(rank)
+                if len(results) == limit:
+                    break
+        return results
+
+
+class FilterSearchIndex:
+    """
+    Índice en memoria para el autocompletado de valores de filtro (matrícula, callsign, etc.).
+
+    Se construye desde `filters_values` (con sus row_count) y resuelve coincidencias por prefijo
+    y por subcadena sin consultar la base de datos en cada pulsación. La reconstrucción arma un
+    índice nuevo y lo publica reemplazando una sola referencia, así que las búsquedas concurrentes
+    siempre ven un índice completo. Quien cambia filters_values (ingesta, borrado, refresco de
+    filtros) llama a rebuild() al terminar, ya cerrada su conexión de escritura; si esa
+    reconstrucción falla, la siguiente búsqueda la reintenta.
+    """
+    def __init__(self, db_path: str = "data/metrics.duckdb"):
+        """
+        Args:
+            db_path (str): Ruta a la base de datos de métricas.
+        """
+        self.db_path = db_path
+        self._categories: Optional[Dict[int, _CategoryIndex]] = None
+        self._stale = True
+        self._rebuild_lock = threading.Lock()
+
+    def rebuild(self) -> int:
+        """
+        Reconstruye el índice desde filters_values y lo publica de forma atómica.
+
+        Returns:
+            int: Cantidad de valores indexados.
+        """
+        with self._rebuild_lock:
+            try:
+                conn = connect(self.db_path, read_only=True)
+                try:
+                    rows = conn.execute("""
+                        SELECT parent_id, id, value, COALESCE(row_count, 0)
+                        FROM filters_values
+                        WHERE parent_id IS NOT NULL AND value IS NOT NULL
+                        ORDER BY parent_id, row_count DESC NULLS LAST, value
+                    """).fetchall()
+                finally:
+                    conn.close()
+            except Exception:
+                self._stale = True
+                raise
+            self._stale = False
+
+            by_category: Dict[int, List[tuple]] = {}
+            for parent_id, value_id, value, row_count in rows:
+                by_category.setdefault(parent_id, []).append((value_id, value, row_count))
+            self._categories = {parent_id: _CategoryIndex(items) for parent_id, items in by_category.items()}
+            logger.info(f"Filter search index rebuilt: {len(rows)} values in {len(self._categories)} categories.")
+            return len(rows)
+
+    def search(self, parent_id: int, query: str = "", limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Busca valores de una categoría que contengan `query` (sin distinguir mayúsculas).
+
+        Args:
+            parent_id (int): Categoría raíz (1=Matrícula, 2=Tipo Aeronave, 3=Empresa, 4=Tipo Vuelo, 5=Callsign).
+            query (str): Texto buscado.
+            limit (int): Máximo de resultados.
+
+        Returns:
+            List[Dict]: [{'id', 'value', 'count'}], primero coincidencias por prefijo y luego por
+                        subcadena, cada grupo ordenado por cantidad de vuelos.
+        """
+        if self._categories is None or (self._stale and not self._rebuild_lock.locked()):
+            self.rebuild()
+        # Keep serving the previous snapshot while another request rebuilds
+        category = (self._categories or {}).get(parent_id)
+        if category is None:
+            return []
+        ranks = category.search(query.strip().lower(), limit)
+        return [
+            {"id": category.ids[rank], "value": category.values[rank], "count": category.counts[rank]}
+            for rank in ranks
+        ]
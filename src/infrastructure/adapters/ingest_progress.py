@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Per-file stages, in execution order: source read, column mapping, type parsing,
+# load into flights (route distances and filter values included) and control-table bookkeeping
+INGEST_STAGES = ("read", "rename", "parse", "insert", "control")
+
+# Telemetry persisted per file in file_processing_control (see migrations._m012_ingest_telemetry)
+TIMING_COLUMNS = (
+    [("file_size_bytes", "BIGINT"), ("duration_seconds", "DOUBLE")]
+    + [(f"{stage}_seconds", "DOUBLE") for stage in INGEST_STAGES]
+    + [("rows_per_second", "DOUBLE"), ("bytes_per_second", "DOUBLE")]
+)
+
+
+def ensure_timing_columns(conn) -> None:
+    """Agrega a file_processing_control las columnas de telemetría que falten."""
+    for column, sql_type in TIMING_COLUMNS:
+        conn.execute(f"ALTER TABLE file_processing_control ADD COLUMN IF NOT EXISTS {column} {sql_type}")
+
+
+def _rate(amount: float, seconds: float) -> Optional[float]:
+    return round(amount / seconds, 2) if seconds > 0 else None
+
+
+class IngestProgress:
+    """
+    Telemetría en vivo de la ingesta: archivo y etapa actuales, tiempos por etapa,
+    filas/s, bytes/s y tiempo estimado restante.
+
+    Una sola instancia compartida (Singleton en el contenedor) la actualiza el hilo de ingesta
+    y la leen /etl/progress y el stream SSE. Cada cambio incrementa `version`, de modo que los
+    lectores solo emiten cuando hay algo nuevo.
+    """
+    def __init__(self, history_size: int = 20):
+        """
+        Args:
+            history_size (int): Cantidad de archivos terminados que se conservan en la instantánea.
+        """
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self.version = 0
+        self._reset_run()
+
+    def _reset_run(self) -> None:
+        self.status = "idle"
+        self.phase = None
+        self.run_started_at: Optional[float] = None
+        self.run_finished_at: Optional[float] = None
+        self.total_files = 0
+        self.processed_count = 0
+        self.total_bytes = 0
+        self.bytes_done = 0
+        self.rows_done = 0
+        self.stage_totals = {stage: 0.0 for stage in INGEST_STAGES}
+        self.recent_files: List[Dict[str, Any]] = []
+        self._sizes: Dict[str, int] = {}
+        self._file: Optional[Dict[str, Any]] = None
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    # --- Run lifecycle (called by the ingest thread) ---
+
+    def start_run(self, files: List[str]) -> None:
+        """Inicia una corrida con la lista de rutas a procesar (sus tamaños alimentan el ETA)."""
+        sizes = {}
+        for path in files:
+            try:
+                sizes[os.path.basename(path)] = os.path.getsize(path)
+            except OSError:
+                sizes[os.path.basename(path)] = 0
+        with self._lock:
+            self._reset_run()
+            self.status = "running"
+            self.phase = "processing"
+            self.run_started_at = time.time()
+            self.total_files = len(files)
+            self.total_bytes = sum(sizes.values())
+            self._sizes = sizes
+            self._changed()
+
+    def set_phase(self, phase: str) -> None:
+        """Fase de la corrida ('processing', 'publishing' en la ingesta por instantánea)."""
+        with self._lock:
+            self.phase = phase
+            self._changed()
+
+    def skip_file(self, file_name: str) -> None:
+        """Archivo ya procesado: cuenta como avance pero sale del total de bytes pendientes."""
+        with self._lock:
+            self.processed_count += 1
+            self.total_bytes -= self._sizes.get(file_name, 0)
+            self._changed()
+
+    def start_file(self, file_name: str) -> None:
+        with self._lock:
+            self._file = {
+                "file_name": file_name,
+                "size_bytes": self._sizes.get(file_name, 0),
+                "started_at": time.time(),
+                "stage": None,
+                "stage_started_at": None,
+                "stages": {stage: 0.0 for stage in INGEST_STAGES},
+            }
+            self._changed()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mide el bloque como la etapa `name` del archivo actual (sin archivo actual no registra nada)."""
+        with self._lock:
+            current = self._file
+            if current is not None:
+                current["stage"] = name
+                current["stage_started_at"] = time.time()
+                self._changed()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if current is not None:
+                with self._lock:
+                    current["stages"][name] += elapsed
+                    self.stage_totals[name] += elapsed
+                    current["stage"] = None
+                    current["stage_started_at"] = None
+                    self._changed()
+
+    def file_metrics(self, rows: Optional[int]) -> Dict[str, Any]:
+        """
+        Telemetría del archivo actual con los nombres de columna de file_processing_control.
+
+        Args:
+            rows (Optional[int]): Filas cargadas (None si el archivo falló o se omitió).
+
+        Returns:
+            Dict: {columna: valor} para TIMING_COLUMNS.
+        """
+        with self._lock:
+            current = self._file or {"size_bytes": 0, "started_at": time.time(), "stages": {}}
+            duration = time.time() - current["started_at"]
+            metrics = {"file_size_bytes": current["size_bytes"], "duration_seconds": round(duration, 3)}
+            for stage in INGEST_STAGES:
+                metrics[f"{stage}_seconds"] = round(current["stages"].get(stage, 0.0), 3)
+            metrics["rows_per_second"] = _rate(rows or 0, duration) if rows else None
+            metrics["bytes_per_second"] = _rate(current["size_bytes"], duration) if rows else None
+            return metrics
+
+    def finish_file(self, status: str, rows: Optional[int] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            current = self._file
+            self._file = None
+            self.processed_count += 1
+            if current is None:
+                self._changed()
+                return
+            self.bytes_done += current["size_bytes"]
+            self.rows_done += rows or 0
+            duration = time.time() - current["started_at"]
+            self.recent_files.insert(0, {
+                "file_name": current["file_name"],
+                "status": status,
+                "rows": rows,
+                "error": error,
+                "size_bytes": current["size_bytes"],
+                "duration_seconds": round(duration, 3),
+                "stages": {stage: round(seconds, 3) for stage, seconds in current["stages"].items()},
+                "rows_per_second": _rate(rows or 0, duration) if rows else None,
+            })
+            del self.recent_files[self.history_size:]
+            self._changed()
+
+    def finish_run(self, status: str = "completed") -> None:
+        with self._lock:
+            self.status = status
+            self.phase = None
+            self._file = None
+            self.run_finished_at = time.time()
+            self._changed()
+
+    # --- Readers ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado actual de la ingesta.
+
+        Returns:
+            Dict: status ('idle', 'running', 'completed', 'error'), archivo y etapa actuales,
+                  avance (0-1, por bytes), filas/s, bytes/s, ETA en segundos, tiempos acumulados
+                  por etapa con la etapa cuello de botella y los últimos archivos terminados.
+        """
+        with self._lock:
+            now = time.time()
+            end = self.run_finished_at or now
+            elapsed = end - self.run_started_at if self.run_started_at else 0.0
+            current = self._file
+            current_bytes = current["size_bytes"] if current else 0
+            bytes_per_second = _rate(self.bytes_done, elapsed)
+            remaining = max(self.total_bytes - self.bytes_done, 0)
+            eta = round(remaining / bytes_per_second, 1) if self.status == "running" and bytes_per_second else None
+            if self.total_bytes > 0:
+                progress = self.bytes_done / self.total_bytes
+            else:
+                progress = self.processed_count / self.total_files if self.total_files else 0.0
+            busiest = max(self.stage_totals, key=self.stage_totals.get)
+            return {
+                "version": self.version,
+                "status": self.status,
+                "phase": self.phase,
+                "current_file": current["file_name"] if current else None,
+                "current_stage": current["stage"] if current else None,
+                "current_file_bytes": current_bytes,
+                "current_file_stages": (
+                    {stage: round(seconds, 3) for stage, seconds in current["stages"].items()} if current else None
+                ),
+                "total_files": self.total_files,
+                "processed_count": self.processed_count,
+                "progress": round(min(progress, 1.0), 4),
+                "rows_done": self.rows_done,
+                "bytes_done": self.bytes_done,
+                "total_bytes": self.total_bytes,
+                "elapsed_seconds": round(elapsed, 1),
+                "rows_per_second": _rate(self.rows_done, elapsed),
+                "bytes_per_second": bytes_per_second,
+                "eta_seconds": eta,
+                "stage_totals": {stage: round(seconds, 3) for stage, seconds in self.stage_totals.items()},
+                "bottleneck_stage": busiest if self.stage_totals[busiest] > 0 else None,
+                "recent_files": list(self.recent_files),
+            }
@@ -0,0 +1,404 @@
+"""
+Observabilidad: métricas en formato de texto de Prometheus, latencia por ruta HTTP y
+perfilado de las consultas DuckDB.
+
+- MetricsRegistry guarda contadores e histogramas con etiquetas y los expone con render()
+  (GET /metrics, ver metrics_controller).
+- PrometheusMiddleware mide cada petición HTTP por plantilla de ruta.
+- QueryObserver recibe cada sentencia ejecutada por una conexión de `connections.connect()`:
+  registra duración, filas leídas y devueltas por huella (fingerprint), si se configura guarda
+  el plan perfilado (EXPLAIN ANALYZE) de las consultas lentas y alimenta el QueryLog
+  (adapters.query_log) con el caso de uso que ejecutó cada sentencia.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.infrastructure.adapters.query_log import QueryLog, calling_use_case
+
+# Query/request latencies range from cache hits to full-year reports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Fingerprints beyond this many distinct statements are folded into "other" (bounded label cardinality)
+MAX_FINGERPRINTS = 500
+OTHER_FINGERPRINT = "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador acumulativo (solo sube)."""
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    """Valor instantáneo (sube y baja)."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Histograma con buckets acumulativos, suma y cantidad por combinación de etiquetas."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts, then sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return int(series[-1]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, observed in zip(self.buckets, series):
+                cumulative += observed
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, inf)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Conjunto de métricas del proceso, expuesto en el formato de texto 0.0.4 de Prometheus."""
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# --- SQL fingerprints ---
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.$])[-+]?\d+(?:\.\d+)?(?:e[-+]?\d+)?\b", re.I)
+_PARAMETERS = re.compile(r"\$\d+|\$\w+")
+_VALUE_LISTS = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce una sentencia a su forma: sin comentarios, literales y parámetros como `?`, listas
+    IN de cualquier largo como `in (?+)`, espacios colapsados y en minúsculas.
+    """
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _PARAMETERS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _VALUE_LISTS.sub("in (?+)", text)
+    return _SPACES.sub(" ", text).strip().lower()
+
+
+def fingerprint_sql(sql: str) -> Tuple[str, str]:
+    """
+    Returns:
+        Tuple[str, str]: (huella de 16 caracteres hex, sentencia normalizada). Consultas que solo
+            difieren en valores o en el largo de sus listas IN comparten huella.
+    """
+    normalized = normalize_sql(sql)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16], normalized
+
+
+# --- DuckDB query observer ---
+
+class QueryObserver:
+    """
+    Métricas por huella de las sentencias que ejecutan las conexiones de `connect()`.
+
+    Con `profile=True` cada conexión activa el profiler de DuckDB (sin salida a consola) y de
+    cada sentencia cuyo resultado se consume completo se leen las filas leídas
+    (cumulative_rows_scanned) y devueltas; el mismo perfil es el árbol de EXPLAIN ANALYZE, así que
+    guardarlo para las consultas lentas no las vuelve a ejecutar.
+    """
+    def __init__(self, registry: MetricsRegistry, profile: bool = True, slow_query_ms: float = 1000.0,
+                 capture_slow_plans: bool = False, plan_history: int = 50,
+                 max_fingerprints: int = MAX_FINGERPRINTS, query_log: Optional[QueryLog] = None):
+        """
+        Args:
+            registry (MetricsRegistry): Registro donde se publican las métricas.
+            profile (bool): Activar el profiler de DuckDB (filas leídas y planes).
+            slow_query_ms (float): Umbral en milisegundos a partir del cual una sentencia es lenta.
+            capture_slow_plans (bool): Guardar el plan perfilado de las sentencias lentas.
+            plan_history (int): Cantidad de planes lentos que se conservan (los más recientes).
+            max_fingerprints (int): Huellas distintas con serie propia; el resto cuenta como "other".
+            query_log (Optional[QueryLog]): Registro por sentencia (buffer y log en disco) con el caso de uso.
+        """
+        self.registry = registry
+        self.profile = profile
+        self.slow_query_seconds = slow_query_ms / 1000.0
+        self.capture_slow_plans = capture_slow_plans and profile
+        self.max_fingerprints = max_fingerprints
+        self.query_log = query_log
+        self._statements: Dict[str, str] = {}
+        self._slow_plans: deque = deque(maxlen=plan_history)
+        self._lock = threading.Lock()
+
+        self.duration = registry.histogram(
+            "duckdb_query_duration_seconds", "DuckDB statement execution time by fingerprint", ["fingerprint"])
+        self.rows_scanned = registry.counter(
+            "duckdb_query_rows_scanned_total", "Rows read by DuckDB table/file scans by fingerprint", ["fingerprint"])
+        self.rows_returned = registry.counter(
+            "duckdb_query_rows_returned_total", "Rows returned by DuckDB statements by fingerprint", ["fingerprint"])
+        self.errors = registry.counter(
+            "duckdb_query_errors_total", "DuckDB statements that raised, by fingerprint and error type",
+            ["fingerprint", "error"])
+        self.slow = registry.counter(
+            "duckdb_slow_queries_total", "DuckDB statements slower than the slow-query threshold", ["fingerprint"])
+        self.statement_info = registry.gauge(
+            "duckdb_query_fingerprint_info", "Normalized statement of each fingerprint", ["fingerprint", "statement"])
+
+    def prepare(self, conn) -> None:
+        """Configura una conexión recién abierta (activa el profiler si corresponde)."""
+        if self.profile:
+            conn.execute("PRAGMA enable_profiling='no_output'")
+
+    def _label(self, fingerprint: str, normalized: str) -> str:
+        with self._lock:
+            if fingerprint not in self._statements:
+                if len(self._statements) >= self.max_fingerprints:
+                    return OTHER_FINGERPRINT
+                self._statements[fingerprint] = normalized
+                self.statement_info.set(1, fingerprint=fingerprint, statement=normalized[:300])
+        return fingerprint
+
+    def read_profile(self, conn, sql: str) -> Optional[Dict[str, Any]]:
+        """
+        Perfil de la última sentencia de `conn`, o None si el profiler está apagado o el perfil aún
+        no es final (DuckDB lo cierra cuando el resultado se consumió completo).
+        """
+        if not self.profile:
+            return None
+        try:
+            profile = json.loads(conn.get_profiling_information(format="json"))
+        except Exception:
+            # Statements without a physical plan (PRAGMA, SET, some DDL) have no profile
+            return None
+        # An unfinished or stale profile belongs to another statement
+        return profile if profile.get("query_name") == sql else None
+
+    def record(self, conn, sql: str, seconds: float, profile: Optional[Dict[str, Any]] = None,
+               error: Optional[BaseException] = None, parameters: Optional[int] = None) -> None:
+        """
+        Registra una sentencia ejecutada por `conn`.
+
+        Args:
+            conn (duckdb.DuckDBPyConnection): Conexión que la ejecutó (de ella sale el plan lento).
+            sql (str): Texto de la sentencia.
+            seconds (float): Duración medida (ejecución más lectura del resultado).
+            profile (Optional[Dict[str, Any]]): Perfil final de read_profile; sin él no se cuentan filas.
+            error (Optional[BaseException]): Excepción lanzada, si falló.
+            parameters (Optional[int]): Cantidad de parámetros enlazados (para el QueryLog).
+        """
+        fingerprint, normalized = fingerprint_sql(sql)
+        if self.query_log is not None and self.query_log.enabled:
+            # Called synchronously from the use case's stack, so the caller is still on it
+            rows = profile.get("rows_returned") if profile is not None else None
+            self.query_log.add(fingerprint, normalized, seconds, parameters=parameters, rows=rows,
+                               use_case=calling_use_case(self.query_log.use_cases_package), error=error)
+
+        fingerprint = self._label(fingerprint, normalized)
+        self.duration.observe(seconds, fingerprint=fingerprint)
+        if error is not None:
+            self.errors.inc(fingerprint=fingerprint, error=type(error).__name__)
+            return
+
+        if profile is not None:
+            self.rows_scanned.inc(profile.get("cumulative_rows_scanned") or 0, fingerprint=fingerprint)
+            self.rows_returned.inc(profile.get("rows_returned") or 0, fingerprint=fingerprint)
+
+        if seconds >= self.slow_query_seconds:
+            self.slow.inc(fingerprint=fingerprint)
+            if self.capture_slow_plans and profile is not None:
+                self._capture_plan(conn, fingerprint, sql, seconds, profile)
+
+    def _capture_plan(self, conn, fingerprint: str, sql: str, seconds: float, profile: Dict[str, Any]) -> None:
+        try:
+            plan = conn.get_profiling_information(format="query_tree")
+        except Exception:
+            return
+        with self._lock:
+            self._slow_plans.append({
+                "fingerprint": fingerprint,
+                "statement": sql,
+                "duration_ms": round(seconds * 1000, 2),
+                "rows_scanned": profile.get("cumulative_rows_scanned"),
+                "rows_returned": profile.get("rows_returned"),
+                "plan": plan,
+                "captured_at": time.time(),
+            })
+
+    def slow_plans(self, fingerprint: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Planes perfilados de las sentencias lentas, del más reciente al más antiguo."""
+        with self._lock:
+            plans = list(self._slow_plans)
+        plans.reverse()
+        return [p for p in plans if fingerprint is None or p["fingerprint"] == fingerprint]
+
+    def statements(self) -> Dict[str, str]:
+        """Sentencia normalizada de cada huella registrada."""
+        with self._lock:
+            return dict(self._statements)
+
+
+# --- HTTP request metrics ---
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI: latencia y cantidad de peticiones por método, plantilla de ruta (p. ej.
+    /api/v1/stats/{kind}, no la URL concreta) y código de estado, más las peticiones en curso.
+    Las respuestas en streaming (SSE, descargas) se miden hasta que termina el cuerpo.
+    """
+    def __init__(self, app, registry: MetricsRegistry, excluded_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"])
+        self.requests = registry.counter(
+            "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"])
+        self.in_progress = registry.gauge(
+            "http_requests_in_progress", "HTTP requests being served", ["method"])
+        self._active: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _track(self, method: str, delta: int) -> None:
+        with self._lock:
+            self._active[method] = self._active.get(method, 0) + delta
+            self.in_progress.set(self._active[method], method=method)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        self._track(method, 1)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._track(method, -1)
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            labels = {"method": method, "route": route, "status": str(status["code"])}
+            self.latency.observe(elapsed, **labels)
+            self.requests.inc(**labels)
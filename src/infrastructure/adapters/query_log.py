@@ -0,0 +1,203 @@
+"""
+Registro de sentencias DuckDB por huella y por caso de uso.
+
+El QueryObserver (ver adapters.observability) entrega cada sentencia medida a QueryLog, que la
+guarda en un buffer circular en memoria (consultado por /api/v1/metrics/queries/*) y, si se
+configura una ruta, en un log JSON por líneas con rotación por tamaño. Cada entrada lleva el
+caso de uso que la ejecutó, tomado de la pila de llamadas: los casos de uso arman el SQL por
+concatenación, así que la huella sola no dice qué pantalla lo originó.
+"""
+import json
+import logging
+import math
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+USE_CASES_PACKAGE = "src.application.use_cases"
+
+# Frames of the instrumentation itself never count as the caller
+_INSTRUMENTATION_MODULES = (
+    "src.infrastructure.adapters.database.connections",
+    "src.infrastructure.adapters.observability",
+    __name__,
+)
+
+ORDER_BY = ("total", "p95")
+
+
+def calling_use_case(package: str = USE_CASES_PACKAGE) -> Optional[str]:
+    """
+    Clase del caso de uso que está ejecutando la sentencia actual.
+
+    Recorre la pila desde el llamador: devuelve la clase del primer método definido en `package`;
+    si no hay ninguno (repositorios, controladores, migraciones) devuelve el primer código propio
+    de la aplicación fuera de la instrumentación, como `Clase` o `modulo:funcion`.
+
+    Returns:
+        Optional[str]: Nombre del llamador, o None si la sentencia no viene de la aplicación.
+    """
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("src.") and module not in _INSTRUMENTATION_MODULES:
+            owner = frame.f_locals.get("self")
+            if module.startswith(package + ".") and owner is not None:
+                return type(owner).__name__
+            if fallback is None:
+                fallback = type(owner).__name__ if owner is not None else f"{module.rsplit('.', 1)[-1]}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class QueryLog:
+    """
+    Últimas sentencias ejecutadas (buffer circular) más un log en disco con rotación.
+
+    Cada entrada registra huella, duración, cantidad de parámetros, filas devueltas, caso de uso
+    y error. `top()` agrega el contenido del buffer por huella, así que las estadísticas cubren
+    las últimas `capacity` sentencias y no toda la vida del proceso (para eso está /metrics).
+    """
+    def __init__(self, enabled: bool = True, capacity: int = 10_000, path: Optional[str] = None,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, min_duration_ms: float = 0.0,
+                 use_cases_package: str = USE_CASES_PACKAGE):
+        """
+        Args:
+            enabled (bool): Si es False no se registra nada (y los endpoints responden 404).
+            capacity (int): Sentencias que conserva el buffer en memoria.
+            path (Optional[str]): Archivo del log en disco (JSON por líneas); vacío o None para no escribirlo.
+            max_bytes (int): Tamaño a partir del cual el archivo rota.
+            backup_count (int): Archivos rotados que se conservan (`path.1` ... `path.N`).
+            min_duration_ms (float): Duración mínima para escribir en disco (el buffer guarda todas).
+            use_cases_package (str): Paquete cuyas clases cuentan como casos de uso.
+        """
+        self.enabled = enabled
+        self.path = path or None
+        self.min_duration_seconds = min_duration_ms / 1000.0
+        self.use_cases_package = use_cases_package
+        self._entries: deque = deque(maxlen=capacity)
+        self._statements: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._handler: Optional[RotatingFileHandler] = None
+        if enabled and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # delay=True: the file is only created once the first statement is written
+            self._handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count,
+                                                encoding="utf-8", delay=True)
+
+    def add(self, fingerprint: str, statement: str, seconds: float, parameters: Optional[int] = None,
+            rows: Optional[int] = None, use_case: Optional[str] = None,
+            error: Optional[BaseException] = None) -> None:
+        """
+        Registra una sentencia medida.
+
+        Args:
+            fingerprint (str): Huella de la sentencia (fingerprint_sql).
+            statement (str): Sentencia normalizada.
+            seconds (float): Duración medida.
+            parameters (Optional[int]): Cantidad de parámetros enlazados.
+            rows (Optional[int]): Filas devueltas, si se conocen (requiere el profiler).
+            use_case (Optional[str]): Llamador (ver calling_use_case).
+            error (Optional[BaseException]): Excepción lanzada, si falló.
+        """
+        if not self.enabled:
+            return
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "fingerprint": fingerprint,
+            "duration_ms": round(seconds * 1000, 3),
+            "parameters": parameters,
+            "rows": rows,
+            "use_case": use_case,
+            "error": type(error).__name__ if error is not None else None,
+        }
+        with self._lock:
+            self._statements.setdefault(fingerprint, statement)
+            self._entries.append(entry)
+            if len(self._statements) > self._entries.maxlen:
+                # Forget statements whose executions already left the buffer
+                live = {e["fingerprint"] for e in self._entries}
+                self._statements = {k: v for k, v in self._statements.items() if k in live}
+        if self._handler is not None and seconds >= self.min_duration_seconds:
+            line = json.dumps({**entry, "statement": statement}, ensure_ascii=False)
+            self._handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO, "levelname": "INFO"}))
+
+    def recent(self, limit: int = 100, fingerprint: Optional[str] = None,
+               use_case: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Últimas sentencias registradas (la más reciente primero), con filtros opcionales."""
+        with self._lock:
+            entries = list(self._entries)
+            statements = dict(self._statements)
+        result = []
+        for entry in reversed(entries):
+            if fingerprint is not None and entry["fingerprint"] != fingerprint:
+                continue
+            if use_case is not None and entry["use_case"] != use_case:
+                continue
+            result.append({**entry, "statement": statements.get(entry["fingerprint"])})
+            if len(result) >= limit:
+                break
+        return result
+
+    def top(self, limit: int = 10, order_by: str = "total") -> List[Dict[str, Any]]:
+        """
+        Huellas con más tiempo acumulado (`total`) o peor percentil 95 (`p95`) dentro del buffer.
+
+        Args:
+            limit (int): Cantidad de huellas a devolver.
+            order_by (str): "total" o "p95".
+
+        Returns:
+            List[Dict[str, Any]]: Por huella: sentencia, ejecuciones, tiempo total/medio/p95/máximo
+                en ms, errores, filas devueltas y ejecuciones por caso de uso.
+        """
+        if order_by not in ORDER_BY:
+            raise ValueError(f"order_by must be one of {', '.join(ORDER_BY)}")
+        with self._lock:
+            entries = list(self._entries)
+            statements = dict(self._statements)
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            groups.setdefault(entry["fingerprint"], []).append(entry)
+
+        stats = []
+        for fingerprint, group in groups.items():
+            durations = sorted(entry["duration_ms"] for entry in group)
+            use_cases: Dict[str, int] = {}
+            for entry in group:
+                name = entry["use_case"] or "unknown"
+                use_cases[name] = use_cases.get(name, 0) + 1
+            stats.append({
+                "fingerprint": fingerprint,
+                "statement": statements.get(fingerprint),
+                "count": len(group),
+                "total_ms": round(sum(durations), 3),
+                "mean_ms": round(sum(durations) / len(durations), 3),
+                "p95_ms": _percentile(durations, 0.95),
+                "max_ms": durations[-1],
+                "errors": sum(1 for entry in group if entry["error"]),
+                "rows": sum(entry["rows"] or 0 for entry in group),
+                "use_cases": dict(sorted(use_cases.items(), key=lambda item: -item[1])),
+            })
+        key = "total_ms" if order_by == "total" else "p95_ms"
+        stats.sort(key=lambda item: item[key], reverse=True)
+        return stats[:limit]
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
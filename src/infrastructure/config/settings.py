@@ -29,11 +29,66 @@ class Settings(BaseSettings):
     # Database
     database_path: str = "data/metrics.duckdb"
     
+    # Flights Storage: "duckdb" (native table) or "parquet" (Hive-partitioned dataset + view)
+    flights_storage_backend: str = "duckdb"
+    flights_parquet_directory: str = "data/flights_parquet"
+    flights_partition_by_file: bool = False
+    
+    # Ingest: build into a staging database and publish in one transaction (readers keep the previous
+    # snapshot and only wait, up to duckdb_connect_wait_seconds, while the publish holds the write connection)
+    ingest_snapshot_mode: bool = False
+    
     # Data Processing
     data_directory: str = "data"
     file_pattern: str = "data/*.csv"
     max_workers: int = 4
     
+    # Report Jobs (asynchronous report generation; runs on the report query executor)
+    report_jobs_directory: str = "data/report_jobs"
+    report_job_ttl_seconds: int = 3600
+    
+    # Ingest Jobs (single-writer queue for ingest/compact/backfill; see use_cases.manage_ingest_jobs)
+    ingest_jobs_directory: str = "data/ingest_jobs"
+    ingest_job_history: int = 50
+    
+    # Query Executors (bounded thread pools per workload; see adapters.api.query_executor)
+    interactive_query_workers: int = 8
+    report_query_workers: int = 2
+    ml_query_workers: int = 2
+    
+    # Resource Governor (see adapters.database.resource_governor). DuckDB engine budget for the shared
+    # metrics database: 0 / "" keep DuckDB's defaults (all cores, 80% of RAM, <database>.tmp)
+    duckdb_threads: int = 0
+    duckdb_memory_limit: str = ""
+    duckdb_temp_directory: str = ""
+    duckdb_max_temp_directory_size: str = ""
+    # How long connect() waits for the database file while it is open with the other mode (read-only vs write)
+    duckdb_connect_wait_seconds: float = 30.0
+    # Per-workload statement timeouts in seconds (0 = none)
+    interactive_statement_timeout_seconds: float = 60.0
+    report_statement_timeout_seconds: float = 900.0
+    ingest_statement_timeout_seconds: float = 0.0
+    ml_statement_timeout_seconds: float = 600.0
+    # Limits of the databases the ingest opens on its own (snapshot staging); "" / 0 = engine budget
+    ingest_threads: int = 0
+    ingest_memory_limit: str = ""
+    ingest_temp_directory: str = ""
+    
+    # Observability (Prometheus /metrics, per-route latency and DuckDB query profiling; see adapters.observability)
+    observability_enabled: bool = True
+    query_profiling_enabled: bool = True
+    slow_query_ms: float = 1000.0
+    capture_slow_query_plans: bool = False
+    slow_query_plan_history: int = 50
+    
+    # Query Log (per-statement ring buffer + rotating JSON-lines file, attributed to the calling use case)
+    query_log_enabled: bool = True
+    query_log_size: int = 10000
+    query_log_path: str = "data/logs/query_log.jsonl"
+    query_log_max_bytes: int = 10485760
+    query_log_backup_count: int = 5
+    query_log_min_ms: float = 0.0
+    
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:8000", "http://localhost:5173"]
     
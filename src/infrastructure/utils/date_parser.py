@@ -1,5 +1,46 @@
+import threading
 from datetime import datetime, time as datetime_time
-from typing import Optional, Union
+from typing import Callable, Optional, Union
+
+import polars as pl
+
+# Tokens that mean "no value" in exported spreadsheets
+_NULL_TOKENS = ['nan', 'none', 'nat', '']
+
+
+def per_distinct(expr: pl.Expr, build: Callable[[pl.Expr], pl.Expr], dtype,
+                 max_cached: int = 10_000) -> pl.Expr:
+    """
+    Evalúa `build` una sola vez por valor distinto y reparte el resultado con un reemplazo por
+    hash: fechas, horas y niveles se repiten mucho dentro de un archivo. Los valores ya resueltos
+    se recuerdan entre lotes (hasta `max_cached`), así que la mayoría de los lotes no vuelve a
+    evaluar la expresión; si un lote casi no repite valores (p. ej. un ID) se evalúa directo.
+    Es elementwise, así que el motor streaming lo sigue procesando lote a lote.
+    """
+    lock = threading.Lock()
+    cache = {"values": pl.Series("value", [], dtype=pl.Utf8), "parsed": pl.Series("value", [], dtype=dtype)}
+
+    def evaluate(values: pl.Series) -> pl.Series:
+        return values.to_frame("value").select(build(pl.col("value"))).to_series()
+
+    def parse(series: pl.Series) -> pl.Series:
+        text = series.cast(pl.Utf8)
+        values = text.drop_nulls().unique()
+        if values.len() * 2 > text.len():
+            return evaluate(text)
+        with lock:
+            new = values.filter(~values.is_in(cache["values"].implode()))
+            if cache["values"].len() + new.len() > max_cached:
+                known, parsed = values, evaluate(values)
+            else:
+                if new.len():
+                    cache["values"] = pl.concat([cache["values"], new])
+                    cache["parsed"] = pl.concat([cache["parsed"], evaluate(new)])
+                known, parsed = cache["values"], cache["parsed"]
+        return text.replace_strict(known, parsed, default=None, return_dtype=dtype)
+
+    return expr.map_batches(parse, return_dtype=dtype, is_elementwise=True)
+
 
 class DateParser:
     @staticmethod
@@ -56,3 +97,70 @@ class DateParser:
             return datetime_time(int(time_str[:2]), int(time_str[2:]))
         except:
             return None
+
+    # --- Vectorized equivalents (same rules, evaluated by Polars on whole columns) ---
+
+    @staticmethod
+    def _clean_text(expr: pl.Expr) -> pl.Expr:
+        text = expr.cast(pl.Utf8).str.replace_all(".0", "", literal=True).str.strip_chars()
+        return pl.when(text.str.to_lowercase().is_in(_NULL_TOKENS)).then(None).otherwise(text)
+
+    @staticmethod
+    def _number(expr: pl.Expr) -> pl.Expr:
+        # int(): optional sign and surrounding whitespace, digits only
+        digits = expr.str.strip_chars()
+        return pl.when(digits.str.contains(r"^[+-]?\d+$")).then(digits.cast(pl.Int64, strict=False))
+
+    @staticmethod
+    def date_expr(expr: pl.Expr) -> pl.Expr:
+        """
+        Versión vectorizada de parse_date: prueba los mismos formatos en el mismo orden sobre toda
+        la columna, sin llamar a Python por fila (apta para el motor streaming de Polars).
+        """
+        text = DateParser._clean_text(expr)
+        length = text.str.len_chars()
+        number = DateParser._number
+
+        def strptime(value: pl.Expr, fmt: str, pattern: str) -> pl.Expr:
+            # The pattern mirrors strptime's digit counts (%Y needs 4 digits, %d/%m/%H/%M/%S take 1-2)
+            parsed = value.str.strptime(pl.Datetime if "%H" in fmt else pl.Date, fmt, strict=False, exact=True)
+            return pl.when(value.str.contains(pattern)).then(parsed.dt.date() if "%H" in fmt else parsed)
+
+        def ymd(year: pl.Expr, month: pl.Expr, day: pl.Expr) -> pl.Expr:
+            return pl.concat_str([year, month, day], separator="-").str.strptime(pl.Date, '%Y-%m-%d', strict=False)
+
+        return pl.coalesce(
+            strptime(text, '%Y-%m-%d %H:%M:%S', r"^\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:\d{1,2}$"),
+            strptime(text, '%Y-%m-%d', r"^\d{4}-\d{1,2}-\d{1,2}$"),
+            strptime(text, '%d/%m/%Y', r"^\d{1,2}/\d{1,2}/\d{4}$"),
+            strptime(text, '%d-%m-%Y', r"^\d{1,2}-\d{1,2}-\d{4}$"),
+            # Compact forms: ddmmyy, dmmyy, mmyy (first day of the month), dmy
+            pl.when(length == 6).then(strptime(text, '%d%m%y', r"^\d{6}$")),
+            pl.when(length == 5).then(ymd(
+                number(pl.lit("20") + text.str.slice(3)), number(text.str.slice(1, 2)), number(text.str.slice(0, 1))
+            )),
+            pl.when(length == 4).then(ymd(
+                number(pl.lit("20") + text.str.slice(2)), number(text.str.slice(0, 2)), pl.lit(1, dtype=pl.Int64)
+            )),
+            pl.when(length == 3).then(ymd(
+                number(pl.lit("20") + text.str.slice(2)), number(text.str.slice(1, 1)), number(text.str.slice(0, 1))
+            )),
+        )
+
+    @staticmethod
+    def time_expr(expr: pl.Expr) -> pl.Expr:
+        """Versión vectorizada de parse_time (HHMM, con las mismas reglas para valores con punto)."""
+        text = DateParser._clean_text(expr).str.zfill(4)
+        main = text.str.split(".").list.first()
+        number = DateParser._number
+
+        def clock(hour: pl.Expr, minute: pl.Expr) -> pl.Expr:
+            valid = hour.is_between(0, 23) & minute.is_between(0, 59)
+            return pl.when(valid).then(pl.time(hour.clip(0, 23), minute.clip(0, 59)))
+
+        dotted = (
+            pl.when(main.str.len_chars() > 4).then(clock(number(main.str.slice(0, 2)), number(main.str.slice(2))))
+            .when(main.str.len_chars() < 2).then(clock(pl.lit(0, dtype=pl.Int64), number(main)))
+        )
+        plain = clock(number(text.str.slice(0, 2)), number(text.str.slice(2)))
+        return pl.when(text.str.contains(".", literal=True)).then(dotted).otherwise(plain)
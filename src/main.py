@@ -3,7 +3,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .infrastructure.adapters.api.metrics_controller import router as metrics_router
+from .infrastructure.adapters.api.metrics_controller import router as metrics_router, exposition_router
 from .infrastructure.adapters.api.etl_controller import router as etl_router
 from .infrastructure.adapters.api.stats_controller import router as stats_router
 from .infrastructure.adapters.api.filters_controller import router as filters_router
@@ -14,8 +14,16 @@ from .infrastructure.adapters.api.region_airports_controller import router as re
 from .infrastructure.adapters.api.files_controller import router as files_router
 from .infrastructure.adapters.api.sectors_controller import router as sectors_router
 from .infrastructure.adapters.api.predictive_controller import router as predictive_router
+from .infrastructure.adapters.database.connections import (
+    set_connect_wait, set_query_observer, set_resource_governor,
+)
+from .infrastructure.adapters.database.flights_store import set_partition_pruning
+from .infrastructure.adapters.observability import PrometheusMiddleware
 from .infrastructure.config.settings import Settings
-from .application.di.container import Container
+from .application.di.container import (
+    Container, get_interactive_executor, get_report_executor, get_ml_executor, get_manage_ingest_jobs_use_case,
+    get_metrics_registry, get_query_observer, get_query_log, get_resource_governor
+)
 
 
 # Initialize settings and container
@@ -34,6 +42,27 @@ async def lifespan(app: FastAPI):
     print(f"Starting {settings.app_name} v{settings.app_version}")
     print(f"Database: {settings.database_path}")
     print(f"Data directory: {settings.data_directory}")
+
+    # Undo what an interrupted compaction or load left in the flights storage (every start)
+    try:
+        get_manage_ingest_jobs_use_case().recover_storage()
+    except Exception as e:
+        print(f"Warning: could not recover the flights storage: {e}")
+
+    # Apply pending schema migrations once, before serving requests
+    try:
+        applied = container.schema_migrator().run()
+        print(f"Schema migrations applied: {applied or 'none (up to date)'}")
+    except Exception as e:
+        print(f"Warning: could not apply schema migrations: {e}")
+
+    # Ingest jobs left running by a previous process can be resumed from their checkpoint
+    try:
+        interrupted = get_manage_ingest_jobs_use_case().mark_interrupted()
+        if interrupted:
+            print(f"Ingest jobs interrupted by the previous shutdown: {interrupted}")
+    except Exception as e:
+        print(f"Warning: could not recover ingest jobs: {e}")
     
     # Log Routes
     # We access app via closure/argument? No, lifespan receives app.
@@ -47,6 +76,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("Shutting down...")
+    for executor in (get_interactive_executor(), get_report_executor(), get_ml_executor()):
+        executor.shutdown()
+    get_query_log().close()
 
 
 def create_app() -> FastAPI:
@@ -71,8 +103,23 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Request latency per route and DuckDB statement metrics, scraped from /metrics
+    if settings.observability_enabled:
+        app.add_middleware(PrometheusMiddleware, registry=get_metrics_registry())
+        set_query_observer(get_query_observer())
+    
+    # Threads, memory, spill and statement timeouts per workload for every connect()
+    set_resource_governor(get_resource_governor())
+    
+    # Readers and the ingest writer take turns on the database file instead of failing
+    set_connect_wait(settings.duckdb_connect_wait_seconds)
+    
+    # Date filters also bound the year/month partitions of the Parquet dataset
+    set_partition_pruning(settings.flights_storage_backend == "parquet")
+    
     # Include routers
     app.include_router(metrics_router)
+    app.include_router(exposition_router)
     app.include_router(etl_router)
     app.include_router(stats_router)
     app.include_router(filters_router)
@@ -6,7 +6,7 @@ import json
 try:
     print("Testing API logic...")
     # Use the correct DB path
-    repo = DuckDBAirportRepository(db_path="data/metrics.duckdb", csv_path="data/raw/data.csv")
+    repo = DuckDBAirportRepository(db_path="data/metrics.duckdb")
     use_case = ManageAirports(repo)
     
     print("Calling get_airports...")
@@ -0,0 +1,53 @@
+"""Integration tests for the in-memory airport catalog."""
+import pytest
+
+from src.domain.entities.airport import Airport
+from src.infrastructure.adapters.airport_catalog import CachedAirportRepository
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+from src.infrastructure.adapters.duckdb_airport_repository import DuckDBAirportRepository
+
+
+def _airport(icao, iata, name, city, country="Colombia"):
+    return Airport(icao_code=icao, iata_code=iata, name=name, city=city, country=country,
+                   latitude=4.7, longitude=-74.1, altitude=8000, timezone=-5, dst="N",
+                   type="airport", source="OurAirports")
+
+
+@pytest.fixture
+def repository(tmp_path):
+    db_path = str(tmp_path / "metrics.duckdb")
+    SchemaMigrator(db_path, airports_csv_path=str(tmp_path / "missing.csv"),
+                   region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+    duckdb_repository = DuckDBAirportRepository(db_path)
+    duckdb_repository.create(_airport("SKBO", "BOG", "El Dorado International Airport", "Bogotá"))
+    duckdb_repository.create(_airport("SKRG", "MDE", "José María Córdova International Airport", "Rionegro"))
+    duckdb_repository.create(_airport("KJFK", "JFK", "John F Kennedy International Airport", "New York", "United States"))
+    return CachedAirportRepository(duckdb_repository)
+
+
+def test_lookups_and_token_search(repository):
+    assert repository.get_by_icao("skbo").city == "Bogotá"
+    assert repository.get_by_iata("MDE").icao_code == "SKRG"
+    assert repository.get_by_icao("XXXX") is None
+
+    items, total = repository.get_paginated(1, 10, "bogota")
+    assert total == 1 and items[0].icao_code == "SKBO"
+
+    items, total = repository.get_paginated(1, 2, "international airport")
+    assert total == 3
+    assert [a.icao_code for a in items] == ["SKBO", "SKRG"]
+
+    # Falls back to substring matching when no token starts with the term
+    items, total = repository.get_paginated(1, 10, "dova")
+    assert [a.icao_code for a in items] == ["SKRG"]
+
+
+def test_writes_invalidate_the_catalog(repository):
+    assert repository.get_paginated(1, 10)[1] == 3
+
+    created = repository.create(_airport("SKCL", "CLO", "Alfonso Bonilla Aragón", "Cali"))
+    assert repository.get_by_icao("SKCL").id == created.id
+
+    repository.delete(created.id)
+    assert repository.get_by_icao("SKCL") is None
+    assert repository.get_paginated(1, 10)[1] == 3
@@ -0,0 +1,53 @@
+"""Integration tests for the deterministic synthetic flight generator used by the benchmarks."""
+import duckdb
+
+from benchmarks.generator import build_database, flights_sql, open_generator, write_source_files
+from src.application.use_cases.ingest_flights_data import IngestFlightsDataUseCase
+from src.infrastructure.adapters.database.flights_store import FLIGHTS_COLUMNS
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+
+
+def _rows(seed, start, count):
+    conn = open_generator(seed)
+    try:
+        return conn.execute(f"SELECT * FROM ({flights_sql(start, count)}) ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_rows_depend_only_on_seed_and_row_number():
+    full = _rows(7, 0, 2000)
+
+    assert full == _rows(7, 0, 1000) + _rows(7, 1000, 1000)
+    assert full != _rows(8, 0, 2000)
+    assert all(row[FLIGHTS_COLUMNS.index("origen")] != row[FLIGHTS_COLUMNS.index("destino")] for row in full)
+
+
+def test_database_and_source_files_hold_the_same_flights(tmp_path):
+    db_path = str(tmp_path / "bench.duckdb")
+    build_database(db_path, 3000, seed=7, rows_per_file=1000)
+    files = write_source_files(str(tmp_path / "csv"), 3000, "csv", seed=7, rows_per_file=3000)
+
+    IngestFlightsDataUseCase._instance = None
+    try:
+        use_case = IngestFlightsDataUseCase(db_path=str(tmp_path / "ingested.duckdb"), data_dir=str(tmp_path / "csv"))
+        SchemaMigrator(use_case.db_path, use_case.store,
+                       airports_csv_path=str(tmp_path / "missing.csv"),
+                       region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+        use_case.execute(files=files)
+    finally:
+        IngestFlightsDataUseCase._instance = None
+
+    columns = ", ".join(column for column in FLIGHTS_COLUMNS if column != "file_id")
+    conn = duckdb.connect(db_path)
+    try:
+        assert conn.execute("SELECT count(*), count(DISTINCT file_id) FROM flights").fetchone() == (3000, 3)
+        generated = conn.execute(f"SELECT {columns} FROM flights ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        ingested = conn.execute(f"SELECT {columns} FROM flights ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    assert ingested == generated
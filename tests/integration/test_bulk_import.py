@@ -0,0 +1,85 @@
+"""Integration tests for the bulk airport and region-airport imports."""
+import duckdb
+import pytest
+
+from src.application.use_cases.manage_airports import ManageAirports
+from src.application.use_cases.manage_region_airports import ManageRegionAirports
+from src.domain.entities.airport import Airport
+from src.infrastructure.adapters.airport_catalog import CachedAirportRepository
+from src.infrastructure.adapters.database.flights_store import DuckDBFlightsStore, FLIGHTS_COLUMNS
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+from src.infrastructure.adapters.duckdb_airport_repository import DuckDBAirportRepository
+from src.infrastructure.adapters.duckdb_region_airport_repository import DuckDBRegionAirportRepository
+from src.infrastructure.adapters.duckdb_repository import DuckDBRegionRepository
+
+AIRPORTS_CSV = b"""icao_code,iata_code,name,city,country,latitude,longitude,altitude,timezone,dst,type,source
+skbo,BOG,El Dorado International Airport,Bogota,Colombia,4.70159,-74.1469,8361,-5,N,airport,OurAirports
+SKCL,CLO,Alfonso Bonilla Aragon,Cali,Colombia,3.54322,-76.3816,3162,-5,N,airport,OurAirports
+SKRG,MDE,,Rionegro,Colombia,6.16454,-75.4231,6955,-5,N,airport,OurAirports
+SKMD,EOH,Olaya Herrera,Medellin,Colombia,north,-75.59,4949,-5,N,airport,OurAirports
+SKCL,CLO,Duplicated Cali,Cali,Colombia,3.5,-76.3,3162,-5,N,airport,OurAirports
+"""
+
+
+def _airport(icao, name):
+    return Airport(icao_code=icao, name=name, city="Bogota", country="Colombia", latitude=4.7, longitude=-74.1,
+                   altitude=8361, timezone=-5, dst="N", type="airport", source="OurAirports")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    SchemaMigrator(path, airports_csv_path=str(tmp_path / "missing.csv"),
+                   region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+    DuckDBAirportRepository(path).create(_airport("SKBO", "Old name"))
+    return path
+
+
+def test_import_airports_upserts_valid_rows_and_reports_errors(db_path):
+    repository = CachedAirportRepository(DuckDBAirportRepository(db_path))
+    assert repository.get_by_icao("SKBO").name == "Old name"
+
+    report = ManageAirports(repository).import_airports("airports.csv", AIRPORTS_CSV)
+
+    assert (report["total_rows"], report["inserted"], report["updated"], report["rejected"]) == (5, 1, 1, 3)
+    assert [(e["row"], e["icao_code"]) for e in report["errors"]] == [(3, "SKRG"), (4, "SKMD"), (5, "SKCL")]
+    # The catalog was invalidated and ids of existing airports are preserved
+    assert repository.get_by_icao("SKBO").name == "El Dorado International Airport"
+    assert repository.get_by_icao("SKBO").id == 1
+    assert repository.get_by_icao("SKCL").name == "Alfonso Bonilla Aragon"
+    assert repository.get_by_icao("SKRG") is None
+
+    with pytest.raises(ValueError):
+        ManageAirports(repository).import_airports("airports.csv", b"iata_code,name\nBOG,El Dorado\n")
+    with pytest.raises(ValueError):
+        ManageAirports(repository).import_airports("airports.xlsx", AIRPORTS_CSV)
+
+
+def test_import_region_airports_validates_references_and_refreshes_flights(db_path):
+    DuckDBAirportRepository(db_path).create(_airport("SKCL", "Cali"))
+    with duckdb.connect(db_path) as conn:
+        conn.execute("INSERT INTO region_airports (icao_code, region_id) VALUES ('SKBO', 1)")
+        conn.execute("INSERT INTO file_processing_control (id, file_name, status) VALUES (1, 'vuelos.csv', 'COMPLETED')")
+        values = {"fecha": "DATE '2024-01-01'", "origen": "'SKBO'", "destino": "'SKCL'", "file_id": "1"}
+        columns = ", ".join(f"{values.get(column, 'NULL')} AS {column}" for column in FLIGHTS_COLUMNS)
+        conn.execute(f"CREATE TEMP VIEW batch AS SELECT {columns}")
+        DuckDBFlightsStore().append(conn, "batch", 1)
+
+    use_case = ManageRegionAirports(
+        DuckDBRegionAirportRepository(db_path), DuckDBAirportRepository(db_path), DuckDBRegionRepository(db_path)
+    )
+    report = use_case.import_region_airports(
+        "mappings.csv", b"icao_code,region_id\nSKBO,2\nSKCL,1\nKJFK,1\nSKCL,99\nSKCL,x\n"
+    )
+
+    assert (report["inserted"], report["updated"], report["rejected"]) == (1, 1, 3)
+    assert {(e["row"], e["error"]) for e in report["errors"]} == {
+        (3, "El aeropuerto no existe en el catálogo"),
+        (4, "La región no existe"),
+        (4, "Código ICAO repetido en el archivo (se aplica la primera aparición)"),
+        (5, "Valor no numérico en region_id"),
+        (5, "Código ICAO repetido en el archivo (se aplica la primera aparición)"),
+    }
+    with duckdb.connect(db_path) as conn:
+        assert conn.execute("SELECT icao_code, region_id FROM region_airports ORDER BY icao_code").fetchall() == [("SKBO", 2), ("SKCL", 1)]
+        assert conn.execute("SELECT region_origen_id, region_destino_id FROM flights").fetchone() == (2, 1)
@@ -0,0 +1,74 @@
+"""Integration tests for streamed uploads in FilesystemRepository."""
+import hashlib
+import io
+import os
+
+import openpyxl
+import pytest
+
+from src.infrastructure.adapters.filesystem_repository import FilesystemRepository, read_xlsx_header
+
+HEADERS = ['Fecha', 'ID', 'SSR', 'Callsign', 'Empresa', 'Origen', 'Destino', 'Nivel', 'Tipo Aeronave']
+
+
+def _workbook_bytes(headers, rows=50, data_sheet_index=0):
+    wb = openpyxl.Workbook()
+    notes = wb.active
+    notes.title = "Resumen"
+    notes.append(["Nota"])
+    data = wb.create_sheet("Vuelos", index=data_sheet_index)
+    data.append(headers)
+    for i in range(rows):
+        data.append(["2024-01-01", i, "1234", f"AVA{i}", "AVIANCA", "SKBO", "SKRG", 320, "A320"])
+    wb.active = data_sheet_index
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return FilesystemRepository(data_directory=str(tmp_path / "data"))
+
+
+def test_valid_upload_is_streamed_hashed_and_published(repository, monkeypatch):
+    content = _workbook_bytes(HEADERS, rows=2000)
+    monkeypatch.setattr("src.infrastructure.adapters.filesystem_repository.UPLOAD_CHUNK_BYTES", 4096)
+
+    info = repository.save_file("enero.xlsx", io.BytesIO(content))
+
+    assert info.validation_status, info.error_message
+    assert info.size_bytes == len(content)
+    assert info.content_hash == hashlib.sha256(content).hexdigest()
+    assert os.listdir(repository.data_directory) == ["enero.xlsx"]
+    with open(os.path.join(repository.data_directory, "enero.xlsx"), "rb") as f:
+        assert f.read() == content
+
+
+def test_header_is_read_from_the_active_sheet(tmp_path):
+    path = tmp_path / "book.xlsx"
+    # The notes sheet comes first; the active tab is the data sheet
+    path.write_bytes(_workbook_bytes(HEADERS, data_sheet_index=1))
+
+    assert read_xlsx_header(str(path)) == HEADERS
+
+
+def test_invalid_uploads_leave_no_files_behind(repository):
+    missing = repository.save_file("incompleto.xlsx", _workbook_bytes(HEADERS[:3]))
+    assert not missing.validation_status
+    assert "Faltan columnas requeridas" in missing.error_message
+
+    not_zip = repository.save_file("texto.xlsx", b"Fecha,ID\n2024-01-01,1\n")
+    assert not not_zip.validation_status
+    assert "No es un archivo ZIP" in not_zip.error_message
+
+    old_excel = repository.save_file("viejo.xlsx", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 64)
+    assert ".xls" in old_excel.error_message
+
+    truncated = repository.save_file("roto.xlsx", _workbook_bytes(HEADERS)[:400])
+    assert "corrupto" in truncated.error_message
+
+    empty = repository.save_file("vacio.xlsx", b"")
+    assert empty.error_message == "El archivo está vacío"
+
+    assert os.listdir(repository.data_directory) == []
@@ -0,0 +1,63 @@
+"""Integration tests for the in-memory filter value search index."""
+import duckdb
+import pytest
+
+from src.application.use_cases.manage_filters import ManageFilters
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+from src.infrastructure.adapters.filter_search_index import FilterSearchIndex
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    SchemaMigrator(path, airports_csv_path=str(tmp_path / "missing.csv"),
+                   region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+    conn = duckdb.connect(path)
+    conn.executemany(
+        "INSERT INTO filters_values (value, parent_id, category_code, row_count) VALUES (?, 5, 'CALLSIGN_VAL', ?)",
+        [["AVA101", 5], ["AVA102", 40], ["LAN201", 12], ["VVC301", 7], ["XAVA01", 90]]
+    )
+    conn.close()
+    return path
+
+
+def _values(results):
+    return [r["value"] for r in results]
+
+
+def test_prefix_matches_rank_before_substring_matches_by_frequency(db_path):
+    index = FilterSearchIndex(db_path)
+
+    assert _values(index.search(5, "ava")) == ["AVA102", "AVA101", "XAVA01"]
+    assert _values(index.search(5, "a10")) == ["AVA102", "AVA101"]
+    assert _values(index.search(5, "ava10")) == ["AVA102", "AVA101"]
+    assert _values(index.search(5, "")) == ["XAVA01", "AVA102", "LAN201", "VVC301", "AVA101"]
+    assert [(r["value"], r["count"]) for r in index.search(5, "va", limit=2)] == [("XAVA01", 90), ("AVA102", 40)]
+    assert index.search(5, "zzzz") == []
+    assert index.search(1, "ava") == []
+
+
+def test_index_is_rebuilt_when_filters_are_refreshed(db_path):
+    index = FilterSearchIndex(db_path)
+    filters = ManageFilters(db_path, search_index=index)
+    assert _values(filters.search_values(5, "lan")) == ["LAN201"]
+
+    conn = duckdb.connect(db_path)
+    conn.execute("INSERT INTO filters_values (value, parent_id, category_code, row_count) VALUES ('LAN999', 5, 'CALLSIGN_VAL', 100)")
+    conn.close()
+
+    # Served from the current snapshot until rebuilt
+    assert _values(filters.search_values(5, "lan")) == ["LAN201"]
+    assert index.rebuild() == 6
+    assert _values(filters.search_values(5, "lan")) == ["LAN999", "LAN201"]
+
+    # A refresh recomputes filters_values from flights (empty here) and rebuilds the index right away
+    filters.refresh_filters()
+    assert index.search(5, "lan") == []
+
+
+def test_search_errors_are_raised_not_hidden(tmp_path):
+    missing = str(tmp_path / "missing.duckdb")
+    filters = ManageFilters(missing, search_index=FilterSearchIndex(missing))
+    with pytest.raises(duckdb.Error):
+        filters.search_values(5, "lan")
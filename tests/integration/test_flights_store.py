@@ -0,0 +1,568 @@
+"""Integration tests for the flights storage backends."""
+import os
+import duckdb
+import pytest
+
+from src.application.use_cases.ingest_flights_data import IngestFlightsDataUseCase
+from src.infrastructure.adapters.database import flights_store
+from src.infrastructure.adapters.database.flights_store import FLIGHTS_SCHEMA, fecha_range_sql
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+
+
+CSV_CONTENT = (
+    "Fecha,Callsign,Empresa,Origen,Destino\n"
+    "2024-01-05,AVA101,AVIANCA,SKBO,SKRG\n"
+    "2024-01-20,AVA102,AVIANCA,SKRG,SKBO\n"
+    "2024-02-03,LAN201,LATAM,SKBO,SKCL\n"
+)
+
+
+@pytest.fixture
+def ingest(tmp_path):
+    def build(backend, partition_by_file=False, snapshot_ingest=False):
+        IngestFlightsDataUseCase._instance = None
+        data_dir = tmp_path / "data"
+        data_dir.mkdir(exist_ok=True)
+        (data_dir / "vuelos.csv").write_text(CSV_CONTENT)
+        use_case = IngestFlightsDataUseCase(
+            db_path=str(tmp_path / "metrics.duckdb"),
+            data_dir=str(data_dir),
+            storage_backend=backend,
+            parquet_directory=str(tmp_path / "flights_parquet"),
+            partition_by_file=partition_by_file,
+            snapshot_ingest=snapshot_ingest,
+        )
+        SchemaMigrator(use_case.db_path, use_case.store,
+                       airports_csv_path=str(tmp_path / "missing.csv"),
+                       region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+        return use_case
+    yield build
+    IngestFlightsDataUseCase._instance = None
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_ingest_and_delete_file(ingest, backend):
+    use_case = ingest(backend)
+
+    result = use_case.execute()
+    assert result["status"] == "success"
+    assert result["rows_inserted"] == 3
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        rows = conn.execute(
+            "SELECT count(*) FROM flights WHERE fecha >= '2024-02-01'"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert rows == 1
+
+    use_case.delete_file("vuelos.csv")
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        assert conn.execute("SELECT count(*) FROM flights").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_parquet_backend_writes_hive_partitions(ingest, tmp_path):
+    use_case = ingest("parquet", partition_by_file=True)
+    use_case.execute()
+
+    root = tmp_path / "flights_parquet"
+    months = sorted(p.name for p in (root / "year=2024").iterdir())
+    assert months == ["month=1", "month=2"]
+    assert any(name.startswith("file_id=") for name in os.listdir(root / "year=2024" / "month=1"))
+
+    use_case.delete_file("vuelos.csv")
+    assert not list(root.rglob("*.parquet"))
+
+
+def test_parquet_date_filters_prune_partitions(ingest, monkeypatch):
+    monkeypatch.setattr(flights_store, "_partition_pruning", True)
+    use_case = ingest("parquet")
+    use_case.execute()
+
+    date_sql, params = fecha_range_sql(start="2024-02-01", end="2024-02-29")
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        assert conn.execute(f"SELECT count(*) FROM flights WHERE {date_sql}", params).fetchone()[0] == 1
+        plan = conn.execute(f"EXPLAIN ANALYZE SELECT count(*) FROM flights WHERE {date_sql}", params).fetchall()[0][1]
+    finally:
+        conn.close()
+    # Only the month=2 partition is opened
+    assert "Total Files Read: 1 " in plan
+
+
+def test_parquet_compaction_keeps_unfiled_rows_and_replaces_stale_backup(ingest, tmp_path):
+    use_case = ingest("parquet")
+    use_case.execute()
+
+    # Rows loaded before file tracking existed have no file_id
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        columns = ", ".join(f"CAST(NULL AS {type_}) AS {name}" for name, type_ in FLIGHTS_SCHEMA if name != "fecha")
+        conn.execute(f"CREATE TEMP VIEW legacy AS SELECT DATE '2023-05-01' AS fecha, {columns}")
+        use_case.store.insert(conn, "legacy", 0)
+        use_case.store.publish(conn)
+    finally:
+        conn.close()
+    stale = tmp_path / "flights_parquet.previous"
+    stale.mkdir()
+    (stale / "leftover.parquet").write_bytes(b"")
+
+    result = use_case.compact_storage()
+    assert result["status"] == "success", result.get("message")
+    assert result["rows"] == 4
+    assert not stale.exists()
+
+
+def test_duckdb_backend_dictionary_encodes_dimensions(ingest, tmp_path):
+    use_case = ingest("duckdb")
+    use_case.execute()
+
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+    )
+    result = use_case.execute()
+    assert result["rows_inserted"] == 1
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        column_types = dict(conn.execute(
+            "SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = 'flights'"
+        ).fetchall())
+        assert column_types["origen"] == "ENUM('SKBO', 'SKMD', 'SKRG')"
+        assert column_types["empresa"].startswith("ENUM")
+        assert column_types["callsign"] == "VARCHAR"
+
+        rows = conn.execute("""
+            SELECT origen, count(*) FROM flights
+            WHERE empresa IN ('VIVA', 'AVIANCA', 'UNKNOWN')
+            GROUP BY origen ORDER BY origen
+        """).fetchall()
+        assert rows == [("SKBO", 1), ("SKMD", 1), ("SKRG", 1)]
+    finally:
+        conn.close()
+
+
+
+def test_duckdb_backend_extends_dimensions_changed_by_another_process(ingest, tmp_path):
+    use_case = ingest("duckdb")
+    use_case.execute()
+
+    # Another worker (its own store instance) moves origen to a newer ENUM version
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        conn.execute("""
+            CREATE TEMP VIEW other_batch AS
+            SELECT 'SKCG' AS origen, NULL AS destino, NULL AS empresa,
+                   NULL AS tipo_vuelo, NULL AS tipo_aeronave, NULL AS eq_ssr
+        """)
+        flights_store.DuckDBFlightsStore().prepare(conn, "other_batch")
+    finally:
+        conn.close()
+
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+    )
+    result = use_case.execute()
+    assert result["status"] == "success", result.get("message")
+    assert result["rows_inserted"] == 1
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        origen_type = conn.execute(
+            "SELECT data_type FROM duckdb_columns() WHERE table_name = 'flights' AND column_name = 'origen'"
+        ).fetchone()[0]
+        assert origen_type == "ENUM('SKBO', 'SKCG', 'SKMD', 'SKRG')"
+        type_names = [row[0] for row in conn.execute(
+            "SELECT type_name FROM duckdb_types() WHERE type_name LIKE 'flights_origen_enum_v%'"
+        ).fetchall()]
+        assert len(type_names) == 1
+    finally:
+        conn.close()
+
+def test_startup_recovers_parquet_left_by_interrupted_compaction_and_load(ingest, tmp_path):
+    from src.application.use_cases.manage_ingest_jobs import ManageIngestJobs
+
+    use_case = ingest("parquet")
+    assert use_case.execute()["status"] == "success"
+    jobs = ManageIngestJobs(use_case, db_path=use_case.db_path, jobs_directory=str(tmp_path / "jobs"))
+    store = use_case.store
+
+    def flights():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return conn.execute("SELECT count(*) FROM flights").fetchone()[0]
+        finally:
+            conn.close()
+
+    # Migrations already ran, so only the startup recovery repairs a compaction that died between its renames
+    os.replace(store.root, store.root + ".previous")
+    with pytest.raises(duckdb.Error):
+        flights()
+    assert jobs.recover_storage()
+    assert flights() == 3 and not os.path.exists(store.root + ".previous")
+
+    # A load that died after withdrawing a file's parts, before its COMMIT
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        store.withdraw_file(conn, 1)
+    finally:
+        conn.close()
+    with pytest.raises(duckdb.Error):
+        flights()
+    assert jobs.recover_storage()
+    assert flights() == 3
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_compaction_rewrites_flights_clustered_by_date(ingest, tmp_path, backend):
+    use_case = ingest(backend)
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2023-12-31,VVC301,VIVA,SKMD,SKBO\n"
+        "2023-06-01,VVC302,VIVA,SKBO,SKMD\n"
+    )
+    use_case.execute()
+    use_case.delete_file("vuelos.csv")
+
+    result = use_case.compact_storage()
+    assert result["status"] == "success", result.get("message")
+    assert result["rows"] == 2
+
+    if backend == "duckdb":
+        # Native table scans follow physical (clustered) order
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            dates = [str(r[0]) for r in conn.execute("SELECT fecha FROM flights").fetchall()]
+        finally:
+            conn.close()
+        assert dates == ["2023-06-01", "2023-12-31"]
+    else:
+        assert result["storage_after"]["files"] == 2
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_region_ids_follow_region_airport_mappings(ingest, tmp_path, backend):
+    from src.domain.entities.region_airport import RegionAirport
+    from src.infrastructure.adapters.duckdb_region_airport_repository import DuckDBRegionAirportRepository
+    from src.application.use_cases.get_region_stats import GetRegionStats
+
+    use_case = ingest(backend)
+    repository = DuckDBRegionAirportRepository(use_case.db_path)
+    bogota = repository.create(RegionAirport(id=None, icao_code="SKBO", region_id=1))
+
+    use_case.execute()
+    assert GetRegionStats(use_case.db_path).execute({}) == [
+        {"name": "FIR Barranquilla(SKBQ)", "data": [{"x": "SKBO", "y": 2}]}
+    ]
+
+    # Remapping and adding airports only backfills the affected flights
+    repository.update(bogota.id, RegionAirport(id=bogota.id, icao_code="SKBO", region_id=2))
+    repository.create(RegionAirport(id=None, icao_code="SKRG", region_id=1))
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        rows = conn.execute("""
+            SELECT origen, destino, region_origen_id, region_destino_id
+            FROM flights ORDER BY fecha
+        """).fetchall()
+    finally:
+        conn.close()
+    assert rows == [
+        ("SKBO", "SKRG", 2, 1),
+        ("SKRG", "SKBO", 1, 2),
+        ("SKBO", "SKCL", 2, None),
+    ]
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_snapshot_ingest_publishes_atomically(ingest, tmp_path, backend, monkeypatch):
+    use_case = ingest(backend)
+    use_case.execute()
+    use_case.snapshot_ingest = True
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+        "2024-03-02,VVC302,VIVA,SKBO,SKMD\n"
+    )
+
+    # Readers can open the metrics database while files are being staged and see the previous snapshot
+    seen_during_staging = []
+    transform = use_case._read_and_transform
+
+    def reading_transform(file_path, file_id):
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            seen_during_staging.append(conn.execute("SELECT count(*) FROM flights").fetchone()[0])
+        finally:
+            conn.close()
+        return transform(file_path, file_id)
+
+    monkeypatch.setattr(use_case, "_read_and_transform", reading_transform)
+    result = use_case.execute()
+
+    assert result["status"] == "success", result.get("message")
+    assert result["rows_inserted"] == 2
+    assert seen_during_staging == [3]
+    assert not os.path.exists(use_case.staging_path)
+
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        assert conn.execute("SELECT count(*) FROM flights").fetchone()[0] == 5
+        file_id, status, row_count = conn.execute(
+            "SELECT id, status, row_count FROM file_processing_control WHERE file_name = 'vuelos_2.csv'"
+        ).fetchone()
+        assert (status, row_count) == ("COMPLETED", 2)
+        assert conn.execute("SELECT count(*) FROM flights WHERE file_id = ?", [file_id]).fetchone()[0] == 2
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_snapshot_reload_replaces_the_previous_load(ingest, tmp_path, backend, monkeypatch):
+    use_case = ingest(backend, snapshot_ingest=True)
+    assert use_case.execute()["status"] == "success"
+    source = tmp_path / "data" / "vuelos.csv"
+    source.write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-01-05,AVA101,AVIANCA,SKBO,SKRG\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+    )
+
+    def state():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return (
+                conn.execute("SELECT id, status, row_count FROM file_processing_control").fetchall(),
+                conn.execute("SELECT list(callsign ORDER BY callsign) FROM flights").fetchone()[0],
+                conn.execute("SELECT value, row_count FROM filters_values WHERE parent_id = 3 ORDER BY value").fetchall(),
+            )
+        finally:
+            conn.close()
+
+    before = state()
+    assert before[1] == ["AVA101", "AVA102", "LAN201"]
+
+    # A failed publish leaves the previous load untouched (Parquet parts included)
+    insert = use_case.store.insert
+
+    def failing_insert(conn, relation, file_id):
+        insert(conn, relation, file_id)
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(use_case.store, "insert", failing_insert)
+    assert use_case.execute(force_reload=True, specific_file=str(source))["status"] == "error"
+    assert state() == before
+
+    monkeypatch.setattr(use_case.store, "insert", insert)
+    result = use_case.execute(force_reload=True, specific_file=str(source))
+    assert result["status"] == "success", result.get("message")
+    controls, callsigns, empresas = state()
+    assert controls == [(before[0][0][0], "COMPLETED", 2)]
+    assert callsigns == ["AVA101", "VVC301"]
+    assert empresas == [("AVIANCA", 1), ("VIVA", 1)]
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_filter_values_follow_ingest_and_delete(ingest, tmp_path, backend):
+    from src.application.use_cases.manage_filters import ManageFilters
+    from src.infrastructure.adapters.filter_search_index import FilterSearchIndex
+
+    use_case = ingest(backend)
+    index = use_case.filter_search_index = FilterSearchIndex(use_case.db_path)
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+        "2024-03-02,AVA103,AVIANCA,SKBO,SKMD\n"
+    )
+    use_case.execute()
+
+    def empresas():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return conn.execute(
+                "SELECT value, row_count FROM filters_values WHERE parent_id = 3 ORDER BY value"
+            ).fetchall()
+        finally:
+            conn.close()
+
+    assert empresas() == [("AVIANCA", 3), ("LATAM", 1), ("VIVA", 1)]
+    # The search index is rebuilt as soon as the ingest finishes
+    assert [(r["value"], r["count"]) for r in index.search(3, "")] == [("AVIANCA", 3), ("LATAM", 1), ("VIVA", 1)]
+
+    use_case.delete_file("vuelos_2.csv")
+    assert empresas() == [("AVIANCA", 2), ("LATAM", 1)]
+    assert [r["value"] for r in index.search(3, "")] == ["AVIANCA", "LATAM"]
+
+    # The full single-scan rebuild agrees with the incremental counts
+    ManageFilters(use_case.db_path).refresh_filters()
+    assert empresas() == [("AVIANCA", 2), ("LATAM", 1)]
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_failed_file_rolls_back_alone_and_reload_replaces_previous_load(ingest, tmp_path, backend, monkeypatch):
+    use_case = ingest(backend)
+    (tmp_path / "data" / "vuelos_2.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino\n"
+        "2024-03-01,VVC301,VIVA,SKMD,SKBO\n"
+    )
+    insert = use_case.store.insert
+
+    def failing_insert(conn, relation, file_id):
+        insert(conn, relation, file_id)
+        if conn.execute(f"SELECT count(*) FROM {relation} WHERE callsign = 'VVC301'").fetchone()[0]:
+            raise RuntimeError("disk full")
+
+    monkeypatch.setattr(use_case.store, "insert", failing_insert)
+    assert use_case.execute()["status"] == "success"
+
+    def state():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return (
+                conn.execute("SELECT file_name, status FROM file_processing_control ORDER BY file_name").fetchall(),
+                conn.execute("SELECT count(*) FROM flights").fetchone()[0],
+                conn.execute("SELECT value FROM filters_values WHERE parent_id = 3 ORDER BY value").fetchall(),
+            )
+        finally:
+            conn.close()
+
+    # The failing file left no flights or filter counts behind, and the other file still loaded
+    assert state() == ([("vuelos.csv", "COMPLETED"), ("vuelos_2.csv", "ERROR")], 3, [("AVIANCA",), ("LATAM",)])
+
+    monkeypatch.setattr(use_case.store, "insert", insert)
+    result = use_case.execute(force_reload=True, specific_file=str(tmp_path / "data" / "vuelos.csv"))
+    assert result["status"] == "success", result.get("message")
+    assert use_case.execute()["status"] == "success"
+    assert state() == ([("vuelos.csv", "COMPLETED"), ("vuelos_2.csv", "COMPLETED")], 4,
+                       [("AVIANCA",), ("LATAM",), ("VIVA",)])
+
+
+@pytest.mark.parametrize("backend", ["duckdb", "parquet"])
+def test_route_distances_fill_missing_distance_and_speed(ingest, tmp_path, backend):
+    use_case = ingest(backend)
+    (tmp_path / "data" / "vuelos.csv").write_text(
+        "Fecha,Origen,Destino,Duración,Distancia,Velocidad\n"
+        "2024-01-05,SKBO,SKRG,30,,\n"
+        "2024-01-06,SKBO,SKRG,0,120,\n"
+        "2024-01-07,SKBO,SKCL,40,,\n"
+    )
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        conn.execute("""
+            INSERT INTO airports (icao_code, name, latitude, longitude) VALUES
+            ('SKBO', 'El Dorado', 4.70159, -74.1469), ('SKRG', 'José María Córdova', 6.16454, -75.4231)
+        """)
+    finally:
+        conn.close()
+
+    use_case.execute()
+
+    def flights():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return conn.execute("SELECT destino, distancia, velocidad FROM flights ORDER BY fecha").fetchall()
+        finally:
+            conn.close()
+
+    # SKBO-SKRG is ~116 NM; reported distances are kept and speed needs a duration
+    assert flights() == [("SKRG", 116, 233), ("SKRG", 120, None), ("SKCL", None, None)]
+
+    # Cali gets coordinates later: the on-demand backfill computes only the new route
+    conn = duckdb.connect(use_case.db_path)
+    try:
+        conn.execute("INSERT INTO airports (icao_code, name, latitude, longitude) VALUES ('SKCL', 'Alfonso Bonilla Aragón', 3.54322, -76.3816)")
+    finally:
+        conn.close()
+    result = use_case.backfill_route_distances()
+
+    assert result["status"] == "success", result.get("message")
+    assert (result["routes_computed"], result["flights_missing_before"], result["flights_missing_after"]) == (1, 2, 1)
+    assert flights()[2] == ("SKCL", 151, 226)
+
+
+@pytest.mark.parametrize("snapshot_ingest", [False, True])
+def test_ingest_records_stage_telemetry(ingest, tmp_path, snapshot_ingest):
+    use_case = ingest("duckdb", snapshot_ingest=snapshot_ingest)
+    (tmp_path / "data" / "vacio.csv").write_text("Fecha,Origen,Destino\n")
+
+    result = use_case.execute()
+    assert result["status"] == "success", result.get("message")
+
+    progress = use_case.get_progress()
+    assert progress["status"] == "completed"
+    assert (progress["total_files"], progress["processed_count"], progress["rows_done"]) == (2, 2, 3)
+    assert progress["progress"] == 1.0
+    assert progress["current_file"] is None
+    assert progress["bottleneck_stage"] in ("read", "rename", "parse", "insert", "control")
+    assert {f["file_name"]: f["status"] for f in progress["recent_files"]} == {"vuelos.csv": "COMPLETED", "vacio.csv": "SKIPPED"}
+
+    history = {row["file_name"]: row for row in use_case.get_history()}
+    loaded = history["vuelos.csv"]
+    assert loaded["file_size_bytes"] == len(CSV_CONTENT.encode())
+    assert loaded["read_seconds"] > 0 and loaded["insert_seconds"] > 0
+    assert loaded["duration_seconds"] >= loaded["read_seconds"] + loaded["parse_seconds"]
+    assert loaded["rows_per_second"] > 0
+    assert history["vacio.csv"]["rows_per_second"] is None
+
+
+@pytest.mark.parametrize("backend,snapshot_ingest", [("duckdb", False), ("parquet", True)])
+def test_invalid_rows_are_quarantined_and_reprocessed_after_correction(ingest, tmp_path, backend, snapshot_ingest):
+    use_case = ingest(backend, snapshot_ingest=snapshot_ingest)
+    (tmp_path / "data" / "vuelos.csv").write_text(
+        "Fecha,Callsign,Empresa,Origen,Destino,Nivel\n"
+        "2024-01-05,AVA101,AVIANCA,SKBO,SKRG,320\n"
+        "not-a-date,AVA102,AVIANCA,SKRG,SKBO,310\n"
+        "2024-01-07,AVA103,AVIANCA,,SKBO,5000\n"
+        "2024-01-08,AVA104,AVIANCA,SKBO,SKCL,300\n"
+    )
+
+    result = use_case.execute()
+    assert result["status"] == "success", result.get("message")
+    assert result["rows_inserted"] == 2
+
+    def control():
+        conn = duckdb.connect(use_case.db_path, read_only=True)
+        try:
+            return conn.execute(
+                "SELECT status, row_count, rejected_count FROM file_processing_control WHERE file_name = 'vuelos.csv'"
+            ).fetchone()
+        finally:
+            conn.close()
+
+    assert control() == ("COMPLETED", 2, 2)
+    rejected = use_case.get_rejected_rows()
+    assert rejected["total"] == 2
+    assert rejected["reasons"] == {"invalid_fecha": 1, "missing_origen": 1, "nivel_out_of_range": 1}
+    by_row = {row["source_row"]: row for row in rejected["rows"]}
+    assert by_row[3]["reasons"] == ["invalid_fecha"]
+    assert by_row[4]["reasons"] == ["nivel_out_of_range", "missing_origen"]
+    assert by_row[4]["raw_record"]["callsign"] == "AVA103"
+
+    # Fix only one of the rows: the reprocess loads it and keeps the other one quarantined
+    with pytest.raises(ValueError):
+        use_case.correct_rejected_row(by_row[4]["id"], {"unknown": "x"})
+    use_case.correct_rejected_row(by_row[4]["id"], {"origen": "SKMD", "nivel": 350})
+    result = use_case.reprocess_rejected()
+    assert (result["rows_loaded"], result["still_rejected"]) == (1, 1)
+
+    assert control() == ("COMPLETED", 3, 1)
+    conn = duckdb.connect(use_case.db_path, read_only=True)
+    try:
+        file_id = conn.execute("SELECT id FROM file_processing_control WHERE file_name = 'vuelos.csv'").fetchone()[0]
+        assert conn.execute("SELECT origen, nivel, file_id FROM flights WHERE callsign = 'AVA103'").fetchone() == ("SKMD", 350, file_id)
+        # The rows loaded before the reprocess are still there
+        assert conn.execute(
+            "SELECT list(callsign ORDER BY callsign) FROM flights WHERE file_id = ?", [file_id]
+        ).fetchone()[0] == ["AVA101", "AVA103", "AVA104"]
+    finally:
+        conn.close()
+
+    use_case.delete_file("vuelos.csv")
+    assert use_case.get_rejected_rows()["total"] == 0
@@ -0,0 +1,30 @@
+"""Integration tests for the versioned schema migrations."""
+import duckdb
+
+from src.infrastructure.adapters.database.migrations import MIGRATIONS, SchemaMigrator
+
+
+def test_migrations_apply_once_and_record_versions(tmp_path):
+    db_path = str(tmp_path / "metrics.duckdb")
+    region_csv = tmp_path / "region_airports.csv"
+    region_csv.write_text(
+        "id,icao_code,region_id,created_at\n"
+        "7,SKBO,2,2025-01-01 00:00:00\n"
+        "40,SKRG,1,2025-01-01 00:00:00\n"
+    )
+    migrator = SchemaMigrator(db_path, airports_csv_path=str(tmp_path / "missing.csv"),
+                              region_airports_csv_path=str(region_csv))
+
+    assert migrator.run() == [m[0] for m in MIGRATIONS]
+    assert migrator.run() == []
+
+    conn = duckdb.connect(db_path)
+    try:
+        assert SchemaMigrator.current_version(conn) == MIGRATIONS[-1][0]
+        # Sequences continue after the seeded / imported ids
+        assert conn.execute("INSERT INTO regions (name) VALUES ('Nueva') RETURNING id").fetchone()[0] == 3
+        assert conn.execute(
+            "INSERT INTO region_airports (icao_code, region_id) VALUES ('SKCL', 1) RETURNING id"
+        ).fetchone()[0] == 41
+    finally:
+        conn.close()
@@ -0,0 +1,121 @@
+"""Integration tests for the Prometheus registry, HTTP middleware, DuckDB query observer and query log."""
+import json
+
+import duckdb
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.use_cases.get_flight_stats import GetFlightStats
+from src.infrastructure.adapters.database.connections import InstrumentedConnection, connect, set_query_observer
+from src.infrastructure.adapters.observability import (
+    MetricsRegistry, PrometheusMiddleware, QueryObserver, fingerprint_sql
+)
+from src.infrastructure.adapters.query_log import QueryLog
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("CREATE TABLE flights AS SELECT range AS id, 'SKBO' AS origen FROM range(5000)")
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def observer():
+    observer = QueryObserver(MetricsRegistry(), slow_query_ms=0, capture_slow_plans=True)
+    set_query_observer(observer)
+    yield observer
+    set_query_observer(None)
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    first, normalized = fingerprint_sql("SELECT * FROM flights WHERE origen IN ('SKBO', 'SKRG') AND nivel > 300")
+    second, _ = fingerprint_sql("select *  from flights\n where origen in ('SKCL') and nivel > 120 -- dashboard")
+    other, _ = fingerprint_sql("SELECT * FROM flights WHERE destino IN ('SKBO')")
+
+    assert first == second != other
+    assert normalized == "select * from flights where origen in (?+) and nivel > ?"
+
+
+def test_instrumented_connection_records_duration_rows_and_slow_plans(db_path, observer):
+    conn = connect(db_path, read_only=True)
+    try:
+        assert isinstance(conn, InstrumentedConnection)
+        sql = "SELECT count(*) FROM flights WHERE id >= ?"
+        assert conn.execute(sql, [1000]).fetchall() == [(4000,)]
+        # A partial read still ends the measurement, but DuckDB has no final profile yet
+        assert conn.execute("SELECT id FROM flights ORDER BY id").fetchone() == (0,)
+        with pytest.raises(duckdb.CatalogException):
+            conn.execute("SELECT * FROM missing_table")
+    finally:
+        conn.close()
+
+    fingerprint, _ = fingerprint_sql(sql)
+    assert observer.duration.count(fingerprint=fingerprint) == 1
+    assert observer.rows_scanned.value(fingerprint=fingerprint) == 5000
+    assert observer.rows_returned.value(fingerprint=fingerprint) == 1
+    missing, _ = fingerprint_sql("SELECT * FROM missing_table")
+    assert observer.errors.value(fingerprint=missing, error="CatalogException") == 1
+    partial, _ = fingerprint_sql("SELECT id FROM flights ORDER BY id")
+    assert observer.duration.count(fingerprint=partial) == 1
+    assert observer.rows_scanned.value(fingerprint=partial) == 0
+
+    plans = observer.slow_plans(fingerprint)
+    assert len(plans) == 1 and "Query Profiling Information" in plans[0]["plan"]
+
+    exposition = observer.registry.render()
+    assert f'duckdb_query_duration_seconds_count{{fingerprint="{fingerprint}"}} 1' in exposition
+    assert f'duckdb_query_rows_scanned_total{{fingerprint="{fingerprint}"}} 5000' in exposition
+
+
+def test_middleware_labels_requests_by_route_template():
+    registry = MetricsRegistry()
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware, registry=registry)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nowhere")
+
+    exposition = registry.render()
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2' in exposition
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in exposition
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",status="200",le="+Inf"} 2' in exposition
+
+
+def test_query_log_attributes_statements_to_use_cases(db_path, tmp_path):
+    log_path = tmp_path / "logs" / "queries.jsonl"
+    query_log = QueryLog(capacity=100, path=str(log_path))
+    set_query_observer(QueryObserver(MetricsRegistry(), query_log=query_log))
+    try:
+        use_case = GetFlightStats(db_path)
+        use_case.execute({"origins": ["SKBO"]})
+        use_case.execute({"origins": ["SKBO", "SKRG"]})
+        conn = connect(db_path, read_only=True)
+        conn.execute("SELECT count(*) FROM flights").fetchall()
+        conn.close()
+    finally:
+        set_query_observer(None)
+        query_log.close()
+
+    # Both calls share a fingerprint despite the different IN list lengths
+    stats = next(item for item in query_log.top() if "GetFlightStats" in item["use_cases"])
+    assert len(query_log.top(order_by="p95")) == 2
+    assert stats["use_cases"] == {"GetFlightStats": 2}
+    assert stats["count"] == 2 and stats["rows"] == 2 and "origen in (?+)" in stats["statement"]
+    assert [entry["parameters"] for entry in query_log.recent(use_case="GetFlightStats")] == [2, 1]
+    assert query_log.recent(limit=1)[0]["use_case"] is None
+    with pytest.raises(ValueError):
+        query_log.top(order_by="mean")
+
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [line["use_case"] for line in lines] == ["GetFlightStats", "GetFlightStats", None]
+    assert lines[0]["fingerprint"] == stats["fingerprint"] and lines[0]["statement"] == stats["statement"]
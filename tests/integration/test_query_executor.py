@@ -0,0 +1,117 @@
+"""Integration tests for the bounded query executors and DuckDB cancellation on disconnect."""
+import asyncio
+import threading
+import time
+
+import duckdb
+import pytest
+
+from src.infrastructure.adapters.api.query_executor import QueryCancelled, QueryExecutor
+from src.infrastructure.adapters.database import connections
+from src.infrastructure.adapters.database.connections import QueryScope, connect
+
+# Cross join large enough to run for minutes unless interrupted
+ENDLESS_QUERY = "SELECT count(*) FROM range(100000000) a, range(100000000) b"
+
+
+class DisconnectingRequest:
+    """Minimal stand-in for starlette's Request: the client goes away after `after` seconds."""
+    def __init__(self, after: float):
+        self.deadline = time.monotonic() + after
+        self.url = type("URL", (), {"path": "/stats/test"})()
+
+    async def is_disconnected(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+def run_endless_query(db_path: str):
+    conn = connect(db_path, read_only=True)
+    try:
+        return conn.execute(ENDLESS_QUERY).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    duckdb.connect(path).close()
+    return path
+
+
+def test_scope_cancel_interrupts_running_statement(db_path):
+    scope = QueryScope()
+    errors = []
+
+    def worker():
+        with scope.bind():
+            try:
+                run_endless_query(db_path)
+            except duckdb.InterruptException as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.3)
+    assert scope.cancel() == 1
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+
+    # Work started after the cancellation is refused outright
+    with scope.bind(), pytest.raises(duckdb.InterruptException):
+        connect(db_path, read_only=True)
+
+
+def test_executor_cancels_query_when_client_disconnects(db_path):
+    executor = QueryExecutor("test", max_workers=1, disconnect_poll_seconds=0.05)
+    started = time.monotonic()
+    with pytest.raises(QueryCancelled):
+        asyncio.run(executor.run(DisconnectingRequest(after=0.3), run_endless_query, db_path))
+    assert time.monotonic() - started < 5
+    assert executor.in_flight == 0
+
+    # The single worker is free again for the next request
+    assert asyncio.run(executor.run(None, lambda: connect(db_path).execute("SELECT 42").fetchone()[0])) == 42
+    executor.shutdown()
+
+
+def test_executor_bounds_concurrency():
+    executor = QueryExecutor("test", max_workers=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def task():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    async def burst():
+        await asyncio.gather(*(executor.run(None, task) for _ in range(8)))
+
+    asyncio.run(burst())
+    assert peak[0] == 2
+    executor.shutdown()
+
+
+def test_readers_wait_for_the_writer_instead_of_failing(db_path, monkeypatch):
+    writer = connect(db_path)
+    writer.execute("CREATE TABLE t AS SELECT 1 AS a")
+    threading.Timer(0.2, writer.close).start()
+    # The read-only open conflicts with the write connection until it closes
+    reader = connect(db_path, read_only=True)
+    try:
+        assert reader.execute("SELECT a FROM t").fetchone()[0] == 1
+    finally:
+        reader.close()
+
+    monkeypatch.setattr(connections, "_connect_wait_seconds", 0.1)
+    reader = connect(db_path, read_only=True)
+    try:
+        with pytest.raises(duckdb.ConnectionException, match="different configuration"):
+            connect(db_path)
+    finally:
+        reader.close()
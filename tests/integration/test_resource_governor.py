@@ -0,0 +1,95 @@
+"""Integration tests for the per-workload DuckDB resource governor."""
+import duckdb
+import pytest
+
+from src.infrastructure.adapters.api.query_executor import QueryExecutor, QueryTimedOut
+from src.infrastructure.adapters.database.connections import connect, set_resource_governor
+from src.infrastructure.adapters.database.resource_governor import (
+    GovernedConnection, ResourceGovernor, StatementTimeout, WorkloadProfile, current_workload, workload
+)
+
+# Cross join large enough to run for minutes unless interrupted
+ENDLESS_QUERY = "SELECT count(*) FROM range(100000000) a, range(100000000) b"
+
+
+def _settings(conn):
+    return conn.execute(
+        "SELECT current_setting('threads'), current_setting('temp_directory')"
+    ).fetchone()
+
+
+@pytest.fixture
+def governor(tmp_path):
+    governor = ResourceGovernor(
+        engine=WorkloadProfile(threads=2, memory_limit="512MB", temp_directory=str(tmp_path / "spill")),
+        profiles={
+            "interactive": WorkloadProfile(statement_timeout_seconds=0.3),
+            "ingest": WorkloadProfile(threads=1, temp_directory=str(tmp_path / "ingest_spill")),
+        },
+        shared_database=str(tmp_path / "metrics.duckdb"),
+    )
+    set_resource_governor(governor)
+    yield governor
+    set_resource_governor(None)
+
+
+def test_engine_budget_on_the_shared_database_and_workload_limits_elsewhere(governor, tmp_path):
+    with workload("ingest"):
+        shared = connect(str(tmp_path / "metrics.duckdb"))
+        staging = connect(str(tmp_path / "metrics.staging.duckdb"))
+    try:
+        assert _settings(shared) == (2, str(tmp_path / "spill"))
+        assert _settings(staging) == (1, str(tmp_path / "ingest_spill"))
+        # Limits the ingest profile leaves unset come from the engine budget
+        assert governor.profile("ingest").memory_limit == "512MB"
+    finally:
+        shared.close()
+        staging.close()
+
+
+def test_statement_timeout_interrupts_only_the_workload_with_one(governor, tmp_path):
+    db_path = str(tmp_path / "metrics.duckdb")
+    with workload("interactive"):
+        conn = connect(db_path)
+    try:
+        assert isinstance(conn, GovernedConnection)
+        with pytest.raises(StatementTimeout):
+            conn.execute(ENDLESS_QUERY).fetchall()
+        # The connection stays usable after the interrupt
+        assert conn.execute("SELECT 42").fetchall() == [(42,)]
+    finally:
+        conn.close()
+
+    # No workload bound: engine budget only, no deadline
+    plain = connect(db_path)
+    try:
+        assert isinstance(plain, duckdb.DuckDBPyConnection)
+    finally:
+        plain.close()
+
+
+async def test_executor_named_after_a_workload_applies_its_timeout(governor, tmp_path):
+    db_path = str(tmp_path / "metrics.duckdb")
+    executor = QueryExecutor("interactive", max_workers=1)
+
+    def endless():
+        conn = connect(db_path)
+        try:
+            return conn.execute(ENDLESS_QUERY).fetchall()
+        finally:
+            conn.close()
+
+    try:
+        with pytest.raises(QueryTimedOut) as excinfo:
+            await executor.run(None, endless)
+        assert excinfo.value.status_code == 504
+    finally:
+        executor.shutdown()
+
+
+async def test_executor_binds_an_explicit_workload():
+    executor = QueryExecutor("reports", max_workers=1, workload="report")
+    try:
+        assert await executor.run(None, current_workload) == "report"
+    finally:
+        executor.shutdown()
@@ -0,0 +1,59 @@
+"""Integration tests for the opt-in columnar JSON / Arrow response encodings."""
+import duckdb
+import orjson
+import pyarrow as pa
+import pytest
+from fastapi import Body, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.application.use_cases.get_company_stats import GetCompanyStats
+from src.infrastructure.adapters.api.response_encoding import ARROW_STREAM, tabular_response, wants_columns
+
+
+@pytest.fixture
+def client(tmp_path):
+    db_path = str(tmp_path / "metrics.duckdb")
+    with duckdb.connect(db_path) as conn:
+        conn.execute("CREATE TABLE flights (fecha DATE, empresa VARCHAR)")
+        conn.execute("INSERT INTO flights VALUES ('2024-01-01', 'AVIANCA'), ('2024-01-02', 'AVIANCA'), ('2024-01-02', 'LATAM')")
+
+    app = FastAPI()
+    use_case = GetCompanyStats(db_path)
+
+    @app.post("/companies")
+    def companies(request: Request, filters: dict = Body(...)):
+        return tabular_response(request, use_case.execute(filters, as_arrow=wants_columns(request)))
+
+    @app.get("/forecast")
+    def forecast(request: Request):
+        history = pa.table({"date": pa.array([19723, 19724], type=pa.date32()), "value": [4, 6]})
+        payload = {"history": history if wants_columns(request) else history.to_pylist(), "model": "test"}
+        return tabular_response(request, payload, main_table="history")
+
+    return TestClient(app)
+
+
+def test_default_response_stays_row_oriented(client):
+    assert client.post("/companies", json={}).json() == [
+        {"name": "AVIANCA", "value": 2}, {"name": "LATAM", "value": 1}
+    ]
+
+
+def test_columnar_json_returns_arrays_per_field(client):
+    response = client.post("/companies?format=columnar", json={})
+    assert response.json() == {"name": ["AVIANCA", "LATAM"], "value": [2, 1]}
+
+    payload = client.get("/forecast?format=columnar").json()
+    assert payload == {"history": {"date": ["2024-01-01", "2024-01-02"], "value": [4, 6]}, "model": "test"}
+
+
+def test_arrow_stream_carries_main_table_and_metadata(client):
+    response = client.post("/companies", json={}, headers={"Accept": ARROW_STREAM})
+    assert response.headers["content-type"] == ARROW_STREAM
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.to_pydict() == {"name": ["AVIANCA", "LATAM"], "value": [2, 1]}
+
+    response = client.get("/forecast", headers={"Accept": ARROW_STREAM})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("value").to_pylist() == [4, 6]
+    assert orjson.loads(table.schema.metadata[b"payload"]) == {"model": "test"}
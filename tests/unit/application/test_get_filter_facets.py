@@ -0,0 +1,53 @@
+"""Unit tests for cross-filtered facet counts."""
+import duckdb
+import pytest
+
+from src.application.use_cases.get_filter_facets import GetFilterFacets
+from src.application.use_cases.manage_filters import ManageFilters
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE TABLE flights (
+            fecha DATE, nivel BIGINT, origen VARCHAR, destino VARCHAR, empresa VARCHAR,
+            tipo_vuelo VARCHAR, tipo_aeronave VARCHAR, matricula VARCHAR, callsign VARCHAR
+        )
+    """)
+    conn.execute("""
+        INSERT INTO flights VALUES
+        ('2024-01-01', 300, 'SKBO', 'SKRG', 'AVIANCA', 'R', 'A320', 'HK1', 'AVA1'),
+        ('2024-01-01', 300, 'SKBO', 'SKCL', 'AVIANCA', 'R', 'A320', 'HK1', 'AVA2'),
+        ('2024-01-02', 200, 'SKRG', 'SKBO', 'LATAM', 'R', 'A319', 'HK2', 'LAN1'),
+        ('2024-02-01', 300, 'SKCL', 'SKBO', 'VIVA', 'N', 'A320', 'HK3', NULL)
+    """)
+    conn.close()
+    return path
+
+
+def test_each_dimension_excludes_its_own_filter(db_path):
+    facets = GetFilterFacets(db_path).execute({"empresa": ["AVIANCA"], "start_date": "2024-01-01", "end_date": "2024-01-31"})
+
+    # empresa ignores its own selection, but keeps the date range
+    assert facets["empresa"] == [{"value": "AVIANCA", "count": 2}, {"value": "LATAM", "count": 1}]
+    # other dimensions only show what AVIANCA flew
+    assert facets["origins"] == [{"value": "SKBO", "count": 2}]
+    assert facets["destinations"] == [{"value": "SKCL", "count": 1}, {"value": "SKRG", "count": 1}]
+    assert facets["callsign"] == [{"value": "AVA1", "count": 1}, {"value": "AVA2", "count": 1}]
+
+
+def test_facet_limit_and_empty_filters(db_path):
+    facets = GetFilterFacets(db_path).execute({}, limit=1)
+    assert facets["tipo_aeronave"] == [{"value": "A320", "count": 3}]
+    assert set(facets) == {"origins", "destinations", "empresa", "tipo_vuelo", "tipo_aeronave", "matriculas", "callsign"}
+
+
+def test_origins_come_from_flights(db_path):
+    conn = duckdb.connect(db_path)
+    conn.execute("CREATE TABLE airports (icao_code VARCHAR)")
+    conn.execute("INSERT INTO airports VALUES ('SKBO'), ('SKMD'), ('KJFK')")
+    conn.close()
+
+    assert ManageFilters(db_path).get_origins() == ["SKBO", "SKCL", "SKRG"]
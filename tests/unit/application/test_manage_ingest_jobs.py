@@ -0,0 +1,157 @@
+"""Unit tests for ManageIngestJobs use case."""
+import os
+import threading
+import time
+import pytest
+
+from src.application.use_cases.manage_ingest_jobs import ManageIngestJobs, WriterBusyError
+from src.infrastructure.adapters.file_lock import InterProcessLock
+
+
+class FakeIngest:
+    """Stand-in for IngestFlightsDataUseCase that records calls and honours the job callbacks."""
+    def __init__(self, data_dir, gate=None):
+        self.data_dir = data_dir
+        self.gate = gate
+        self.in_file = threading.Event()
+        self.calls = []
+
+    def execute(self, force_reload=False, specific_file=None, files=None, should_stop=None, on_file_done=None):
+        self.calls.append({"force_reload": force_reload, "files": [os.path.basename(f) for f in files]})
+        for index, path in enumerate(files):
+            if should_stop and should_stop():
+                return {"status": "cancelled", "remaining_files": len(files) - index}
+            self.in_file.set()
+            if self.gate is not None:
+                self.gate.wait(5)
+            on_file_done(os.path.basename(path), "COMPLETED")
+        return {"status": "success", "rows_inserted": len(files)}
+
+    def compact_storage(self):
+        self.calls.append({"kind": "compact"})
+        return {"status": "success"}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    path.mkdir()
+    for name in ("a.csv", "b.csv", "c.csv"):
+        (path / name).write_text("x")
+    return str(path)
+
+
+def _make(tmp_path, engine, **kwargs):
+    return ManageIngestJobs(engine, db_path=str(tmp_path / "metrics.duckdb"),
+                            jobs_directory=str(tmp_path / "jobs"), lock_poll_seconds=0.1, **kwargs)
+
+
+def _wait(jobs, job_id, statuses=("completed", "failed", "cancelled"), timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get_status(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"ingest job stayed {jobs.get_status(job_id)['status']}")
+
+
+def test_jobs_run_in_submission_order_and_checkpoint_files(tmp_path, data_dir):
+    engine = FakeIngest(data_dir)
+    jobs = _make(tmp_path, engine)
+
+    first = jobs.submit("ingest")
+    second = jobs.submit("compact")
+    assert first["files"] == ["a.csv", "b.csv", "c.csv"]
+
+    done = _wait(jobs, first["id"])
+    _wait(jobs, second["id"])
+    assert done["status"] == "completed"
+    assert done["completed_files"] == ["a.csv", "b.csv", "c.csv"]
+    assert done["pending_files"] == []
+    assert engine.calls[1] == {"kind": "compact"}
+
+
+def test_cancel_stops_between_files_and_resume_finishes_pending(tmp_path, data_dir):
+    gate = threading.Event()
+    engine = FakeIngest(data_dir, gate=gate)
+    jobs = _make(tmp_path, engine)
+
+    job = jobs.submit("ingest", force_reload=True)
+    assert engine.in_file.wait(5)
+    jobs.cancel(job["id"])
+    gate.set()
+
+    cancelled = _wait(jobs, job["id"])
+    assert cancelled["status"] == "cancelled"
+    assert cancelled["completed_files"] == ["a.csv"]
+    assert cancelled["pending_files"] == ["b.csv", "c.csv"]
+
+    jobs.resume(job["id"])
+    resumed = _wait(jobs, job["id"], statuses=("completed", "failed"))
+    assert resumed["status"] == "completed"
+    assert resumed["resumes"] == 1
+    # The reset already happened on the first run: the resume must not wipe the loaded file
+    assert engine.calls[-1] == {"force_reload": False, "files": ["b.csv", "c.csv"]}
+
+
+def test_job_waits_for_writer_held_by_another_process(tmp_path, data_dir):
+    jobs = _make(tmp_path, FakeIngest(data_dir))
+    # flock locks belong to the open file, so a second handle behaves like another worker
+    other = InterProcessLock(str(tmp_path / "metrics.writer.lock"))
+    assert other.acquire(blocking=False)
+    try:
+        job = jobs.submit("ingest", filename="a.csv")
+        assert _wait(jobs, job["id"], statuses=("waiting",))["status"] == "waiting"
+        with pytest.raises(WriterBusyError):
+            jobs.run_exclusive(lambda: None, timeout=0.2)
+    finally:
+        other.release()
+    assert _wait(jobs, job["id"])["status"] == "completed"
+
+
+def test_unfinished_jobs_from_a_previous_process_are_marked_interrupted(tmp_path, data_dir):
+    gate = threading.Event()
+    engine = FakeIngest(data_dir, gate=gate)
+    first = _make(tmp_path, engine)
+    job = first.submit("ingest")
+    assert engine.in_file.wait(5)
+
+    # A new worker cannot claim the job while the first process still holds the writer lock
+    second = _make(tmp_path, FakeIngest(data_dir))
+    assert second.mark_interrupted() == 0
+    gate.set()
+    _wait(first, job["id"])
+
+    stale = dict(first.get_status(job["id"]), status="running", id="stale", pending_files=["b.csv"])
+    first._persist(stale)
+    third = _make(tmp_path, FakeIngest(data_dir))
+    assert third.mark_interrupted() == 1
+    assert third.get_status("stale")["status"] == "interrupted"
+
+
+def test_submit_rejects_unknown_kind_and_empty_directory(tmp_path):
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    jobs = _make(tmp_path, FakeIngest(str(empty)))
+
+    with pytest.raises(ValueError):
+        jobs.submit("vacuum")
+    with pytest.raises(ValueError):
+        jobs.submit("ingest")
+
+
+def test_submit_keeps_requested_files_inside_the_data_directory(tmp_path, data_dir):
+    (tmp_path / "secret.csv").write_text("x")
+    engine = FakeIngest(data_dir)
+    jobs = _make(tmp_path, engine)
+
+    for name in ("../secret.csv", str(tmp_path / "secret.csv"), "..", "missing.csv"):
+        with pytest.raises(ValueError):
+            jobs.submit("ingest", filename=name)
+
+    # Directory parts are dropped: the name resolves inside the data directory
+    job = jobs.submit("ingest", filename="../data/b.csv")
+    assert job["filename"] == "b.csv"
+    assert _wait(jobs, job["id"])["status"] == "completed"
+    assert engine.calls == [{"force_reload": False, "files": ["b.csv"]}]
@@ -0,0 +1,89 @@
+"""Unit tests for ManageReportJobs use case."""
+import os
+import time
+import duckdb
+import pytest
+
+from src.application.use_cases.manage_report_jobs import ManageReportJobs
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("CREATE TABLE flights (fecha DATE, origen VARCHAR, destino VARCHAR)")
+    conn.execute("""
+        INSERT INTO flights VALUES
+        ('2024-01-01', 'SKBO', 'SKRG'),
+        ('2024-01-02', 'SKBO', 'SKCL'),
+        ('2024-01-03', 'SKRG', 'SKBO')
+    """)
+    conn.close()
+    return path
+
+
+def _wait(jobs, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get_status(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("report job did not finish")
+
+
+def test_report_job_completes_and_exposes_artifact(db_path, tmp_path):
+    jobs = ManageReportJobs(db_path, jobs_directory=str(tmp_path / "jobs"))
+
+    submitted = jobs.submit("origin", "excel", {"start_date": "2024-01-01"})
+    assert submitted["status"] == "queued"
+
+    job = _wait(jobs, submitted["id"])
+    assert job["status"] == "completed", job["error"]
+    assert job["progress"] == 100
+    assert job["filename"] == "reporte_origen.xlsx"
+
+    artifact = jobs.get_artifact(submitted["id"])
+    assert os.path.getsize(artifact["path"]) > 0
+
+
+def test_report_job_rejects_unknown_report_and_format(db_path, tmp_path):
+    jobs = ManageReportJobs(db_path, jobs_directory=str(tmp_path / "jobs"))
+
+    with pytest.raises(ValueError):
+        jobs.submit("unknown", "pdf", {})
+    with pytest.raises(ValueError):
+        jobs.submit("raw", "pdf", {})
+
+
+def test_expired_jobs_are_cleaned_up(db_path, tmp_path):
+    jobs = ManageReportJobs(db_path, jobs_directory=str(tmp_path / "jobs"), ttl_seconds=0)
+
+    submitted = jobs.submit("raw", "csv", {})
+    deadline = time.time() + 30
+    while jobs.get_status(submitted["id"]) is not None and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert jobs.get_status(submitted["id"]) is None
+    assert os.listdir(tmp_path / "jobs") == []
+
+
+def test_another_worker_sees_status_and_artifact(db_path, tmp_path):
+    jobs = ManageReportJobs(db_path, jobs_directory=str(tmp_path / "jobs"))
+    other_worker = ManageReportJobs(db_path, jobs_directory=str(tmp_path / "jobs"))
+
+    submitted = jobs.submit("origin", "pdf", {})
+    job = _wait(other_worker, submitted["id"])
+
+    assert job["status"] == "completed", job["error"]
+    assert [j["id"] for j in other_worker.list_jobs()] == [submitted["id"]]
+    assert os.path.getsize(other_worker.get_artifact(submitted["id"])["path"]) > 0
+
+
+def test_report_generators_announce_their_stages(db_path):
+    from src.application.use_cases.generate_origin_report import GenerateOriginReport
+
+    stages = []
+    GenerateOriginReport(db_path).generate_excel({}, progress=stages.append)
+
+    assert stages == ["data", "chart", "layout"]
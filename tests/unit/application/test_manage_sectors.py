@@ -0,0 +1,78 @@
+"""Unit tests for sector membership tables maintained by ManageSectors."""
+import duckdb
+import pytest
+
+from src.application.use_cases.manage_sectors import ManageSectors
+from src.application.use_cases.calculate_sector_capacity import CalculateSectorCapacity
+from src.infrastructure.adapters.database.migrations import SchemaMigrator
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metrics.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE TABLE sectors (
+            id VARCHAR PRIMARY KEY, name VARCHAR, definition VARCHAR,
+            t_transfer FLOAT, t_comm_ag FLOAT, t_separation FLOAT, t_coordination FLOAT,
+            adjustment_factor_r FLOAT DEFAULT 0.8, capacity_baseline INTEGER
+        )
+    """)
+    conn.execute("""INSERT INTO sectors (id, name, definition) VALUES ('s1', 'Legacy', '{"origins": ["SKBO"], "destinations": ["SKRG"]}')""")
+    conn.execute("CREATE TABLE flights (fecha DATE, origen VARCHAR, destino VARCHAR, duracion BIGINT)")
+    conn.execute("""
+        INSERT INTO flights VALUES
+        ('2024-01-01', 'SKBO', 'SKRG', 40),
+        ('2024-01-01', 'SKBO', 'SKCL', 60),
+        ('2024-01-02', 'SKMD', 'SKRG', 20)
+    """)
+    conn.close()
+    # Adopt the pre-migration database (legacy sectors and flights tables)
+    SchemaMigrator(path, airports_csv_path=str(tmp_path / "missing.csv"),
+                   region_airports_csv_path=str(tmp_path / "missing.csv")).run()
+    return path
+
+
+def _members(db_path, table, sector_id):
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        rows = conn.execute(f"SELECT icao_code FROM {table} WHERE sector_id = ? ORDER BY 1", [sector_id]).fetchall()
+        return [r[0] for r in rows]
+    finally:
+        conn.close()
+
+
+def test_memberships_follow_sector_lifecycle(db_path):
+    sectors = ManageSectors(db_path)
+
+    sector_id = sectors.create({"name": "Norte", "definition": {"origins": ["SKBO"], "destinations": ["SKRG", "SKCL"]}})
+    assert _members(db_path, "sector_origins", sector_id) == ["SKBO"]
+    assert _members(db_path, "sector_destinations", sector_id) == ["SKCL", "SKRG"]
+
+    assert sectors.update(sector_id, {"definition": {"origins": ["SKBO", "SKMD"], "destinations": ["SKRG"]}})
+    assert _members(db_path, "sector_origins", sector_id) == ["SKBO", "SKMD"]
+    assert _members(db_path, "sector_destinations", sector_id) == ["SKRG"]
+
+    assert sectors.update(sector_id, {"name": "Norte 2"})
+    assert _members(db_path, "sector_origins", sector_id) == ["SKBO", "SKMD"]
+
+    sectors.delete(sector_id)
+    assert _members(db_path, "sector_origins", sector_id) == []
+    assert _members(db_path, "sector_destinations", sector_id) == []
+
+
+def test_migrations_backfill_existing_sectors(db_path):
+    assert _members(db_path, "sector_origins", "s1") == ["SKBO"]
+    assert _members(db_path, "sector_destinations", "s1") == ["SKRG"]
+
+
+def test_sector_capacity_semi_joins_membership(db_path):
+    sector_id = ManageSectors(db_path).create({
+        "name": "Norte",
+        "definition": {"origins": ["SKBO", "SKMD"], "destinations": ["SKRG"]},
+        "t_transfer": 10, "t_comm_ag": 10, "t_separation": 10, "t_coordination": 10,
+    })
+
+    result = CalculateSectorCapacity(db_path).execute(sector_id, {})
+
+    assert result["total_flights_analyzed"] == 2
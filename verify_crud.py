@@ -6,7 +6,7 @@ def verify_crud():
     print("Verifying CRUD operations on data/metrics.duckdb...")
     
     # 1. Setup Repository
-    repo = DuckDBAirportRepository(db_path="data/metrics.duckdb", csv_path="data/raw/data.csv")
+    repo = DuckDBAirportRepository(db_path="data/metrics.duckdb")
     
     # 2. Test CREATE
     print("\n--- Testing CREATE ---")